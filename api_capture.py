@@ -0,0 +1,334 @@
+import base64
+import json
+import re
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from http_cache import HttpCache
+from records import DATE_FIELDS, MISSING_VALUE
+from replay import Recording
+
+CapturedResponse = Dict[str, Any]
+
+# Part of the URL of every request the website sends to its API (the search-eo table and the eo-detail view)
+API_URL_PATTERN = '/tools/eudamed/api/'
+
+# The Chrome capability that writes the network events to the performance log, where get_log('performance') reads
+# them
+CAPTURE_CAPABILITIES = {'goog:loggingPrefs': {'performance': 'ALL'}}
+
+# Where the fields of an actor record are in the JSON of the actor details, dots separate nested keys. The paths
+# follow the responses seen so far; a field that is not found gets '-' like an empty field on the page. Fix a path
+# here when the API changes, the captured responses stay in the HTTP cache.
+ACTOR_FIELD_PATHS = {
+    'Actor ID/SRN': 'srn',
+    'Role': 'actorType.code',
+    'Country': 'countryName',
+    'Actor/Organisation name': 'name',
+    'Abbreviated name': 'abbreviatedName',
+    'VAT number': 'vatNumber',
+    'EORI': 'eoriNumber',
+    'National trade register': 'nationalTradeRegister',
+    'Last confirmation date of actor data accuracy': 'lastConfirmationDate',
+    'Street name': 'actorAddress.streetName',
+    'Street number': 'actorAddress.buildingNumber',
+    'Address line 2': 'actorAddress.complement',
+    'PO box': 'actorAddress.postbox',
+    'City name': 'actorAddress.cityName',
+    'Postal Code': 'actorAddress.postalZone',
+    'Latitude': 'actorAddress.latitude',
+    'Longitude': 'actorAddress.longitude',
+    'Email': 'electronicMail',
+    'Telephone number': 'telephone',
+    'Web site': 'website',
+    'Last update date': 'lastUpdateDate',
+}
+
+# Fields a record built from the JSON must have, otherwise the actor page is parsed instead
+REQUIRED_FIELDS = ('Actor ID/SRN', 'Actor/Organisation name', 'Country', 'Last update date')
+
+# Reference data codes, e.g. 'refdata.actor-type.manufacturer', are shown by their last part on the page
+REFDATA_CODE_PREFIX = 'refdata.'
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+
+def get_path(data: Any, path: str) -> Any:
+    """
+        Returns the value at a dotted path of nested dictionaries, None if it is not there.
+
+        Args:
+            - data: The decoded JSON.
+            - path: The keys separated by dots, e.g. 'actorAddress.cityName'.
+    """
+    for key in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+
+        data = data.get(key)
+
+    return data
+
+
+def format_value(field: str, value: Any) -> str:
+    """
+        Formats a JSON value the way the actor page shows it.
+
+        Args:
+            - field: The name of the field.
+            - value: The value from the JSON.
+
+        Returns:
+            - The text of the field, '-' if the value is missing.
+    """
+    if value is None or value == '':
+        return MISSING_VALUE
+
+    if isinstance(value, str) and value.startswith(REFDATA_CODE_PREFIX):
+        return value.rsplit('.', 1)[-1].replace('-', ' ').capitalize()
+
+    if field in DATE_FIELDS and isinstance(value, str) and DATE_PATTERN.match(value):
+        return value[:10]
+
+    return str(value).strip()
+
+
+def build_actor_record(data: Any, url: str) -> Optional[Dict[str, str]]:
+    """
+        Builds an actor record from the JSON of the actor details.
+
+        Produces the same dictionary as parse_actor_html for the actor page of the JSON.
+
+        Args:
+            - data: The decoded JSON.
+            - url: The URL of the actor page.
+
+        Returns:
+            - A dictionary containing actor information, None if one of the REQUIRED_FIELDS is missing.
+    """
+    if not isinstance(data, dict):
+        return None
+
+    actor_information = {field: format_value(field, get_path(data, path)) for field, path in ACTOR_FIELD_PATHS.items()}
+
+    if any(actor_information[field] == MISSING_VALUE for field in REQUIRED_FIELDS):
+        return None
+
+    actor_information['Actor URL'] = url
+
+    return actor_information
+
+
+def parse_performance_log(entries: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+    """
+        Reads the network events from the entries of the Chrome performance log.
+
+        Args:
+            - entries: The entries returned by driver.get_log('performance').
+
+        Returns:
+            - An iterator over the events, each a dictionary with the method and the params of the DevTools event.
+    """
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        if message.get('method', '').startswith('Network.'):
+            yield message
+
+
+class ApiCapture:
+    """
+        Captures the JSON responses of the website API from the Chrome performance log.
+
+        The browser has to be started with CAPTURE_CAPABILITIES. The responses are read when their loading has
+        finished: the body is taken through the DevTools protocol, stored in the HTTP cache or the recording if there
+        is one and the JSON is kept in memory, so the actor records can be built from it instead of waiting for and
+        parsing the actor page. The responses of the actor details are stored under the ID of their actor as well, so
+        a later run can build the record from the HTTP cache without opening the actor page at all.
+    """
+
+    def __init__(self, store: Optional[Union[HttpCache, Recording]] = None, max_responses: int = 100,
+                 url_pattern: str = API_URL_PATTERN, json_only: bool = True):
+        """
+            Initializes the ApiCapture.
+
+            Args:
+                - store: Where the captured responses are stored, None to only keep them in memory.
+                - max_responses: How many of the most recent JSON responses are kept in memory.
+                - url_pattern: Only the responses whose URL contains it are captured.
+                - json_only: Capture only JSON responses. Without it pages, scripts and styles are stored as well,
+                  e.g. to replay them.
+        """
+        self.store = store
+        self.url_pattern = url_pattern
+        self.json_only = json_only
+        self.responses = deque(maxlen=max_responses)
+        # API responses whose body is still loading, by request ID
+        self.pending = {}
+
+    def collect(self, driver: WebDriver) -> List[CapturedResponse]:
+        """
+            Reads the API responses loaded since the last call.
+
+            Args:
+                - driver: The WebDriver of the browser.
+
+            Returns:
+                - The new JSON responses, each a dictionary with the URL, status, headers and decoded JSON.
+        """
+        collected = []
+
+        for message in parse_performance_log(driver.get_log('performance')):
+            params = message.get('params', {})
+
+            if message['method'] == 'Network.responseReceived':
+                response = params.get('response', {})
+
+                if self.url_pattern in response.get('url', '') and \
+                        (not self.json_only or 'json' in response.get('mimeType', '')):
+                    self.pending[params['requestId']] = response
+
+            elif message['method'] == 'Network.loadingFinished' and params.get('requestId') in self.pending:
+                captured = self.read_response(driver, params['requestId'], self.pending.pop(params['requestId']))
+
+                if captured is not None:
+                    collected.append(captured)
+
+            elif message['method'] == 'Network.loadingFailed':
+                self.pending.pop(params.get('requestId'), None)
+
+        self.responses.extend(collected)
+
+        return collected
+
+    def read_response(self, driver: WebDriver, request_id: str,
+                      response: Dict[str, Any]) -> Optional[CapturedResponse]:
+        """
+            Takes the body of a finished response and stores it.
+
+            Args:
+                - driver: The WebDriver of the browser.
+                - request_id: The DevTools ID of the request.
+                - response: The response params of the Network.responseReceived event.
+
+            Returns:
+                - The captured response, None if the body is no longer available or is not JSON.
+        """
+        try:
+            result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except WebDriverException:
+            return None
+
+        body = result['body']
+        body = base64.b64decode(body) if result.get('base64Encoded') else body.encode('utf-8')
+
+        if self.store is not None:
+            self.store.put(response['url'], response.get('status', 0), response.get('headers', {}), body)
+
+        if 'json' not in response.get('mimeType', ''):
+            return None
+
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return None
+
+        actor_id = get_path(data, ACTOR_FIELD_PATHS['Actor ID/SRN'])
+
+        if isinstance(self.store, HttpCache) and response.get('status') == 200 and isinstance(actor_id, str):
+            self.store.add_key(actor_id, response['url'], driver.current_url)
+
+        return {'url': response['url'], 'status': response.get('status'), 'headers': response.get('headers', {}),
+                'data': data}
+
+    def find_actor(self, actor_id: str, url: str) -> Optional[Dict[str, str]]:
+        """
+            Builds the record of an actor from the most recent captured response of its details.
+
+            Args:
+                - actor_id: The ID of the actor.
+                - url: The URL of the actor page.
+
+            Returns:
+                - A dictionary containing actor information, None if no usable response of the actor was captured.
+        """
+        for response in reversed(self.responses):
+            if response['status'] == 200 and get_path(response['data'], ACTOR_FIELD_PATHS['Actor ID/SRN']) == actor_id:
+                return build_actor_record(response['data'], url)
+
+        return None
+
+    def get_cached_actor(self, actor_id: str, url: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+            Builds the record of an actor from the fresh response of its details in the HTTP cache.
+
+            Args:
+                - actor_id: The ID of the actor.
+                - url: The URL of the actor page, by default the one the response was loaded by.
+
+            Returns:
+                - A dictionary containing actor information, None if the cache has no usable fresh response of the
+                  actor.
+        """
+        if not isinstance(self.store, HttpCache):
+            return None
+
+        cached = self.store.get_by_key(actor_id)
+
+        if cached is None:
+            return None
+
+        try:
+            data = json.loads(cached['body'])
+        except ValueError:
+            return None
+
+        if get_path(data, ACTOR_FIELD_PATHS['Actor ID/SRN']) != actor_id:
+            return None
+
+        return build_actor_record(data, url or cached['page_url'] or MISSING_VALUE)
+
+    def wait_for_actor(self, driver: WebDriver, actor_id: str, timeout: float,
+                       stop: Optional[Callable[[], bool]] = None,
+                       poll_interval: float = 0.1) -> Optional[Dict[str, str]]:
+        """
+            Waits for the response of the actor details and builds the record of the actor from it.
+
+            Args:
+                - driver: The WebDriver of the browser, on the actor page.
+                - actor_id: The ID of the actor.
+                - timeout: The maximum time to wait, in seconds.
+                - stop: Stops waiting when it returns True, e.g. once the page shows the actor.
+                - poll_interval: How often (in seconds) the performance log is read.
+
+            Returns:
+                - A dictionary containing actor information, None if the response did not come or could not be used.
+        """
+        deadline = time.time() + timeout
+
+        while True:
+            # Checked before reading the log, so the response the page was rendered from is read once more
+            stopped = time.time() >= deadline or (stop is not None and stop())
+
+            self.collect(driver)
+
+            actor_information = self.find_actor(actor_id, driver.current_url)
+
+            if actor_information is not None or stopped:
+                return actor_information
+
+            time.sleep(poll_interval)
+
+    def clear(self) -> None:
+        """
+            Forgets the captured and pending responses, e.g. after the browser was restarted.
+        """
+        self.responses.clear()
+        self.pending.clear()
@@ -0,0 +1,193 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+from data_handling import atomic_write, save_data_stream
+from pages.actor_parser import parse_actor_html
+from parallel import parallel_map
+
+ArchiveEntry = Dict[str, str]
+
+
+class PageArchive:
+    """
+        Stores the page source of scraped actor pages compressed on disk, so the data can be parsed again later
+        (e.g. when a new field is added) without crawling the website again.
+
+        Pages are content-addressed: every distinct page source is saved once as
+        <directory>/objects/<hash[:2]>/<hash>.html.gz, where hash is its SHA-256. Every fetch is appended to
+        <directory>/index.jsonl with the actor ID, the actor URL, the fetch time and the hash of the page.
+    """
+    INDEX_FILENAME = 'index.jsonl'
+    OBJECTS_DIRECTORY = 'objects'
+
+    def __init__(self, directory: str):
+        """
+            Initializes the PageArchive and creates its directory.
+
+            Args:
+                - directory: The directory where the pages are stored.
+        """
+        self.directory = directory
+        self.index_filename = os.path.join(directory, self.INDEX_FILENAME)
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.join(directory, self.OBJECTS_DIRECTORY), exist_ok=True)
+
+    def get_object_filename(self, content_hash: str) -> str:
+        return os.path.join(self.directory, self.OBJECTS_DIRECTORY, content_hash[:2], f'{content_hash}.html.gz')
+
+    def add(self, actor_id: str, url: str, html: str, fetched_at: Optional[float] = None) -> str:
+        """
+            Saves the page source of an actor page.
+
+            Args:
+                - actor_id: The ID of the actor.
+                - url: The URL of the actor page.
+                - html: The page source.
+                - fetched_at: When the page was fetched (as a timestamp), now by default.
+
+            Returns:
+                - The hash of the page source.
+        """
+        content = html.encode('utf-8')
+
+        content_hash = hashlib.sha256(content).hexdigest()
+
+        object_filename = self.get_object_filename(content_hash)
+
+        # The same page fetched again is stored only once
+        if not os.path.exists(object_filename):
+            os.makedirs(os.path.dirname(object_filename), exist_ok=True)
+
+            compressed = gzip.compress(content)
+
+            atomic_write(object_filename, lambda file: file.write(compressed), binary=True)
+
+        entry = {
+            'Actor ID/SRN': actor_id,
+            'Actor URL': url,
+            'Fetched at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(fetched_at)),
+            'Hash': content_hash,
+        }
+
+        with self.lock, open(self.index_filename, 'a', encoding='utf-8') as index_file:
+            index_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        return content_hash
+
+    def read(self, content_hash: str) -> str:
+        """
+            Returns a saved page source.
+
+            Args:
+                - content_hash: The hash of the page source.
+
+            Returns:
+                - The page source.
+        """
+        with gzip.open(self.get_object_filename(content_hash), 'rt', encoding='utf-8') as file:
+            return file.read()
+
+    def iter_entries(self) -> Iterator[ArchiveEntry]:
+        """
+            Iterates over all the fetches in the order they were saved.
+        """
+        try:
+            index_file = open(self.index_filename, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+
+        with index_file:
+            for line in index_file:
+                # A line cut off by a crash is skipped
+                if line.endswith('\n'):
+                    yield json.loads(line)
+
+    def get_latest_entries(self) -> Dict[str, ArchiveEntry]:
+        """
+            Returns the most recent fetch of every actor.
+
+            Returns:
+                - A dictionary of index entries by actor ID, in the order the actors were first fetched.
+        """
+        latest = {}
+
+        for entry in self.iter_entries():
+            latest[entry['Actor ID/SRN']] = entry
+
+        return latest
+
+    def get_latest(self, actor_id: str) -> Optional[str]:
+        """
+            Returns the most recently saved page source of an actor.
+
+            Args:
+                - actor_id: The ID of the actor.
+
+            Returns:
+                - The page source, None if there is no saved page for the actor.
+        """
+        entry = self.get_latest_entries().get(actor_id)
+
+        return self.read(entry['Hash']) if entry else None
+
+
+def _extract_archived_page(args: Tuple[str, ArchiveEntry]) -> Tuple[str, Optional[Dict[str, str]], Optional[str]]:
+    """
+        Parses one archived page. Runs in a worker process.
+
+        Returns:
+            - A tuple of the actor ID, the actor information (None if it failed) and the error message.
+    """
+    directory, entry = args
+
+    try:
+        html = PageArchive(directory).read(entry['Hash'])
+
+        return entry['Actor ID/SRN'], parse_actor_html(html, entry['Actor URL']), None
+    except Exception as e:
+        return entry['Actor ID/SRN'], None, str(e)
+
+
+def reextract(page_archive: PageArchive, filename: str, workers: Optional[int] = None, chunk_size: int = 64,
+              ordered: bool = True) -> Tuple[int, int]:
+    """
+        Rebuilds the actor data from the latest archived page of every actor, parsing the pages on all cores.
+
+        The records are written to the file as they are parsed.
+
+        Args:
+            - page_archive: The archive to read the pages from.
+            - filename: The name of the JSON file to save the data to.
+            - workers: The number of worker processes, the number of CPUs by default.
+            - chunk_size: How many pages are sent to a worker process at once.
+            - ordered: Save the records in the order the actors were first archived. Otherwise they are saved as soon
+              as they are parsed, which is faster when some pages take longer.
+
+        Returns:
+            - A tuple of the number of extracted and failed records.
+    """
+    entries = page_archive.get_latest_entries()
+
+    failed = 0
+
+    def extracted_items():
+        nonlocal failed
+
+        tasks = ((page_archive.directory, entry) for entry in entries.values())
+
+        for actor_id, actor_information, _ in parallel_map(_extract_archived_page, tasks, workers, chunk_size, ordered):
+            if actor_information is None:
+                failed += 1
+                continue
+
+            yield actor_id, actor_information
+
+    save_data_stream(extracted_items(), filename)
+
+    return len(entries) - failed, failed
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from changefeed import get_record_hash
+from data_handling import iter_data, load_ids
+from records import ActorRecord
+
+# How many times every stage is timed, the fastest time is reported
+BENCH_REPEAT = 3
+
+
+def time_stage(function: Callable[[], object], repeat: int) -> float:
+    """
+        Times a function.
+
+        Args:
+            - function: The function to time.
+            - repeat: How many times it is called.
+
+        Returns:
+            - The fastest time, in seconds.
+    """
+    fastest = None
+
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+
+        function()
+
+        elapsed = time.perf_counter() - start_time
+
+        fastest = elapsed if fastest is None else min(fastest, elapsed)
+
+    return fastest
+
+
+def run_benchmarks(filename: str, repeat: int = BENCH_REPEAT) -> List[Tuple[str, float, int]]:
+    """
+        Times the local stages of the scraper on a data file, without a browser: loading the actor IDs, streaming
+        the records, hashing them for the changefeed, converting them to ActorRecords and exporting them to Parquet.
+
+        Args:
+            - filename: The name of the data file, e.g. importers_data.json.
+            - repeat: How many times every stage is timed.
+
+        Returns:
+            - The name, the fastest time in seconds and the number of records of every stage.
+    """
+    records = [record for _, record in iter_data(filename)]
+
+    stages: Dict[str, Callable[[], object]] = {
+        'Load actor IDs': lambda: load_ids(filename),
+        'Stream records': lambda: sum(1 for _ in iter_data(filename)),
+        'Hash records': lambda: [get_record_hash(record) for record in records],
+        'Typed records': lambda: [ActorRecord.from_dict(record) for record in records],
+    }
+
+    try:
+        # Imported here, pyarrow is only needed by this stage
+        from export import export_parquet
+    except ImportError:
+        export_parquet = None
+
+    with tempfile.TemporaryDirectory() as directory:
+        if export_parquet is not None:
+            stages['Parquet export'] = lambda: export_parquet(records, os.path.join(directory, 'bench.parquet'))
+
+        return [(name, time_stage(function, repeat), len(records)) for name, function in stages.items()]
+
+
+def format_benchmarks(results: List[Tuple[str, float, int]]) -> str:
+    """
+        Formats the results of run_benchmarks as text.
+
+        Args:
+            - results: The results.
+
+        Returns:
+            - The text of the results, one stage per line.
+    """
+    lines = []
+
+    for name, seconds, records in results:
+        rate = f'{records / seconds:,.0f} records/s' if seconds > 0 else '-'
+
+        lines.append(f'{name:<16} {seconds * 1000:>10.1f} ms  {rate}')
+
+    return '\n'.join(lines)
@@ -0,0 +1,65 @@
+from typing import Dict, List, Union
+
+# Available browser profiles
+LEGACY_PROFILE = 'legacy'
+LIGHTWEIGHT_PROFILE = 'lightweight'
+DENSE_PROFILE = 'dense'
+
+# Switches that turn off everything a scraping session does not need: background requests to Google services,
+# component updates, sync, first run UI and so on.
+# More info: https://github.com/GoogleChrome/chrome-launcher/blob/main/docs/chrome-flags-for-tools.md
+_BACKGROUND_OPTIONS = ['--disable-background-networking', '--disable-sync', '--disable-component-update',
+                       '--disable-default-apps', '--disable-domain-reliability',
+                       '--disable-client-side-phishing-detection', '--disable-breakpad', '--no-first-run',
+                       '--no-default-browser-check', '--mute-audio', '--disable-notifications',
+                       '--disable-extensions', '--disable-infobars', '--disable-gpu',
+                       '--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions']
+
+# Small disk and media caches, the pages are visited once
+_CACHE_OPTIONS = ['--disk-cache-size=33554432', '--media-cache-size=1048576', '--aggressive-cache-discard']
+
+# Chrome preference that blocks loading of images, the scraper only needs the text
+BLOCK_IMAGES_PREFERENCE = 'profile.managed_default_content_settings.images'
+_BLOCK_IMAGES_PREFERENCES = {BLOCK_IMAGES_PREFERENCE: 2}
+
+BROWSER_PROFILES: Dict[str, Dict[str, Union[List[str], str, Dict[str, int]]]] = {
+    # The options the scraper used before the profiles were introduced
+    LEGACY_PROFILE: {
+        'arguments': ['headless', '--disable-extensions', '--disable-infobars', '--disable-gpu',
+                      '--disable-notifications'],
+        'page_load_strategy': 'normal',
+        'preferences': {},
+    },
+    # New headless mode without background work, with small caches and a fixed window. The page load waits only
+    # for the DOM, the scraper waits for the elements it needs anyway.
+    LIGHTWEIGHT_PROFILE: {
+        'arguments': ['--headless=new', '--window-size=1280,800', *_BACKGROUND_OPTIONS, *_CACHE_OPTIONS],
+        'page_load_strategy': 'eager',
+        'preferences': {},
+    },
+    # Lightweight profile that additionally limits the renderer processes and their memory and does not load
+    # images. Use it to run many sessions on one host.
+    DENSE_PROFILE: {
+        'arguments': ['--headless=new', '--window-size=1024,768', *_BACKGROUND_OPTIONS, *_CACHE_OPTIONS,
+                      '--renderer-process-limit=1', '--js-flags=--max-old-space-size=256',
+                      '--disable-dev-shm-usage'],
+        'page_load_strategy': 'eager',
+        'preferences': _BLOCK_IMAGES_PREFERENCES,
+    },
+}
+
+
+def get_browser_profile(name: str) -> Dict[str, Union[List[str], str, Dict[str, int]]]:
+    """
+        Returns the browser profile with the given name.
+
+        Args:
+            - name: The name of the profile.
+
+        Returns:
+            - A dictionary with the command line arguments, the page load strategy and the preferences of the profile.
+    """
+    try:
+        return BROWSER_PROFILES[name]
+    except KeyError:
+        raise ValueError(f'Invalid browser profile specified. Choices allowed are: {", ".join(BROWSER_PROFILES)}')
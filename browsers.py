@@ -0,0 +1,212 @@
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
+
+from options import WebDriverOptions
+from pages.locators import CLASS_NAME, CSS_SELECTOR, ID, TAG_NAME, XPATH
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, ElementHandle, Page, Playwright
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Available browsers, see WebDriverOptions.BROWSER
+CHROME_BROWSER = 'chrome'
+FIREFOX_BROWSER = 'firefox'
+PLAYWRIGHT_BROWSER = 'playwright'
+
+BROWSERS = (CHROME_BROWSER, FIREFOX_BROWSER, PLAYWRIGHT_BROWSER)
+
+# The browsers Playwright can start, see WebDriverOptions.PLAYWRIGHT_BROWSER_TYPE
+PLAYWRIGHT_BROWSER_TYPES = ('chromium', 'firefox', 'webkit')
+
+# Playwright selectors of the location strategies of pages/locators.py
+PLAYWRIGHT_SELECTORS = {
+    CSS_SELECTOR: 'css={}',
+    ID: 'id={}',
+    CLASS_NAME: 'css=.{}',
+    TAG_NAME: 'css={}',
+    XPATH: 'xpath={}',
+}
+
+PLAYWRIGHT_MISSING_MESSAGE = ('The playwright browser needs Playwright, install it with \'pip install playwright\' and '
+                              '\'playwright install {browser_type}\'.')
+
+
+def create_driver(web_driver_options: WebDriverOptions) -> 'WebDriver':
+    """
+        Starts a Selenium WebDriver of the configured browser, which the pages drive through PageHelper.
+
+        Args:
+            - web_driver_options: The options of the browser, BROWSER tells which one is started.
+
+        Returns:
+            - The WebDriver.
+
+        Raises:
+            - ValueError if the browser can not drive the pages, or lacks something the run needs.
+    """
+    # Imported here, so the commands that do not start a browser do not load Selenium
+    from selenium import webdriver
+
+    if web_driver_options.BROWSER == CHROME_BROWSER:
+        return webdriver.Chrome(options=web_driver_options.get_driver_options())
+
+    if web_driver_options.BROWSER == FIREFOX_BROWSER:
+        # The performance log and the command line switches of the replay server only exist in Chrome
+        if web_driver_options.capture_api_responses or web_driver_options.arguments:
+            raise ValueError('CAPTURE_API_RESPONSES, RECORD_DIRECTORY and replay need the chrome browser.')
+
+        return webdriver.Firefox(options=web_driver_options.get_firefox_options())
+
+    raise ValueError(f'The {web_driver_options.BROWSER} browser only fetches actor pages, with '
+                     f'\'python main.py retry-failed\'. Use {CHROME_BROWSER} or {FIREFOX_BROWSER} to crawl the list.')
+
+
+def get_playwright_selector(location: Tuple[str, str]) -> str:
+    """
+        Converts a location of pages/locators.py to a Playwright selector.
+
+        Args:
+            - location: A tuple representing the location strategy and value (e.g., (ID, 'actor_information')).
+
+        Returns:
+            - The selector, e.g. 'id=actor_information'.
+    """
+    strategy, value = location
+
+    return PLAYWRIGHT_SELECTORS[strategy].format(value)
+
+
+class PlaywrightBrowser:
+    """
+        One browser process started by Playwright (async API), which opens a page in a context of its own for every
+        worker.
+
+        A context is an isolated session (cookies, cache, storage) inside the browser process, it takes a fraction of
+        the memory and start-up time of a separate browser, so many pages can be fetched at once on one host.
+    """
+
+    def __init__(self, web_driver_options: WebDriverOptions):
+        """
+            Initializes the PlaywrightBrowser. The browser is started by start.
+
+            Args:
+                - web_driver_options: The options of the browser, the browser profile is carried over where
+                  Playwright supports it.
+        """
+        self.web_driver_options = web_driver_options
+        self.playwright: Optional['Playwright'] = None
+        self.browser: Optional['Browser'] = None
+        # The timeout exception of Playwright, known once it is imported
+        self.timeout_error = TimeoutError
+
+    async def start(self) -> None:
+        """
+            Starts Playwright and the browser.
+
+            Raises:
+                - ImportError if Playwright is not installed.
+        """
+        browser_type = self.web_driver_options.PLAYWRIGHT_BROWSER_TYPE
+
+        try:
+            from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+        except ImportError:
+            raise ImportError(PLAYWRIGHT_MISSING_MESSAGE.format(browser_type=browser_type))
+
+        self.timeout_error = PlaywrightTimeoutError
+
+        self.playwright = await async_playwright().start()
+
+        self.browser = await getattr(self.playwright, browser_type).launch(**self.get_launch_options())
+
+    def get_launch_options(self) -> Dict[str, Any]:
+        """
+            Returns the options the browser is launched with. Playwright sets the headless mode itself, the other
+            switches of the profile are Chrome switches and are only passed to Chromium.
+        """
+        launch_options: Dict[str, Any] = {'headless': self.web_driver_options.is_headless()}
+
+        if self.web_driver_options.PLAYWRIGHT_BROWSER_TYPE == 'chromium':
+            launch_options['args'] = self.get_chromium_arguments()
+
+        return launch_options
+
+    def get_chromium_arguments(self) -> List[str]:
+        profile_arguments = [argument for argument in self.web_driver_options.profile['arguments']
+                             if not argument.lstrip('-').startswith('headless')]
+
+        return [*profile_arguments, *self.web_driver_options.WEBDRIVER_OPTIONS, *self.web_driver_options.arguments]
+
+    async def new_page(self) -> 'Page':
+        """
+            Opens a page in a new context.
+
+            Returns:
+                - The page.
+        """
+        window_size = self.web_driver_options.get_window_size()
+
+        context = await self.browser.new_context(
+            viewport={'width': window_size[0], 'height': window_size[1]} if window_size else None)
+
+        if self.web_driver_options.blocks_images():
+            await context.route('**/*', self.block_images)
+
+        return await context.new_page()
+
+    @staticmethod
+    async def block_images(route: Any) -> None:
+        if route.request.resource_type == 'image':
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @staticmethod
+    async def close_page(page: 'Page') -> None:
+        """
+            Closes a page together with its context, which frees its memory.
+        """
+        await page.context.close()
+
+    async def get_url(self, page: 'Page', url: str, wait_time: float) -> None:
+        """
+            Navigates a page to a URL, waiting at most wait_time seconds for the page load strategy of the profile.
+        """
+        # Eager is the DOM content loaded event, normal is the load event
+        wait_until = 'domcontentloaded' if self.web_driver_options.profile['page_load_strategy'] == 'eager' else 'load'
+
+        await page.goto(url, wait_until=wait_until, timeout=wait_time * 1000)
+
+    async def wait_for_presence(self, page: 'Page', location: Tuple[str, str],
+                                wait_time: float) -> Union['ElementHandle', str]:
+        """
+            Waits for the presence of an element identified by the given location on the page, like
+            PageHelper.wait_for_presence.
+
+            Args:
+                - page: The page.
+                - location: A tuple representing the location strategy and value (e.g., (ID, 'actor_information')).
+                - wait_time: The maximum time to wait, in seconds.
+
+            Returns:
+                - The located element upon successful presence.
+                - A timeout error message if the element is not found within the specified time.
+        """
+        try:
+            return await page.wait_for_selector(get_playwright_selector(location), state='attached',
+                                                timeout=wait_time * 1000)
+        except self.timeout_error as e:
+            return f'Timeout for presence Exception error! \nMessage: {e}'
+
+    async def stop(self) -> None:
+        """
+            Closes the browser with all its contexts and stops Playwright.
+        """
+        if self.browser is not None:
+            await self.browser.close()
+
+            self.browser = None
+
+        if self.playwright is not None:
+            await self.playwright.stop()
+
+            self.playwright = None
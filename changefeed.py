@@ -0,0 +1,378 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from data_handling import atomic_write, iter_data, update_data
+from records import INACTIVE_SINCE_FIELD
+
+Change = Dict[str, Any]
+
+# Kinds of changes
+INSERTED = 'inserted'
+UPDATED = 'updated'
+REMOVED = 'removed'
+
+# The changes of an update wait in <run ID>.jsonl.pending until the data file is replaced, see Changefeed.update_data
+PENDING_SUFFIX = '.pending'
+
+
+def get_record_hash(record: Dict[str, str]) -> str:
+    """
+        Returns the content hash of a record, independent of the order of its fields.
+
+        Args:
+            - record: The actor information.
+
+        Returns:
+            - The SHA-1 of the record as canonical JSON.
+    """
+    return hashlib.sha1(json.dumps(record, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def get_field_changes(old_record: Dict[str, str], new_record: Dict[str, str]) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+        Compares two versions of a record field by field.
+
+        Args:
+            - old_record: The previous version.
+            - new_record: The current version.
+
+        Returns:
+            - The old and new value of every field that differs, by field. A field missing in one of the versions has
+              the value None there.
+    """
+    return {
+        field: {'old': old_record.get(field), 'new': new_record.get(field)}
+        for field in {**old_record, **new_record}
+        if old_record.get(field) != new_record.get(field)
+    }
+
+
+def get_change_kind(field_changes: Dict[str, Dict[str, Optional[str]]]) -> str:
+    """
+        Tells an update from an actor being marked inactive by the reconciliation, which is a removal for the
+        consumers even though the record stays in the data file.
+
+        Args:
+            - field_changes: The changed fields, see get_field_changes.
+
+        Returns:
+            - REMOVED if only the inactive mark was added, UPDATED otherwise.
+    """
+    if list(field_changes) == [INACTIVE_SINCE_FIELD] and field_changes[INACTIVE_SINCE_FIELD]['old'] is None:
+        return REMOVED
+
+    return UPDATED
+
+
+def create_change(change: str, actor_id: str, record_hash: Optional[str], previous_hash: Optional[str],
+                  **fields: Any) -> Change:
+    return {'change': change, 'actor_id': actor_id, 'hash': record_hash, 'previous_hash': previous_hash, **fields}
+
+
+class HashIndex:
+    """
+        The content hash of every record of a data file, so a changed record is recognized without reading the
+        previous version.
+
+        The hashes are appended to a JSON Lines file next to the data file ({data file name}_hashes.jsonl), one actor
+        per line, where the last line of an actor wins. It is built from the data file the first time and compacted
+        when it holds more than twice as many lines as actors.
+    """
+
+    def __init__(self, data_filename: str):
+        """
+            Initializes the HashIndex and loads the hashes, or builds them from the data file.
+
+            Args:
+                - data_filename: The name of the data file, e.g. importers_data.json.
+        """
+        self.filename = f'{data_filename.rsplit(".", 1)[0]}_hashes.jsonl'
+        self.hashes = {}
+
+        lines = 0
+
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as file:
+                for line in file:
+                    # A line cut off by a crash is skipped
+                    if line.endswith('\n'):
+                        entry = json.loads(line)
+
+                        self.hashes[entry['id']] = entry['hash']
+
+                        lines += 1
+        except FileNotFoundError:
+            self.hashes = {actor_id: get_record_hash(record) for actor_id, record in iter_data(data_filename)}
+
+            lines = None
+
+        # Removed actors are written with a None hash
+        self.hashes = {actor_id: record_hash for actor_id, record_hash in self.hashes.items() if record_hash}
+
+        if lines is None or lines > 2 * len(self.hashes):
+            self.save()
+
+    def get(self, actor_id: str) -> Optional[str]:
+        return self.hashes.get(actor_id)
+
+    def save(self) -> None:
+        """
+            Writes all the hashes, replacing the file.
+        """
+        def write(file):
+            for actor_id, record_hash in self.hashes.items():
+                file.write(json.dumps({'id': actor_id, 'hash': record_hash}, ensure_ascii=False) + '\n')
+
+        atomic_write(self.filename, write)
+
+    def update(self, hashes: Dict[str, Optional[str]]) -> None:
+        """
+            Records new hashes.
+
+            Args:
+                - hashes: The hashes by actor ID, None for actors that were removed.
+        """
+        if not hashes:
+            return
+
+        with open(self.filename, 'a', encoding='utf-8') as file:
+            for actor_id, record_hash in hashes.items():
+                file.write(json.dumps({'id': actor_id, 'hash': record_hash}, ensure_ascii=False) + '\n')
+
+                if record_hash:
+                    self.hashes[actor_id] = record_hash
+                else:
+                    self.hashes.pop(actor_id, None)
+
+
+class Changefeed:
+    """
+        Writes the changes of a data file made during a run to a JSON Lines file of its own
+        (<directory>/<run ID>.jsonl), so downstream systems can process only the changes instead of loading the whole
+        data file again.
+
+        Every line is one change of one actor: 'inserted' with the whole record, 'updated' with the old and new value
+        of every changed field, or 'removed'. An actor marked inactive by the reconciliation is 'removed' too, with
+        the inactive mark as its changed field. Every change has the content hash of the record before and after it, so
+        a consumer can check it is in sync. Records that are saved again without a change are not written.
+
+        The changes of an update are saved to a pending file before the data file is replaced, and appended to the
+        changefeed after it. A pending file left by a crash is appended at the start of the next run if the data file
+        holds its changes, and dropped otherwise.
+    """
+
+    def __init__(self, directory: str, data_filename: str, run_id: Optional[str] = None):
+        """
+            Initializes the Changefeed and creates its directory.
+
+            Args:
+                - directory: The directory of the changefeed files.
+                - data_filename: The name of the data file the changes are made to.
+                - run_id: The ID of the run, the current time by default.
+        """
+        self.run_id = run_id or time.strftime('%Y%m%d-%H%M%S')
+        self.filename = os.path.join(directory, f'{self.run_id}.jsonl')
+        self.pending_filename = f'{self.filename}{PENDING_SUFFIX}'
+        self.hash_index = HashIndex(data_filename)
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.recover(directory, data_filename)
+
+    def format(self, changes: Iterable[Change]) -> str:
+        timestamp = round(time.time(), 3)
+
+        return ''.join(json.dumps({'time': timestamp, 'run': self.run_id, **change}, ensure_ascii=False) + '\n'
+                       for change in changes)
+
+    def write(self, changes: Iterable[Change]) -> None:
+        """
+            Appends changes to the changefeed file of the run.
+
+            Args:
+                - changes: The changes, see create_change.
+        """
+        lines = self.format(changes)
+
+        if lines:
+            with open(self.filename, 'a', encoding='utf-8') as file:
+                file.write(lines)
+
+    def write_pending(self, changes: List[Change]) -> None:
+        """
+            Saves the changes of an update to the pending file and flushes it to disk, before the data file is
+            replaced.
+        """
+        if not changes:
+            return
+
+        with open(self.pending_filename, 'w', encoding='utf-8') as file:
+            file.write(self.format(changes))
+
+            file.flush()
+            os.fsync(file.fileno())
+
+    def commit_pending(self, pending_filename: str) -> List[Change]:
+        """
+            Appends the changes of a pending file to its changefeed file and removes the pending file.
+
+            Args:
+                - pending_filename: The name of the pending file.
+
+            Returns:
+                - The committed changes.
+        """
+        with open(pending_filename, 'r', encoding='utf-8') as file:
+            # A line cut off by a crash is skipped
+            lines = ''.join(line for line in file if line.endswith('\n'))
+
+        filename = pending_filename[:-len(PENDING_SUFFIX)]
+
+        # A crash after the changes were appended and before the pending file was removed
+        if not _file_ends_with(filename, lines):
+            with open(filename, 'a', encoding='utf-8') as file:
+                file.write(lines)
+
+                file.flush()
+                os.fsync(file.fileno())
+
+        os.remove(pending_filename)
+
+        return [json.loads(line) for line in lines.splitlines()]
+
+    def recover(self, directory: str, data_filename: str) -> None:
+        """
+            Commits or drops the pending files left by a crash, see the class description.
+
+            Args:
+                - directory: The directory of the changefeed files.
+                - data_filename: The name of the data file the changes are made to.
+        """
+        pending_filenames = [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                             if name.endswith(PENDING_SUFFIX)]
+
+        if not pending_filenames:
+            return
+
+        saved_hashes = {actor_id: get_record_hash(record) for actor_id, record in iter_data(data_filename)}
+
+        for pending_filename in pending_filenames:
+            with open(pending_filename, 'r', encoding='utf-8') as file:
+                changes = [json.loads(line) for line in file if line.endswith('\n')]
+
+            # The data file is replaced at once, so it holds either all the changes or none of them
+            if changes and all(saved_hashes.get(change['actor_id']) == change['hash'] for change in changes):
+                self.commit_pending(pending_filename)
+
+                self.hash_index.update({change['actor_id']: change['hash'] for change in changes})
+            else:
+                os.remove(pending_filename)
+
+    def update_data(self, new_data: Dict[str, Dict[str, str]], filename: str, snapshots: int = 0) -> int:
+        """
+            Adds or replaces records in the data file like data_handling.update_data and writes the changes.
+
+            A replaced record whose hash has not changed is not read at all, only the changed ones are compared field
+            by field.
+
+            Args:
+                - new_data: The records to add or replace.
+                - filename: The name of the data file.
+                - snapshots: How many previous versions of the file to keep.
+
+            Returns:
+                - The number of changes.
+        """
+        changes = []
+        hashes = {}
+
+        def on_write(actor_id: str, record: Dict[str, str], raw_previous: Optional[str]) -> None:
+            record_hash = get_record_hash(record)
+
+            if raw_previous is None:
+                changes.append(create_change(INSERTED, actor_id, record_hash, None, record=record))
+            elif self.hash_index.get(actor_id) != record_hash:
+                previous = json.loads(raw_previous)
+
+                field_changes = get_field_changes(previous, record)
+
+                if field_changes:
+                    changes.append(create_change(get_change_kind(field_changes), actor_id, record_hash,
+                                                 get_record_hash(previous), fields=field_changes))
+
+            hashes[actor_id] = record_hash
+
+        with self.lock:
+            update_data(new_data, filename, snapshots, on_write, lambda: self.write_pending(changes))
+
+            # Only committed once the data file is saved
+            if changes:
+                self.commit_pending(self.pending_filename)
+
+            self.hash_index.update(hashes)
+
+        return len(changes)
+
+
+def _file_ends_with(filename: str, text: str) -> bool:
+    content = text.encode('utf-8')
+
+    try:
+        with open(filename, 'rb') as file:
+            file.seek(0, os.SEEK_END)
+
+            if file.tell() < len(content):
+                return False
+
+            file.seek(-len(content), os.SEEK_END)
+
+            return file.read() == content
+    except FileNotFoundError:
+        return False
+
+
+def diff_snapshots(old_filename: str, new_filename: str) -> Iterator[Change]:
+    """
+        Compares two versions of a data file, e.g. a snapshot ({role}s_data.json.1) and the current file.
+
+        Only the hashes of the records are kept in memory, plus the records that changed. The old file is read twice
+        and the new file once.
+
+        Args:
+            - old_filename: The name of the old version.
+            - new_filename: The name of the new version.
+
+        Returns:
+            - An iterator over the changes, the same as the ones of a Changefeed: first the inserted actors in the
+              order of the new file, then the updated and removed ones in the order of the old file.
+    """
+    old_hashes = {actor_id: get_record_hash(record) for actor_id, record in iter_data(old_filename)}
+
+    updated = {}
+    new_ids = set()
+
+    for actor_id, record in iter_data(new_filename):
+        new_ids.add(actor_id)
+
+        record_hash = get_record_hash(record)
+
+        if actor_id not in old_hashes:
+            yield create_change(INSERTED, actor_id, record_hash, None, record=record)
+        elif old_hashes[actor_id] != record_hash:
+            updated[actor_id] = (record_hash, record)
+
+    for actor_id, previous in iter_data(old_filename):
+        if actor_id in updated:
+            record_hash, record = updated[actor_id]
+
+            field_changes = get_field_changes(previous, record)
+
+            yield create_change(get_change_kind(field_changes), actor_id, record_hash, old_hashes[actor_id],
+                                fields=field_changes)
+        elif actor_id not in new_ids:
+            yield create_change(REMOVED, actor_id, None, old_hashes[actor_id])
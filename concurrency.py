@@ -0,0 +1,190 @@
+import math
+import threading
+from collections import deque
+from typing import Optional
+
+from utils import percentile
+
+
+class ConcurrencyLimit:
+    """
+        A semaphore whose limit can be changed while it is in use.
+
+        Lowering the limit does not interrupt the tasks that are already running, new tasks just wait until fewer than
+        limit tasks are running.
+    """
+
+    def __init__(self, limit: int, min_limit: int = 1, max_limit: Optional[int] = None):
+        """
+            Initializes the ConcurrencyLimit.
+
+            Args:
+                - limit: How many tasks can run at the same time.
+                - min_limit: The lowest the limit can go.
+                - max_limit: The highest the limit can go, the initial limit by default.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit or limit
+        self.limit = limit
+        self.running = 0
+        self.condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self.condition:
+            self.condition.wait_for(lambda: self.running < self.limit)
+
+            self.running += 1
+
+    def release(self) -> None:
+        with self.condition:
+            self.running -= 1
+
+            self.condition.notify_all()
+
+    def __enter__(self) -> 'ConcurrencyLimit':
+        self.acquire()
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def set_limit(self, limit: int) -> int:
+        """
+            Changes the limit, keeping it between min_limit and max_limit.
+
+            Args:
+                - limit: The new limit.
+
+            Returns:
+                - The limit that was set.
+        """
+        with self.condition:
+            self.limit = max(self.min_limit, min(self.max_limit, limit))
+
+            self.condition.notify_all()
+
+            return self.limit
+
+    def decrease(self) -> int:
+        return self.set_limit(self.limit - 1)
+
+
+class LatencyTracker:
+    """
+        Keeps the most recent load times and derives wait timeouts from them.
+    """
+
+    def __init__(self, window: int = 100, min_samples: int = 10):
+        """
+            Initializes the LatencyTracker.
+
+            Args:
+                - window: How many of the most recent load times are kept.
+                - min_samples: How many load times are needed before the percentiles are used.
+        """
+        self.latencies = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def get_percentile(self, percent: float) -> Optional[float]:
+        """
+            Returns a percentile of the recent load times, None if there are too few of them.
+        """
+        with self.lock:
+            latencies = list(self.latencies)
+
+        if len(latencies) < self.min_samples:
+            return None
+
+        return percentile(latencies, percent)
+
+    def get_timeout(self, default: float, minimum: float, maximum: float, factor: float = 2) -> float:
+        """
+            Returns a wait timeout that fits the current load times: factor times their p95.
+
+            Args:
+                - default: The timeout while there are too few load times.
+                - minimum: The lowest timeout.
+                - maximum: The highest timeout.
+                - factor: How many times longer than the p95 load time the timeout is.
+
+            Returns:
+                - The timeout, in seconds.
+        """
+        p95 = self.get_percentile(95)
+
+        if p95 is None:
+            return default
+
+        return max(minimum, min(maximum, p95 * factor))
+
+
+class AIMDController:
+    """
+        Adjusts a ConcurrencyLimit the way TCP adjusts its congestion window (additive increase, multiplicative
+        decrease).
+
+        The limit grows by one after every round of fetches (as many successful fetches as the limit) whose p95 load
+        time stays under latency_target. A failed fetch, or a round that is too slow, cuts the limit by
+        decrease_factor. After a cut, the next one waits for a full round, so the failures of the fetches that were
+        already in flight do not cut the limit again.
+    """
+
+    def __init__(self, concurrency_limit: ConcurrencyLimit, latency_target: float, decrease_factor: float = 0.5):
+        """
+            Initializes the AIMDController.
+
+            Args:
+                - concurrency_limit: The limit to adjust.
+                - latency_target: The p95 load time (in seconds) above which the backend is considered overloaded.
+                - decrease_factor: The limit is multiplied by it when the backend is overloaded.
+        """
+        self.concurrency_limit = concurrency_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.round_latencies = []
+        # Fetches completed since the last cut, the first failure always cuts
+        self.completed_since_decrease = math.inf
+        self.lock = threading.Lock()
+
+    def record_success(self, latency: float) -> None:
+        """
+            Records a successful fetch.
+
+            Args:
+                - latency: The load time of the fetch, in seconds.
+        """
+        with self.lock:
+            self.completed_since_decrease += 1
+            self.round_latencies.append(latency)
+
+            if len(self.round_latencies) < self.concurrency_limit.limit:
+                return
+
+            if percentile(self.round_latencies, 95) <= self.latency_target:
+                self.concurrency_limit.set_limit(self.concurrency_limit.limit + 1)
+
+                self.round_latencies = []
+            else:
+                self.decrease()
+
+    def record_failure(self) -> None:
+        """
+            Records a fetch that failed because the backend did not respond in time or returned an error.
+        """
+        with self.lock:
+            self.completed_since_decrease += 1
+
+            if self.completed_since_decrease > self.concurrency_limit.limit:
+                self.decrease()
+
+    def decrease(self) -> None:
+        self.concurrency_limit.set_limit(int(self.concurrency_limit.limit * self.decrease_factor))
+
+        self.round_latencies = []
+        self.completed_since_decrease = 0
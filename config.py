@@ -0,0 +1,381 @@
+import os
+import socket
+import tomllib
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from browser_profiles import BROWSER_PROFILES
+from browsers import BROWSERS, PLAYWRIGHT_BROWSER_TYPES
+from options import ScraperOptions, WebDriverOptions
+from utils import MessageProvider
+
+# The configuration file read when no other is given, in the working directory
+CONFIG_FILENAME = 'eudamed.toml'
+# Environment variable with the name of the configuration file
+CONFIG_ENV_VARIABLE = 'EUDAMED_CONFIG'
+# Prefix of the environment variables that set options, e.g. EUDAMED_ROWS_PER_PAGE=50
+ENV_PREFIX = 'EUDAMED_'
+
+# Tables of the configuration file
+SCRAPER_SECTION = 'scraper'
+WEBDRIVER_SECTION = 'webdriver'
+HOSTS_SECTION = 'hosts'
+
+OPTION_CLASSES = {
+    SCRAPER_SECTION: ScraperOptions,
+    WEBDRIVER_SECTION: WebDriverOptions,
+}
+
+# Class constants that are not options
+NOT_OPTIONS = ('MANUFACTURER_ROLE', 'IMPORTER_ROLE', 'ROLE_VALUE_ERROR_MSG')
+
+# The types of the options whose default does not tell it: the ones without a value by default, and times, factors
+# and percentages that are whole numbers by default
+OPTION_TYPES = {
+    'RECORD_DIRECTORY': str,
+    'COORDINATOR_TOKEN': str,
+    'REEXTRACT_WORKERS': int,
+    'PAGE_LOAD_TIME': float,
+    'WAIT_TIME_BETWEEN_RUNS': float,
+    'RESOURCE_SAMPLE_INTERVAL': float,
+    'SYSTEM_MEMORY_LIMIT_PERCENT': float,
+    'SYSTEM_CPU_LIMIT_PERCENT': float,
+    'THROTTLE_PAUSE_TIME': float,
+    'MIN_WAIT_TIME': float,
+    'MAX_WAIT_TIME': float,
+    'WAIT_TIME_P95_FACTOR': float,
+    'LATENCY_TARGET': float,
+    'LEASE_TIME': float,
+    'HEARTBEAT_INTERVAL': float,
+    'FLUSH_INTERVAL': float,
+    'COORDINATOR_REQUEST_TIMEOUT': float,
+    'WEBDRIVER_WAIT_TIME': float,
+}
+
+# Options that can be turned off with the value none
+OPTIONAL_OPTIONS = ('RECORD_DIRECTORY', 'REEXTRACT_WORKERS', 'MEMORY_LIMIT_MB', 'SYSTEM_MEMORY_LIMIT_PERCENT',
+                    'SYSTEM_CPU_LIMIT_PERCENT', 'COORDINATOR_TOKEN')
+
+# Options that only take some values
+OPTION_CHOICES = {
+    'ROLE': (ScraperOptions.MANUFACTURER_ROLE, ScraperOptions.IMPORTER_ROLE),
+    'ROWS_PER_PAGE': (10, 25, 50),
+    'RECONCILE_ROWS_PER_PAGE': (10, 25, 50),
+    'VERBOSITY': (MessageProvider.QUIET, MessageProvider.NORMAL, MessageProvider.VERBOSE),
+    'BROWSER_PROFILE': tuple(BROWSER_PROFILES),
+    'BROWSER': BROWSERS,
+    'PLAYWRIGHT_BROWSER_TYPE': PLAYWRIGHT_BROWSER_TYPES,
+}
+
+# The smallest and the largest value of the numeric options that have limits, None for no limit. The other numbers
+# can not be negative
+OPTION_RANGES = {
+    'MAX_CONSECUTIVE_EXCEPTIONS': (1, None),
+    'MAX_INACTIVE_FRACTION': (0, 1),
+    'MEMORY_LIMIT_MB': (1, None),
+    'SYSTEM_MEMORY_LIMIT_PERCENT': (1, 100),
+    'SYSTEM_CPU_LIMIT_PERCENT': (1, 100),
+    'HTTP_CACHE_MAX_SIZE_MB': (1, None),
+    'REEXTRACT_WORKERS': (1, None),
+    'REEXTRACT_CHUNK_SIZE': (1, None),
+    'EXPORT_BATCH_SIZE': (1, None),
+    'MAX_RETRY_ATTEMPTS': (1, None),
+    'RETRY_WORKERS': (1, None),
+    'REPORT_THROUGHPUT_INTERVAL': (1, None),
+    'COORDINATOR_PORT': (1, 65535),
+    'PAGES_PER_WORK_UNIT': (1, None),
+}
+
+# Times and factors that have to be more than 0, e.g. a sample interval of 0 would sample without pause
+POSITIVE_OPTIONS = ('RESOURCE_SAMPLE_INTERVAL', 'THROTTLE_PAUSE_TIME', 'MIN_WAIT_TIME', 'MAX_WAIT_TIME',
+                    'WAIT_TIME_P95_FACTOR', 'LATENCY_TARGET', 'LEASE_TIME', 'HEARTBEAT_INTERVAL', 'FLUSH_INTERVAL',
+                    'COORDINATOR_REQUEST_TIMEOUT', 'WEBDRIVER_WAIT_TIME', 'WEBDRIVER_POLL_FREQUENCY')
+
+# Options whose values can also be given by name
+NAMED_VALUES = {
+    'VERBOSITY': {'quiet': MessageProvider.QUIET, 'normal': MessageProvider.NORMAL, 'verbose': MessageProvider.VERBOSE},
+}
+
+TRUE_VALUES = ('true', 'yes', 'on', '1')
+FALSE_VALUES = ('false', 'no', 'off', '0')
+NONE_VALUE = 'none'
+
+
+class ConfigError(ValueError):
+    """
+        Raised when the configuration has an unknown option or an invalid value.
+    """
+
+
+class Config:
+    """
+        The options of a run that differ from the class constants of ScraperOptions and WebDriverOptions, by section.
+    """
+
+    def __init__(self, scraper: Optional[Dict[str, Any]] = None, webdriver: Optional[Dict[str, Any]] = None):
+        """
+            Initializes the Config.
+
+            Args:
+                - scraper: The ScraperOptions values by name.
+                - webdriver: The WebDriverOptions values by name.
+        """
+        self.scraper = scraper or {}
+        self.webdriver = webdriver or {}
+
+    def get_scraper_options(self) -> ScraperOptions:
+        return ScraperOptions(self.scraper)
+
+    def get_web_driver_options(self, **kwargs: Any) -> WebDriverOptions:
+        """
+            Returns WebDriverOptions with the configured options.
+
+            Args:
+                - kwargs: The other arguments of WebDriverOptions, e.g. arguments.
+        """
+        return WebDriverOptions(options=self.webdriver, **kwargs)
+
+
+def get_option_defaults(options_class: type) -> Dict[str, Any]:
+    """
+        Returns the options of an options class with their default values.
+
+        Args:
+            - options_class: ScraperOptions or WebDriverOptions.
+
+        Returns:
+            - The default values by option name.
+    """
+    return {name: value for name, value in vars(options_class).items() if name.isupper() and name not in NOT_OPTIONS}
+
+
+OPTION_SECTIONS = {name: section for section, options_class in OPTION_CLASSES.items()
+                   for name in get_option_defaults(options_class)}
+
+
+def find_option(name: str, source: str) -> str:
+    """
+        Finds an option by name, ignoring the case and with '-' for '_'.
+
+        Args:
+            - name: The name as given.
+            - source: Where the name comes from, for the error message.
+
+        Returns:
+            - The name of the option.
+
+        Raises:
+            - ConfigError if there is no such option.
+    """
+    option = name.strip().upper().replace('-', '_')
+
+    if option not in OPTION_SECTIONS:
+        raise ConfigError(f'Unknown option {name} in {source}.')
+
+    return option
+
+
+def parse_text(option: str, text: str, source: str) -> Any:
+    """
+        Converts the text of an environment variable or a command line option to the type of the option.
+
+        Args:
+            - option: The name of the option.
+            - text: The text of the value.
+            - source: Where the value comes from, for the error message.
+
+        Returns:
+            - The value, to be validated by validate_option.
+    """
+    expected_type = get_option_type(option)
+
+    text = text.strip()
+
+    if text.lower() == NONE_VALUE or text.lower() in NAMED_VALUES.get(option, {}):
+        return text
+
+    try:
+        if expected_type is bool:
+            if text.lower() in TRUE_VALUES:
+                return True
+            if text.lower() in FALSE_VALUES:
+                return False
+        elif expected_type is int:
+            return int(text)
+        elif expected_type is float:
+            return float(text)
+        elif expected_type is list:
+            return [item.strip() for item in text.split(',') if item.strip()]
+        else:
+            return text
+    except ValueError:
+        pass
+
+    raise ConfigError(f'Invalid value {text!r} for {option} in {source}, expected {expected_type.__name__}.')
+
+
+def get_option_type(option: str) -> type:
+    default = get_option_defaults(OPTION_CLASSES[OPTION_SECTIONS[option]])[option]
+
+    return OPTION_TYPES.get(option, type(default))
+
+
+def validate_option(option: str, value: Any, source: str) -> Any:
+    """
+        Checks the value of an option: its type, its choices and that numbers are within their range (see OPTION_RANGES
+        and POSITIVE_OPTIONS) or else not negative. The value none turns off the options in OPTIONAL_OPTIONS and names
+        are replaced by their values (see NAMED_VALUES).
+
+        Args:
+            - option: The name of the option.
+            - value: The value, from the configuration file or parse_text.
+            - source: Where the value comes from, for the error message.
+
+        Returns:
+            - The valid value.
+
+        Raises:
+            - ConfigError if the value is not valid.
+    """
+    if isinstance(value, str) and value.lower() == NONE_VALUE and option in OPTIONAL_OPTIONS:
+        return None
+
+    if isinstance(value, str) and value.lower() in NAMED_VALUES.get(option, {}):
+        value = NAMED_VALUES[option][value.lower()]
+
+    expected_type = get_option_type(option)
+
+    if expected_type is float and isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+
+    # bool is an int in Python, but not a valid number of rows
+    valid_type = isinstance(value, expected_type) and (expected_type is bool or not isinstance(value, bool))
+
+    if expected_type is list:
+        valid_type = valid_type and all(isinstance(item, str) for item in value)
+
+    if not valid_type:
+        raise ConfigError(f'Invalid value {value!r} for {option} in {source}, expected {expected_type.__name__}.')
+
+    if option in OPTION_CHOICES and value not in OPTION_CHOICES[option]:
+        choices = ', '.join(str(choice) for choice in OPTION_CHOICES[option])
+
+        raise ConfigError(f'Invalid value {value!r} for {option} in {source}. Choices allowed are: {choices}')
+
+    if expected_type in (int, float):
+        minimum, maximum = OPTION_RANGES.get(option, (0, None))
+
+        if option in POSITIVE_OPTIONS and value <= 0:
+            raise ConfigError(f'Invalid value {value!r} for {option} in {source}, it has to be more than 0.')
+
+        if value < minimum:
+            raise ConfigError(f'Invalid value {value!r} for {option} in {source}, it can not be less than {minimum}.')
+
+        if maximum is not None and value > maximum:
+            raise ConfigError(f'Invalid value {value!r} for {option} in {source}, it can not be more than {maximum}.')
+
+    return value
+
+
+def read_config_file(filename: str, hostname: str) -> Dict[str, Any]:
+    """
+        Reads the options of a TOML configuration file.
+
+        The options are in the [scraper] and [webdriver] tables, in lower or upper case. Tables of the form
+        [hosts.<host name>.scraper] override them on one host only.
+
+        Args:
+            - filename: The name of the configuration file.
+            - hostname: The name of the current host.
+
+        Returns:
+            - The values by option name.
+
+        Raises:
+            - ConfigError if the file can not be read or has an invalid option.
+    """
+    try:
+        with open(filename, 'rb') as file:
+            document = tomllib.load(file)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ConfigError(f'Can not read the configuration file {filename}: {e}')
+
+    host_document = document.pop(HOSTS_SECTION, {}).get(hostname, {})
+
+    values = {}
+
+    for source, tables in ((filename, document), (f'{filename} [{HOSTS_SECTION}.{hostname}]', host_document)):
+        for section, table in tables.items():
+            if section not in OPTION_CLASSES or not isinstance(table, dict):
+                raise ConfigError(f'Unknown table {section} in {source}, expected one of: {", ".join(OPTION_CLASSES)}')
+
+            for name, value in table.items():
+                option = find_option(name, f'{source} [{section}]')
+
+                if OPTION_SECTIONS[option] != section:
+                    raise ConfigError(f'{option} belongs to the [{OPTION_SECTIONS[option]}] table, not [{section}], '
+                                      f'in {source}.')
+
+                values[option] = validate_option(option, value, source)
+
+    return values
+
+
+def load_config(filename: Optional[str] = None, environ: Optional[Mapping[str, str]] = None,
+                overrides: Iterable[str] = (), hostname: Optional[str] = None) -> Config:
+    """
+        Loads the options of a run, validated, from (later ones win):
+            - the configuration file: the given one, the one in the EUDAMED_CONFIG environment variable, or
+              eudamed.toml if it exists
+            - environment variables EUDAMED_<OPTION>, e.g. EUDAMED_ROWS_PER_PAGE=50
+            - overrides from the command line, e.g. ROWS_PER_PAGE=50
+
+        Args:
+            - filename: The name of the configuration file.
+            - environ: The environment variables, the ones of the process by default.
+            - overrides: Options as NAME=VALUE.
+            - hostname: The name of the host for the [hosts.<host name>] tables, the current one by default.
+
+        Returns:
+            - The Config with the options that differ from the defaults.
+
+        Raises:
+            - ConfigError if an option is unknown or invalid.
+    """
+    environ = os.environ if environ is None else environ
+
+    filename = filename or environ.get(CONFIG_ENV_VARIABLE)
+
+    if filename is None and os.path.exists(CONFIG_FILENAME):
+        filename = CONFIG_FILENAME
+
+    values = read_config_file(filename, hostname or socket.gethostname()) if filename else {}
+
+    for variable, text in environ.items():
+        # Other variables of the scraper with the same prefix (e.g. EUDAMED_RECORDING) are not options
+        option = variable[len(ENV_PREFIX):]
+
+        if variable.startswith(ENV_PREFIX) and option in OPTION_SECTIONS:
+            values[option] = validate_option(option, parse_text(option, text, variable), variable)
+
+    for override in overrides:
+        name, separator, text = override.partition('=')
+
+        if not separator:
+            raise ConfigError(f'Invalid option {override}, expected NAME=VALUE.')
+
+        option = find_option(name, 'the command line')
+
+        values[option] = validate_option(option, parse_text(option, text, 'the command line'), 'the command line')
+
+    scraper_options = ScraperOptions(values)
+
+    if scraper_options.MIN_WAIT_TIME > scraper_options.MAX_WAIT_TIME:
+        raise ConfigError(f'MIN_WAIT_TIME ({scraper_options.MIN_WAIT_TIME}) is greater than MAX_WAIT_TIME '
+                          f'({scraper_options.MAX_WAIT_TIME}).')
+
+    config = Config()
+
+    for option, value in values.items():
+        getattr(config, OPTION_SECTIONS[option])[option] = value
+
+    return config
@@ -0,0 +1,442 @@
+import hmac
+import ipaddress
+import json
+import math
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Union
+
+import requests
+
+from changefeed import Changefeed
+from data_handling import load_ids, update_data
+
+WorkUnit = Dict[str, Union[int, str]]
+
+
+class WorkQueue:
+    """
+        A SQLite backed queue of work units for a distributed crawl.
+
+        A work unit is a range of list pages, with the number of rows per page the list was split with. Workers lease
+        a unit for a limited time and have to extend the lease with heartbeats while they work on it. If a worker
+        dies, its lease expires and the unit is handed to another worker. Records returned by the workers are kept in
+        the database until they are flushed to the data file, so the state survives a restart of the coordinator.
+    """
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+
+    def __init__(self, database: str):
+        """
+            Initializes the WorkQueue and creates the tables if needed.
+
+            Args:
+                - database: The name of the SQLite database file.
+        """
+        self.connection = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+
+        with self.lock:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS work_units (
+                    id INTEGER PRIMARY KEY,
+                    first_page INTEGER NOT NULL,
+                    last_page INTEGER NOT NULL,
+                    rows_per_page INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS records (
+                    actor_id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL
+                );
+            ''')
+
+    def has_units(self) -> bool:
+        with self.lock:
+            return self.connection.execute('SELECT 1 FROM work_units LIMIT 1').fetchone() is not None
+
+    def create_units(self, total_pages: int, pages_per_unit: int, rows_per_page: int) -> None:
+        """
+            Splits the list pages into work units, unless the units already exist.
+
+            Args:
+                - total_pages: The number of list pages.
+                - pages_per_unit: How many pages are in one work unit.
+                - rows_per_page: The number of rows per list page the pages are counted with.
+        """
+        with self.lock:
+            if self.connection.execute('SELECT 1 FROM work_units LIMIT 1').fetchone() is not None:
+                return
+
+            self.connection.executemany(
+                'INSERT INTO work_units (first_page, last_page, rows_per_page, status) VALUES (?, ?, ?, ?)',
+                [(first_page, min(first_page + pages_per_unit - 1, total_pages), rows_per_page, self.PENDING)
+                 for first_page in range(1, total_pages + 1, pages_per_unit)])
+
+    def reset_units(self) -> bool:
+        """
+            Removes the work units of the previous crawl once they are all done, so the next lease splits the list
+            again. The records that were not flushed yet are kept.
+
+            Returns:
+                - False if some units of the previous crawl are not done, they are then kept, True otherwise.
+        """
+        with self.lock:
+            if self.connection.execute('SELECT 1 FROM work_units WHERE status != ? LIMIT 1',
+                                       (self.DONE,)).fetchone() is not None:
+                return False
+
+            self.connection.execute('DELETE FROM work_units')
+
+        return True
+
+    def lease(self, worker_id: str, lease_time: float) -> Optional[WorkUnit]:
+        """
+            Leases the next pending unit, or a unit whose lease has expired, to a worker.
+
+            Args:
+                - worker_id: The ID of the worker.
+                - lease_time: For how many seconds the unit is leased.
+
+            Returns:
+                - The leased unit, None if there is no unit left.
+        """
+        now = time.time()
+
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT id, first_page, last_page, rows_per_page FROM work_units '
+                'WHERE status = ? OR (status = ? AND lease_expires < ?) ORDER BY id LIMIT 1',
+                (self.PENDING, self.LEASED, now)).fetchone()
+
+            if row is None:
+                return None
+
+            self.connection.execute(
+                'UPDATE work_units SET status = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1 '
+                'WHERE id = ?', (self.LEASED, worker_id, now + lease_time, row[0]))
+
+        return {'id': row[0], 'first_page': row[1], 'last_page': row[2], 'rows_per_page': row[3]}
+
+    def heartbeat(self, unit_id: int, worker_id: str, lease_time: float) -> bool:
+        """
+            Extends the lease of a unit.
+
+            Args:
+                - unit_id: The ID of the unit.
+                - worker_id: The ID of the worker.
+                - lease_time: For how many seconds the lease is extended.
+
+            Returns:
+                - False if the worker does not own the unit anymore, True otherwise.
+        """
+        with self.lock:
+            cursor = self.connection.execute(
+                'UPDATE work_units SET lease_expires = ? WHERE id = ? AND worker_id = ? AND status = ?',
+                (time.time() + lease_time, unit_id, worker_id, self.LEASED))
+
+        return cursor.rowcount == 1
+
+    def complete(self, unit_id: int, worker_id: str) -> bool:
+        """
+            Marks a unit as done.
+
+            Args:
+                - unit_id: The ID of the unit.
+                - worker_id: The ID of the worker.
+
+            Returns:
+                - False if the worker does not own the unit anymore, True otherwise.
+        """
+        with self.lock:
+            cursor = self.connection.execute(
+                'UPDATE work_units SET status = ?, lease_expires = NULL WHERE id = ? AND worker_id = ? AND status = ?',
+                (self.DONE, unit_id, worker_id, self.LEASED))
+
+        return cursor.rowcount == 1
+
+    def add_records(self, records: Dict[str, Dict[str, str]]) -> None:
+        """
+            Stores records returned by a worker until they are flushed.
+
+            Args:
+                - records: The actor records by actor ID.
+        """
+        with self.lock:
+            self.connection.executemany('INSERT OR REPLACE INTO records (actor_id, data) VALUES (?, ?)',
+                                        [(actor_id, json.dumps(record, ensure_ascii=False))
+                                         for actor_id, record in records.items()])
+
+    def get_pending_records(self) -> Dict[str, Dict[str, str]]:
+        with self.lock:
+            rows = self.connection.execute('SELECT actor_id, data FROM records').fetchall()
+
+        return {actor_id: json.loads(data) for actor_id, data in rows}
+
+    def remove_records(self, actor_ids: List[str]) -> None:
+        with self.lock:
+            self.connection.executemany('DELETE FROM records WHERE actor_id = ?',
+                                        [(actor_id,) for actor_id in actor_ids])
+
+    def get_status(self) -> Dict[str, int]:
+        """
+            Returns how many units are in each status and how many records wait to be flushed.
+        """
+        with self.lock:
+            status = dict(self.connection.execute('SELECT status, COUNT(*) FROM work_units GROUP BY status').fetchall())
+            status['records'] = self.connection.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+        return status
+
+
+class Coordinator:
+    """
+        Owns the work queue and the data file of a distributed crawl and serves the workers over HTTP.
+
+        Endpoints (JSON over POST, GET for /ids and /status):
+            - /lease: {worker_id, total_records} -> {unit} or {unit: null} when the crawl is done. The list is split
+              with the rows per page of the coordinator, the unit tells the worker how many to show.
+            - /heartbeat: {worker_id, unit_id} -> {ok}
+            - /submit: {worker_id, unit_id, records} -> {ok}, stores records and extends the lease.
+            - /complete: {worker_id, unit_id} -> {ok}
+            - /ids: the IDs of all the already scraped actors.
+            - /status: the number of units per status.
+
+        With a token, every request has to send it in the Authorization header (Bearer <token>), the others are
+        refused.
+    """
+
+    def __init__(self, work_queue: WorkQueue, filename: str, snapshots: int, lease_time: float,
+                 pages_per_unit: int, rows_per_page: int, flush_interval: float,
+                 changefeed: Optional[Changefeed] = None, token: Optional[str] = None):
+        self.work_queue = work_queue
+        # The shared secret of the workers, None to accept every request
+        self.token = token
+        self.filename = filename
+        # Writes the changes of the data file, None to not track them
+        self.changefeed = changefeed
+        self.snapshots = snapshots
+        self.lease_time = lease_time
+        self.pages_per_unit = pages_per_unit
+        # The rows per page the list is split with, the same for all the workers
+        self.rows_per_page = rows_per_page
+        self.flush_interval = flush_interval
+        self.flush_lock = threading.Lock()
+        # The IDs of the scraped actors, read from the data file on the first /ids request and updated by /submit
+        self.ids: Optional[Set[str]] = None
+        self.ids_lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def lease(self, request: Dict) -> Dict:
+        if not self.work_queue.has_units():
+            total_pages = math.ceil(request['total_records'] / self.rows_per_page)
+
+            self.work_queue.create_units(total_pages, self.pages_per_unit, self.rows_per_page)
+
+        return {'unit': self.work_queue.lease(request['worker_id'], self.lease_time)}
+
+    def heartbeat(self, request: Dict) -> Dict:
+        return {'ok': self.work_queue.heartbeat(request['unit_id'], request['worker_id'], self.lease_time)}
+
+    def submit(self, request: Dict) -> Dict:
+        self.work_queue.add_records(request['records'])
+
+        with self.ids_lock:
+            if self.ids is not None:
+                self.ids.update(request['records'])
+
+        return self.heartbeat(request)
+
+    def complete(self, request: Dict) -> Dict:
+        return {'ok': self.work_queue.complete(request['unit_id'], request['worker_id'])}
+
+    def get_ids(self) -> List[str]:
+        with self.ids_lock:
+            if self.ids is None:
+                # The data file is not replaced while it is read
+                with self.flush_lock:
+                    self.ids = load_ids(self.filename) | set(self.work_queue.get_pending_records())
+
+            return sorted(self.ids)
+
+    def flush(self) -> int:
+        """
+            Writes the stored records to the data file.
+
+            Returns:
+                - The number of written records.
+        """
+        with self.flush_lock:
+            records = self.work_queue.get_pending_records()
+
+            if records:
+                if self.changefeed is not None:
+                    self.changefeed.update_data(records, self.filename, self.snapshots)
+                else:
+                    update_data(records, self.filename, self.snapshots)
+
+                self.work_queue.remove_records(list(records))
+
+        return len(records)
+
+    def is_authorized(self, authorization: Optional[str]) -> bool:
+        """
+            Tells if a request may be served.
+
+            Args:
+                - authorization: The Authorization header of the request, None if it has none.
+        """
+        if self.token is None:
+            return True
+
+        return hmac.compare_digest((authorization or '').encode('utf-8'), f'Bearer {self.token}'.encode('utf-8'))
+
+    def flush_periodically(self) -> None:
+        while not self.stopped.wait(self.flush_interval):
+            self.flush()
+
+    def serve(self, host: str, port: int) -> None:
+        """
+            Serves the workers until interrupted, flushing the records periodically and on exit.
+
+            Args:
+                - host: The address to listen on.
+                - port: The port to listen on.
+
+            Raises:
+                - ValueError if the coordinator has no token and the address is reachable from other machines.
+        """
+        if self.token is None and not is_loopback(host):
+            raise ValueError(f'Set COORDINATOR_TOKEN to listen on {host}, otherwise anyone who can reach the '
+                             f'coordinator can read and change the data.')
+
+        server = ThreadingHTTPServer((host, port), _make_request_handler(self))
+
+        flusher = threading.Thread(target=self.flush_periodically, daemon=True)
+        flusher.start()
+
+        try:
+            server.serve_forever()
+        finally:
+            self.stopped.set()
+
+            server.server_close()
+
+            self.flush()
+
+
+def is_loopback(host: str) -> bool:
+    """
+        Tells if an address can only be reached from the same machine, e.g. 127.0.0.1 or localhost.
+    """
+    if host == 'localhost':
+        return True
+
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _make_request_handler(coordinator: Coordinator):
+    post_routes = {
+        '/lease': coordinator.lease,
+        '/heartbeat': coordinator.heartbeat,
+        '/submit': coordinator.submit,
+        '/complete': coordinator.complete,
+    }
+    get_routes = {
+        '/ids': coordinator.get_ids,
+        '/status': coordinator.work_queue.get_status,
+    }
+
+    class RequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if not coordinator.is_authorized(self.headers.get('Authorization')):
+                return self.send_error(401)
+
+            if self.path not in get_routes:
+                return self.send_error(404)
+
+            self.send_json(get_routes[self.path]())
+
+        def do_POST(self):
+            if not coordinator.is_authorized(self.headers.get('Authorization')):
+                return self.send_error(401)
+
+            if self.path not in post_routes:
+                return self.send_error(404)
+
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+            self.send_json(post_routes[self.path](json.loads(body)))
+
+        def send_json(self, response) -> None:
+            body = json.dumps(response, ensure_ascii=False).encode('utf-8')
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Requests are frequent, do not print every one of them
+            pass
+
+    return RequestHandler
+
+
+class CoordinatorClient:
+    """
+        HTTP client used by the workers to talk to the coordinator.
+    """
+    REQUEST_TIMEOUT = 60
+
+    def __init__(self, url: str, worker_id: str, token: Optional[str] = None, request_timeout: float = REQUEST_TIMEOUT):
+        """
+            Args:
+                - url: The URL of the coordinator, e.g. http://10.0.0.1:8765.
+                - worker_id: The ID of this worker.
+                - token: The shared secret of the coordinator, None if it has none.
+                - request_timeout: How long (in seconds) to wait for an answer of the coordinator.
+        """
+        self.url = url.rstrip('/')
+        self.worker_id = worker_id
+        self.request_timeout = request_timeout
+        self.session = requests.Session()
+
+        if token is not None:
+            self.session.headers['Authorization'] = f'Bearer {token}'
+
+    def post(self, path: str, **payload) -> Dict:
+        response = self.session.post(f'{self.url}{path}', json={'worker_id': self.worker_id, **payload},
+                                     timeout=self.request_timeout)
+        response.raise_for_status()
+
+        return response.json()
+
+    def get_ids(self) -> Set[str]:
+        response = self.session.get(f'{self.url}/ids', timeout=self.request_timeout)
+        response.raise_for_status()
+
+        return set(response.json())
+
+    def lease(self, total_records: int) -> Optional[WorkUnit]:
+        return self.post('/lease', total_records=total_records)['unit']
+
+    def heartbeat(self, unit_id: int) -> bool:
+        return self.post('/heartbeat', unit_id=unit_id)['ok']
+
+    def submit(self, unit_id: int, records: Dict[str, Dict[str, str]]) -> bool:
+        return self.post('/submit', unit_id=unit_id, records=records)['ok']
+
+    def complete(self, unit_id: int) -> bool:
+        return self.post('/complete', unit_id=unit_id)['ok']
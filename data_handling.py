@@ -1,11 +1,32 @@
 import json
-from typing import List, Dict
+import os
+import shutil
+import tempfile
+from contextlib import suppress
+from itertools import count
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Set, TextIO, Tuple, Union
 
+try:
+    # Optional faster JSON parser, used when it is installed
+    import orjson
+except ImportError:
+    orjson = None
 
-def load_data(filename: str) -> Dict[str, str]:
+# How many characters are read from the data file at once when streaming
+READ_CHUNK_SIZE = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+
+_WHITESPACE = ' \t\n\r'
+
+
+def load_data(filename: str) -> Dict[str, Dict[str, str]]:
     """
         Load data from a JSON file.
 
+        Uses orjson when it is installed, since it parses the whole file considerably faster than the json module.
+        If the file is corrupted, it is restored from the newest valid snapshot first.
+
         Args:
             - filename: The name of the JSON file to load data from.
 
@@ -13,20 +34,408 @@ def load_data(filename: str) -> Dict[str, str]:
             - A dictionary containing the loaded data.
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        return _load_data(filename)
+    except ValueError:
+        restore_snapshot(filename)
+
+        return _load_data(filename)
+
+
+def _load_data(filename: str) -> Dict[str, Dict[str, str]]:
+    try:
+        if orjson is not None:
+            with open(filename, 'rb') as file:
+                data = orjson.loads(file.read())
+        else:
+            with open(filename, 'r', encoding='utf-8') as file:
+                data = json.load(file)
     except FileNotFoundError:
         data = {}
     return data
 
 
-def save_data(data: List[Dict[str, str]], filename: str) -> None:
+def iter_data(filename: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+        Iterate over the records of a JSON file without loading the whole file.
+
+        The file is read in chunks and every top-level key and value is decoded as soon as it is complete, so only
+        one record (and one chunk) is held in memory at a time.
+
+        Args:
+            - filename: The name of the JSON file to load data from.
+            - chunk_size: How many characters are read at once.
+
+        Returns:
+            - An iterator over (key, record) pairs, in file order.
+    """
+    for key, value, _ in _iter_items(filename, chunk_size):
+        yield key, value
+
+
+def _iter_items(filename: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Tuple[str, Dict[str, str], str]]:
+    """
+        Iterate over the top-level items of a JSON file, together with the raw JSON text of each value.
+    """
+    try:
+        file = open(filename, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+
+    with file:
+        reader = _JSONObjectReader(file, chunk_size)
+
+        reader.expect('{')
+
+        if reader.peek() == '}':
+            return
+
+        while True:
+            key, _ = reader.decode()
+
+            reader.expect(':')
+
+            yield (key, *reader.decode())
+
+            if reader.expect(',}') == '}':
+                return
+
+
+def load_ids(filename: str) -> Set[str]:
+    """
+        Load only the keys (actor IDs) of a JSON file.
+
+        If the file is corrupted, it is restored from the newest valid snapshot first.
+
+        Args:
+            - filename: The name of the JSON file to load the IDs from.
+
+        Returns:
+            - A set containing the IDs.
+    """
+    try:
+        return {key for key, _ in iter_data(filename)}
+    except ValueError:
+        restore_snapshot(filename)
+
+        return {key for key, _ in iter_data(filename)}
+
+
+def save_data(data: Dict[str, Dict[str, str]], filename: str, snapshots: int = 0) -> None:
     """
         Save data to a JSON file.
 
+        The file is replaced atomically, see atomic_write.
+
         Args:
             - data: The data to be saved to the JSON file.
             - filename: The name of the JSON file to save data to.
+            - snapshots: How many previous versions of the file to keep.
+    """
+    atomic_write(filename, lambda json_file: json.dump(data, json_file, ensure_ascii=False, indent=4), snapshots)
+
+
+def save_data_stream(items: Iterable[Tuple[str, Union[Dict[str, str], str]]], filename: str,
+                     snapshots: int = 0, before_replace: Optional[Callable[[], None]] = None) -> None:
+    """
+        Save (key, record) pairs to a JSON file one by one.
+
+        The output is the same as save_data produces for a dictionary with the same items. A record can also be
+        passed as already encoded JSON text (as found in a file written by save_data), then it is written unchanged.
+        The file is replaced atomically, see atomic_write.
+
+        Args:
+            - items: The (key, record) pairs to be saved.
+            - filename: The name of the JSON file to save data to.
+            - snapshots: How many previous versions of the file to keep.
+            - before_replace: Called once the new version is written, before it replaces the file, see atomic_write.
+    """
+    def write(json_file: TextIO) -> None:
+        json_file.write('{')
+
+        separator = '\n'
+
+        for key, value in items:
+            json_file.write(separator)
+            json_file.write(f'    {json.dumps(key, ensure_ascii=False)}: ')
+
+            if isinstance(value, str):
+                json_file.write(value)
+            else:
+                # The strings can not contain a raw newline, so it is safe to indent the value line by line
+                json_file.write(json.dumps(value, ensure_ascii=False, indent=4).replace('\n', '\n    '))
+
+            separator = ',\n'
+
+        json_file.write('\n}' if separator != '\n' else '}')
+
+    atomic_write(filename, write, snapshots, before_replace=before_replace)
+
+
+def update_data(new_data: Dict[str, Dict[str, str]], filename: str, snapshots: int = 0,
+                on_write: Optional[Callable[[str, Dict[str, str], Optional[str]], None]] = None,
+                before_replace: Optional[Callable[[], None]] = None) -> None:
+    """
+        Add or replace records in a JSON file without loading the whole file.
+
+        The existing records are streamed into a temporary file, replaced records keep their position and new records
+        are added at the end, the same as dict.update followed by save_data. Records that are not replaced are copied
+        as they are, without encoding them again.
+
+        Args:
+            - new_data: The records to add or replace.
+            - filename: The name of the JSON file to update.
+            - snapshots: How many previous versions of the file to keep.
+            - on_write: Called for every added or replaced record with its key, the record and the raw JSON text of
+              the record it replaces (None for added records), e.g. to track the changes.
+            - before_replace: Called once every record is written, before the file is replaced, e.g. to save the
+              changes first.
+    """
+    written = set()
+
+    def merged_items():
+        for key, _, raw_value in _iter_items(filename):
+            if key in new_data:
+                if on_write is not None:
+                    on_write(key, new_data[key], raw_value)
+
+                yield key, new_data[key]
+            else:
+                yield key, raw_value
+
+            written.add(key)
+
+        for key, value in new_data.items():
+            if key not in written:
+                if on_write is not None:
+                    on_write(key, value, None)
+
+                yield key, value
+
+    save_data_stream(merged_items(), filename, snapshots, before_replace)
+
+
+def atomic_write(filename: str, write: Callable[[Union[TextIO, BinaryIO]], None], snapshots: int = 0,
+                 binary: bool = False, before_replace: Optional[Callable[[], None]] = None) -> None:
+    """
+        Write a file so that a crash never leaves it truncated.
+
+        The content is written to a temporary file in the same directory and flushed to disk, then the temporary
+        file is renamed over the target. Either the old or the new version of the file exists at any time. Before
+        the rename, the current version is kept as filename.1, the older ones are moved to filename.2, filename.3...
+
+        Args:
+            - filename: The name of the file to write.
+            - write: A function that writes the content to the given file object.
+            - snapshots: How many previous versions of the file to keep.
+            - binary: Open the file in binary mode instead of as UTF-8 text.
+            - before_replace: Called after the new version is flushed to disk and before it replaces the file. If it
+              raises, the file is left as it was.
     """
-    with open(filename, 'w', encoding='utf-8') as json_file:
-        json.dump(data, json_file, ensure_ascii=False, indent=4)
+    directory = os.path.dirname(os.path.abspath(filename))
+
+    fd, temp_filename = tempfile.mkstemp(prefix=f'.{os.path.basename(filename)}.', suffix='.tmp', dir=directory)
+
+    try:
+        # mkstemp creates the file readable only by the owner, keep the permissions of the file being replaced
+        os.chmod(temp_filename, os.stat(filename).st_mode if os.path.exists(filename) else 0o644)
+
+        with (open(fd, 'wb') if binary else open(fd, 'w', encoding='utf-8')) as file:
+            write(file)
+
+            file.flush()
+            os.fsync(file.fileno())
+
+        if before_replace is not None:
+            before_replace()
+
+        if snapshots > 0:
+            rotate_snapshots(filename, snapshots)
+
+        os.replace(temp_filename, filename)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temp_filename)
+        raise
+
+    _fsync_directory(directory)
+
+
+def get_snapshot_filename(filename: str, number: int) -> str:
+    return f'{filename}.{number}'
+
+
+def rotate_snapshots(filename: str, snapshots: int) -> None:
+    """
+        Keep the current version of a file as snapshot 1 and shift the older snapshots by one.
+
+        Args:
+            - filename: The name of the file.
+            - snapshots: How many snapshots to keep.
+    """
+    if not os.path.exists(filename):
+        return
+
+    for number in range(snapshots - 1, 0, -1):
+        with suppress(FileNotFoundError):
+            os.replace(get_snapshot_filename(filename, number), get_snapshot_filename(filename, number + 1))
+
+    newest_snapshot = get_snapshot_filename(filename, 1)
+
+    with suppress(FileNotFoundError):
+        os.remove(newest_snapshot)
+
+    # The file is about to be replaced, so a hard link is enough and avoids copying the whole file
+    try:
+        os.link(filename, newest_snapshot)
+    except OSError:
+        shutil.copy2(filename, newest_snapshot)
+
+
+def is_valid_data(filename: str) -> bool:
+    """
+        Check that a file contains a complete JSON object.
+
+        Args:
+            - filename: The name of the JSON file to check.
+
+        Returns:
+            - True if the whole file can be parsed, False otherwise.
+    """
+    try:
+        for _ in _iter_items(filename):
+            pass
+    except ValueError:
+        return False
+    return True
+
+
+def restore_snapshot(filename: str) -> str:
+    """
+        Replace a corrupted file with its newest valid snapshot.
+
+        The corrupted file is kept as filename.corrupt.
+
+        Args:
+            - filename: The name of the corrupted file.
+
+        Returns:
+            - The name of the snapshot the file was restored from.
+
+        Raises:
+            - ValueError if there is no valid snapshot.
+    """
+    for number in count(1):
+        snapshot = get_snapshot_filename(filename, number)
+
+        if not os.path.exists(snapshot):
+            break
+
+        if is_valid_data(snapshot):
+            os.replace(filename, f'{filename}.corrupt')
+
+            with open(snapshot, 'r', encoding='utf-8') as snapshot_file:
+                atomic_write(filename, lambda file: shutil.copyfileobj(snapshot_file, file))
+
+            return snapshot
+
+    raise ValueError(f'{filename} is corrupted and there is no valid snapshot to restore it from.')
+
+
+def _fsync_directory(directory: str) -> None:
+    """
+        Flush the directory entry of a renamed file to disk. Not supported on Windows.
+    """
+    if os.name == 'nt':
+        return
+
+    fd = os.open(directory, os.O_RDONLY)
+
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _JSONObjectReader:
+    """
+        Reads JSON values one after another from a file that is consumed in chunks.
+    """
+
+    def __init__(self, file, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def read_more(self) -> bool:
+        """
+            Appends the next chunk to the buffer, dropping the already consumed part.
+
+            Returns:
+                - False if the end of the file was reached, True otherwise.
+        """
+        chunk = self.file.read(self.chunk_size)
+
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+        return True
+
+    def peek(self) -> str:
+        """
+            Skips whitespace and returns the next character without consuming it.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            if not self.read_more():
+                raise json.JSONDecodeError('Unexpected end of data', self.buffer, self.position)
+
+    def expect(self, characters: str) -> str:
+        """
+            Consumes the next character, which has to be one of the given characters.
+        """
+        character = self.peek()
+
+        if character not in characters:
+            raise json.JSONDecodeError(f'Expecting one of {characters!r}', self.buffer, self.position)
+
+        self.position += 1
+
+        return character
+
+    def decode(self) -> Tuple[object, str]:
+        """
+            Decodes the next JSON value, reading more chunks until it is complete.
+
+            Returns:
+                - A tuple of the decoded value and its raw JSON text.
+        """
+        self.peek()
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.eof or not self.read_more():
+                    raise
+                continue
+
+            # A value that ends at the end of the buffer (e.g. a number) might continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self.read_more():
+                continue
+
+            raw_value = self.buffer[self.position:end]
+
+            self.position = end
+
+            return value, raw_value
@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from data_handling import load_data, save_data
+
+
+class DeadLetterQueue:
+    """
+        A persistent store for actors whose detail page could not be scraped.
+
+        Every failure is kept under the actor ID together with the actor URL (if it was reached), the stage at which
+        the scraping failed, the last error and how many attempts were made. The entries are saved to a JSON file, so
+        they survive restarts and can be re-scraped later without walking through all the list pages again.
+    """
+    # Stages at which scraping of an actor can fail
+    STAGE_OPEN = 'open'
+    STAGE_LOAD = 'load'
+    STAGE_EXTRACT = 'extract'
+
+    def __init__(self, filename: str):
+        """
+            Initializes the DeadLetterQueue and loads the already recorded failures.
+
+            Args:
+                - filename: The name of the JSON file where the failures are stored.
+        """
+        self.filename = filename
+        self.entries = load_data(filename)
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, actor_id: str) -> bool:
+        return actor_id in self.entries
+
+    def record_failure(self, actor_id: str, url: Optional[str], stage: str, error: str) -> Dict[str, Union[str, int]]:
+        """
+            Records a failed attempt to scrape an actor and saves the queue.
+
+            Args:
+                - actor_id: The ID of the actor that failed.
+                - url: The actor URL, None if the actor page was never reached.
+                - stage: The stage at which the scraping failed.
+                - error: The error message.
+
+            Returns:
+                - The updated entry for the actor.
+        """
+        with self.lock:
+            entry = self.entries.get(actor_id, {'Actor ID/SRN': actor_id, 'Actor URL': None, 'Attempts': 0})
+
+            # Keep the URL from a previous attempt if this time we did not get that far
+            entry['Actor URL'] = url or entry['Actor URL']
+            entry['Stage'] = stage
+            entry['Error'] = error
+            entry['Attempts'] += 1
+            entry['Last attempt'] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
+
+            self.entries[actor_id] = entry
+
+            save_data(self.entries, self.filename)
+
+        return entry
+
+    def resolve(self, actor_id: str) -> None:
+        """
+            Removes an actor from the queue after it was scraped successfully.
+
+            Args:
+                - actor_id: The ID of the actor that was scraped.
+        """
+        with self.lock:
+            if self.entries.pop(actor_id, None) is not None:
+                save_data(self.entries, self.filename)
+
+    def get_retryable(self, max_attempts: int) -> List[Dict[str, Union[str, int]]]:
+        """
+            Returns the entries that can be re-scraped directly.
+
+            Only entries with a known actor URL and fewer than max_attempts attempts are returned. The rest are left
+            for the next full run, they are not in the scraped data, so they will be picked up again.
+
+            Args:
+                - max_attempts: The maximum number of attempts per actor.
+
+            Returns:
+                - A list of retryable entries.
+        """
+        return [entry for entry in self.entries.values() if entry['Actor URL'] and entry['Attempts'] < max_attempts]
@@ -0,0 +1,111 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import socket
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, Optional
+
+Event = Dict[str, Any]
+
+# Event types
+RUN_STARTED = 'run_started'
+RUN_FINISHED = 'run_finished'
+PAGE = 'page'
+RECORD = 'record'
+PAGES_SKIPPED = 'pages_skipped'
+RESOURCES = 'resources'
+SESSION_RECYCLED = 'session_recycled'
+
+# Outcomes of record events
+SCRAPED = 'scraped'
+KNOWN = 'known'
+FAILED = 'failed'
+
+# Outcomes of page events
+COMPLETE = 'complete'
+INCOMPLETE = 'incomplete'
+
+
+def get_worker_id() -> str:
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+class EventLog:
+    """
+        Appends structured events to a JSON Lines file, one event per line, for throughput analysis (see report.py).
+
+        Every event has the time it happened (a timestamp in seconds), its type and the ID of the worker, plus its
+        own fields such as the page number, the actor ID, the duration in seconds and the outcome. Like the Logger,
+        the events are written by a background thread.
+    """
+
+    def __init__(self, filename: str, worker_id: Optional[str] = None):
+        """
+            Initializes the EventLog and starts its background thread.
+
+            Args:
+                - filename: The name of the JSON Lines file.
+                - worker_id: The ID written with every event, the host name and process ID by default.
+        """
+        self.filename = filename
+        self.worker_id = worker_id or get_worker_id()
+
+        file_handler = logging.FileHandler(filename, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+
+        event_queue = queue.SimpleQueue()
+
+        # A logger of its own, so the events do not end up in app.log
+        self.logger = logging.getLogger(f'{__name__}.{id(self)}')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(QueueHandler(event_queue))
+
+        self.listener = QueueListener(event_queue, file_handler)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        """
+            Writes an event.
+
+            Args:
+                - event_type: The type of the event.
+                - fields: The fields of the event. A 'worker' field replaces the worker ID of the log.
+        """
+        event = {'time': round(time.time(), 3), 'event': event_type, 'worker': self.worker_id, **fields}
+
+        if event.get('duration') is not None:
+            event['duration'] = round(event['duration'], 3)
+
+        self.logger.info(json.dumps(event, ensure_ascii=False))
+
+    def close(self) -> None:
+        """
+            Writes the queued events and stops the background thread.
+        """
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+            for handler in self.listener.handlers:
+                handler.close()
+
+
+def read_events(filename: str) -> Iterator[Event]:
+    """
+        Reads the events of an event log.
+
+        Args:
+            - filename: The name of the JSON Lines file.
+
+        Returns:
+            - An iterator over the events, in the order they were written.
+    """
+    with open(filename, 'r', encoding='utf-8') as file:
+        for line in file:
+            # A line cut off by a crash is skipped
+            if line.endswith('\n'):
+                yield json.loads(line)
@@ -0,0 +1,150 @@
+import json
+from typing import Dict, Iterable, List, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from parallel import batched
+from records import DATE_FIELDS, DICTIONARY_FIELDS, FIELD_NAMES, FLOAT_FIELDS, INACTIVE_SINCE_FIELD, MISSING_VALUE, \
+    parse_date, parse_float
+
+# How many records are converted and written at once
+EXPORT_BATCH_SIZE = 5000
+
+PARQUET_FORMAT = 'parquet'
+JSONL_FORMAT = 'jsonl'
+
+EXPORT_FILE_EXTENSIONS = {
+    PARQUET_FORMAT: 'parquet',
+    JSONL_FORMAT: 'jsonl.zst',
+}
+
+# Actor fields as saved by the scraper (see README - DATA) and their column names in the export. Actors that are not
+# marked inactive have no inactive_since
+EXPORT_COLUMNS = {**FIELD_NAMES, INACTIVE_SINCE_FIELD: 'inactive_since'}
+
+EXPORT_DATE_FIELDS = (*DATE_FIELDS, INACTIVE_SINCE_FIELD)
+
+
+def get_field_type(field: str) -> pa.DataType:
+    """
+        Returns the Arrow type of an actor field.
+
+        Args:
+            - field: The actor field name.
+
+        Returns:
+            - The Arrow data type of the column.
+    """
+    if field in EXPORT_DATE_FIELDS:
+        return pa.date32()
+    if field in FLOAT_FIELDS:
+        return pa.float64()
+    if field in DICTIONARY_FIELDS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+EXPORT_SCHEMA = pa.schema([pa.field(column, get_field_type(field)) for field, column in EXPORT_COLUMNS.items()])
+
+
+def records_to_batch(records: List[Dict[str, str]]) -> pa.RecordBatch:
+    """
+        Converts actor records to an Arrow record batch with typed columns.
+
+        Args:
+            - records: The actor records, as saved by the scraper.
+
+        Returns:
+            - A record batch following EXPORT_SCHEMA.
+    """
+    arrays = []
+
+    for field, column in EXPORT_COLUMNS.items():
+        values = [record.get(field) for record in records]
+        values = [None if value == MISSING_VALUE else value for value in values]
+
+        if field in EXPORT_DATE_FIELDS:
+            values = [parse_date(value) for value in values]
+        elif field in FLOAT_FIELDS:
+            values = [parse_float(value) for value in values]
+
+        arrays.append(pa.array(values, type=EXPORT_SCHEMA.field(column).type))
+
+    return pa.RecordBatch.from_arrays(arrays, schema=EXPORT_SCHEMA)
+
+
+def export_parquet(records: Iterable[Dict[str, str]], filename: str, batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """
+        Writes actor records to a zstd compressed Parquet file, one row group per batch.
+
+        Args:
+            - records: The actor records, as saved by the scraper.
+            - filename: The name of the Parquet file.
+            - batch_size: How many records are converted and written at once.
+
+        Returns:
+            - The number of exported records.
+    """
+    exported = 0
+
+    with pq.ParquetWriter(filename, EXPORT_SCHEMA, compression='zstd') as writer:
+        for batch in batched(records, batch_size):
+            writer.write_batch(records_to_batch(batch))
+
+            exported += len(batch)
+
+    return exported
+
+
+def export_jsonl(records: Iterable[Dict[str, str]], filename: str, batch_size: int = EXPORT_BATCH_SIZE) -> int:
+    """
+        Writes actor records to a zstd compressed JSON Lines file, one record per line.
+
+        Args:
+            - records: The actor records, as saved by the scraper.
+            - filename: The name of the compressed JSON Lines file.
+            - batch_size: How many records are serialized and written at once.
+
+        Returns:
+            - The number of exported records.
+    """
+    exported = 0
+
+    with pa.CompressedOutputStream(filename, 'zstd') as stream:
+        for batch in batched(records, batch_size):
+            lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in batch)
+
+            stream.write(lines.encode('utf-8'))
+
+            exported += len(batch)
+
+    return exported
+
+
+EXPORTERS = {
+    PARQUET_FORMAT: export_parquet,
+    JSONL_FORMAT: export_jsonl,
+}
+
+
+def export_data(records: Iterable[Dict[str, str]], data_filename: str, export_format: str,
+                batch_size: int = EXPORT_BATCH_SIZE) -> Tuple[str, int]:
+    """
+        Exports actor records in the given format next to the scraped data file.
+
+        Args:
+            - records: The actor records, as saved by the scraper.
+            - data_filename: The name of the scraped data file, e.g. importers_data.json.
+            - export_format: One of 'parquet' or 'jsonl'.
+            - batch_size: How many records are converted and written at once.
+
+        Returns:
+            - A tuple of the export file name and the number of exported records.
+    """
+    if export_format not in EXPORTERS:
+        raise ValueError(f'Invalid export format specified. Choices allowed are: {", ".join(EXPORTERS)}')
+
+    filename = f'{data_filename.rsplit(".", 1)[0]}.{EXPORT_FILE_EXTENSIONS[export_format]}'
+
+    return filename, EXPORTERS[export_format](records, filename, batch_size)
@@ -0,0 +1,291 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+CachedResponse = Dict[str, Any]
+
+
+class HttpCache:
+    """
+        A size-bounded on-disk cache of HTTP responses, keyed by URL and stored in SQLite.
+
+        A response is fresh for ttl seconds after it was stored. A stale response is kept together with its ETag and
+        Last-Modified headers, so it can be revalidated with a conditional request and served again if the server
+        answers 304 Not Modified. When the bodies take more than max_size bytes, the least recently used responses are
+        removed.
+
+        The cache does not know where the responses come from: the direct HTTP client below fills it with its own
+        requests, a browser capture fills it with the responses the page loaded. A response can also be found by a key
+        of its own (see add_key), e.g. the ID of the actor whose details it holds.
+    """
+
+    def __init__(self, database: str, ttl: float, max_size: int):
+        """
+            Initializes the HttpCache and creates its table if needed.
+
+            Args:
+                - database: The name of the SQLite database file.
+                - ttl: How long (in seconds) a response is fresh.
+                - max_size: The maximum size of all the bodies, in bytes.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.connection = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+
+        with self.lock:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+                CREATE TABLE IF NOT EXISTS keys (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    page_url TEXT
+                );
+            ''')
+
+    def get(self, url: str, include_stale: bool = False) -> Optional[CachedResponse]:
+        """
+            Returns the cached response of a URL.
+
+            Args:
+                - url: The URL of the response.
+                - include_stale: Also return a response older than ttl, e.g. to revalidate it.
+
+            Returns:
+                - A dictionary with the status, headers, body, the time it was stored and whether it is still fresh,
+                  None if there is no such response.
+        """
+        now = time.time()
+
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT status, headers, body, stored_at FROM responses WHERE url = ?', (url,)).fetchone()
+
+            if row is None:
+                return None
+
+            status, headers, body, stored_at = row
+
+            fresh = now - stored_at < self.ttl
+
+            if not fresh and not include_stale:
+                return None
+
+            self.connection.execute('UPDATE responses SET last_access = ? WHERE url = ?', (now, url))
+
+        return {
+            'url': url,
+            'status': status,
+            'headers': json.loads(headers),
+            'body': body,
+            'stored_at': stored_at,
+            'fresh': fresh,
+        }
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """
+            Stores a response, replacing the previous one of the URL. Only successful responses are stored.
+
+            Args:
+                - url: The URL of the response.
+                - status: The HTTP status code.
+                - headers: The response headers.
+                - body: The response body.
+        """
+        if status != 200:
+            return
+
+        # Header names are case-insensitive
+        lower_headers = {name.lower(): value for name, value in headers.items()}
+
+        now = time.time()
+
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, status, headers, body, size, etag, last_modified, stored_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, status, json.dumps(dict(headers)), body, len(body), lower_headers.get('etag'),
+                 lower_headers.get('last-modified'), now, now))
+
+            self.evict()
+
+    def add_key(self, key: str, url: str, page_url: Optional[str] = None) -> None:
+        """
+            Lets a cached response be found by another key than its URL, replacing the previous response of the key.
+
+            Args:
+                - key: The key, e.g. the ID of an actor.
+                - url: The URL of the response.
+                - page_url: The URL of the page that loaded the response, if any.
+        """
+        with self.lock:
+            self.connection.execute('INSERT OR REPLACE INTO keys (key, url, page_url) VALUES (?, ?, ?)',
+                                    (key, url, page_url))
+
+    def get_by_key(self, key: str, include_stale: bool = False) -> Optional[CachedResponse]:
+        """
+            Returns the cached response of a key, see add_key and get.
+
+            Returns:
+                - The response like get with the page URL of the key, None if there is no such response.
+        """
+        with self.lock:
+            row = self.connection.execute('SELECT url, page_url FROM keys WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        cached = self.get(row[0], include_stale)
+
+        return None if cached is None else {**cached, 'page_url': row[1]}
+
+    def refresh(self, url: str) -> None:
+        """
+            Marks a cached response as fresh again, after the server confirmed it has not changed.
+
+            Args:
+                - url: The URL of the response.
+        """
+        now = time.time()
+
+        with self.lock:
+            self.connection.execute('UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?',
+                                    (now, now, url))
+
+    def get_validators(self, url: str) -> Dict[str, str]:
+        """
+            Returns the headers of a conditional request for a cached response.
+
+            Args:
+                - url: The URL of the response.
+
+            Returns:
+                - The If-None-Match and If-Modified-Since headers, empty if the response is not cached or has no
+                  validators.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT etag, last_modified FROM responses WHERE url = ?', (url,)).fetchone()
+
+        if row is None:
+            return {}
+
+        etag, last_modified = row
+
+        validators = {}
+
+        if etag:
+            validators['If-None-Match'] = etag
+        if last_modified:
+            validators['If-Modified-Since'] = last_modified
+
+        return validators
+
+    def evict(self) -> None:
+        """
+            Removes the least recently used responses until the bodies fit into max_size. Called with the lock held.
+        """
+        total_size = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+        if total_size <= self.max_size:
+            return
+
+        cursor = self.connection.execute('SELECT url, size FROM responses ORDER BY last_access')
+
+        evicted = []
+
+        for url, size in cursor:
+            if total_size <= self.max_size:
+                break
+
+            evicted.append((url,))
+
+            total_size -= size
+
+        self.connection.executemany('DELETE FROM responses WHERE url = ?', evicted)
+        self.connection.executemany('DELETE FROM keys WHERE url = ?', evicted)
+
+    def get_size(self) -> int:
+        with self.lock:
+            return self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+class CachedHttpClient:
+    """
+        Fetches URLs directly over HTTP through an HttpCache.
+
+        Fresh responses are served from the cache without a request. Stale ones are revalidated with a conditional
+        request and served from the cache if the server answers 304 Not Modified.
+    """
+
+    def __init__(self, cache: HttpCache, session: Optional[requests.Session] = None, timeout: float = 30):
+        """
+            Initializes the CachedHttpClient.
+
+            Args:
+                - cache: The cache of the responses.
+                - session: The requests session to use, a new one by default.
+                - timeout: How long (in seconds) to wait for the server.
+        """
+        self.cache = cache
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """
+            Fetches a URL.
+
+            Args:
+                - url: The URL to fetch.
+                - headers: Additional request headers.
+
+            Returns:
+                - A dictionary with the status, headers and body of the response and whether it was served from the
+                  cache.
+        """
+        cached = self.cache.get(url, include_stale=True)
+
+        if cached is not None and cached['fresh']:
+            return {**cached, 'from_cache': True}
+
+        request_headers = {**(headers or {}), **self.cache.get_validators(url)}
+
+        response = self.session.get(url, headers=request_headers, timeout=self.timeout)
+
+        if response.status_code == 304 and cached is not None:
+            self.cache.refresh(url)
+
+            return {**cached, 'fresh': True, 'from_cache': True}
+
+        self.cache.put(url, response.status_code, dict(response.headers), response.content)
+
+        return {
+            'url': url,
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'body': response.content,
+            'stored_at': time.time(),
+            'fresh': True,
+            'from_cache': False,
+        }
@@ -1,328 +1,421 @@
-import time
-
-from selenium import webdriver
-from data_handling import load_data, save_data
-from pages.actor_page import ActorPage
-from pages.browse_page import BrowsePage
+import argparse
+import json
+import os
+import socket
+from typing import List, Optional
+
+from config import Config, ConfigError, load_config
+# WebDriverOptions is also imported from here by the browser tests
+from options import ScraperOptions, WebDriverOptions
 from utils import MessageProvider, TextFormatter, Logger, AppMessages
 
+# Selenium, pyarrow and the scraper itself are imported by the commands that use them, so the commands without a
+# browser (export, stats, report, ...) start without loading them.
 
-class ScraperOptions:
-    # Available roles
-    MANUFACTURER_ROLE = 'manufacturer'
-    IMPORTER_ROLE = 'importer'
+# Commands that start a browser and crawl the list
+CRAWL_COMMAND = 'crawl'
+RESUME_COMMAND = 'resume'
+NEW_SINCE_COMMAND = 'new-since'
+RECONCILE_COMMAND = 'reconcile'
+WORKER_COMMAND = 'worker'
 
-    # Possible roles: manufacturer, importer
-    ROLE = 'importer'
 
-    ROLE_VALUE_ERROR_MSG = "Invalid role specified."
-    # Options: 10, 25, 50. Changes how many records are there in a table per page
-    ROWS_PER_PAGE = 10
+def export_scraped_data(export_format: Optional[str], options: ScraperOptions, message_provider: MessageProvider,
+                        logger: Logger) -> None:
+    """
+        Exports the scraped data of the current role to a compressed Parquet or JSON Lines file.
 
-    # The time it takes to load a page (in seconds), used for calculating total estimated time for completion. Change
-    # as needed.
-    PAGE_LOAD_TIME = 2
+        Parameters:
+        - export_format: One of 'parquet' or 'jsonl', None for Parquet.
+        - options: The options of the run.
+        - message_provider: MessageProvider used to display the result.
+        - logger: Logger used to log the result.
+    """
+    from data_handling import iter_data
+    from export import export_data, PARQUET_FORMAT
 
-    # How much consecutive exceptions can be raised before the program stops for good.
-    MAX_CONSECUTIVE_EXCEPTIONS = 5
+    filename = f"{options.ROLE}s_data.json"
 
-    # The wait time between runs (in seconds). When the app raises an error, it will try to start the program again
-    # after that time if MAX_CONSECUTIVE_EXCEPTIONS has not reached the maximum
-    WAIT_TIME_BETWEEN_RUNS = 30
+    export_filename, exported = export_data((record for _, record in iter_data(filename)), filename,
+                                             export_format or PARQUET_FORMAT, options.EXPORT_BATCH_SIZE)
 
+    message_provider.export_completed(exported, export_filename)
 
-class WebDriverOptions:
-    # Options you can pass to configurate your webdriver. '--headless=new'
-    # More info: https://github.com/GoogleChrome/chrome-launcher/blob/main/docs/chrome-flags-for-tools.md
+    logger.log_info(message_provider.app_messages.EXPORT_COMPLETED_MESSAGE.format(exported=exported,
+                                                                                  filename=export_filename))
 
-    WEBDRIVER_OPTIONS = ['headless', '--disable-extensions', '--disable-infobars', '--disable-gpu',
-                         '--disable-notifications']
 
-    # Depends on the loading time of your page (in seconds). Adjust as needed or pass a value as argument when you
-    # initialize the class.
-    WEBDRIVER_WAIT_TIME = 10
+def reextract_archived_data(options: ScraperOptions, message_provider: MessageProvider, logger: Logger) -> None:
+    """
+        Rebuilds the data of the current role from the page archive, without crawling the website.
 
-    def __init__(self, wait_time: int = WEBDRIVER_WAIT_TIME):
-        self.web_driver_wait_time = wait_time
+        The records are saved to {role}s_data.reextracted.json, so the current data file is left untouched.
 
-    @property
-    def get_web_driver_wait_time(self):
-        return self.web_driver_wait_time
+        Parameters:
+        - options: The options of the run.
+        - message_provider: MessageProvider used to display the result.
+        - logger: Logger used to log the result.
+    """
+    from archive import PageArchive, reextract
 
-    def get_driver_options(self) -> webdriver.ChromeOptions:
-        options = webdriver.ChromeOptions()
+    filename = f"{options.ROLE}s_data.reextracted.json"
 
-        for option in self.WEBDRIVER_OPTIONS:
-            options.add_argument(option)
+    extracted, failed = reextract(PageArchive(f"{options.ROLE}s_pages"), filename,
+                                  options.REEXTRACT_WORKERS, options.REEXTRACT_CHUNK_SIZE,
+                                  options.REEXTRACT_ORDERED)
 
-        return options
+    message_provider.reextract_completed(extracted, failed, filename)
 
+    logger.log_info(message_provider.app_messages.REEXTRACT_COMPLETED_MESSAGE.format(extracted=extracted,
+                                                                                     failed=failed, filename=filename))
 
-class Scraper(ScraperOptions):
-    def __init__(self, driver, browse_page: BrowsePage, actor_page: ActorPage, message_provider: MessageProvider,
-                 logger: Logger):
-        self.driver = driver
-        self.browse_page = browse_page
-        self.actor_page = actor_page
-        self.message_provider = message_provider
-        self.logger = logger
-        self.total_records_found = 0
-        self.remaining_records = self.total_records_found
-        self.filename = f"{self.ROLE}s_data.json"
-        self.existing_data = load_data(self.filename)
-        self.new_data = {}  # TODO: Maybe remove this and pass it to functions
-        self.session_time = 0
-        self.loop_start_time = 0
-        self.loop_end_time = 0
 
-    def run(self) -> None:
-        """
-            Runs the scraping process.
+def diff_data_files(old_filename: str, new_filename: Optional[str], options: ScraperOptions,
+                    message_provider: MessageProvider, logger: Logger) -> None:
+    """
+        Compares two versions of the data file and saves the changes between them to {role}s_diff.jsonl, in the
+        format of the changefeed.
 
-            This function orchestrates the scraping process by handling exceptions, initializing the driver,
-            executing data scraping, and displaying messages. If unknown exception is raised it will try to restart
-            the process again if MAX_CONSECUTIVE_EXCEPTIONS are not reached.
+        Parameters:
+        - old_filename: The old version, e.g. the snapshot importers_data.json.1.
+        - new_filename: The new version, None for the current data file.
+        - options: The options of the run.
+        - message_provider: MessageProvider used to display the result.
+        - logger: Logger used to log the result.
+    """
+    from changefeed import diff_snapshots, INSERTED, REMOVED, UPDATED
+    from data_handling import atomic_write
 
-        """
-        consecutive_exceptions = 0
+    new_filename = new_filename or f"{options.ROLE}s_data.json"
 
-        while consecutive_exceptions < self.MAX_CONSECUTIVE_EXCEPTIONS:
-            self.message_provider.app_starting()
+    filename = f"{options.ROLE}s_diff.jsonl"
 
-            self.logger.log_info(self.message_provider.app_messages.APP_STARTING_MESSAGE)
+    counts = {INSERTED: 0, UPDATED: 0, REMOVED: 0}
 
-            try:
-                self.start_scraping_data()
+    def write(file) -> None:
+        for change in diff_snapshots(old_filename, new_filename):
+            file.write(json.dumps(change, ensure_ascii=False) + '\n')
 
-                self.message_provider.scraping_completed_msg(self.filename)
+            counts[change['change']] += 1
 
-                self.logger.log_info(self.message_provider.app_messages.SCRAPING_COMPLETED_MESSAGE)
+    atomic_write(filename, write)
 
-            except KeyboardInterrupt:
-                self.message_provider.keyboard_interruption_msg()
+    message_provider.diff_completed(counts[INSERTED], counts[UPDATED], counts[REMOVED], filename)
 
-                self.logger.log_error(self.message_provider.app_messages.KEYBOARD_INTERRUPTION_MESSAGE)
+    logger.log_info(message_provider.app_messages.DIFF_COMPLETED_MESSAGE.format(
+        inserted=counts[INSERTED], updated=counts[UPDATED], removed=counts[REMOVED], filename=filename))
 
-                break
 
-            except Exception as e:
-                consecutive_exceptions += 1
+def print_event_report(filename: Optional[str], options: ScraperOptions) -> None:
+    """
+        Prints the throughput, stalls and error rates of a crawl from its event log.
 
-                self.message_provider.unexpected_error_msg(e)
+        Parameters:
+        - filename: The name of the event log, None for {role}s_events.jsonl.
+        - options: The options of the run.
+    """
+    from events import read_events
+    from report import build_report, format_report
 
-                self.logger.log_error(
-                    self.message_provider.app_messages.UNEXPECTED_ERROR_MESSAGE.format(exception=str(e)))
+    events = read_events(filename or f"{options.ROLE}s_events.jsonl")
 
-            finally:
-                self.cleanup()
+    print(format_report(build_report(events, options.REPORT_THROUGHPUT_INTERVAL, options.REPORT_STALL_THRESHOLD)))
 
-                self.logger.log_info('Cleaning up resources...')
 
-            # If scraping failed, wait before attempting again
-            if consecutive_exceptions > 0:
-                time.sleep(self.WAIT_TIME_BETWEEN_RUNS)
+def print_stats(options: ScraperOptions) -> None:
+    """
+        Prints the state of the scraped data of the current role, see stats.py.
 
-                self.logger.log_info(f'Waiting {self.WAIT_TIME_BETWEEN_RUNS}s before attempting again.')
+        Parameters:
+        - options: The options of the run.
+    """
+    from stats import build_stats, format_stats
 
-    def cleanup(self) -> None:
-        """
-            Cleans up resources.
+    print(format_stats(build_stats(options.ROLE, options.MAX_RETRY_ATTEMPTS)))
 
-            Quits the WebDriver if it exists to free up system resources.
 
-        """
-        if self.driver:
-            self.driver.quit()
+def print_benchmarks(filename: Optional[str], repeat: Optional[int], options: ScraperOptions) -> None:
+    """
+        Times the local stages of the scraper on a data file and prints the results, see bench.py.
 
-            self.logger.log_info('Cleaning up the driver resources.')
+        Parameters:
+        - filename: The name of the data file, None for the data file of the current role.
+        - repeat: How many times every stage is timed, None for BENCH_REPEAT.
+        - options: The options of the run.
+    """
+    from bench import BENCH_REPEAT, format_benchmarks, run_benchmarks
 
-    def go_to_next_page_if_possible(self) -> bool:
-        """
-        Go to the next page if available.
-        """
-        next_page_button = self.browse_page.find_next_page_button()
+    filename = filename or f"{options.ROLE}s_data.json"
 
-        if self.browse_page.is_button_disabled(next_page_button):
-            return False
+    print(format_benchmarks(run_benchmarks(filename, repeat or BENCH_REPEAT)))
 
-        # Why is this here
-        next_page_button.click()
 
-        return True
+def run_coordinator(port: Optional[int], new_crawl: bool, options: ScraperOptions, message_provider: MessageProvider,
+                    logger: Logger) -> None:
+    """
+        Runs the coordinator of a distributed crawl until interrupted.
 
-    def save_existing_data(self) -> None:
-        """
-        Save scraped data.
-        """
-        self.existing_data.update(self.new_data)
+        Parameters:
+        - port: The port to listen on, None for COORDINATOR_PORT.
+        - new_crawl: Whether the list is crawled again once the work units of the previous crawl are all done.
+        - options: The options of the run.
+        - message_provider: MessageProvider used to display messages.
+        - logger: Logger used to log messages.
+    """
+    from changefeed import Changefeed
+    from coordination import Coordinator, WorkQueue
 
-        save_data(self.existing_data, self.filename)
+    port = port or options.COORDINATOR_PORT
 
-        self.message_provider.saved_current_scraped_data()
+    filename = f"{options.ROLE}s_data.json"
 
-        self.logger.log_info(self.message_provider.app_messages.SAVED_CURRENT_SCRAPED_DATA)
+    database = f"{options.ROLE}s_work_queue.sqlite3"
 
-    def display_completion_time(self) -> None:
-        """
-        Display average completion time.
-        """
-        self.loop_end_time = time.time()
+    changefeed = Changefeed(f"{options.ROLE}s_changes", filename) if options.CHANGEFEED else None
 
-        time_per_page = self.loop_end_time - self.loop_start_time
+    work_queue = WorkQueue(database)
 
-        self.message_provider.average_time_until_completion(
-            self.remaining_records, self.ROWS_PER_PAGE, time_per_page + self.PAGE_LOAD_TIME)
+    if new_crawl:
+        started = work_queue.reset_units()
 
-    def display_session_info(self) -> None:
-        """
-        Display session information.
-        """
-        self.message_provider.time_of_current_session(self.session_time)
-        self.message_provider.remaining_records(self.remaining_records)
+        message_provider.new_crawl(started)
 
-    def process_table_rows(self, table_rows_count: int) -> None:
-        """
-            Processes each row in the table.
+        logger.log_info(message_provider.app_messages.NEW_CRAWL_MESSAGE if started else
+                        message_provider.app_messages.CRAWL_NOT_DONE_MESSAGE)
 
-            Parameters:
-            - table_rows_len: int. Number of table rows on the current page
+    coordinator = Coordinator(work_queue, filename, options.DATA_SNAPSHOTS, options.LEASE_TIME,
+                              options.PAGES_PER_WORK_UNIT, options.ROWS_PER_PAGE, options.FLUSH_INTERVAL, changefeed,
+                              options.COORDINATOR_TOKEN)
 
-            This method iterates through each row in the provided table,
-            retrieves the actor ID for each row, checks if the actor ID exists in the existing data,
-            and calls the scrape_actor_page method to scrape data if the actor ID is not in the existing data.
-            If the actor ID is already present, it logs a message indicating that the record has already been scraped.
-        """
+    host = options.COORDINATOR_HOST
 
-        # We need to use this kind of loop because if we iter through the rows, as elements it will raise
-        # StaleElementReferenceException
-        for i in range(0, table_rows_count - 1):
-            actor_id = self.browse_page.find_actor_id(i + 1)
+    message_provider.coordinator_started(host, port, database)
 
-            if actor_id in self.existing_data:
-                self.message_provider.record_already_scraped(actor_id)
-                continue
+    logger.log_info(message_provider.app_messages.COORDINATOR_STARTED_MESSAGE.format(host=host, port=port,
+                                                                                     database=database))
 
-            self.scrape_actor_page(i, actor_id)
+    try:
+        coordinator.serve(host, port)
+    except KeyboardInterrupt:
+        message_provider.keyboard_interruption_msg()
 
-    def scrape_actor_page(self, i: int, actor_id: str) -> None:
-        """
-            Scrapes information from the actor page based on the given index and actor ID.
 
-            Parameters:
-            - i: The index of the current row.
-            - actor_id: The ID of the actor whose page is being scraped.
+def run_replay_crawl(recording_directory: str, latency: float, config: Config,
+                     message_provider: MessageProvider) -> None:
+    """
+        Crawls a recording through a local replay server and prints the report of the run, see scraper.run_replay.
+        The log file is written to the directory of the run.
 
-            This method locates and clicks the action button associated with the specified row,
-            waits for the actor information to load, captures the actor's information,
-            updates the new data with the scraped information, logs the completion of the record,
-            and navigates back to the previous page.
-        """
-        current_row_button = self.browse_page.find_action_button(i)
+        Parameters:
+        - recording_directory: The directory of the recording, see RECORD_DIRECTORY.
+        - latency: How long (in seconds) every response is delayed.
+        - config: The options of the run.
+        - message_provider: MessageProvider used to display messages.
+    """
+    from scraper import run_replay
 
-        self.browse_page.scroll_to_element(current_row_button)
+    options = config.get_scraper_options()
 
-        current_row_button.click()
+    run_directory = run_replay(recording_directory, latency, message_provider, config)
 
-        self.actor_page.wait_for_actor_information_to_load()
+    print_event_report(os.path.join(run_directory, f"{options.ROLE}s_events.jsonl"), options)
 
-        self.message_provider.working_on(self.driver.current_url)
 
-        self.new_data[actor_id] = self.actor_page.extract_actor_information()
+def run_crawl(command: str, config: Config, message_provider: MessageProvider, logger: Logger,
+              coordinator_url: Optional[str] = None) -> None:
+    """
+        Starts a browser (see WebDriverOptions.BROWSER) and runs the scraper of a crawl command until it is done or
+        interrupted.
 
-        self.message_provider.completed_record(self.driver.current_url)
+        Parameters:
+        - command: One of the crawl commands, e.g. CRAWL_COMMAND.
+        - config: The options of the run.
+        - message_provider: MessageProvider used to display messages.
+        - logger: Logger used to log messages.
+        - coordinator_url: The URL of the coordinator, for WORKER_COMMAND only.
+    """
+    from selenium.webdriver.remote.webdriver import WebDriver
 
-        self.driver.back()
+    from browsers import create_driver
+    from coordination import CoordinatorClient
+    from pages.actor_page import ActorPage
+    from pages.browse_page import BrowsePage
+    from scraper import DistributedWorker, ListReconciler, NewActorsScraper, Scraper
 
-    def scrape_pages(self) -> None:
-        """
-            Scrapes data from each page of the table.
+    options = config.get_scraper_options()
 
-            This method starts a session timer, refreshes the browser page,
-            waits for the table to load, finds the table rows,
-            calculates the remaining records to be scraped,
-            processes each table row, displays session information,
-            saves the existing data if new data is found, and displays completion time.
+    # Only the list crawl reads the captured responses
+    web_driver_options: WebDriverOptions = config.get_web_driver_options(
+        capture_api_responses=options.CAPTURE_API_RESPONSES or bool(options.RECORD_DIRECTORY))
 
-            The scraping continues until there are no more pages to scrape.
-        """
-        self.session_time = time.time()
+    def driver_factory() -> WebDriver:
+        return create_driver(web_driver_options)
 
-        while True:
-            self.loop_start_time = time.time()
+    driver = driver_factory()
 
-            self.driver.refresh()
+    browse_page = BrowsePage(driver, web_driver_options.get_web_driver_wait_time,
+                             web_driver_options.WEBDRIVER_POLL_FREQUENCY)
 
-            self.browse_page.wait_for_table_to_load()
+    actor_page = ActorPage(driver, web_driver_options.get_web_driver_wait_time,
+                           web_driver_options.WEBDRIVER_POLL_FREQUENCY)
 
-            table_rows = self.browse_page.find_table_rows()
+    if command == WORKER_COMMAND:
+        client = CoordinatorClient(coordinator_url, f'{socket.gethostname()}-{os.getpid()}', options.COORDINATOR_TOKEN,
+                                   options.COORDINATOR_REQUEST_TIMEOUT)
 
-            self.remaining_records = self.total_records_found - len(self.existing_data)
+        scraper = DistributedWorker(driver, browse_page, actor_page, message_provider, logger, client, driver_factory,
+                                    config.scraper)
+    elif command == NEW_SINCE_COMMAND:
+        scraper = NewActorsScraper(driver, browse_page, actor_page, message_provider, logger, driver_factory,
+                                   config.scraper)
+    elif command == RECONCILE_COMMAND:
+        scraper = ListReconciler(driver, browse_page, actor_page, message_provider, logger, driver_factory,
+                                 config.scraper)
+    else:
+        scraper = Scraper(driver, browse_page, actor_page, message_provider, logger, driver_factory, config.scraper)
 
-            self.process_table_rows(len(table_rows))
+        # Jumps over the pages complete in the previous run even if SKIP_SCRAPED_PAGES is off
+        if command == RESUME_COMMAND:
+            scraper.skip_ahead = True
 
-            self.display_session_info()
+    scraper.run()
 
-            if len(self.new_data) > 0:
-                self.save_existing_data()
-                self.display_completion_time()
 
-            if not self.go_to_next_page_if_possible():
-                break
+def run_retry_failed(config: Config, message_provider: MessageProvider, logger: Logger) -> None:
+    """
+        Re-scrapes the actors of the dead-letter queue with a pool of browsers.
 
-    def load_role(self) -> None:
-        """
-        Loads the appropriate role data based on the specified role.
-        """
-        if self.ROLE == self.MANUFACTURER_ROLE:
-            self.browse_page.load_url(self.MANUFACTURER_ROLE)
-        elif self.ROLE == self.IMPORTER_ROLE:
-            self.browse_page.load_url(self.IMPORTER_ROLE)
-        else:
-            raise ValueError(self.ROLE_VALUE_ERROR_MSG)
+        Parameters:
+        - config: The options of the run.
+        - message_provider: MessageProvider used to display messages.
+        - logger: Logger used to log messages.
+    """
+    from scraper import FailedActorsScraper
 
-    def start_scraping_data(self) -> None:
-        """
-            Initiates the data scraping process based on the specified role.
+    FailedActorsScraper(config.get_web_driver_options(), message_provider, logger, options=config.scraper).run()
 
-            If the role is set to 'manufacturer', load the manufacturers' data.
-            If the role is set to 'importer', load the importers' data.
-            Raises a ValueError if an invalid role is specified.
-        """
 
-        self.load_role()
+def create_parser() -> argparse.ArgumentParser:
+    """
+        Creates the parser of the command line. Without a command, a full crawl is run.
 
-        self.browse_page.accept_cookies()
+        Returns:
+            - The argument parser.
+    """
+    parser = argparse.ArgumentParser(prog='main.py', description='Scrapes the actors of EUDAMED.',
+                                     epilog='The options are read from eudamed.toml (or the file in EUDAMED_CONFIG), '
+                                            'then from EUDAMED_<OPTION> environment variables, then from -o.')
 
-        # Right now the close prompt does not exist as 24.03.2024. When I was working on this project, a month ago
-        # there was one. So if they decide to introduce it again, this is a fail-safe; hopefully they introduce it
-        # with the same attribute...
-        self.browse_page.close_cookies_prompt_after_accept()
+    parser.add_argument('--config', help='the TOML configuration file, see config.py')
+    parser.add_argument('-o', '--option', action='append', default=[], metavar='NAME=VALUE',
+                        help='set an option of ScraperOptions or WebDriverOptions, e.g. -o ROWS_PER_PAGE=50')
 
-        self.browse_page.choose_table_rows_per_page(self.ROWS_PER_PAGE)
+    commands = parser.add_subparsers(dest='command', metavar='command')
 
-        self.total_records_found = self.browse_page.find_total_records()
+    commands.add_parser(CRAWL_COMMAND, help='scrape the whole list (the default)')
+    commands.add_parser(RESUME_COMMAND, help='scrape the whole list, jumping over the pages complete in the '
+                                             'previous run')
+    commands.add_parser(NEW_SINCE_COMMAND, help='scrape only the actors registered or updated since the last run')
+    commands.add_parser(RECONCILE_COMMAND, help='mark the scraped actors that are no longer listed as inactive')
 
-        self.scrape_pages()
+    worker = commands.add_parser(WORKER_COMMAND, help='scrape the work units leased from a coordinator')
+    worker.add_argument('coordinator_url', help='the URL of the coordinator')
 
+    commands.add_parser('retry-failed', help='re-scrape only the actors from the dead-letter queue')
 
-if __name__ == "__main__":
-    # You can pass wait time if you need to adjust it, currently default is 10s wait time.
-    web_driver_options = WebDriverOptions()
+    export = commands.add_parser('export', help='export the scraped data, no browser is needed')
+    export.add_argument('format', nargs='?', help='parquet or jsonl, parquet by default')
 
-    driver = webdriver.Chrome(options=web_driver_options.get_driver_options())
+    commands.add_parser('stats', help='show the state of the scraped data, no browser is needed')
 
-    browse_page = BrowsePage(driver, web_driver_options.get_web_driver_wait_time)
+    bench = commands.add_parser('bench', help='time the local stages of the scraper on the data file')
+    bench.add_argument('data_file', nargs='?', help='the data file, the one of the current role by default')
+    bench.add_argument('--repeat', type=int, help='how many times every stage is timed')
 
-    actor_page = ActorPage(driver, web_driver_options.get_web_driver_wait_time)
+    commands.add_parser('reextract', help='parse the archived actor pages again, no browser is needed')
 
-    test_formatter = TextFormatter()
+    report = commands.add_parser('report', help='analyse the event log of a crawl, no browser is needed')
+    report.add_argument('event_log', nargs='?', help='the event log, the one of the current role by default')
 
-    logger = Logger()
+    diff = commands.add_parser('diff', help='save the changes between two versions of the data')
+    diff.add_argument('old_data_file', help='the old version, e.g. a snapshot')
+    diff.add_argument('new_data_file', nargs='?', help='the new version, the current data file by default')
+
+    replay = commands.add_parser('replay', help='crawl a recording through a local replay server')
+    replay.add_argument('recording_directory', help='the directory of the recording')
+    replay.add_argument('latency', nargs='?', type=float, default=0, help='the delay of every response in seconds')
+
+    coordinator = commands.add_parser('coordinator', help='hand out work units to the workers')
+    coordinator.add_argument('port', nargs='?', type=int, help='the port to listen on, COORDINATOR_PORT by default')
+    coordinator.add_argument('--new-crawl', action='store_true',
+                             help='crawl the list again if the work units of the previous crawl are all done')
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+        Runs a command of the command line.
+
+        Parameters:
+        - argv: The arguments, the ones of the process by default.
+    """
+    parser = create_parser()
+
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config, overrides=args.option)
+    except ConfigError as e:
+        parser.error(str(e))
+
+    options = config.get_scraper_options()
+
+    command = args.command or CRAWL_COMMAND
+
+    if command == 'stats':
+        # Prints only, no messages or log file are needed
+        print_stats(options)
+
+        return
+
+    if command == 'bench':
+        print_benchmarks(args.data_file, args.repeat, options)
+
+        return
+
+    if command == 'report':
+        print_event_report(args.event_log, options)
+
+        return
+
+    text_formatter = TextFormatter()
 
     app_messages = AppMessages()
 
-    message_provider = MessageProvider(test_formatter, app_messages)
+    message_provider = MessageProvider(text_formatter, app_messages, options.VERBOSITY)
 
-    scraper = Scraper(driver, browse_page, actor_page, message_provider, logger)
+    if command == 'replay':
+        # The replay logs to the directory of its run
+        run_replay_crawl(args.recording_directory, args.latency, config, message_provider)
 
-    scraper.run()
+        return
+
+    logger = Logger()
+
+    if command == 'export':
+        export_scraped_data(args.format, options, message_provider, logger)
+    elif command == 'reextract':
+        reextract_archived_data(options, message_provider, logger)
+    elif command == 'diff':
+        diff_data_files(args.old_data_file, args.new_data_file, options, message_provider, logger)
+    elif command == 'coordinator':
+        run_coordinator(args.port, args.new_crawl, options, message_provider, logger)
+    elif command == 'retry-failed':
+        run_retry_failed(config, message_provider, logger)
+    else:
+        run_crawl(command, config, message_provider, logger, getattr(args, 'coordinator_url', None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from browser_profiles import BLOCK_IMAGES_PREFERENCE, get_browser_profile, LIGHTWEIGHT_PROFILE
+from utils import MessageProvider
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+# The Chrome switch of the window size in the browser profiles, e.g. --window-size=1280,800
+WINDOW_SIZE_ARGUMENT = '--window-size='
+
+
+class ScraperOptions:
+    # Available roles
+    MANUFACTURER_ROLE = 'manufacturer'
+    IMPORTER_ROLE = 'importer'
+
+    # Possible roles: manufacturer, importer
+    ROLE = 'importer'
+
+    ROLE_VALUE_ERROR_MSG = "Invalid role specified."
+    # Options: 10, 25, 50. Changes how many records are there in a table per page
+    ROWS_PER_PAGE = 10
+
+    # The time it takes to load a page (in seconds), used for calculating total estimated time for completion. Change
+    # as needed.
+    PAGE_LOAD_TIME = 2
+
+    # How much consecutive exceptions can be raised before the program stops for good.
+    MAX_CONSECUTIVE_EXCEPTIONS = 5
+
+    # The wait time between runs (in seconds). When the app raises an error, it will try to start the program again
+    # after that time if MAX_CONSECUTIVE_EXCEPTIONS has not reached the maximum
+    WAIT_TIME_BETWEEN_RUNS = 30
+
+    # Read all the actor IDs of a list page at once and move on without touching the rows if they are all scraped.
+    # Runs of pages that were complete in the previous run ({role}s_page_index.json) are jumped over through the
+    # paginator page links, as long as the total number of records has not changed.
+    SKIP_SCRAPED_PAGES = True
+
+    # The list column 'python main.py new-since' sorts by, newest first. It has to be the title of a sortable column
+    # as shown in the table header. Known actors whose date in this column is later than the one of the actor field
+    # with the same name are scraped again.
+    NEW_SINCE_SORT_COLUMN = 'Last update date'
+
+    # Rows per list page when 'python main.py reconcile' reads all the actor IDs of the list. Options: 10, 25, 50.
+    RECONCILE_ROWS_PER_PAGE = 50
+    # The largest fraction of the scraped actors the reconciliation marks inactive at once. More missing actors
+    # more likely mean the list did not load completely, and nothing is marked then.
+    MAX_INACTIVE_FRACTION = 0.05
+
+    # How much is shown in the console: MessageProvider.QUIET (errors and results), MessageProvider.NORMAL (progress
+    # bar without a line for every record) or MessageProvider.VERBOSE (a line for every record and page).
+    VERBOSITY = MessageProvider.NORMAL
+
+    # Resource monitor. How often (in seconds) the memory and CPU use of the scraper and its browsers is sampled.
+    RESOURCE_SAMPLE_INTERVAL = 10
+    # The memory (RSS, in MB) the scraper and its browsers can use before the browser is restarted. None for no limit.
+    MEMORY_LIMIT_MB = 3072
+    # The used memory and CPU of the whole system (in percent) above which the scraper pauses, or uses fewer browsers
+    # when retrying failed actors. None for no limit.
+    SYSTEM_MEMORY_LIMIT_PERCENT = 90
+    SYSTEM_CPU_LIMIT_PERCENT = 95
+    # How long (in seconds) the scraper pauses when the system is short on resources.
+    THROTTLE_PAUSE_TIME = 30
+
+    # Adapt the WebDriver wait time to the load times of the actor pages: WAIT_TIME_P95_FACTOR times their p95, kept
+    # between MIN_WAIT_TIME and MAX_WAIT_TIME (in seconds). WEBDRIVER_WAIT_TIME is used until enough pages are loaded.
+    ADAPTIVE_WAIT_TIME = True
+    MIN_WAIT_TIME = 5
+    MAX_WAIT_TIME = 60
+    WAIT_TIME_P95_FACTOR = 2
+
+    # The p95 load time (in seconds) of the actor pages above which fewer browsers are used when retrying failed
+    # actors. Below it, one more browser is used after every round of pages, up to RETRY_WORKERS.
+    LATENCY_TARGET = 5
+
+    # Capture the JSON the website loads from its API (through the Chrome performance log) and build the actor
+    # records from it instead of waiting for the actor page and parsing it. Falls back to the page when the JSON of
+    # the actor does not come or lacks a field, see api_capture.py. The captured responses are kept in
+    # {role}s_http_cache.sqlite3, while they are fresh the next runs and 'retry-failed' build the records of those
+    # actors from the cache without opening their pages.
+    CAPTURE_API_RESPONSES = False
+    # How long (in seconds) the captured responses are fresh and how much of them (in MB) is kept in the cache.
+    HTTP_CACHE_TTL = 7 * 24 * 3600
+    HTTP_CACHE_MAX_SIZE_MB = 512
+
+    # Record everything the website loads (pages, scripts, styles and API responses) to this directory, so the crawl
+    # can be replayed later without the website with 'python main.py replay <directory>'. None to not record.
+    RECORD_DIRECTORY = None
+
+    # Write the changes every run makes to the data file (inserted, updated and removed actors with the changed
+    # fields) to {role}s_changes/<run>.jsonl, so downstream systems can process only the changes.
+    CHANGEFEED = True
+
+    # How many previous versions of the data file are kept ({role}s_data.json.1, .2, ...). They are used to restore
+    # the data if the file gets corrupted.
+    DATA_SNAPSHOTS = 3
+
+    # Take the page source of every actor page once and parse it locally instead of reading every element through
+    # the WebDriver. Much faster, falls back to reading the elements if the page source can not be parsed. Off by
+    # default: the parser (pages/actor_parser.py) is only tested against a page built after the locators, check its
+    # records against the ones read through the WebDriver on a few live pages before turning it on.
+    PARSE_PAGE_SOURCE = False
+
+    # Save the page source of every actor page compressed to {role}s_pages/, so the data can be parsed again later
+    # without crawling the website again.
+    ARCHIVE_PAGE_SOURCE = False
+
+    # How many processes parse the archived pages with 'python main.py reextract'. None uses all the CPU cores.
+    REEXTRACT_WORKERS = None
+
+    # How many archived pages are sent to a parsing process at once.
+    REEXTRACT_CHUNK_SIZE = 64
+
+    # Keep the order of the archived actors in the re-extracted data. Without it the records are saved as soon as
+    # they are parsed, which is a bit faster.
+    REEXTRACT_ORDERED = True
+
+    # How many records 'python main.py export' converts and writes at once, one Parquet row group per batch. Larger
+    # batches compress better and use more memory.
+    EXPORT_BATCH_SIZE = 5000
+
+    # How many times a failed actor is retried with 'python main.py retry-failed' before it is left for the next full
+    # run.
+    MAX_RETRY_ATTEMPTS = 3
+
+    # The maximum number of browsers used in parallel when retrying failed actors. With the playwright browser (see
+    # WebDriverOptions.BROWSER) it is the number of browser contexts of a single browser process, which are much
+    # cheaper than browsers, so it can be set a lot higher.
+    RETRY_WORKERS = 4
+
+    # 'python main.py report': the length (in seconds) of the intervals the throughput is computed over, and how long
+    # (in seconds) a worker has to write no event to be reported as stalled.
+    REPORT_THROUGHPUT_INTERVAL = 300
+    REPORT_STALL_THRESHOLD = 120
+
+    # Distributed crawl ('python main.py coordinator' and 'python main.py worker <coordinator url>').
+    # The address the coordinator listens on. 127.0.0.1 only accepts workers of the same machine, use 0.0.0.0 together
+    # with COORDINATOR_TOKEN for workers on other machines.
+    COORDINATOR_HOST = '127.0.0.1'
+    # The port the coordinator listens on.
+    COORDINATOR_PORT = 8765
+    # A shared secret the workers send with every request, the coordinator refuses the requests without it. It is
+    # needed unless the coordinator listens on 127.0.0.1. Set the same value on the coordinator and the workers.
+    COORDINATOR_TOKEN = None
+    # How long (in seconds) a worker waits for an answer of the coordinator.
+    COORDINATOR_REQUEST_TIMEOUT = 60
+    # How many list pages are in one work unit leased to a worker.
+    PAGES_PER_WORK_UNIT = 20
+    # How long (in seconds) a worker owns a work unit without sending a heartbeat. After that the unit is given to
+    # another worker.
+    LEASE_TIME = 300
+    # How often (in seconds) a worker sends a heartbeat to the coordinator.
+    HEARTBEAT_INTERVAL = 60
+    # How often (in seconds) the coordinator writes the records returned by the workers to the data file.
+    FLUSH_INTERVAL = 30
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        """
+            Initializes the options. The class constants are the defaults, the given options override them for this
+            instance only (see config.py).
+
+            Args:
+                - options: Option values by name, e.g. {'ROWS_PER_PAGE': 50}, as validated by config.load_config.
+        """
+        for name, value in (options or {}).items():
+            setattr(self, name, value)
+
+
+class WebDriverOptions:
+    # The browser backend, see browsers.py. Possible browsers:
+    # - chrome: Selenium with Chrome, supports everything
+    # - firefox: Selenium with Firefox, without the API capture, the recording and the replay (they need Chrome)
+    # - playwright: Playwright with one browser process and many contexts, for 'python main.py retry-failed' only
+    BROWSER = 'chrome'
+
+    # The browser Playwright starts: chromium, firefox or webkit. Needs 'pip install playwright' and
+    # 'playwright install <browser>'.
+    PLAYWRIGHT_BROWSER_TYPE = 'chromium'
+
+    # Browser profile with a preset of options, see browser_profiles.py. Possible profiles:
+    # - legacy: the old '--headless' flag with a handful of generic options
+    # - lightweight: new headless mode, no background networking/sync, small caches, eager page load, fixed window
+    # - dense: lightweight + one renderer process, limited JS heap and no images, to run many sessions per host
+    BROWSER_PROFILE = LIGHTWEIGHT_PROFILE
+
+    # Additional options you can pass to configurate your webdriver, they are added on top of the profile.
+    # More info: https://github.com/GoogleChrome/chrome-launcher/blob/main/docs/chrome-flags-for-tools.md
+    WEBDRIVER_OPTIONS = []
+
+    # Depends on the loading time of your page (in seconds). Adjust as needed or pass a value as argument when you
+    # initialize the class.
+    WEBDRIVER_WAIT_TIME = 10
+
+    # How often (in seconds) the pages check for an element they wait for. 0.5 is the default of Selenium, a shorter
+    # interval notices loaded elements sooner at the cost of more WebDriver calls.
+    WEBDRIVER_POLL_FREQUENCY = 0.5
+
+    def __init__(self, wait_time: Optional[int] = None, profile: Optional[str] = None,
+                 capture_api_responses: bool = False, arguments: Optional[List[str]] = None,
+                 options: Optional[Dict[str, Any]] = None):
+        # Options of this instance, see ScraperOptions.__init__
+        for name, value in (options or {}).items():
+            setattr(self, name, value)
+
+        self.web_driver_wait_time = wait_time or self.WEBDRIVER_WAIT_TIME
+        self.profile = get_browser_profile(profile or self.BROWSER_PROFILE)
+        # Arguments of this instance only, e.g. the ones of a replay server
+        self.arguments = arguments or []
+        # Writes the network events to the performance log, so ApiCapture can read the API responses
+        self.capture_api_responses = capture_api_responses
+
+    @property
+    def get_web_driver_wait_time(self):
+        return self.web_driver_wait_time
+
+    def get_driver_options(self) -> 'webdriver.ChromeOptions':
+        # Imported here, so the commands that do not start a browser do not load Selenium
+        from selenium import webdriver
+
+        from api_capture import CAPTURE_CAPABILITIES
+
+        options = webdriver.ChromeOptions()
+
+        for option in [*self.profile['arguments'], *self.WEBDRIVER_OPTIONS, *self.arguments]:
+            options.add_argument(option)
+
+        options.page_load_strategy = self.profile['page_load_strategy']
+
+        if self.profile['preferences']:
+            options.add_experimental_option('prefs', self.profile['preferences'])
+
+        if self.capture_api_responses:
+            for name, value in CAPTURE_CAPABILITIES.items():
+                options.set_capability(name, value)
+
+        return options
+
+    def get_firefox_options(self) -> 'webdriver.FirefoxOptions':
+        """
+            Returns the options of Firefox. The profiles are made of Chrome switches, only their headless mode, window
+            size, page load strategy and blocked images are carried over.
+        """
+        from selenium import webdriver
+
+        options = webdriver.FirefoxOptions()
+
+        if self.is_headless():
+            options.add_argument('-headless')
+
+        window_size = self.get_window_size()
+
+        if window_size is not None:
+            options.add_argument(f'--width={window_size[0]}')
+            options.add_argument(f'--height={window_size[1]}')
+
+        # Firefox switches only, the profile switches are for Chrome
+        for option in self.WEBDRIVER_OPTIONS:
+            options.add_argument(option)
+
+        options.page_load_strategy = self.profile['page_load_strategy']
+
+        if self.blocks_images():
+            # Same as the image preference of Chrome: 2 blocks all images
+            options.set_preference('permissions.default.image', 2)
+
+        return options
+
+    def blocks_images(self) -> bool:
+        return self.profile['preferences'].get(BLOCK_IMAGES_PREFERENCE) == 2
+
+    def is_headless(self) -> bool:
+        return any(argument.lstrip('-').startswith('headless') for argument in self.profile['arguments'])
+
+    def get_window_size(self) -> Optional[Tuple[int, int]]:
+        """
+            Returns the window size of the profile as (width, height), None if the profile does not set it.
+        """
+        for argument in self.profile['arguments']:
+            if argument.startswith(WINDOW_SIZE_ARGUMENT):
+                width, height = argument[len(WINDOW_SIZE_ARGUMENT):].split(',')
+
+                return int(width), int(height)
+
+        return None
@@ -0,0 +1,116 @@
+import hashlib
+from typing import Iterable
+
+from data_handling import load_data, save_data
+
+
+class PageIndex:
+    """
+        Remembers a fingerprint (a hash of the actor IDs) of every list page and whether all of its actors were
+        scraped.
+
+        On the next run, as long as the total number of records and the number of rows per page have not changed, a
+        run of pages that were complete in the previous run can be jumped over instead of being opened one by one. The
+        fingerprint of the page where the scraper lands tells if the list is still the same.
+    """
+
+    def __init__(self, filename: str):
+        """
+            Initializes the PageIndex and loads the index of the previous run.
+
+            Args:
+                - filename: The name of the JSON file where the index is stored.
+        """
+        self.filename = filename
+
+        data = load_data(filename)
+
+        self.previous_total_records = data.get('total_records')
+        self.total_records = self.previous_total_records
+        self.previous_rows_per_page = data.get('rows_per_page')
+        self.rows_per_page = self.previous_rows_per_page
+        self.pages = data.get('pages', {})
+
+    @staticmethod
+    def get_fingerprint(actor_ids: Iterable[str]) -> str:
+        """
+            Returns the fingerprint of a list page.
+
+            Args:
+                - actor_ids: The actor IDs on the page, in order.
+
+            Returns:
+                - The fingerprint of the page.
+        """
+        return hashlib.sha1('\n'.join(actor_ids).encode('utf-8')).hexdigest()
+
+    def matches(self, page: int, fingerprint: str) -> bool:
+        """
+            Checks that a page looks the same as when it was last visited.
+
+            Args:
+                - page: The number of the page.
+                - fingerprint: The current fingerprint of the page.
+
+            Returns:
+                - False if the page was visited before with different actors, True otherwise.
+        """
+        entry = self.pages.get(str(page))
+
+        return entry is None or entry['fingerprint'] == fingerprint
+
+    def update(self, page: int, fingerprint: str, complete: bool) -> None:
+        """
+            Records the current state of a page and saves the index.
+
+            The pages of the previous run are discarded first if the list is not laid out the same way anymore.
+
+            Args:
+                - page: The number of the page.
+                - fingerprint: The fingerprint of the page.
+                - complete: Whether all the actors on the page are scraped.
+        """
+        if not self.has_same_layout():
+            # The pages of the previous run hold other actors now
+            self.pages = {}
+            self.previous_total_records = self.total_records
+            self.previous_rows_per_page = self.rows_per_page
+
+        entry = {'fingerprint': fingerprint, 'complete': complete}
+
+        if self.pages.get(str(page)) == entry:
+            return
+
+        self.pages[str(page)] = entry
+
+        save_data({'total_records': self.total_records, 'rows_per_page': self.rows_per_page, 'pages': self.pages},
+                  self.filename)
+
+    def find_skip_target(self, page: int) -> int:
+        """
+            Finds the last page of the run of complete pages that starts at the given page.
+
+            Nothing is skipped if the total number of records or the number of rows per page changed since the
+            previous run, because then the actors have moved between the pages.
+
+            Args:
+                - page: The number of the current page.
+
+            Returns:
+                - The number of the page to jump to, the given page if nothing can be skipped.
+        """
+        if not self.has_same_layout() or not self.is_complete(page):
+            return page
+
+        target = page
+
+        while self.is_complete(target + 1):
+            target += 1
+
+        return target
+
+    def has_same_layout(self) -> bool:
+        return (self.total_records, self.rows_per_page) == (self.previous_total_records, self.previous_rows_per_page)
+
+    def is_complete(self, page: int) -> bool:
+        return self.pages.get(str(page), {}).get('complete', False)
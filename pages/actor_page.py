@@ -1,9 +1,11 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import POLL_FREQUENCY
 
+from pages.actor_parser import parse_actor_html, parse_dl_texts, parse_last_updated
+from pages.locators import ACTOR_DL_ELEMENTS, ACTOR_INFORMATION, ACTOR_INFORMATION_CONTAINER, INFORMATION_LAST_UPDATED
 from pages.utils.page_helper import PageHelper
 
 
@@ -15,25 +17,32 @@ class ActorPage(PageHelper):
         the extraction of detailed information about actors from web pages.
     """
 
-    def __init__(self, driver: WebDriver, wait_time: int):
+    def __init__(self, driver: WebDriver, wait_time: int, poll_frequency: float = POLL_FREQUENCY):
         """
             Initializes the ActorPage instance.
 
             Args:
                - driver: WebDriver instance for browser automation.
                - wait_time: The time to wait for elements to load.
+               - poll_frequency: How often (in seconds) a wait checks for an element.
         """
-        super().__init__(driver, wait_time)
+        super().__init__(driver, wait_time, poll_frequency)
 
     def wait_for_actor_information_to_load(self):
         """
             Waits for actor information to load on the page.
+
+            A new actor page was opened, so the elements cached for the previous one are dropped.
         """
-        actor_information_location = (By.ID, 'actor_information')
+        self.invalidate_cache()
 
-        # self.wait_for_presence(actor_information_location)
+        return self.wait_for_presence(ACTOR_INFORMATION)
 
-        return self.wait_for_presence(actor_information_location)
+    def is_actor_information_loaded(self) -> bool:
+        """
+            Checks without waiting whether the actor information is shown on the page.
+        """
+        return len(self.driver.find_elements(*ACTOR_INFORMATION)) > 0
 
     def find_actor_information_last_updated(self) -> Dict[str, str]:
         """
@@ -42,19 +51,9 @@ class ActorPage(PageHelper):
             Returns:
                 - A dictionary containing the last updated information.
         """
-        information_last_updated_location = (By.XPATH,
-                                             '/html/body/app-root/eui-block-content/div/ecl-app/div/div/div/app-eo'
-                                             '-detail/eui-block-content/div/div/div[2]/div[2]/div['
-                                             '1]/div/mat-accordion/mat-expansion-panel/div/div/div['
-                                             '1]/app-history-nav/ul/li[2]')
-
-        information_last_updated = self.wait_for_presence(information_last_updated_location)
-
-        information_last_updated_text_split = self.extract_text(information_last_updated).split(': ')
-
-        key, value = information_last_updated_text_split[0], information_last_updated_text_split[1]
+        information_last_updated = self.wait_for_presence(INFORMATION_LAST_UPDATED)
 
-        return {key: value}
+        return parse_last_updated(self.extract_text(information_last_updated))
 
     def find_actor_dl_elements(self, actor_information_container: WebElement) -> List[WebElement]:
         """
@@ -63,11 +62,9 @@ class ActorPage(PageHelper):
             Args:
                 - actor_information_container: The container containing actor information.
         """
-        actor_dl_elements_location = (By.TAG_NAME, 'dl')
+        self.wait_for_presence(ACTOR_DL_ELEMENTS)
 
-        self.wait_for_presence(actor_dl_elements_location)
-
-        actor_dl_elements = self.find_elements(actor_information_container, actor_dl_elements_location)
+        actor_dl_elements = self.find_elements(actor_information_container, ACTOR_DL_ELEMENTS)
 
         return actor_dl_elements
 
@@ -75,12 +72,7 @@ class ActorPage(PageHelper):
         """
             Finds the container containing actor information on the page.
         """
-        actor_information_location = (By.XPATH,
-                                      '/html/body/app-root/eui-block-content/div/ecl-app/div/div/div/app-eo-detail'
-                                      '/eui-block-content/div/div/div[2]/div[2]/div['
-                                      '1]/div/mat-accordion/mat-expansion-panel/div/div/div[2]')
-
-        return self.wait_for_presence(actor_information_location)
+        return self.find_cached(ACTOR_INFORMATION_CONTAINER)
 
     def extract_actor_information(self) -> Dict[str, str]:
         """
@@ -101,6 +93,27 @@ class ActorPage(PageHelper):
 
         return actor_information_text_parsed
 
+    def extract_actor_information_from_source(self) -> Tuple[Dict[str, str], str]:
+        """
+            Extracts actor information from the page source.
+
+            Waits for the actor information, takes the page source once and parses it locally, which is much faster
+            than reading every element through the WebDriver. Falls back to extract_actor_information if the page
+            source can not be parsed.
+
+            Returns:
+                - A tuple of the dictionary containing actor information and the page source.
+        """
+        self.find_cached(ACTOR_INFORMATION_CONTAINER)
+        self.wait_for_presence(INFORMATION_LAST_UPDATED)
+
+        page_source = self.driver.page_source
+
+        try:
+            return parse_actor_html(page_source, self.driver.current_url), page_source
+        except ValueError:
+            return self.extract_actor_information(), page_source
+
     @staticmethod
     def parse_text(dl_elements: List[WebElement]) -> Dict[str, str]:
         """
@@ -112,19 +125,4 @@ class ActorPage(PageHelper):
             Returns:
                 - A dictionary containing parsed text.
         """
-        elements_to_skip = ['Actor identification', 'Actor address', 'Actor contact details']
-
-        to_dict = {}
-
-        for dl in dl_elements:
-            dl_split = dl.text.split('\n')
-
-            if len(dl_split) <= 1:
-                dl_el = dl_split[0].strip()
-
-                if dl_el not in elements_to_skip:
-                    to_dict[dl_el] = '-'
-            else:
-                to_dict[dl_split[0].strip()] = dl_split[1].strip()
-
-        return to_dict
+        return parse_dl_texts(dl.text for dl in dl_elements)
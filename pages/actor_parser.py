@@ -0,0 +1,103 @@
+from typing import Dict, Iterable
+
+import lxml.html
+
+from pages.locators import ACTOR_INFORMATION_CONTAINER_XPATH, INFORMATION_LAST_UPDATED_XPATH
+
+# Section titles that are rendered as dl elements without a value
+ELEMENTS_TO_SKIP = ['Actor identification', 'Actor address', 'Actor contact details']
+
+
+def parse_dl_texts(dl_texts: Iterable[str]) -> Dict[str, str]:
+    """
+        Parses the text of dl elements and constructs a dictionary.
+
+        Every text has the field name on the first line and its value on the second one. Fields without a value
+        get '-', section titles are skipped.
+
+        Args:
+            - dl_texts: The text of each dl element.
+
+        Returns:
+            - A dictionary containing parsed text.
+    """
+    to_dict = {}
+
+    for dl_text in dl_texts:
+        dl_split = dl_text.split('\n')
+
+        if len(dl_split) <= 1:
+            dl_el = dl_split[0].strip()
+
+            if dl_el not in ELEMENTS_TO_SKIP:
+                to_dict[dl_el] = '-'
+        else:
+            to_dict[dl_split[0].strip()] = dl_split[1].strip()
+
+    return to_dict
+
+
+def parse_last_updated(text: str) -> Dict[str, str]:
+    """
+        Parses the text of the history item, e.g. 'Last update date: 2021-02-11'.
+
+        Args:
+            - text: The text of the history item.
+
+        Returns:
+            - A dictionary containing the last updated information.
+    """
+    key, value = text.split(': ', 1)
+
+    return {key.strip(): value.strip()}
+
+
+def get_element_text(element: lxml.html.HtmlElement) -> str:
+    """
+        Returns the text of an element the way the browser renders it: every child on its own line, with whitespace
+        collapsed.
+
+        Args:
+            - element: The element.
+
+        Returns:
+            - The text of the element.
+    """
+    children = list(element) or [element]
+
+    lines = [' '.join(child.text_content().split()) for child in children]
+
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_actor_html(html: str, url: str) -> Dict[str, str]:
+    """
+        Extracts actor information from the page source of an actor page.
+
+        Produces the same dictionary as ActorPage.extract_actor_information, without any WebDriver calls.
+
+        Args:
+            - html: The page source of the actor page.
+            - url: The URL of the actor page.
+
+        Returns:
+            - A dictionary containing actor information.
+
+        Raises:
+            - ValueError if the actor information is not in the page source.
+    """
+    tree = lxml.html.fromstring(html)
+
+    containers = tree.xpath(ACTOR_INFORMATION_CONTAINER_XPATH)
+    last_updated = tree.xpath(INFORMATION_LAST_UPDATED_XPATH)
+
+    if not containers or not last_updated:
+        raise ValueError(f'Actor information was not found in the page source of {url}.')
+
+    actor_information = parse_dl_texts(get_element_text(dl) for dl in containers[0].iter('dl'))
+
+    actor_information.update(parse_last_updated(get_element_text(last_updated[0])))
+
+    actor_information['Actor URL'] = url
+
+    return actor_information
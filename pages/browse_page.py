@@ -1,10 +1,16 @@
-from typing import List
+from typing import Dict, List, Tuple
 
-from selenium.webdriver.common.by import By
+from selenium.common import StaleElementReferenceException
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import POLL_FREQUENCY
 
+from pages.locators import ACTOR_ID_CELLS, BODY_ROWS, COLUMN_CELLS, COLUMN_HEADERS, LAST_PAGE_BUTTON, \
+    NEXT_PAGE_BUTTON, PAGE_LINKS, PAGINATOR, PREVIOUS_PAGE_BUTTON, RESULTS_TABLE, RESULTS_TABLE_BODY_ROW, \
+    ROW_ACTION_BUTTON, ROW_ACTOR_ID, SORTABLE_COLUMN_HEADERS, TABLE_DROPDOWN_TRIGGER, TABLE_ROWS, TABLE_ROWS_OPTION, \
+    TOTAL_RECORDS
 from pages.utils.page_helper import PageHelper
+from records import parse_display_date
 
 
 class BrowsePage(PageHelper):
@@ -16,32 +22,25 @@ class BrowsePage(PageHelper):
 
     """
 
-    def __init__(self, driver: WebDriver, wait_time: int):
+    def __init__(self, driver: WebDriver, wait_time: int, poll_frequency: float = POLL_FREQUENCY):
         """
             Initializes a BrowsePage object.
 
             Args:
                - driver: WebDriver instance for browser automation.
                - wait_time: The maximum time to wait for elements to appear on the page, in seconds.
+               - poll_frequency: How often (in seconds) a wait checks for an element.
         """
-        super().__init__(driver, wait_time)
+        super().__init__(driver, wait_time, poll_frequency)
 
     def wait_for_table_to_load(self) -> None:
         """
             Waits for the search results table to be loaded on the page.
         """
-        table_location = (
-            By.XPATH,
-            '/html/body/app-root/eui-block-content/div/ecl-app/div/div/div/app-search-eo/eui-block-content/div')
-
-        self.wait_for_presence(table_location)
+        self.find_cached(RESULTS_TABLE)
 
     def find_total_records(self) -> int:
-        records_location = (By.CLASS_NAME, 'nb-records')
-
-        self.wait_for_presence(records_location)
-
-        records_el = self.find_element(self.driver, records_location)
+        records_el = self.wait_for_presence(TOTAL_RECORDS)
 
         records_el_text = self.extract_text(records_el)
 
@@ -58,14 +57,47 @@ class BrowsePage(PageHelper):
             Returns:
                 - A list of WebElements representing the rows of the table.
         """
-        table_rows_location = (By.TAG_NAME, 'tr')
+        self.wait_for_presence(RESULTS_TABLE_BODY_ROW)
 
-        self.wait_for_presence(table_rows_location)
+        rows = self.find_elements(self.find_cached(RESULTS_TABLE), TABLE_ROWS)
 
-        rows = self.find_elements(self.driver, table_rows_location)
+        return rows
+
+    def find_body_rows(self) -> List[WebElement]:
+        """
+            Finds and returns the rows of the search results table body, cached until the page changes.
+
+            Returns:
+                - A list of WebElements representing the rows of the table body.
+        """
+        rows = self.cache.get(BODY_ROWS)
+
+        if rows is None:
+            self.wait_for_presence(RESULTS_TABLE_BODY_ROW)
+
+            rows = self.cache[BODY_ROWS] = self.find_elements(self.find_cached(RESULTS_TABLE), BODY_ROWS)
 
         return rows
 
+    def find_row_element(self, row_num: int, location: Tuple[str, str]) -> WebElement:
+        """
+            Finds and returns an element inside a specific row of the search results table body.
+
+            Args:
+                - row_num: The row number, starting from 1.
+                - location: The location of the element relative to the row.
+
+            Returns:
+                - The located WebElement.
+        """
+        try:
+            return self.find_element(self.find_body_rows()[row_num - 1], location)
+        except StaleElementReferenceException:
+            # The table was rendered again, e.g. after going back from an actor page
+            self.invalidate_cache()
+
+            return self.find_element(self.find_body_rows()[row_num - 1], location)
+
     def find_action_button(self, row_num: int) -> WebElement:
         """
             Finds and returns the action button for a specific row of the search results table.
@@ -76,11 +108,7 @@ class BrowsePage(PageHelper):
             Returns:
                 - The WebElement representing the action button for the specified row.
         """
-        action_button_location = (By.XPATH,
-                                  f'/html/body/app-root/eui-block-content/div/ecl-app/div/div/div/app-search-eo/eui'
-                                  f'-block-content/div/div/p-table/div/div/table/tbody/tr[{row_num + 1}]/td[8]/button')
-
-        action_button = self.wait_for_presence(action_button_location)
+        action_button = self.find_row_element(row_num + 1, ROW_ACTION_BUTTON)
 
         return action_button
 
@@ -91,11 +119,7 @@ class BrowsePage(PageHelper):
             Returns:
                     - The WebElement representing the next page button.
         """
-        next_page_button_location = (By.XPATH,
-                                     "/html/body/app-root/eui-block-content/div/ecl-app/div/div/div/app"
-                                     "-search-eo/eui-block-content/div/div/p-table/div/p-paginator/div/button[3]")
-
-        next_page_button = self.wait_for_presence(next_page_button_location)
+        next_page_button = self.find_element(self.find_cached(PAGINATOR), NEXT_PAGE_BUTTON)
 
         return next_page_button
 
@@ -106,11 +130,7 @@ class BrowsePage(PageHelper):
             Returns:
                 - The WebElement representing the previous page button.
         """
-        previous_page_button_location = (By.XPATH,
-                                         '/html/body/app-root/eui-block-content/div/ecl-app/div/div/div/app-search-eo'
-                                         '/eui-block-content/div/div/p-table/div/p-paginator/div/button[2]')
-
-        previous_page_button = self.wait_for_presence(previous_page_button_location)
+        previous_page_button = self.find_element(self.find_cached(PAGINATOR), PREVIOUS_PAGE_BUTTON)
 
         return previous_page_button
 
@@ -133,14 +153,21 @@ class BrowsePage(PageHelper):
             Returns:
                 - The WebElement representing the last page button.
         """
-        last_page_button_location = (By.XPATH,
-                                     '/html/body/app-root/eui-block-content/div/ecl-app/div/div/div/app-search-eo/eui'
-                                     '-block-content/div/div/p-table/div/p-paginator/div/button[4]')
-
-        last_page_button = self.wait_for_presence(last_page_button_location)
+        last_page_button = self.find_element(self.find_cached(PAGINATOR), LAST_PAGE_BUTTON)
 
         return last_page_button
 
+    def find_page_links(self) -> Dict[int, WebElement]:
+        """
+            Finds and returns the numbered page links shown in the paginator.
+
+            Returns:
+                - A dictionary of the page link WebElements by page number.
+        """
+        page_links = self.find_elements(self.find_cached(PAGINATOR), PAGE_LINKS)
+
+        return {int(self.extract_text(page_link)): page_link for page_link in page_links}
+
     def find_table_dropdown_trigger(self) -> WebElement:
         """
             Finds and returns the dropdown trigger element for selecting rows per page.
@@ -148,9 +175,7 @@ class BrowsePage(PageHelper):
             Returns:
                 - The WebElement representing the dropdown trigger.
         """
-        table_dropdown_trigger_location = (By.CLASS_NAME, 'p-dropdown-trigger')
-
-        table_dropdown_trigger = self.wait_for_presence(table_dropdown_trigger_location)
+        table_dropdown_trigger = self.wait_for_presence(TABLE_DROPDOWN_TRIGGER)
 
         return table_dropdown_trigger
 
@@ -161,11 +186,9 @@ class BrowsePage(PageHelper):
             Returns:
                 - A list of WebElements representing the available options.
         """
-        options_location = (By.TAG_NAME, 'p-dropdownitem')
+        self.wait_for_presence(TABLE_ROWS_OPTION)
 
-        self.wait_for_presence(options_location)
-
-        options = self.find_elements(self.driver, options_location)
+        options = self.find_elements(self.driver, TABLE_ROWS_OPTION)
 
         return options
 
@@ -187,6 +210,83 @@ class BrowsePage(PageHelper):
                 option.click()
                 break
 
+        # The table is rendered again with the new number of rows
+        self.invalidate_cache()
+
+    def find_column_header(self, title: str) -> WebElement:
+        """
+            Finds and returns the header of a sortable column of the search results table.
+
+            Args:
+                - title: The title of the column, as shown in the header.
+
+            Returns:
+                - The WebElement representing the column header.
+
+            Raises:
+                - ValueError if the table has no sortable column with the given title.
+        """
+        self.wait_for_table_to_load()
+
+        headers = self.find_elements(self.find_cached(RESULTS_TABLE), SORTABLE_COLUMN_HEADERS)
+
+        for header in headers:
+            if self.extract_text(header).strip() == title:
+                return header
+
+        titles = ', '.join(self.extract_text(header).strip() for header in headers)
+
+        raise ValueError(f'The table has no sortable column "{title}". Sortable columns are: {titles}')
+
+    def sort_table(self, title: str, descending: bool = True) -> None:
+        """
+            Sorts the search results table by a column. The table goes back to the first page.
+
+            Args:
+                - title: The title of the column, as shown in the header.
+                - descending: Sort from the highest value to the lowest one.
+        """
+        order = 'descending' if descending else 'ascending'
+
+        # Clicking on the header switches between ascending and descending order, and possibly no order
+        for _ in range(3):
+            header = self.find_column_header(title)
+
+            if header.get_attribute('aria-sort') == order:
+                # The header shows the order right away, the rows only once the website answered
+                self.wait_for_sorted_rows(title, descending)
+
+                return
+
+            header.click()
+
+            self.invalidate_cache()
+
+        raise ValueError(f'The table could not be sorted by "{title}" in {order} order.')
+
+    def wait_for_sorted_rows(self, title: str, descending: bool) -> None:
+        """
+            Waits until the rows of the table are in the order of a column, after the table was sorted by it.
+
+            Args:
+                - title: The title of the column, as shown in the header.
+                - descending: The rows are sorted from the highest value to the lowest one.
+
+            Raises:
+                - TimeoutException if the rows are not in that order after the wait time.
+        """
+        def is_sorted(_) -> bool:
+            values = self.find_column_values(title)
+
+            # Dates are compared as dates, the website may not show them in ISO format
+            dates = [parse_display_date(value) for value in values]
+
+            keys = values if None in dates else dates
+
+            return all(first >= second if descending else first <= second for first, second in zip(keys, keys[1:]))
+
+        self.wait.until(is_sorted, f'The table is not sorted by "{title}" after {self.wait_time} seconds.')
+
     def find_actor_id(self, row_num: int) -> str:
         """
             Finds and returns the actor ID for a specific row of the search results table.
@@ -197,14 +297,86 @@ class BrowsePage(PageHelper):
             Returns:
                 - The actor ID as a string.
         """
-        actor_id_location = (By.XPATH,
-                             f'/html/body/app-root/eui-block-content/div/ecl-app/div/div/div/app-search-eo/eui-block'
-                             f'-content/div/div/p-table/div/div/table/tbody/tr[{row_num}]/td[1]')
-
-        actor_id = self.wait_for_presence(actor_id_location)
+        actor_id = self.find_row_element(row_num, ROW_ACTOR_ID)
 
         return self.extract_text(actor_id)
 
+    def find_actor_ids(self) -> List[str]:
+        """
+            Finds and returns the actor IDs of all the rows of the search results table.
+
+            The IDs are read in a single script call instead of one WebDriver round trip per row.
+
+            Returns:
+                - A list of actor IDs, in the order of the rows.
+        """
+        self.wait_for_presence(RESULTS_TABLE_BODY_ROW)
+
+        return self.read_actor_ids()
+
+    def read_actor_ids(self) -> List[str]:
+        """
+            Reads the actor IDs of the rows shown right now, without waiting for the table.
+        """
+        return self.read_cells(ACTOR_ID_CELLS)
+
+    def read_cells(self, location: Tuple[str, str]) -> List[str]:
+        """
+            Reads the text of the cells at the given CSS location in a single script call.
+        """
+        return self.driver.execute_script(
+            'return Array.from(document.querySelectorAll(arguments[0]), cell => cell.innerText.trim());', location[1])
+
+    def find_column_values(self, title: str) -> List[str]:
+        """
+            Finds and returns the values of a column for all the rows of the search results table.
+
+            Args:
+                - title: The title of the column, as shown in the header.
+
+            Returns:
+                - A list of the values, in the order of the rows.
+
+            Raises:
+                - ValueError if the table has no column with the given title.
+        """
+        self.wait_for_presence(RESULTS_TABLE_BODY_ROW)
+
+        titles = [self.extract_text(header).strip()
+                  for header in self.find_elements(self.find_cached(RESULTS_TABLE), COLUMN_HEADERS)]
+
+        if title not in titles:
+            raise ValueError(f'The table has no column "{title}". Columns are: {", ".join(titles)}')
+
+        column = titles.index(title) + 1
+
+        return self.read_cells((COLUMN_CELLS[0], COLUMN_CELLS[1].format(column=column)))
+
+    def wait_for_page_change(self, previous_actor_ids: List[str]) -> List[str]:
+        """
+            Waits until the table shows other actors than before, after going to another page or sorting the table.
+
+            The table element stays the same and its rows are rendered again only once the website answered, so
+            without waiting the actors of the previous page would be read again as the ones of the new page.
+
+            Args:
+                - previous_actor_ids: The actor IDs shown before the table was changed.
+
+            Returns:
+                - The actor IDs shown now.
+
+            Raises:
+                - TimeoutException if the table still shows the same actors after the wait time.
+        """
+        self.invalidate_cache()
+
+        def new_actor_ids(_) -> List[str]:
+            actor_ids = self.read_actor_ids()
+
+            return actor_ids if actor_ids and actor_ids != previous_actor_ids else []
+
+        return self.wait.until(new_actor_ids, f'The table still shows the same actors after {self.wait_time} seconds.')
+
     @staticmethod
     def is_button_disabled(button: WebElement) -> bool:
         """
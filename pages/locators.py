@@ -0,0 +1,54 @@
+# Central registry of the locations of the elements the scraper uses.
+#
+# Browser locations are short CSS selectors in the (strategy, value) form accepted by find_element. The ones marked as
+# relative are searched inside a cached container (see PageHelper.find_cached) instead of the whole document. The XPath
+# expressions at the end are used by lxml to parse a page source.
+
+# The same values as selenium.webdriver.common.by.By, so this module can be used without importing Selenium
+CSS_SELECTOR = 'css selector'
+CLASS_NAME = 'class name'
+TAG_NAME = 'tag name'
+ID = 'id'
+XPATH = 'xpath'
+
+# Search results page
+RESULTS_TABLE = (CSS_SELECTOR, 'app-search-eo p-table')
+RESULTS_TABLE_BODY_ROW = (CSS_SELECTOR, 'app-search-eo p-table tbody > tr')
+TOTAL_RECORDS = (CLASS_NAME, 'nb-records')
+TABLE_DROPDOWN_TRIGGER = (CLASS_NAME, 'p-dropdown-trigger')
+TABLE_ROWS_OPTION = (TAG_NAME, 'p-dropdownitem')
+PAGINATOR = (CSS_SELECTOR, 'app-search-eo p-paginator')
+# The first cell of every body row, read in one script call (see BrowsePage.find_actor_ids)
+ACTOR_ID_CELLS = (CSS_SELECTOR, 'app-search-eo p-table tbody > tr > td:nth-child(1)')
+# The cells of a column of every body row, formatted with the position of the column starting from 1
+COLUMN_CELLS = (CSS_SELECTOR, 'app-search-eo p-table tbody > tr > td:nth-child({column})')
+
+# Relative to RESULTS_TABLE
+TABLE_ROWS = (TAG_NAME, 'tr')
+SORTABLE_COLUMN_HEADERS = (CSS_SELECTOR, 'thead th.p-sortable-column')
+COLUMN_HEADERS = (CSS_SELECTOR, 'thead th')
+# Relative to the table body
+BODY_ROWS = (CSS_SELECTOR, 'tbody > tr')
+# Relative to a table row
+ROW_ACTOR_ID = (CSS_SELECTOR, 'td:nth-child(1)')
+ROW_ACTION_BUTTON = (CSS_SELECTOR, 'td:nth-child(8) button')
+# Relative to PAGINATOR
+PREVIOUS_PAGE_BUTTON = (CSS_SELECTOR, '.p-paginator-prev')
+NEXT_PAGE_BUTTON = (CSS_SELECTOR, '.p-paginator-next')
+LAST_PAGE_BUTTON = (CSS_SELECTOR, '.p-paginator-last')
+PAGE_LINKS = (CSS_SELECTOR, '.p-paginator-page')
+
+# Actor page
+ACTOR_INFORMATION = (ID, 'actor_information')
+ACTOR_INFORMATION_CONTAINER = (CSS_SELECTOR, 'app-eo-detail mat-expansion-panel > div > div > div:nth-child(2)')
+INFORMATION_LAST_UPDATED = (CSS_SELECTOR, 'app-eo-detail app-history-nav li:nth-child(2)')
+# Relative to ACTOR_INFORMATION_CONTAINER
+ACTOR_DL_ELEMENTS = (TAG_NAME, 'dl')
+
+# Cookies
+ACCEPT_COOKIES = (CSS_SELECTOR, "a[href='#accept']")
+COOKIES_PROMPT_CLOSE_BUTTON = (CLASS_NAME, 'wt-ecl-message__close')
+
+# Page source (lxml) equivalents of the actor page locations
+ACTOR_INFORMATION_CONTAINER_XPATH = '(//app-eo-detail//mat-expansion-panel/div/div/div[2])[1]'
+INFORMATION_LAST_UPDATED_XPATH = '(//app-eo-detail//app-history-nav/ul/li[2])[1]'
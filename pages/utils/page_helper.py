@@ -1,12 +1,16 @@
 from typing import Tuple, List, Union
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 
 from selenium.common import TimeoutException
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.support.wait import POLL_FREQUENCY, WebDriverWait
+
+from pages.locators import ACCEPT_COOKIES, COOKIES_PROMPT_CLOSE_BUTTON
+
+# The address of the EUDAMED website
+EUDAMED_URL = 'https://ec.europa.eu/tools/eudamed/'
 
 
 class PageHelper:
@@ -14,16 +18,54 @@ class PageHelper:
         A utility class providing helper methods for interacting with web pages.
     """
 
-    def __init__(self, driver: WebDriver, wait_time: int):
+    def __init__(self, driver: WebDriver, wait_time: int, poll_frequency: float = POLL_FREQUENCY):
         """
             Initializes the PageHelper with a WebDriver instance and wait time.
 
             Args:
                 - driver: WebDriver instance for browser automation.
                 - wait_time: The maximum time to wait for an element to appear on the page, in seconds.
+                - poll_frequency: How often (in seconds) a wait checks for the element.
+        """
+        self.driver = driver
+        self.wait_time = wait_time
+        self.poll_frequency = poll_frequency
+        self.wait = WebDriverWait(self.driver, wait_time, poll_frequency)
+        self.base_url = EUDAMED_URL
+        # Elements found with find_cached, they are valid until the page changes
+        self.cache = {}
+
+    def set_driver(self, driver: WebDriver) -> None:
+        """
+            Switches to another WebDriver instance, e.g. after the browser was restarted.
+
+            Args:
+                - driver: WebDriver instance for browser automation.
         """
         self.driver = driver
-        self.wait = WebDriverWait(self.driver, wait_time)
+        self.wait = WebDriverWait(self.driver, self.wait_time, self.poll_frequency)
+
+        self.invalidate_cache()
+
+    def set_wait_time(self, wait_time: float) -> None:
+        """
+            Changes the maximum time to wait for elements, e.g. to follow the load times of the website.
+
+            Args:
+                - wait_time: The maximum time to wait for an element to appear on the page, in seconds.
+        """
+        if wait_time != self.wait_time:
+            self.wait_time = wait_time
+            self.wait = WebDriverWait(self.driver, wait_time, self.poll_frequency)
+
+    def set_base_url(self, base_url: str) -> None:
+        """
+            Changes the address of the website, e.g. to a replay server (see replay.py).
+
+            Args:
+                - base_url: The address the URLs of the pages are built on, ending with a slash.
+        """
+        self.base_url = base_url
 
     def get_url(self, url: str) -> None:
         """
@@ -32,8 +74,54 @@ class PageHelper:
             Args:
                 - url: The URL to navigate to.
         """
+        self.invalidate_cache()
+
         self.driver.get(url)
 
+    def go_back(self) -> None:
+        """
+            Navigates the browser to the previous page.
+        """
+        self.invalidate_cache()
+
+        self.driver.back()
+
+    def refresh(self) -> None:
+        """
+            Reloads the current page.
+        """
+        self.invalidate_cache()
+
+        self.driver.refresh()
+
+    def invalidate_cache(self) -> None:
+        """
+            Forgets the cached elements. Has to be called whenever the page changes.
+        """
+        self.cache.clear()
+
+    def find_cached(self, location: Tuple[str, str]) -> Union[WebElement, str]:
+        """
+            Waits for the presence of an element and keeps it until the page changes, so containers that are used
+            for many lookups are located only once per page load.
+
+            Args:
+                - location: A tuple representing the location strategy and value (e.g., (By.ID, 'element_id')).
+
+            Returns:
+                - The located WebElement upon successful presence.
+                - A timeout error message if the element is not found within the specified time.
+        """
+        element = self.cache.get(location)
+
+        if element is None:
+            element = self.wait_for_presence(location)
+
+            if isinstance(element, WebElement):
+                self.cache[location] = element
+
+        return element
+
     def load_url(self, role):
         """
             Loads a specific URL based on the role of the actor.
@@ -41,8 +129,7 @@ class PageHelper:
             Args:
                 - role: The role of the actor for which the URL is to be loaded.
         """
-        url = f'https://ec.europa.eu/tools/eudamed/#/screen/search-eo?actorTypeCode=refdata.actor-type.{role}' \
-              '&submitted=true'
+        url = f'{self.base_url}#/screen/search-eo?actorTypeCode=refdata.actor-type.{role}&submitted=true'
 
         self.get_url(url)
 
@@ -75,9 +162,7 @@ class PageHelper:
         """
             Accepts cookies by clicking on the corresponding button.
         """
-        cookies_location = (By.XPATH, "//a[@href='#accept']")
-
-        cookies = self.wait_for_presence(cookies_location)
+        cookies = self.wait_for_presence(ACCEPT_COOKIES)
 
         cookies.click()
 
@@ -85,9 +170,7 @@ class PageHelper:
         """
             Closes the cookies prompt after accepting them.
         """
-        prompt_close_button_location = (By.CLASS_NAME, 'wt-ecl-message__close')
-
-        prompt_close_button = self.wait_for_presence(prompt_close_button_location)
+        prompt_close_button = self.wait_for_presence(COOKIES_PROMPT_CLOSE_BUTTON)
 
         if isinstance(prompt_close_button, WebElement):
             prompt_close_button.click()
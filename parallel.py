@@ -0,0 +1,79 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def batched(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    """
+        Splits the items into lists of at most batch_size items.
+
+        Args:
+            - items: The items to split.
+            - batch_size: The maximum number of items in a batch.
+
+        Returns:
+            - An iterator over the batches.
+    """
+    iterator = iter(items)
+
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def _apply_to_chunk(function: Callable[[T], R], chunk: List[T]) -> List[R]:
+    return [function(item) for item in chunk]
+
+
+def parallel_map(function: Callable[[T], R], items: Iterable[T], workers: Optional[int] = None, chunk_size: int = 64,
+                 ordered: bool = True) -> Iterator[R]:
+    """
+        Applies a function to every item in a pool of worker processes.
+
+        The items are sent to the workers in chunks, which keeps the inter-process overhead low for small tasks such
+        as parsing one page. Only a few chunks per worker are in flight at a time, so the items can be a lazy iterator
+        over more data than fits in memory.
+
+        Args:
+            - function: A top-level (picklable) function to apply.
+            - items: The items to process.
+            - workers: The number of worker processes, the number of CPUs by default.
+            - chunk_size: How many items are sent to a worker at once.
+            - ordered: Return the results in the order of the items. Otherwise they are returned as soon as their chunk
+              is done, which keeps all the workers busy even if some chunks are slow.
+
+        Returns:
+            - An iterator over the results.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    max_pending = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        def completed() -> Iterator[Future]:
+            if ordered:
+                yield pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    pending.remove(future)
+
+                    yield future
+
+        for chunk in batched(items, chunk_size):
+            pending.append(executor.submit(_apply_to_chunk, function, chunk))
+
+            while len(pending) >= max_pending:
+                for future in completed():
+                    yield from future.result()
+
+        while pending:
+            for future in completed():
+                yield from future.result()
@@ -0,0 +1,126 @@
+import datetime
+from typing import Iterable, Optional, Set, Tuple
+
+from changefeed import Changefeed
+from data_handling import atomic_write, iter_data, update_data
+from records import INACTIVE_SINCE_FIELD
+
+
+class ReconciliationRefused(ValueError):
+    """
+        Raised when the list does not look complete enough to mark the missing actors inactive. Nothing is changed
+        then, and running again right away would read the same list.
+    """
+
+def save_id_list(actor_ids: Iterable[str], filename: str) -> None:
+    """
+        Saves actor IDs sorted, one per line.
+
+        Args:
+            - actor_ids: The actor IDs.
+            - filename: The name of the text file.
+    """
+    def write(file) -> None:
+        for actor_id in sorted(actor_ids):
+            file.write(actor_id + '\n')
+
+    atomic_write(filename, write)
+
+
+def load_id_list(filename: str) -> Set[str]:
+    """
+        Loads the actor IDs saved by save_id_list.
+
+        Args:
+            - filename: The name of the text file.
+
+        Returns:
+            - The actor IDs, empty if the file does not exist.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            return {line.strip() for line in file if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def compare_ids(list_ids: Set[str], data_filename: str) -> Tuple[Set[str], Set[str], Set[str], int]:
+    """
+        Compares the actor IDs listed on the website with the scraped ones. Only the IDs are kept in memory.
+
+        Args:
+            - list_ids: All the actor IDs of the list.
+            - data_filename: The name of the data file.
+
+        Returns:
+            - The active actors that are no longer listed, the inactive actors that are listed again, the listed
+              actors that are not scraped yet, and the number of active actors in the data file.
+    """
+    active_ids = set()
+    inactive_ids = set()
+
+    for actor_id, record in iter_data(data_filename):
+        if record.get(INACTIVE_SINCE_FIELD):
+            inactive_ids.add(actor_id)
+        else:
+            active_ids.add(actor_id)
+
+    removed = active_ids - list_ids
+    reactivated = inactive_ids & list_ids
+    unscraped = list_ids - active_ids - inactive_ids
+
+    return removed, reactivated, unscraped, len(active_ids)
+
+
+def reconcile(list_ids: Set[str], data_filename: str, max_removed_fraction: float, snapshots: int = 0,
+              changefeed: Optional[Changefeed] = None,
+              today: Optional[datetime.date] = None) -> Tuple[Set[str], Set[str], Set[str]]:
+    """
+        Marks the actors that are no longer listed on the website as inactive.
+
+        The records are kept, with the date they disappeared in the INACTIVE_SINCE_FIELD field. An inactive actor
+        that is listed again loses the field. The data file is read twice, once for the IDs and once for the records
+        to change, and written once.
+
+        Args:
+            - list_ids: All the actor IDs of the list, collected without opening the actor pages.
+            - data_filename: The name of the data file.
+            - max_removed_fraction: The largest fraction of the active actors that may be marked inactive at once.
+            - snapshots: How many previous versions of the data file to keep.
+            - changefeed: The changefeed the changes are written to, None to only update the data file.
+            - today: The date the removed actors are marked with, the current date by default.
+
+        Returns:
+            - The removed, reactivated and unscraped actor IDs, see compare_ids.
+
+        Raises:
+            - ReconciliationRefused if more actors would be removed than max_removed_fraction allows. A list that
+              failed to load completely looks the same as a mass deregistration, so nothing is changed then.
+    """
+    removed, reactivated, unscraped, active = compare_ids(list_ids, data_filename)
+
+    if len(removed) > max_removed_fraction * active:
+        raise ReconciliationRefused(f'{len(removed)} of {active} actors are no longer listed, more than the allowed '
+                         f'{max_removed_fraction:.0%}. The list was probably not loaded completely, nothing is marked '
+                         f'inactive.')
+
+    if not removed and not reactivated:
+        return removed, reactivated, unscraped
+
+    inactive_since = (today or datetime.date.today()).isoformat()
+
+    changed_data = {}
+
+    for actor_id, record in iter_data(data_filename):
+        if actor_id in removed:
+            changed_data[actor_id] = {**record, INACTIVE_SINCE_FIELD: inactive_since}
+        elif actor_id in reactivated:
+            changed_data[actor_id] = {field: value for field, value in record.items()
+                                      if field != INACTIVE_SINCE_FIELD}
+
+    if changefeed is not None:
+        changefeed.update_data(changed_data, data_filename, snapshots)
+    else:
+        update_data(changed_data, data_filename, snapshots)
+
+    return removed, reactivated, unscraped
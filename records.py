@@ -0,0 +1,288 @@
+import datetime
+import functools
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# Value used by ActorPage.parse_text when a field has no value
+MISSING_VALUE = '-'
+
+# Actor fields as saved by the scraper (see README - DATA) and their attribute names in ActorRecord, which are also
+# the column names of the export
+FIELD_NAMES = {
+    'Actor ID/SRN': 'actor_id',
+    'Role': 'role',
+    'Country': 'country',
+    'Actor/Organisation name': 'name',
+    'Abbreviated name': 'abbreviated_name',
+    'VAT number': 'vat_number',
+    'EORI': 'eori',
+    'National trade register': 'national_trade_register',
+    'Last confirmation date of actor data accuracy': 'last_confirmation_date',
+    'Street name': 'street_name',
+    'Street number': 'street_number',
+    'Address line 2': 'address_line_2',
+    'PO box': 'po_box',
+    'City name': 'city_name',
+    'Postal Code': 'postal_code',
+    'Latitude': 'latitude',
+    'Longitude': 'longitude',
+    'Email': 'email',
+    'Telephone number': 'telephone_number',
+    'Web site': 'web_site',
+    'Last update date': 'last_update_date',
+    'Actor URL': 'actor_url',
+}
+
+DATE_FIELDS = ('Last confirmation date of actor data accuracy', 'Last update date')
+# The formats of the dates shown on the website: the actor pages use the first one, the list may use the second one
+DISPLAY_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y')
+FLOAT_FIELDS = ('Latitude', 'Longitude')
+# Added by the reconciliation (see reconciliation.py) to actors that are no longer listed on the website, with the
+# date they disappeared. It is not an actor page field, so ActorRecord keeps it in extra_fields
+INACTIVE_SINCE_FIELD = 'Inactive since'
+
+# Low cardinality fields, their values are interned in ActorRecord and stored dictionary-encoded in the export
+DICTIONARY_FIELDS = ('Role', 'Country')
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_date(value: Optional[str]) -> Optional[datetime.date]:
+    """
+        Parses a date in YYYY-MM-DD format.
+
+        The dates are cached, so the records of the same day share one date object.
+
+        Args:
+            - value: The date string.
+
+        Returns:
+            - The parsed date, None if the value is missing or invalid.
+    """
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_display_date(value: Optional[str]) -> Optional[datetime.date]:
+    """
+        Parses a date as shown on the website, in one of DISPLAY_DATE_FORMATS.
+
+        Args:
+            - value: The date string.
+
+        Returns:
+            - The parsed date, None if the value is missing or in another format.
+    """
+    for date_format in DISPLAY_DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value.strip(), date_format).date()
+        except (AttributeError, ValueError):
+            pass
+
+    return None
+
+
+def parse_float(value: Optional[str]) -> Optional[float]:
+    """
+        Parses a floating point number.
+
+        Args:
+            - value: The number string.
+
+        Returns:
+            - The parsed number, None if the value is missing or invalid.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_value(field: str, value: Optional[str]) -> Any:
+    """
+        Converts the text of an actor field to its type: dates, numbers, interned strings for the low cardinality
+        fields and None for missing values.
+
+        Args:
+            - field: The actor field name.
+            - value: The text of the field, as saved by the scraper.
+
+        Returns:
+            - The typed value.
+    """
+    if value is None or value == MISSING_VALUE:
+        return None
+    if field in DATE_FIELDS:
+        return parse_date(value)
+    if field in FLOAT_FIELDS:
+        return parse_float(value)
+    if field in DICTIONARY_FIELDS:
+        return sys.intern(value)
+    return value
+
+
+def is_lossy(text: Optional[str], value: Any) -> bool:
+    """
+        Tells if format_value would not give back the text of a field from its parsed value, e.g. 'abc' as a latitude
+        that parse_value could not read, or '1.50' that would become '1.5'.
+    """
+    return text is not None and format_value(value) != text
+
+
+def format_value(value: Any) -> str:
+    """
+        Converts a typed value back to the text the scraper saves.
+
+        Args:
+            - value: The typed value.
+
+        Returns:
+            - The text of the field, '-' for None.
+    """
+    if value is None:
+        return MISSING_VALUE
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+class ActorRecord:
+    """
+        The information of an actor with typed fields.
+
+        The records saved by the scraper are dictionaries of texts keyed by the field labels of the actor page, with
+        '-' for missing values. An ActorRecord keeps the same information in slots instead: dates as datetime.date,
+        latitude and longitude as floats, None for missing values, and interned role and country strings shared by
+        all the records. It takes a fraction of the memory of the dictionary and its row form (see to_row) is much
+        smaller to serialize.
+
+        from_dict and to_dict convert from and to the saved dictionaries, and to_dict gives back the dictionary
+        from_dict was created from. Fields the scraper does not know are kept in extra_fields as they are, and so is
+        the text of the values that would not be written back the same way: dates and numbers that can not be parsed,
+        whose attribute is None, and numbers like '1.50' that are not in their shortest form. The labels of the known
+        fields the dictionary did not have are kept in absent_fields, so they are not written back as '-'.
+    """
+    __slots__ = (*FIELD_NAMES.values(), 'extra_fields', 'absent_fields')
+
+    actor_id: Optional[str]
+    role: Optional[str]
+    country: Optional[str]
+    name: Optional[str]
+    abbreviated_name: Optional[str]
+    vat_number: Optional[str]
+    eori: Optional[str]
+    national_trade_register: Optional[str]
+    last_confirmation_date: Optional[datetime.date]
+    street_name: Optional[str]
+    street_number: Optional[str]
+    address_line_2: Optional[str]
+    po_box: Optional[str]
+    city_name: Optional[str]
+    postal_code: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    email: Optional[str]
+    telephone_number: Optional[str]
+    web_site: Optional[str]
+    last_update_date: Optional[datetime.date]
+    actor_url: Optional[str]
+    extra_fields: Optional[Dict[str, str]]
+    absent_fields: Optional[Tuple[str, ...]]
+
+    def __init__(self, extra_fields: Optional[Dict[str, str]] = None,
+                 absent_fields: Optional[Tuple[str, ...]] = None, **values: Any):
+        """
+            Initializes the ActorRecord.
+
+            Args:
+                - extra_fields: Fields the scraper does not know, by label, None if there are none.
+                - absent_fields: The labels of the known fields the record does not have, None if it has them all.
+                - values: The typed values by attribute name, the missing ones are None.
+        """
+        for name in FIELD_NAMES.values():
+            setattr(self, name, values.pop(name, None))
+
+        if values:
+            raise TypeError(f'Unknown actor fields: {", ".join(values)}')
+
+        self.extra_fields = extra_fields
+        self.absent_fields = absent_fields
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, str]) -> 'ActorRecord':
+        """
+            Creates an ActorRecord from a record as saved by the scraper.
+
+            Args:
+                - record: The actor information by field label.
+
+            Returns:
+                - The typed record.
+        """
+        values = {name: parse_value(field, record.get(field)) for field, name in FIELD_NAMES.items()}
+
+        extra_fields = {field: value for field, value in record.items()
+                        if field not in FIELD_NAMES or is_lossy(value, values[FIELD_NAMES[field]])} or None
+
+        absent_fields = tuple(field for field in FIELD_NAMES if field not in record) or None
+
+        return cls(extra_fields, absent_fields, **values)
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+            Returns the record the way the scraper saves it.
+
+            Returns:
+                - The actor information by field label.
+        """
+        absent_fields = self.absent_fields or ()
+
+        record = {field: format_value(getattr(self, name)) for field, name in FIELD_NAMES.items()
+                  if field not in absent_fields}
+
+        if self.extra_fields:
+            record.update(self.extra_fields)
+
+        return record
+
+    def to_row(self) -> List[Any]:
+        """
+            Returns the values of the record as a JSON serializable list, in the order of FIELD_NAMES with the extra
+            fields and the absent fields last.
+        """
+        row = [getattr(self, name) for name in FIELD_NAMES.values()]
+
+        row = [value.isoformat() if isinstance(value, datetime.date) else value for value in row]
+
+        row.append(self.extra_fields)
+        row.append(list(self.absent_fields) if self.absent_fields else None)
+
+        return row
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> 'ActorRecord':
+        """
+            Creates an ActorRecord from the list returned by to_row.
+
+            Args:
+                - row: The values of the record.
+
+            Returns:
+                - The typed record.
+        """
+        *values, extra_fields, absent_fields = row
+
+        values = {name: parse_value(field, value) for (field, name), value in zip(FIELD_NAMES.items(), values)}
+
+        return cls(extra_fields, tuple(absent_fields) if absent_fields else None, **values)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ActorRecord):
+            return NotImplemented
+
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f'ActorRecord(actor_id={self.actor_id!r}, name={self.name!r})'
+
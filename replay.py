@@ -0,0 +1,253 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from data_handling import atomic_write
+from http_cache import CachedResponse
+
+# The website the recordings are taken from
+RECORDED_ORIGIN = 'https://ec.europa.eu'
+
+# Part of the URL of every request of the website (pages, scripts, styles and API) that is recorded
+RECORDED_URL_PATTERN = 'https://ec.europa.eu/tools/eudamed/'
+
+# Content types whose bodies may contain absolute URLs of the website, they are pointed at the replay server
+TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/javascript', 'application/x-javascript')
+
+# Headers that are not replayed: the bodies are stored decoded and the server sets its own length
+SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection', 'strict-transport-security',
+                   'content-security-policy', 'set-cookie')
+
+
+def get_request_key(url: str) -> str:
+    """
+        Returns the part of a URL a response is looked up by: the path and the query, without the origin and the
+        fragment.
+
+        Args:
+            - url: The URL of the request.
+    """
+    parts = urlsplit(url)
+
+    return f'{parts.path}?{parts.query}' if parts.query else parts.path
+
+
+class Recording:
+    """
+        The responses of a crawl, saved once so the crawl can be replayed without the website (see ReplayServer).
+
+        Like the page archive, every distinct body is saved once as <directory>/bodies/<hash[:2]>/<hash>.gz, where
+        hash is its SHA-256, and every response is appended to <directory>/index.jsonl with its URL, status and
+        headers. A URL recorded again replaces the previous response when replayed.
+
+        It has the same put method as HttpCache, so ApiCapture can record into it.
+    """
+    INDEX_FILENAME = 'index.jsonl'
+    BODIES_DIRECTORY = 'bodies'
+
+    def __init__(self, directory: str):
+        """
+            Initializes the Recording, creates its directory and reads the responses recorded so far.
+
+            Args:
+                - directory: The directory of the recording.
+        """
+        self.directory = directory
+        self.index_filename = os.path.join(directory, self.INDEX_FILENAME)
+        self.lock = threading.Lock()
+        # The latest index entry of every request key
+        self.entries = {}
+
+        os.makedirs(os.path.join(directory, self.BODIES_DIRECTORY), exist_ok=True)
+
+        try:
+            with open(self.index_filename, 'r', encoding='utf-8') as index_file:
+                for line in index_file:
+                    # A line cut off by a crash is skipped
+                    if line.endswith('\n'):
+                        entry = json.loads(line)
+
+                        self.entries[get_request_key(entry['url'])] = entry
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get_body_filename(self, content_hash: str) -> str:
+        return os.path.join(self.directory, self.BODIES_DIRECTORY, content_hash[:2], f'{content_hash}.gz')
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """
+            Records a response.
+
+            Args:
+                - url: The URL of the response.
+                - status: The HTTP status code.
+                - headers: The response headers.
+                - body: The decoded response body.
+        """
+        content_hash = hashlib.sha256(body).hexdigest()
+
+        body_filename = self.get_body_filename(content_hash)
+
+        if not os.path.exists(body_filename):
+            os.makedirs(os.path.dirname(body_filename), exist_ok=True)
+
+            compressed = gzip.compress(body)
+
+            atomic_write(body_filename, lambda file: file.write(compressed), binary=True)
+
+        entry = {
+            'url': url,
+            'status': status,
+            'headers': {name.lower(): value for name, value in headers.items()
+                        if name.lower() not in SKIPPED_HEADERS},
+            'hash': content_hash,
+            'recorded_at': round(time.time(), 3),
+        }
+
+        with self.lock:
+            self.entries[get_request_key(url)] = entry
+
+            with open(self.index_filename, 'a', encoding='utf-8') as index_file:
+                index_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+            Returns the recorded response of a URL, the origin and fragment of the URL are ignored.
+
+            Args:
+                - url: The URL or the path and query of the request.
+
+            Returns:
+                - A dictionary with the URL, status, headers and body, None if the URL was not recorded.
+        """
+        entry = self.entries.get(get_request_key(url))
+
+        if entry is None:
+            return None
+
+        with gzip.open(self.get_body_filename(entry['hash']), 'rb') as file:
+            body = file.read()
+
+        return {'url': entry['url'], 'status': entry['status'], 'headers': entry['headers'], 'body': body}
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """
+        Serves the recorded responses of the ReplayServer the handler belongs to.
+    """
+    server: 'ReplayHTTPServer'
+
+    def do_GET(self) -> None:
+        replay_server = self.server.replay_server
+
+        response = replay_server.recording.get(self.path)
+
+        replay_server.count_request(response is not None)
+
+        if replay_server.latency:
+            time.sleep(replay_server.latency)
+
+        if response is None:
+            self.send_error(404, 'Not recorded')
+            return
+
+        body = response['body']
+
+        content_type = response['headers'].get('content-type', '')
+
+        if content_type.startswith(TEXT_CONTENT_TYPES):
+            body = body.replace(RECORDED_ORIGIN.encode('utf-8'), replay_server.url.encode('utf-8'))
+
+        self.send_response(response['status'])
+
+        for name, value in response['headers'].items():
+            self.send_header(name, value)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # The requests of the browser would flood the console
+        pass
+
+
+class ReplayHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    replay_server: 'ReplayServer'
+
+
+class ReplayServer:
+    """
+        Serves a Recording over HTTP on the local machine, so the scraper, the browser tests and the benchmarks run
+        against the same pages every time, without the website.
+
+        The browser opens the pages of the replay server instead of the website (see get_url) and is kept away from
+        every other host (see get_browser_arguments). Absolute URLs of the website in the recorded pages, scripts and
+        JSON are pointed at the replay server. An optional latency is added to every response to benchmark the
+        scraper under the load times of the website.
+    """
+
+    def __init__(self, recording: Recording, host: str = '127.0.0.1', port: int = 0, latency: float = 0):
+        """
+            Initializes the ReplayServer.
+
+            Args:
+                - recording: The responses to serve.
+                - host: The address to listen on.
+                - port: The port to listen on, 0 for any free port.
+                - latency: How long (in seconds) every response is delayed.
+        """
+        self.recording = recording
+        self.latency = latency
+        self.server = ReplayHTTPServer((host, port), ReplayRequestHandler)
+        self.server.replay_server = self
+        self.url = f'http://{host}:{self.server.server_address[1]}'
+        self.thread = None
+        self.lock = threading.Lock()
+        self.served = 0
+        # Requests that were not recorded, a crawl that needs them is not fully replayed
+        self.missed = 0
+
+    def count_request(self, served: bool) -> None:
+        with self.lock:
+            if served:
+                self.served += 1
+            else:
+                self.missed += 1
+
+    def get_url(self, url: str) -> str:
+        """
+            Returns the replay server URL of a website URL.
+
+            Args:
+                - url: The URL on the website.
+        """
+        return self.url + url[len(RECORDED_ORIGIN):] if url.startswith(RECORDED_ORIGIN) else url
+
+    def get_browser_arguments(self) -> List[str]:
+        """
+            Returns the Chrome command line arguments that keep the browser from reaching any host but the replay
+            server.
+        """
+        return [f'--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE {urlsplit(self.url).hostname}']
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+        self.thread.join()
+        self.thread = None
@@ -0,0 +1,161 @@
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, Optional
+
+from events import Event, FAILED, PAGE, RECORD, RESOURCES, SCRAPED
+from utils import percentile
+
+# The length of the intervals (in seconds) the throughput is computed over
+THROUGHPUT_INTERVAL = 300
+
+# A worker that writes no event for this long (in seconds) is stalled
+STALL_THRESHOLD = 120
+
+
+def build_report(events: Iterable[Event], interval: int = THROUGHPUT_INTERVAL,
+                 stall_threshold: int = STALL_THRESHOLD) -> Dict[str, Any]:
+    """
+        Computes the throughput over time, the stalls and the error rates of a crawl from its event log.
+
+        Args:
+            - events: The events, as written by EventLog.
+            - interval: The length of the throughput intervals, in seconds.
+            - stall_threshold: How long (in seconds) a worker has to write no event to be reported as stalled.
+
+        Returns:
+            - A dictionary with the report.
+    """
+    record_outcomes = Counter()
+    page_outcomes = Counter()
+    failures_by_stage = Counter()
+    durations = []
+    intervals = defaultdict(Counter)
+    workers = defaultdict(Counter)
+    first_event = {}
+    last_event = {}
+    stalls = []
+    peak_rss = {}
+
+    for event in events:
+        timestamp, worker = event['time'], event['worker']
+
+        # Resource samples are written even when nothing moves, so they do not count as progress
+        if event['event'] == RESOURCES:
+            peak_rss[worker] = max(peak_rss.get(worker, 0), event['rss'])
+            continue
+
+        if worker in last_event and timestamp - last_event[worker] > stall_threshold:
+            stalls.append({'worker': worker, 'start': last_event[worker], 'end': timestamp,
+                           'duration': timestamp - last_event[worker]})
+
+        first_event.setdefault(worker, timestamp)
+        last_event[worker] = timestamp
+
+        if event['event'] == RECORD:
+            outcome = event['outcome']
+
+            record_outcomes[outcome] += 1
+            workers[worker][outcome] += 1
+            intervals[int(timestamp // interval * interval)][outcome] += 1
+
+            if outcome == SCRAPED and event.get('duration') is not None:
+                durations.append(event['duration'])
+            elif outcome == FAILED:
+                failures_by_stage[event.get('stage')] += 1
+
+        elif event['event'] == PAGE:
+            page_outcomes[event['outcome']] += 1
+
+    if not first_event:
+        return {}
+
+    start, end = min(first_event.values()), max(last_event.values())
+
+    attempted = record_outcomes[SCRAPED] + record_outcomes[FAILED]
+
+    return {
+        'start': start,
+        'end': end,
+        'duration': end - start,
+        'records': dict(record_outcomes),
+        'pages': dict(page_outcomes),
+        'error_rate': record_outcomes[FAILED] / attempted if attempted else 0.0,
+        'failures_by_stage': dict(failures_by_stage),
+        'record_duration_p50': percentile(durations, 50),
+        'record_duration_p95': percentile(durations, 95),
+        'throughput': [
+            {
+                'start': interval_start,
+                'scraped': counts[SCRAPED],
+                'failed': counts[FAILED],
+                'per_hour': counts[SCRAPED] * 3600 / interval,
+            }
+            for interval_start, counts in sorted(intervals.items())
+        ],
+        'workers': {
+            worker: {
+                'scraped': workers[worker][SCRAPED],
+                'failed': workers[worker][FAILED],
+                'per_hour': workers[worker][SCRAPED] * 3600 / max(last_event[worker] - first_event[worker], 1),
+                'peak_rss_mb': peak_rss[worker] // (1024 * 1024) if worker in peak_rss else None,
+            }
+            for worker in first_event
+        },
+        'stalls': stalls,
+    }
+
+
+def format_time(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+        Formats a report built by build_report as text.
+
+        Args:
+            - report: The report.
+
+        Returns:
+            - The text of the report.
+    """
+    if not report:
+        return 'The event log is empty.'
+
+    def seconds(value: Optional[float]) -> str:
+        return '-' if value is None else f'{value:.2f}s'
+
+    lines = [
+        f'Events from {format_time(report["start"])} to {format_time(report["end"])} '
+        f'({report["duration"] / 3600:.2f} hours)',
+        '',
+        'Records: ' + ', '.join(f'{count} {outcome}' for outcome, count in sorted(report['records'].items())),
+        'Pages: ' + ', '.join(f'{count} {outcome}' for outcome, count in sorted(report['pages'].items())),
+        f'Error rate: {report["error_rate"]:.2%}',
+        'Failures by stage: ' + (', '.join(
+            f'{count} {stage}' for stage, count in sorted(report['failures_by_stage'].items())) or '-'),
+        f'Time per scraped record: p50 {seconds(report["record_duration_p50"])}, '
+        f'p95 {seconds(report["record_duration_p95"])}',
+        '',
+        'Throughput:',
+    ]
+
+    for row in report['throughput']:
+        lines.append(f'  {format_time(row["start"])}  {row["scraped"]:>6} scraped  {row["failed"]:>5} failed  '
+                     f'{row["per_hour"]:>8.0f} records/hour')
+
+    lines += ['', 'Workers:']
+
+    for worker, row in sorted(report['workers'].items()):
+        peak_rss = '-' if row['peak_rss_mb'] is None else f'{row["peak_rss_mb"]} MB'
+
+        lines.append(f'  {worker}  {row["scraped"]:>6} scraped  {row["failed"]:>5} failed  '
+                     f'{row["per_hour"]:>8.0f} records/hour  peak RSS {peak_rss}')
+
+    lines += ['', f'Stalls ({len(report["stalls"])}):']
+
+    for stall in report['stalls']:
+        lines.append(f'  {stall["worker"]}  {format_time(stall["start"])} - {format_time(stall["end"])}  '
+                     f'{stall["duration"]:.0f}s')
+
+    return '\n'.join(lines)
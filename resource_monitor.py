@@ -0,0 +1,195 @@
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+import psutil
+
+ResourceSample = Dict[str, Union[int, float]]
+
+# Actions taken when a limit is crossed
+RECYCLE_SESSION = 'recycle_session'
+THROTTLE = 'throttle'
+
+MEGABYTE = 1024 * 1024
+
+
+class RecycleSession(Exception):
+    """
+        Raised to restart the browser when it uses too much memory.
+    """
+
+
+class ResourceMonitor:
+    """
+        Samples the memory (RSS) and CPU use of the Python process and all its child processes (chromedriver and the
+        Chrome processes it starts) in a background thread.
+
+        After every sample the monitor decides if an action is needed. The scraper picks it up with get_action()
+        between pages or records:
+        - RECYCLE_SESSION when the processes use more memory than memory_limit_mb, so the browser has to be restarted.
+        - THROTTLE when the whole system is short on memory or CPU, so the scraper has to pause or run fewer browsers.
+    """
+
+    def __init__(self, interval: float, memory_limit_mb: Optional[int] = None,
+                 system_memory_limit_percent: Optional[float] = None, system_cpu_limit_percent: Optional[float] = None,
+                 on_sample: Optional[Callable[[ResourceSample], None]] = None):
+        """
+            Initializes the ResourceMonitor.
+
+            Args:
+                - interval: How often (in seconds) the processes are sampled.
+                - memory_limit_mb: The RSS of all the processes (in MB) above which the browser is recycled, None for
+                  no limit.
+                - system_memory_limit_percent: The used memory of the system (in percent) above which the scraper is
+                  throttled, None for no limit.
+                - system_cpu_limit_percent: The CPU use of the system (in percent) above which the scraper is
+                  throttled, None for no limit.
+                - on_sample: Called with every sample, from the background thread.
+        """
+        self.interval = interval
+        self.memory_limit_mb = memory_limit_mb
+        self.system_memory_limit_percent = system_memory_limit_percent
+        self.system_cpu_limit_percent = system_cpu_limit_percent
+        self.on_sample = on_sample
+        self.process = psutil.Process()
+        # The same Process objects are kept between samples, cpu_percent measures the CPU time since the last call
+        self.processes: Dict[int, psutil.Process] = {}
+        self.latest: Optional[ResourceSample] = None
+        self.action: Optional[str] = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def get_processes(self) -> List[psutil.Process]:
+        try:
+            children = self.process.children(recursive=True)
+        except psutil.Error:
+            children = []
+
+        processes = {}
+
+        for process in [self.process, *children]:
+            processes[process.pid] = self.processes.get(process.pid, process)
+
+        self.processes = processes
+
+        return list(processes.values())
+
+    def sample(self) -> ResourceSample:
+        """
+            Measures the memory and CPU use of the processes and the system.
+
+            Returns:
+                - A dictionary with the RSS (in bytes) of the Python process, of its child processes and of both, the
+                  CPU use (in percent of one core) of all of them, the number of processes and the used memory and CPU
+                  of the system (in percent).
+        """
+        python_rss = browser_rss = 0
+        cpu_percent = 0.0
+        processes = 0
+
+        for process in self.get_processes():
+            try:
+                rss = process.memory_info().rss
+                cpu_percent += process.cpu_percent(None)
+            except psutil.Error:
+                # The process ended between listing and measuring it
+                continue
+
+            if process.pid == self.process.pid:
+                python_rss = rss
+            else:
+                browser_rss += rss
+
+            processes += 1
+
+        return {
+            'python_rss': python_rss,
+            'browser_rss': browser_rss,
+            'rss': python_rss + browser_rss,
+            'cpu_percent': round(cpu_percent, 1),
+            'processes': processes,
+            'system_memory_percent': psutil.virtual_memory().percent,
+            'system_cpu_percent': psutil.cpu_percent(None),
+        }
+
+    def decide(self, sample: ResourceSample) -> Optional[str]:
+        """
+            Returns the action needed for a sample, None if all the limits are kept.
+        """
+        if self.memory_limit_mb is not None and sample['rss'] > self.memory_limit_mb * MEGABYTE:
+            return RECYCLE_SESSION
+
+        if self.system_memory_limit_percent is not None and \
+                sample['system_memory_percent'] > self.system_memory_limit_percent:
+            return THROTTLE
+
+        if self.system_cpu_limit_percent is not None and sample['system_cpu_percent'] > self.system_cpu_limit_percent:
+            return THROTTLE
+
+        return None
+
+    def update(self) -> ResourceSample:
+        """
+            Takes a sample, decides the action and passes the sample to on_sample.
+
+            Returns:
+                - The sample.
+        """
+        sample = self.sample()
+
+        action = self.decide(sample)
+
+        with self.lock:
+            self.latest = sample
+
+            # A recycle is more urgent than throttling, it is not replaced until it is taken
+            if action is not None and self.action != RECYCLE_SESSION:
+                self.action = action
+
+        if self.on_sample is not None:
+            self.on_sample(sample)
+
+        return sample
+
+    def get_action(self) -> Optional[str]:
+        """
+            Takes the pending action, so every crossed limit is acted upon once.
+
+            Returns:
+                - RECYCLE_SESSION, THROTTLE or None.
+        """
+        with self.lock:
+            action, self.action = self.action, None
+
+        return action
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            self.update()
+
+    def start(self) -> None:
+        """
+            Starts sampling in the background.
+        """
+        if self.thread is not None:
+            return
+
+        self.stop_event.clear()
+
+        self.update()
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+            Stops sampling.
+        """
+        if self.thread is None:
+            return
+
+        self.stop_event.set()
+
+        self.thread.join()
+
+        self.thread = None
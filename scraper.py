@@ -0,0 +1,1684 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple, TYPE_CHECKING, Union
+
+from selenium.common import InvalidSessionIdException, NoSuchWindowException, TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from data_handling import iter_data, load_ids, update_data
+from api_capture import ApiCapture
+from archive import PageArchive
+from browsers import create_driver, PLAYWRIGHT_BROWSER, PlaywrightBrowser
+from changefeed import Changefeed
+from config import Config
+from concurrency import AIMDController, ConcurrencyLimit, LatencyTracker
+from coordination import CoordinatorClient, WorkUnit
+from dead_letter import DeadLetterQueue
+from events import COMPLETE, EventLog, FAILED, INCOMPLETE, KNOWN, PAGE, PAGES_SKIPPED, RECORD, RESOURCES, \
+    RUN_FINISHED, RUN_STARTED, SCRAPED, SESSION_RECYCLED
+from http_cache import HttpCache
+from options import ScraperOptions, WebDriverOptions
+from page_index import PageIndex
+from reconciliation import reconcile, ReconciliationRefused, save_id_list
+from records import parse_display_date
+from resource_monitor import MEGABYTE, RECYCLE_SESSION, RecycleSession, ResourceMonitor, ResourceSample, THROTTLE
+from replay import Recording, RECORDED_URL_PATTERN, ReplayServer
+from pages.actor_page import ActorPage
+from pages.actor_parser import parse_actor_html
+from pages.browse_page import BrowsePage
+from pages.locators import ACTOR_INFORMATION, ACTOR_INFORMATION_CONTAINER, INFORMATION_LAST_UPDATED
+from pages.utils.page_helper import EUDAMED_URL
+from utils import MessageProvider, Logger
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+
+def extract_actor_information(actor_page: ActorPage, actor_id: str, parse_page_source: bool,
+                              page_archive: Optional[PageArchive]) -> Dict[str, str]:
+    """
+        Extracts the actor information from the currently opened actor page.
+
+        Parameters:
+        - actor_page: The ActorPage of the opened actor page.
+        - actor_id: The ID of the actor.
+        - parse_page_source: Parse the page source locally instead of reading every element through the WebDriver.
+        - page_archive: PageArchive where the page source is saved, None to not save it.
+
+        Returns:
+        - A dictionary containing actor information.
+    """
+    if parse_page_source:
+        actor_information, page_source = actor_page.extract_actor_information_from_source()
+    else:
+        actor_information = actor_page.extract_actor_information()
+
+        page_source = actor_page.driver.page_source if page_archive is not None else None
+
+    if page_archive is not None:
+        page_archive.add(actor_id, actor_information['Actor URL'], page_source)
+
+    return actor_information
+
+
+class Scraper(ScraperOptions):
+    def __init__(self, driver, browse_page: BrowsePage, actor_page: ActorPage, message_provider: MessageProvider,
+                 logger: Logger, driver_factory: Optional[Callable[[], WebDriver]] = None,
+                 options: Optional[Dict[str, Any]] = None):
+        # The options of this run override the class constants, see config.py
+        super().__init__(options)
+        self.driver = driver
+        # Starts a new browser when the old one is recycled or lost, None to run with the given driver only
+        self.driver_factory = driver_factory
+        self.browse_page = browse_page
+        self.actor_page = actor_page
+        self.message_provider = message_provider
+        self.logger = logger
+        self.total_records_found = 0
+        self.remaining_records = self.total_records_found
+        self.filename = f"{self.ROLE}s_data.json"
+        # Only the IDs are needed to skip already scraped actors, the records themselves stay on disk
+        self.existing_ids = load_ids(self.filename)
+        self.dead_letter_queue = DeadLetterQueue(f"{self.ROLE}s_failed.json")
+        self.changefeed = Changefeed(f"{self.ROLE}s_changes", self.filename) if self.CHANGEFEED else None
+        self.page_archive = PageArchive(f"{self.ROLE}s_pages") if self.ARCHIVE_PAGE_SOURCE else None
+        self.api_capture = self.create_api_capture()
+        self.event_log = EventLog(f"{self.ROLE}s_events.jsonl")
+        self.resource_monitor = ResourceMonitor(self.RESOURCE_SAMPLE_INTERVAL, self.MEMORY_LIMIT_MB,
+                                                self.SYSTEM_MEMORY_LIMIT_PERCENT, self.SYSTEM_CPU_LIMIT_PERCENT,
+                                                self.record_resources)
+        self.latency_tracker = LatencyTracker()
+        self.default_wait_time = actor_page.wait_time
+        # Pages are only remembered in the default order of the list, None when the scraper sees the list differently
+        self.page_index: Optional[PageIndex] = PageIndex(f"{self.ROLE}s_page_index.json")
+        self.new_data = {}  # TODO: Maybe remove this and pass it to functions
+        # Pages processed since the last save as (page, fingerprint, complete), they are added to the page index
+        # only once their records are saved
+        self.pending_pages: List[Tuple[int, str, bool]] = []
+        self.current_page = 1
+        # Cleared when a page does not match the previous run, the remembered pages can not be trusted then
+        self.skip_ahead = self.SKIP_SCRAPED_PAGES
+        # The page the browser was recycled on, the next run with the new browser goes straight back to it
+        self.resume_page: Optional[int] = None
+        self.session_time = 0
+        self.loop_start_time = 0
+        self.loop_end_time = 0
+
+    def run(self) -> None:
+        """
+            Runs the scraping process.
+
+            This function orchestrates the scraping process by handling exceptions, initializing the driver,
+            executing data scraping, and displaying messages. If unknown exception is raised it will try to restart
+            the process again if MAX_CONSECUTIVE_EXCEPTIONS are not reached.
+
+        """
+        consecutive_exceptions = 0
+
+        self.resource_monitor.start()
+
+        while consecutive_exceptions < self.MAX_CONSECUTIVE_EXCEPTIONS:
+            if self.driver is None:
+                self.start_driver()
+
+            self.message_provider.app_starting()
+
+            self.logger.log_info(self.message_provider.app_messages.APP_STARTING_MESSAGE)
+
+            self.event_log.emit(RUN_STARTED, role=self.ROLE)
+
+            run_start_time = time.time()
+
+            try:
+                self.start_scraping_data()
+
+                self.message_provider.scraping_completed_msg(self.filename)
+
+                self.logger.log_info(self.message_provider.app_messages.SCRAPING_COMPLETED_MESSAGE)
+
+                self.event_log.emit(RUN_FINISHED, outcome='completed', duration=time.time() - run_start_time)
+
+                consecutive_exceptions = 0
+
+                break
+
+            except RecycleSession:
+                # Not an error, the run goes on with a new browser from the same page
+                self.resume_page = self.current_page
+
+                self.event_log.emit(RUN_FINISHED, outcome='recycled', duration=time.time() - run_start_time)
+
+                consecutive_exceptions = 0
+
+                continue
+
+            except ReconciliationRefused as e:
+                # Not retried, the list would be read the same way again
+                self.message_provider.reconciliation_refused(e)
+
+                self.logger.log_warning(
+                    self.message_provider.app_messages.RECONCILIATION_REFUSED_MESSAGE.format(reason=str(e)))
+
+                self.event_log.emit(RUN_FINISHED, outcome='refused', error=str(e),
+                                    duration=time.time() - run_start_time)
+
+                break
+
+            except KeyboardInterrupt:
+                self.message_provider.keyboard_interruption_msg()
+
+                self.logger.log_error(self.message_provider.app_messages.KEYBOARD_INTERRUPTION_MESSAGE)
+
+                self.event_log.emit(RUN_FINISHED, outcome='interrupted', duration=time.time() - run_start_time)
+
+                break
+
+            except Exception as e:
+                consecutive_exceptions += 1
+
+                self.message_provider.unexpected_error_msg(e)
+
+                self.logger.log_error(
+                    self.message_provider.app_messages.UNEXPECTED_ERROR_MESSAGE.format(exception=str(e)))
+
+                self.event_log.emit(RUN_FINISHED, outcome='error', error=str(e), duration=time.time() - run_start_time)
+
+            finally:
+                self.cleanup()
+
+                self.logger.log_info('Cleaning up resources...')
+
+            # If scraping failed, wait before attempting again
+            if consecutive_exceptions > 0:
+                time.sleep(self.WAIT_TIME_BETWEEN_RUNS)
+
+                self.logger.log_info(f'Waiting {self.WAIT_TIME_BETWEEN_RUNS}s before attempting again.')
+
+        self.resource_monitor.stop()
+
+    def cleanup(self) -> None:
+        """
+            Cleans up resources.
+
+            Quits the WebDriver if it exists to free up system resources. With a driver_factory the next run starts
+            a new browser.
+
+        """
+        if self.driver:
+            self.driver.quit()
+
+            self.logger.log_info('Cleaning up the driver resources.')
+
+            if self.driver_factory is not None:
+                self.driver = None
+
+    def create_api_capture(self) -> Optional[ApiCapture]:
+        """
+            Creates the ApiCapture of the browser: it records everything the website loads with RECORD_DIRECTORY, or
+            only the API responses with CAPTURE_API_RESPONSES.
+
+            Returns:
+                - The ApiCapture, None if neither is enabled.
+        """
+        if self.RECORD_DIRECTORY:
+            return ApiCapture(Recording(self.RECORD_DIRECTORY), url_pattern=RECORDED_URL_PATTERN, json_only=False)
+
+        if self.CAPTURE_API_RESPONSES:
+            return ApiCapture(HttpCache(f"{self.ROLE}s_http_cache.sqlite3", self.HTTP_CACHE_TTL,
+                                        self.HTTP_CACHE_MAX_SIZE_MB * MEGABYTE))
+
+        return None
+
+    def record_responses(self) -> None:
+        """
+            Records the responses loaded since the last call, when the crawl is recorded.
+        """
+        if self.RECORD_DIRECTORY:
+            self.api_capture.collect(self.driver)
+
+    def start_driver(self) -> None:
+        """
+            Starts a new browser with the driver_factory and switches the pages to it.
+        """
+        self.driver = self.driver_factory()
+
+        self.browse_page.set_driver(self.driver)
+        self.actor_page.set_driver(self.driver)
+
+        if self.api_capture is not None:
+            # The pending responses belong to the old browser
+            self.api_capture.clear()
+
+    def record_resources(self, sample: ResourceSample) -> None:
+        """
+            Shows a resource sample in the progress output and writes it to the event log.
+
+            Parameters:
+            - sample: The sample taken by the resource monitor.
+        """
+        self.message_provider.resources(sample['rss'] // MEGABYTE, sample['cpu_percent'])
+
+        self.event_log.emit(RESOURCES, **sample)
+
+    def check_resources(self) -> None:
+        """
+            Acts on the limits crossed since the last check.
+
+            If the scraper and its browser use too much memory, RecycleSession is raised, run() then restarts the
+            browser and continues where it stopped. If the system is short on memory or CPU, the scraping pauses for
+            THROTTLE_PAUSE_TIME.
+        """
+        action = self.resource_monitor.get_action()
+
+        sample = self.resource_monitor.latest
+
+        if action == RECYCLE_SESSION and self.driver_factory is not None:
+            self.message_provider.recycling_session(sample['rss'] // MEGABYTE)
+
+            self.logger.log_warning(self.message_provider.app_messages.RECYCLING_SESSION_MESSAGE.format(
+                rss=sample['rss'] // MEGABYTE))
+
+            self.event_log.emit(SESSION_RECYCLED, page=self.current_page, rss=sample['rss'])
+
+            raise RecycleSession()
+
+        if action == THROTTLE:
+            self.message_provider.throttling(sample['system_memory_percent'], sample['system_cpu_percent'],
+                                             self.THROTTLE_PAUSE_TIME)
+
+            self.logger.log_warning(self.message_provider.app_messages.THROTTLING_MESSAGE.format(
+                memory_percent=sample['system_memory_percent'], cpu_percent=sample['system_cpu_percent'],
+                seconds=self.THROTTLE_PAUSE_TIME))
+
+            time.sleep(self.THROTTLE_PAUSE_TIME)
+
+    def go_to_next_page_if_possible(self) -> bool:
+        """
+        Go to the next page if available.
+        """
+        next_page_button = self.browse_page.find_next_page_button()
+
+        if self.browse_page.is_button_disabled(next_page_button):
+            return False
+
+        previous_actor_ids = self.browse_page.find_actor_ids()
+
+        next_page_button.click()
+
+        # The rows of the previous page are still shown until the website answers
+        self.browse_page.wait_for_page_change(previous_actor_ids)
+
+        self.current_page += 1
+
+        return True
+
+    def jump_to_page(self, target_page: int) -> None:
+        """
+            Goes forward or back to the given page.
+
+            The paginator only shows links to the pages around the current one, so the scraper clicks the link
+            closest to the target that does not go past it until it gets there.
+
+            Parameters:
+            - target_page: The number of the page. The scraper stops on the last page if the list has fewer pages.
+        """
+        while self.current_page != target_page:
+            self.browse_page.wait_for_table_to_load()
+
+            page_links = self.browse_page.find_page_links()
+
+            if self.current_page < target_page:
+                pages = [page for page in page_links if self.current_page < page <= target_page]
+                closest_page = max(pages, default=None)
+            else:
+                pages = [page for page in page_links if target_page <= page < self.current_page]
+                closest_page = min(pages, default=None)
+
+            if closest_page is not None:
+                previous_actor_ids = self.browse_page.find_actor_ids()
+
+                page_links[closest_page].click()
+
+                self.browse_page.wait_for_page_change(previous_actor_ids)
+
+                self.current_page = closest_page
+            elif self.current_page > target_page or not self.go_to_next_page_if_possible():
+                break
+
+    def resume_recycled_page(self) -> None:
+        """
+            Goes back to the page the browser was recycled on, if it was, whatever the state of the page index is.
+        """
+        if self.resume_page is None:
+            return
+
+        self.logger.log_info(f'Resuming at page {self.resume_page} after the browser was recycled.')
+
+        self.jump_to_page(self.resume_page)
+
+        self.resume_page = None
+
+    def skip_scraped_pages(self) -> None:
+        """
+            Jumps over the run of pages that were complete in the previous run, starting at the current page.
+
+            It stops on the last complete page, whose fingerprint is checked when the page is processed.
+        """
+        target_page = self.page_index.find_skip_target(self.current_page)
+
+        first_page = self.current_page
+
+        self.jump_to_page(target_page)
+
+        if self.current_page > first_page:
+            self.event_log.emit(PAGES_SKIPPED, first_page=first_page, last_page=self.current_page)
+
+            self.message_provider.skipped_pages(first_page, self.current_page)
+
+            self.logger.log_info(self.message_provider.app_messages.SKIPPED_PAGES_MESSAGE.format(
+                first_page=first_page, last_page=self.current_page))
+
+    def save_existing_data(self) -> None:
+        """
+        Save scraped data.
+        """
+        if self.changefeed is not None:
+            self.changefeed.update_data(self.new_data, self.filename, self.DATA_SNAPSHOTS)
+        else:
+            update_data(self.new_data, self.filename, self.DATA_SNAPSHOTS)
+
+        self.existing_ids.update(self.new_data)
+
+        self.new_data.clear()
+
+        if self.page_index is not None:
+            self.update_page_index()
+
+        self.message_provider.saved_current_scraped_data()
+
+        self.logger.log_info(self.message_provider.app_messages.SAVED_CURRENT_SCRAPED_DATA)
+
+    def display_completion_time(self) -> None:
+        """
+        Display average completion time.
+        """
+        self.loop_end_time = time.time()
+
+        time_per_page = self.loop_end_time - self.loop_start_time
+
+        self.message_provider.average_time_until_completion(
+            self.remaining_records, self.ROWS_PER_PAGE, time_per_page + self.PAGE_LOAD_TIME)
+
+    def display_session_info(self) -> None:
+        """
+        Display session information.
+        """
+        self.message_provider.time_of_current_session(self.session_time)
+        self.message_provider.remaining_records(self.remaining_records)
+
+    def is_page_scraped(self, actor_ids: List[str]) -> bool:
+        """
+            Checks if all the actors of a page are already scraped.
+
+            Parameters:
+            - actor_ids: The actor IDs on the page.
+        """
+        return all(self.is_actor_scraped(actor_id) or actor_id in self.new_data for actor_id in actor_ids)
+
+    def is_actor_scraped(self, actor_id: str) -> bool:
+        """
+            Checks if an actor is in the saved data and does not have to be scraped again.
+        """
+        return actor_id in self.existing_ids
+
+    def process_table_rows(self, actor_ids: List[str]) -> None:
+        """
+            Processes each row in the table.
+
+            Parameters:
+            - actor_ids: The actor IDs on the current page, in the order of the rows.
+
+            This method goes through the actor IDs of the rows, checks if the actor ID exists in the existing data,
+            and calls the scrape_actor_page method to scrape data if the actor ID is not in the existing data.
+            If the actor ID is already present, it logs a message indicating that the record has already been scraped.
+            The state of the page is saved to the page index for the next run.
+        """
+        # The responses of the list page
+        self.record_responses()
+
+        new_records = len(self.new_data)
+
+        if self.is_page_scraped(actor_ids):
+            self.message_provider.page_already_scraped(self.current_page, len(actor_ids))
+
+            outcome = KNOWN
+        else:
+            # The rows are located again by index because the table is rendered again after going back from an actor
+            # page, so the row elements would raise StaleElementReferenceException
+            for i, actor_id in enumerate(actor_ids):
+                if self.is_actor_scraped(actor_id):
+                    self.message_provider.record_already_scraped(actor_id)
+
+                    self.event_log.emit(RECORD, page=self.current_page, actor_id=actor_id, outcome=KNOWN)
+                    continue
+
+                self.scrape_actor_page(i, actor_id)
+
+            outcome = COMPLETE if self.is_page_scraped(actor_ids) else INCOMPLETE
+
+        self.event_log.emit(PAGE, page=self.current_page, records=len(actor_ids),
+                            scraped=len(self.new_data) - new_records, outcome=outcome,
+                            duration=time.time() - self.loop_start_time)
+
+        if self.page_index is not None:
+            self.pending_pages.append((self.current_page, PageIndex.get_fingerprint(actor_ids), outcome != INCOMPLETE))
+
+            # Otherwise the records of the page are not saved yet, a crash now would leave it marked complete
+            if not self.new_data:
+                self.update_page_index()
+
+    def update_page_index(self) -> None:
+        """
+            Adds the pages processed since the last save to the page index.
+        """
+        for page, fingerprint, complete in self.pending_pages:
+            self.page_index.update(page, fingerprint, complete)
+
+        self.pending_pages.clear()
+
+    def scrape_actor_page(self, i: int, actor_id: str) -> None:
+        """
+            Scrapes information from the actor page based on the given index and actor ID.
+
+            Parameters:
+            - i: The index of the current row.
+            - actor_id: The ID of the actor whose page is being scraped.
+
+            This method locates and clicks the action button associated with the specified row,
+            waits for the actor information to load, captures the actor's information,
+            updates the new data with the scraped information, logs the completion of the record,
+            and navigates back to the previous page.
+            If the actor can not be scraped, the failure is recorded in the dead-letter queue and the
+            scraping continues with the next row instead of restarting the whole run.
+            With CAPTURE_API_RESPONSES, an actor whose details are fresh in the HTTP cache is built from
+            them without opening its page.
+        """
+        list_url = self.driver.current_url
+
+        record_start_time = time.time()
+
+        cached_information = self.get_cached_actor(actor_id)
+
+        if cached_information is not None:
+            self.new_data[actor_id] = cached_information
+
+            self.event_log.emit(RECORD, page=self.current_page, actor_id=actor_id, outcome=SCRAPED, cached=True,
+                                duration=time.time() - record_start_time)
+
+            self.message_provider.completed_record(cached_information['Actor URL'])
+
+            self.dead_letter_queue.resolve(actor_id)
+
+            return
+
+        stage = DeadLetterQueue.STAGE_OPEN
+
+        try:
+            current_row_button = self.browse_page.find_action_button(i)
+
+            self.browse_page.scroll_to_element(current_row_button)
+
+            current_row_button.click()
+
+            stage = DeadLetterQueue.STAGE_LOAD
+
+            load_start_time = time.time()
+
+            captured_information = None
+
+            if self.CAPTURE_API_RESPONSES:
+                # Stops waiting for the JSON as soon as the page shows the actor, the page is parsed then
+                captured_information = self.api_capture.wait_for_actor(
+                    self.driver, actor_id, self.actor_page.wait_time, self.actor_page.is_actor_information_loaded)
+
+            if captured_information is not None:
+                self.record_load_time(time.time() - load_start_time)
+
+                self.message_provider.working_on(self.driver.current_url)
+
+                self.new_data[actor_id] = captured_information
+            else:
+                actor_information = self.actor_page.wait_for_actor_information_to_load()
+
+                # A timeout counts as a load as long as the wait time, so slow periods raise the wait time
+                self.record_load_time(time.time() - load_start_time)
+
+                if not isinstance(actor_information, WebElement):
+                    raise TimeoutException(actor_information)
+
+                self.message_provider.working_on(self.driver.current_url)
+
+                stage = DeadLetterQueue.STAGE_EXTRACT
+
+                self.new_data[actor_id] = extract_actor_information(
+                    self.actor_page, actor_id, self.PARSE_PAGE_SOURCE, self.page_archive)
+
+        except (InvalidSessionIdException, NoSuchWindowException):
+            # The browser itself is gone, let run() restart the whole process
+            raise
+
+        except Exception as e:
+            self.event_log.emit(RECORD, page=self.current_page, actor_id=actor_id, outcome=FAILED, stage=stage,
+                                error=str(e), duration=time.time() - record_start_time)
+
+            self.record_failed_actor(actor_id, list_url, stage, e)
+
+            return
+
+        self.event_log.emit(RECORD, page=self.current_page, actor_id=actor_id, outcome=SCRAPED,
+                            duration=time.time() - record_start_time)
+
+        self.message_provider.completed_record(self.driver.current_url)
+
+        self.dead_letter_queue.resolve(actor_id)
+
+        self.record_responses()
+
+        self.browse_page.go_back()
+
+    def get_cached_actor(self, actor_id: str) -> Optional[Dict[str, str]]:
+        """
+            Builds the record of an actor from the HTTP cache, see ApiCapture.get_cached_actor.
+
+            Parameters:
+            - actor_id: The ID of the actor.
+
+            Returns:
+            - A dictionary containing actor information, None if the actor page has to be opened.
+        """
+        if not self.CAPTURE_API_RESPONSES or self.api_capture is None:
+            return None
+
+        return self.api_capture.get_cached_actor(actor_id)
+
+    def record_load_time(self, seconds: float) -> None:
+        """
+            Records the load time of an actor page and adapts the wait time of the pages to the recent load times.
+
+            Parameters:
+            - seconds: The load time of the actor page.
+        """
+        self.latency_tracker.add(seconds)
+
+        if self.ADAPTIVE_WAIT_TIME:
+            wait_time = round(self.latency_tracker.get_timeout(
+                self.default_wait_time, self.MIN_WAIT_TIME, self.MAX_WAIT_TIME, self.WAIT_TIME_P95_FACTOR))
+
+            self.browse_page.set_wait_time(wait_time)
+            self.actor_page.set_wait_time(wait_time)
+
+    def record_failed_actor(self, actor_id: str, list_url: str, stage: str, exception: Exception) -> None:
+        """
+            Records a failed actor in the dead-letter queue and returns to the list page.
+
+            Parameters:
+            - actor_id: The ID of the actor that failed.
+            - list_url: The URL of the list page the actor was opened from.
+            - stage: The stage at which the scraping failed.
+            - exception: The raised exception.
+        """
+        current_url = self.driver.current_url
+
+        actor_url = current_url if current_url != list_url else None
+
+        self.dead_letter_queue.record_failure(actor_id, actor_url, stage, str(exception))
+
+        self.message_provider.record_failed(actor_id, stage, exception)
+
+        self.logger.log_error(self.message_provider.app_messages.RECORD_FAILED_MESSAGE.format(
+            actor_id=actor_id, stage=stage, exception=str(exception)))
+
+        if actor_url:
+            self.browse_page.go_back()
+
+    def scrape_pages(self) -> None:
+        """
+            Scrapes data from each page of the table.
+
+            This method starts a session timer, skips the pages scraped in the previous run,
+            waits for the table to load, reads the actor IDs, refreshes the pages that have new actors,
+            calculates the remaining records to be scraped,
+            processes each table row, displays session information,
+            saves the existing data if new data is found, and displays completion time.
+
+            The scraping continues until there are no more pages to scrape.
+        """
+        self.session_time = time.time()
+
+        while True:
+            self.check_resources()
+
+            self.loop_start_time = time.time()
+
+            skipped_from = self.current_page
+
+            if self.skip_ahead:
+                self.skip_scraped_pages()
+
+            self.browse_page.wait_for_table_to_load()
+
+            actor_ids = self.browse_page.find_actor_ids()
+
+            fingerprint = PageIndex.get_fingerprint(actor_ids)
+
+            if self.page_index is not None and not self.page_index.matches(self.current_page, fingerprint):
+                self.skip_ahead = False
+
+                # The list changed since the previous run, so the pages jumped over may have changed as well
+                if self.current_page > skipped_from:
+                    self.logger.log_warning(f'Page {self.current_page} changed since the previous run. Going back to '
+                                            f'page {skipped_from} to process the skipped pages again.')
+
+                    self.jump_to_page(skipped_from)
+
+                    self.browse_page.wait_for_table_to_load()
+
+                    actor_ids = self.browse_page.find_actor_ids()
+
+            # Pages with nothing to scrape are not refreshed, the refresh only frees the memory used by actor pages
+            if not self.is_page_scraped(actor_ids):
+                self.browse_page.refresh()
+
+                self.browse_page.wait_for_table_to_load()
+
+                actor_ids = self.browse_page.find_actor_ids()
+
+            self.remaining_records = self.total_records_found - len(self.existing_ids)
+
+            self.process_table_rows(actor_ids)
+
+            self.display_session_info()
+
+            if len(self.new_data) > 0:
+                self.save_existing_data()
+                self.display_completion_time()
+
+            if not self.go_to_next_page_if_possible():
+                break
+
+    def load_role(self) -> None:
+        """
+        Loads the appropriate role data based on the specified role.
+        """
+        if self.ROLE == self.MANUFACTURER_ROLE:
+            self.browse_page.load_url(self.MANUFACTURER_ROLE)
+        elif self.ROLE == self.IMPORTER_ROLE:
+            self.browse_page.load_url(self.IMPORTER_ROLE)
+        else:
+            raise ValueError(self.ROLE_VALUE_ERROR_MSG)
+
+    def start_scraping_data(self) -> None:
+        """
+            Initiates the data scraping process based on the specified role.
+
+            If the role is set to 'manufacturer', load the manufacturers' data.
+            If the role is set to 'importer', load the importers' data.
+            Raises a ValueError if an invalid role is specified.
+        """
+
+        self.load_role()
+
+        self.browse_page.accept_cookies()
+
+        # Right now the close prompt does not exist as 24.03.2024. When I was working on this project, a month ago
+        # there was one. So if they decide to introduce it again, this is a fail-safe; hopefully they introduce it
+        # with the same attribute...
+        self.browse_page.close_cookies_prompt_after_accept()
+
+        self.browse_page.choose_table_rows_per_page(self.ROWS_PER_PAGE)
+
+        self.total_records_found = self.browse_page.find_total_records()
+
+        self.message_provider.start_progress(self.total_records_found, len(self.existing_ids))
+
+        self.current_page = 1
+
+        self.page_index.total_records = self.total_records_found
+        self.page_index.rows_per_page = self.ROWS_PER_PAGE
+
+        self.resume_recycled_page()
+
+        self.scrape_pages()
+
+
+class NewActorsScraper(Scraper):
+    """
+        Scraper for daily delta runs that only looks for actors registered or updated since the last run.
+
+        The list is sorted by NEW_SINCE_SORT_COLUMN, newest first, so the new actors are on the first pages. Known
+        actors whose date in that column is later than the one of their saved record were updated and are scraped
+        again. The scraping stops at the first page without new or updated actors instead of walking the whole list.
+    """
+
+    def __init__(self, driver, browse_page: BrowsePage, actor_page: ActorPage, message_provider: MessageProvider,
+                 logger: Logger, driver_factory: Optional[Callable[[], WebDriver]] = None,
+                 options: Optional[Dict[str, Any]] = None):
+        super().__init__(driver, browse_page, actor_page, message_provider, logger, driver_factory, options)
+        self.page_index = None
+        self.skip_ahead = False
+        # The saved date of every actor in the sort column, e.g. its 'Last update date'
+        self.saved_dates = {actor_id: parse_display_date(record.get(self.NEW_SINCE_SORT_COLUMN))
+                            for actor_id, record in iter_data(self.filename)}
+        # The known actors of the current page that were updated since they were saved
+        self.updated_ids = set()
+
+    def is_actor_scraped(self, actor_id: str) -> bool:
+        return actor_id in self.existing_ids and actor_id not in self.updated_ids
+
+    def get_cached_actor(self, actor_id: str) -> Optional[Dict[str, str]]:
+        # The cached details of an updated actor may be older than the update
+        if actor_id in self.updated_ids:
+            return None
+
+        return super().get_cached_actor(actor_id)
+
+    def find_updated_ids(self, actor_ids: List[str]) -> Set[str]:
+        """
+            Finds the known actors of the current page whose date in the sort column is later than the saved one.
+
+            Parameters:
+            - actor_ids: The actor IDs on the current page, in the order of the rows.
+
+            Returns:
+            - The IDs of the updated actors. Actors whose dates can not be compared are not counted as updated.
+        """
+        listed_dates = self.browse_page.find_column_values(self.NEW_SINCE_SORT_COLUMN)
+
+        updated_ids = set()
+
+        for actor_id, listed_date in zip(actor_ids, listed_dates):
+            saved_date = self.saved_dates.get(actor_id)
+
+            listed_date = parse_display_date(listed_date)
+
+            if actor_id in self.existing_ids and saved_date and listed_date and listed_date > saved_date:
+                updated_ids.add(actor_id)
+
+        return updated_ids
+
+    def save_existing_data(self) -> None:
+        """
+            Saves the scraped data and remembers the dates of the scraped actors.
+        """
+        for actor_id, record in self.new_data.items():
+            self.saved_dates[actor_id] = parse_display_date(record.get(self.NEW_SINCE_SORT_COLUMN))
+
+        self.updated_ids.difference_update(self.new_data)
+
+        super().save_existing_data()
+
+    def start_scraping_data(self) -> None:
+        """
+            Loads the list of the role sorted newest first and scrapes it until the first page without new actors.
+        """
+        self.load_role()
+
+        self.browse_page.accept_cookies()
+
+        self.browse_page.close_cookies_prompt_after_accept()
+
+        self.browse_page.choose_table_rows_per_page(self.ROWS_PER_PAGE)
+
+        self.browse_page.sort_table(self.NEW_SINCE_SORT_COLUMN)
+
+        self.total_records_found = self.browse_page.find_total_records()
+
+        self.message_provider.start_progress(self.total_records_found, len(self.existing_ids))
+
+        self.current_page = 1
+
+        self.resume_recycled_page()
+
+        self.scrape_pages()
+
+    def scrape_pages(self) -> None:
+        """
+            Scrapes the pages of the sorted table until a page has no new or updated actors.
+
+            The pages are not refreshed, a refresh would lose the sort order.
+        """
+        self.session_time = time.time()
+
+        while True:
+            self.check_resources()
+
+            self.loop_start_time = time.time()
+
+            self.browse_page.wait_for_table_to_load()
+
+            actor_ids = self.browse_page.find_actor_ids()
+
+            self.updated_ids = self.find_updated_ids(actor_ids)
+
+            if self.is_page_scraped(actor_ids):
+                self.message_provider.no_new_records_left(self.current_page)
+
+                self.logger.log_info(
+                    self.message_provider.app_messages.NO_NEW_RECORDS_LEFT_MESSAGE.format(page=self.current_page))
+
+                break
+
+            self.remaining_records = self.total_records_found - len(self.existing_ids)
+
+            self.process_table_rows(actor_ids)
+
+            self.display_session_info()
+
+            if len(self.new_data) > 0:
+                self.save_existing_data()
+                self.display_completion_time()
+
+            if not self.go_to_next_page_if_possible():
+                break
+
+
+class ListReconciler(Scraper):
+    """
+        Scraper that walks the whole list reading only the actor IDs, without opening any actor page, and marks the
+        scraped actors that are no longer listed as inactive (see reconciliation.py).
+
+        The IDs of the list are saved to {role}s_list_ids.txt. Nothing is marked when fewer actors were read than the
+        list has, e.g. because the pages shifted while walking them.
+    """
+
+    def __init__(self, driver, browse_page: BrowsePage, actor_page: ActorPage, message_provider: MessageProvider,
+                 logger: Logger, driver_factory: Optional[Callable[[], WebDriver]] = None,
+                 options: Optional[Dict[str, Any]] = None):
+        super().__init__(driver, browse_page, actor_page, message_provider, logger, driver_factory, options)
+        self.page_index = None
+        self.skip_ahead = False
+        self.list_ids_filename = f"{self.ROLE}s_list_ids.txt"
+        # The IDs read so far, kept when the browser is recycled so the list is not read again from the first page
+        self.list_ids = set()
+
+    def start_scraping_data(self) -> None:
+        """
+            Loads the list of the role with the most rows per page, reads all of its actor IDs and reconciles them
+            with the scraped data.
+        """
+        self.load_role()
+
+        self.browse_page.accept_cookies()
+
+        self.browse_page.close_cookies_prompt_after_accept()
+
+        self.browse_page.choose_table_rows_per_page(self.RECONCILE_ROWS_PER_PAGE)
+
+        self.total_records_found = self.browse_page.find_total_records()
+
+        self.current_page = 1
+
+        if self.resume_page is None:
+            self.list_ids = set()
+
+        self.resume_recycled_page()
+
+        self.scrape_pages()
+
+    def scrape_pages(self) -> None:
+        """
+            Reads the actor IDs of every page of the table and reconciles them with the scraped data.
+
+            Raises:
+                - ReconciliationRefused if the list could not be read completely or too many actors would be marked
+                  inactive.
+        """
+        list_ids = self.list_ids
+
+        while True:
+            self.check_resources()
+
+            self.browse_page.wait_for_table_to_load()
+
+            list_ids.update(self.browse_page.find_actor_ids())
+
+            if not self.go_to_next_page_if_possible():
+                break
+
+        save_id_list(list_ids, self.list_ids_filename)
+
+        if len(list_ids) < self.total_records_found:
+            raise ReconciliationRefused(f'Only {len(list_ids)} of {self.total_records_found} actors were read from the '
+                                        f'list, nothing is marked inactive.')
+
+        removed, reactivated, unscraped = reconcile(list_ids, self.filename, self.MAX_INACTIVE_FRACTION,
+                                                    self.DATA_SNAPSHOTS, self.changefeed)
+
+        self.message_provider.reconciliation_completed(len(list_ids), len(removed), len(reactivated), len(unscraped))
+
+        self.logger.log_info(self.message_provider.app_messages.RECONCILIATION_COMPLETED_MESSAGE.format(
+            listed=len(list_ids), removed=len(removed), reactivated=len(reactivated), unscraped=len(unscraped)))
+
+
+class DistributedWorker(Scraper):
+    """
+        Scraper that works on ranges of list pages leased from a coordinator (see coordination.py) instead of on
+        the whole list.
+
+        The records scraped on every page are sent to the coordinator, which also extends the lease of the work
+        unit. A background thread keeps sending heartbeats while a page takes long. If the lease is lost, the unit is
+        abandoned, because the coordinator already gave it to another worker.
+    """
+
+    def __init__(self, driver, browse_page: BrowsePage, actor_page: ActorPage, message_provider: MessageProvider,
+                 logger: Logger, client: CoordinatorClient, driver_factory: Optional[Callable[[], WebDriver]] = None,
+                 options: Optional[Dict[str, Any]] = None):
+        super().__init__(driver, browse_page, actor_page, message_provider, logger, driver_factory, options)
+        self.client = client
+        self.unit = None
+        self.page_index = None
+        # The coordinator writes the data file and its changes
+        self.changefeed = None
+        self.skip_ahead = False
+        self.lease_lost = threading.Event()
+        # The rows per page of the list, the ones of the work unit once one is leased
+        self.rows_per_page = self.ROWS_PER_PAGE
+
+    def start_scraping_data(self) -> None:
+        """
+            Opens the list and scrapes the work units leased from the coordinator until there are none left.
+        """
+        self.open_list()
+
+        self.total_records_found = self.browse_page.find_total_records()
+
+        self.existing_ids = self.client.get_ids()
+
+        self.message_provider.start_progress(self.total_records_found, len(self.existing_ids))
+
+        while (unit := self.client.lease(self.total_records_found)) is not None:
+            self.scrape_unit(unit)
+
+    def open_list(self) -> None:
+        """
+            Loads the list of the role on the first page.
+        """
+        self.load_role()
+
+        self.browse_page.accept_cookies()
+
+        self.browse_page.close_cookies_prompt_after_accept()
+
+        self.browse_page.choose_table_rows_per_page(self.rows_per_page)
+
+        self.current_page = 1
+
+    def go_to_page(self, page: int) -> bool:
+        """
+            Goes to the given list page through the paginator, see jump_to_page.
+
+            Parameters:
+            - page: The number of the page, starting from 1.
+
+            Returns:
+            - False if the list has fewer pages, True otherwise.
+        """
+        if page < self.current_page:
+            self.open_list()
+
+        self.jump_to_page(page)
+
+        return self.current_page == page
+
+    def scrape_unit(self, unit: WorkUnit) -> None:
+        """
+            Scrapes all the pages of a work unit and marks it as complete.
+
+            Parameters:
+            - unit: The leased work unit.
+        """
+        self.unit = unit
+
+        self.lease_lost.clear()
+
+        self.message_provider.working_on_unit(unit['first_page'], unit['last_page'])
+
+        stop_heartbeats = threading.Event()
+
+        threading.Thread(target=self.send_heartbeats, args=(unit['id'], stop_heartbeats), daemon=True).start()
+
+        try:
+            # The coordinator counted the pages of the unit with its own rows per page
+            if unit['rows_per_page'] != self.rows_per_page:
+                self.rows_per_page = unit['rows_per_page']
+
+                self.open_list()
+
+            if not self.go_to_page(unit['first_page']):
+                self.client.complete(unit['id'])
+                return
+
+            self.session_time = time.time()
+
+            for page in range(unit['first_page'], unit['last_page'] + 1):
+                # A recycled browser starts again with a new work unit, this one is leased again after LEASE_TIME
+                self.check_resources()
+
+                self.loop_start_time = time.time()
+
+                self.browse_page.wait_for_table_to_load()
+
+                actor_ids = self.browse_page.find_actor_ids()
+
+                self.remaining_records = self.total_records_found - len(self.existing_ids)
+
+                self.process_table_rows(actor_ids)
+
+                if len(self.new_data) > 0:
+                    self.save_existing_data()
+                    self.display_completion_time()
+
+                if self.lease_lost.is_set():
+                    self.logger.log_warning(f'Lease of work unit {unit["id"]} was lost, abandoning it.')
+                    return
+
+                if page == unit['last_page'] or not self.go_to_next_page_if_possible():
+                    break
+
+        finally:
+            stop_heartbeats.set()
+
+        self.client.complete(unit['id'])
+
+    def send_heartbeats(self, unit_id: int, stop: threading.Event) -> None:
+        """
+            Extends the lease of the work unit every HEARTBEAT_INTERVAL seconds until stopped.
+        """
+        while not stop.wait(self.HEARTBEAT_INTERVAL):
+            try:
+                if not self.client.heartbeat(unit_id):
+                    self.lease_lost.set()
+                    return
+            except Exception as e:
+                # The coordinator may be restarting, the next heartbeat will try again
+                self.logger.log_warning(f'Heartbeat for work unit {unit_id} failed: {e}')
+
+    def save_existing_data(self) -> None:
+        """
+        Send the scraped data to the coordinator.
+        """
+        if not self.client.submit(self.unit['id'], self.new_data):
+            self.lease_lost.set()
+
+        self.existing_ids.update(self.new_data)
+
+        self.new_data.clear()
+
+        self.message_provider.saved_current_scraped_data()
+
+        self.logger.log_info(self.message_provider.app_messages.SAVED_CURRENT_SCRAPED_DATA)
+
+
+class FailedActorsScraper(ScraperOptions):
+    """
+        Re-scrapes only the actors recorded in the dead-letter queue.
+
+        Every worker thread gets its own browser and opens the recorded actor URLs directly, so no list pages are
+        visited. With the playwright browser (see WebDriverOptions.BROWSER) the workers are coroutines instead, each
+        with a context of its own in a single browser process. Recovered actors are added to the scraped data and
+        removed from the queue.
+    """
+
+    def __init__(self, web_driver_options: WebDriverOptions, message_provider: MessageProvider, logger: Logger,
+                 workers: Optional[int] = None, options: Optional[Dict[str, Any]] = None):
+        super().__init__(options)
+        self.web_driver_options = web_driver_options
+        self.message_provider = message_provider
+        self.logger = logger
+        self.workers = workers or self.RETRY_WORKERS
+        self.filename = f"{self.ROLE}s_data.json"
+        self.dead_letter_queue = DeadLetterQueue(f"{self.ROLE}s_failed.json")
+        self.changefeed = Changefeed(f"{self.ROLE}s_changes", self.filename) if self.CHANGEFEED else None
+        self.page_archive = PageArchive(f"{self.ROLE}s_pages") if self.ARCHIVE_PAGE_SOURCE else None
+        # Reads the actor details captured by the previous runs, see Scraper.get_cached_actor
+        self.api_capture = ApiCapture(HttpCache(f"{self.ROLE}s_http_cache.sqlite3", self.HTTP_CACHE_TTL,
+                                                self.HTTP_CACHE_MAX_SIZE_MB * MEGABYTE)) \
+            if self.CAPTURE_API_RESPONSES else None
+        self.event_log = EventLog(f"{self.ROLE}s_events.jsonl")
+        self.resource_monitor = ResourceMonitor(self.RESOURCE_SAMPLE_INTERVAL, self.MEMORY_LIMIT_MB,
+                                                self.SYSTEM_MEMORY_LIMIT_PERCENT, self.SYSTEM_CPU_LIMIT_PERCENT,
+                                                self.record_resources)
+        # Starts with one browser and follows the load times of the website up to the given number of workers. It
+        # is also lowered when the system is short on resources, the extra threads then wait.
+        self.concurrency_limit = ConcurrencyLimit(1, max_limit=self.workers)
+        self.concurrency_controller = AIMDController(self.concurrency_limit, self.LATENCY_TARGET)
+        self.latency_tracker = LatencyTracker()
+        self.drivers = []
+        self.drivers_lock = threading.Lock()
+        self.local = threading.local()
+        # Started by run, the workers get contexts of it instead of browsers of their own
+        self.playwright_browser = (PlaywrightBrowser(web_driver_options)
+                                   if web_driver_options.BROWSER == PLAYWRIGHT_BROWSER else None)
+
+    def run(self) -> None:
+        """
+            Retries the failed actors in parallel and saves the recovered ones.
+        """
+        entries = self.dead_letter_queue.get_retryable(self.MAX_RETRY_ATTEMPTS)
+
+        self.message_provider.retrying_failed(len(entries), len(self.dead_letter_queue))
+
+        self.logger.log_info(self.message_provider.app_messages.RETRYING_FAILED_MESSAGE.format(
+            retryable=len(entries), failed=len(self.dead_letter_queue)))
+
+        self.message_provider.start_progress(len(entries))
+
+        recovered = {}
+
+        self.resource_monitor.start()
+
+        try:
+            if self.playwright_browser is not None:
+                asyncio.run(self.retry_with_playwright(entries, recovered))
+            else:
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    for result in executor.map(self.scrape_within_limits, entries):
+                        if result is not None:
+                            actor_id, actor_information = result
+
+                            recovered[actor_id] = actor_information
+
+        except KeyboardInterrupt:
+            self.message_provider.keyboard_interruption_msg()
+
+            self.logger.log_error(self.message_provider.app_messages.KEYBOARD_INTERRUPTION_MESSAGE)
+
+        finally:
+            self.resource_monitor.stop()
+
+            self.save_recovered_data(recovered)
+
+            self.cleanup()
+
+        self.message_provider.retry_completed(len(recovered), len(entries), self.filename)
+
+        self.logger.log_info(self.message_provider.app_messages.RETRY_COMPLETED_MESSAGE.format(
+            recovered=len(recovered), retryable=len(entries), filename=self.filename))
+
+    def get_actor_page(self) -> ActorPage:
+        """
+            Returns the ActorPage of the current worker thread, starting its browser on first use.
+        """
+        if not hasattr(self.local, 'actor_page'):
+            driver = create_driver(self.web_driver_options)
+
+            with self.drivers_lock:
+                self.drivers.append(driver)
+
+            self.local.actor_page = ActorPage(driver, self.web_driver_options.get_web_driver_wait_time,
+                                              self.web_driver_options.WEBDRIVER_POLL_FREQUENCY)
+
+        return self.local.actor_page
+
+    def get_thread_worker_id(self) -> str:
+        # Every thread has its own browser, so it is reported as a worker of its own
+        return f'{self.event_log.worker_id}/{threading.current_thread().name}'
+
+    def record_resources(self, sample: ResourceSample) -> None:
+        """
+            Shows a resource sample in the progress output and writes it to the event log.
+        """
+        self.message_provider.resources(sample['rss'] // MEGABYTE, sample['cpu_percent'])
+
+        self.event_log.emit(RESOURCES, **sample)
+
+    def check_resources(self) -> None:
+        """
+            Acts on the limits crossed since the last check.
+
+            If the scraper and its browsers use too much memory, the browser of the current thread is restarted. If
+            the system is short on memory or CPU, one browser fewer is used at a time.
+        """
+        action = self.resource_monitor.get_action()
+
+        sample = self.resource_monitor.latest
+
+        if action == RECYCLE_SESSION and hasattr(self.local, 'actor_page'):
+            self.message_provider.recycling_session(sample['rss'] // MEGABYTE)
+
+            self.event_log.emit(SESSION_RECYCLED, worker=self.get_thread_worker_id(), rss=sample['rss'])
+
+            driver = self.local.actor_page.driver
+
+            del self.local.actor_page
+
+            with self.drivers_lock:
+                self.drivers.remove(driver)
+
+            driver.quit()
+
+        elif action == THROTTLE:
+            self.reduce_concurrency(sample)
+
+    def reduce_concurrency(self, sample: ResourceSample) -> None:
+        """
+            Uses one browser fewer at a time because the system is short on memory or CPU.
+        """
+        workers = self.concurrency_limit.decrease()
+
+        self.message_provider.reduced_concurrency(sample['system_memory_percent'], sample['system_cpu_percent'],
+                                                  workers)
+
+        self.logger.log_warning(self.message_provider.app_messages.REDUCED_CONCURRENCY_MESSAGE.format(
+            memory_percent=sample['system_memory_percent'], cpu_percent=sample['system_cpu_percent'],
+            workers=workers))
+
+    def scrape_within_limits(self, entry: Dict[str, Union[str, int]]) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+            Scrapes a single actor from the dead-letter queue once the resource limits allow it.
+        """
+        self.check_resources()
+
+        with self.concurrency_limit:
+            return self.scrape_failed_actor(entry)
+
+    def scrape_failed_actor(self, entry: Dict[str, Union[str, int]]) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+            Scrapes a single actor from the dead-letter queue in the browser of the current thread, see retry_actor.
+
+            Parameters:
+            - entry: The dead-letter queue entry of the actor.
+
+            Returns:
+            - A tuple of the actor ID and the actor information, None if the actor failed again.
+        """
+        def load_page(actor_page: ActorPage, url: str, wait_time: float) -> Optional[str]:
+            actor_page.set_wait_time(wait_time)
+
+            actor_page.get_url(url)
+
+            actor_information = actor_page.wait_for_actor_information_to_load()
+
+            return None if isinstance(actor_information, WebElement) else actor_information
+
+        def extract_page(actor_page: ActorPage, wait_time: float) -> Dict[str, str]:
+            return extract_actor_information(actor_page, entry['Actor ID/SRN'], self.PARSE_PAGE_SOURCE,
+                                             self.page_archive)
+
+        return self.retry_actor(entry, self.get_thread_worker_id(), self.get_actor_page, load_page, extract_page)
+
+    def retry_actor(self, entry: Dict[str, Union[str, int]], worker: str, open_page: Callable[[], Any],
+                    load_page: Callable[[Any, str, float], Optional[str]],
+                    extract_page: Callable[[Any, float], Dict[str, str]]) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+            Retries a single actor from the dead-letter queue with the given page functions of a browser.
+
+            The actor is built from the HTTP cache if it can be. Otherwise its page is loaded, the load time adjusts
+            the wait time and the concurrency, and the actor information is extracted. The outcome is written to the
+            event log, and a failure to the dead-letter queue.
+
+            Parameters:
+            - entry: The dead-letter queue entry of the actor.
+            - worker: The worker ID for the event log.
+            - open_page: Returns the page to load the actor in, e.g. the ActorPage of the current thread.
+            - load_page: Loads the actor URL in the page, waiting at most the given time (in seconds) for the actor
+              information. Returns the timeout message if it did not come in time, None otherwise.
+            - extract_page: Returns the actor information of the loaded page.
+
+            Returns:
+            - A tuple of the actor ID and the actor information, None if the actor failed again.
+        """
+        actor_id, url = entry['Actor ID/SRN'], entry['Actor URL']
+
+        record_start_time = time.time()
+
+        cached_information = self.get_cached_actor(entry)
+
+        if cached_information is not None:
+            self.record_retry_success(worker, entry, record_start_time, cached=True)
+
+            return actor_id, cached_information
+
+        stage = DeadLetterQueue.STAGE_LOAD
+
+        try:
+            page = open_page()
+
+            wait_time = self.get_retry_wait_time()
+
+            load_start_time = time.time()
+
+            timeout_message = load_page(page, url, wait_time)
+
+            load_time = time.time() - load_start_time
+
+            self.latency_tracker.add(load_time)
+
+            if timeout_message is not None:
+                # The website did not respond in time, which is a sign it is overloaded
+                self.concurrency_controller.record_failure()
+
+                raise TimeoutException(timeout_message)
+
+            self.concurrency_controller.record_success(load_time)
+
+            stage = DeadLetterQueue.STAGE_EXTRACT
+
+            actor_information = extract_page(page, wait_time)
+
+        except Exception as e:
+            self.record_retry_failure(worker, entry, stage, e, record_start_time)
+
+            return None
+
+        self.record_retry_success(worker, entry, record_start_time)
+
+        return actor_id, actor_information
+
+    def get_cached_actor(self, entry: Dict[str, Union[str, int]]) -> Optional[Dict[str, str]]:
+        """
+            Builds the record of a failed actor from the HTTP cache, so its page is not opened again. The responses
+            are captured by the crawls with CAPTURE_API_RESPONSES.
+
+            Parameters:
+            - entry: The dead-letter queue entry of the actor.
+
+            Returns:
+            - A dictionary containing actor information, None if the actor page has to be opened.
+        """
+        if self.api_capture is None:
+            return None
+
+        return self.api_capture.get_cached_actor(entry['Actor ID/SRN'], entry['Actor URL'])
+
+    def get_retry_wait_time(self) -> float:
+        """
+            Returns how long a worker waits for an actor page, following the load times if ADAPTIVE_WAIT_TIME is on.
+        """
+        if not self.ADAPTIVE_WAIT_TIME:
+            return self.web_driver_options.get_web_driver_wait_time
+
+        return round(self.latency_tracker.get_timeout(self.web_driver_options.get_web_driver_wait_time,
+                                                      self.MIN_WAIT_TIME, self.MAX_WAIT_TIME,
+                                                      self.WAIT_TIME_P95_FACTOR))
+
+    def record_retry_failure(self, worker: str, entry: Dict[str, Union[str, int]], stage: str, exception: Exception,
+                             record_start_time: float) -> None:
+        """
+            Reports an actor that failed again and records it in the dead-letter queue.
+        """
+        actor_id, url = entry['Actor ID/SRN'], entry['Actor URL']
+
+        self.event_log.emit(RECORD, worker=worker, actor_id=actor_id, outcome=FAILED, stage=stage,
+                            error=str(exception), duration=time.time() - record_start_time)
+
+        self.dead_letter_queue.record_failure(actor_id, url, stage, str(exception))
+
+        self.message_provider.record_failed(actor_id, stage, exception)
+
+        self.logger.log_error(self.message_provider.app_messages.RECORD_FAILED_MESSAGE.format(
+            actor_id=actor_id, stage=stage, exception=str(exception)))
+
+    def record_retry_success(self, worker: str, entry: Dict[str, Union[str, int]], record_start_time: float,
+                             cached: bool = False) -> None:
+        self.event_log.emit(RECORD, worker=worker, actor_id=entry['Actor ID/SRN'], outcome=SCRAPED,
+                            duration=time.time() - record_start_time, **({'cached': True} if cached else {}))
+
+        self.message_provider.completed_record(entry['Actor URL'])
+
+    async def retry_with_playwright(self, entries: List[Dict[str, Union[str, int]]],
+                                    recovered: Dict[str, Dict[str, str]]) -> None:
+        """
+            Retries the failed actors with the Playwright browser and a worker coroutine for every context.
+
+            Parameters:
+            - entries: The dead-letter queue entries to retry.
+            - recovered: The recovered actor information by actor ID, filled as the actors are scraped.
+        """
+        browser = self.playwright_browser
+
+        queue = asyncio.Queue()
+
+        for entry in entries:
+            queue.put_nowait(entry)
+
+        # Every worker retries its actor in a thread of its own, see scrape_failed_actor_with_playwright
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=self.workers))
+
+        try:
+            await browser.start()
+
+            await asyncio.gather(*(self.run_playwright_worker(browser, queue, index, recovered)
+                                   for index in range(min(self.workers, len(entries)))))
+        finally:
+            await browser.stop()
+
+            self.logger.log_info('Cleaning up the driver resources.')
+
+    async def run_playwright_worker(self, browser: PlaywrightBrowser, queue: asyncio.Queue, index: int,
+                                    recovered: Dict[str, Dict[str, str]]) -> None:
+        """
+            Scrapes actors from the queue in a context of its own until the queue is empty.
+
+            The workers whose index is not below the concurrency limit wait, like the threads of the Selenium
+            browsers do, so the number of pages loading at once follows the load times and the system resources.
+
+            Parameters:
+            - browser: The PlaywrightBrowser.
+            - queue: The dead-letter queue entries left to scrape.
+            - index: The index of the worker.
+            - recovered: The recovered actor information by actor ID.
+        """
+        worker = f'{self.event_log.worker_id}/context-{index}'
+
+        page = None
+
+        try:
+            while not queue.empty():
+                if index >= self.concurrency_limit.limit:
+                    await asyncio.sleep(self.web_driver_options.WEBDRIVER_POLL_FREQUENCY)
+
+                    continue
+
+                entry = queue.get_nowait()
+
+                if self.check_context_resources(worker) and page is not None:
+                    # A new context starts with an empty cache and a fresh renderer
+                    await browser.close_page(page)
+
+                    page = None
+
+                if page is None:
+                    page = await browser.new_page()
+
+                result = await self.scrape_failed_actor_with_playwright(browser, page, entry, worker)
+
+                if result is not None:
+                    actor_id, actor_information = result
+
+                    recovered[actor_id] = actor_information
+        finally:
+            if page is not None:
+                await browser.close_page(page)
+
+    def check_context_resources(self, worker: str) -> bool:
+        """
+            Acts on the limits crossed since the last check, see check_resources.
+
+            Returns:
+            - True if the context of the worker has to be recycled because the scraper uses too much memory.
+        """
+        action = self.resource_monitor.get_action()
+
+        sample = self.resource_monitor.latest
+
+        if action == RECYCLE_SESSION:
+            self.message_provider.recycling_session(sample['rss'] // MEGABYTE)
+
+            self.event_log.emit(SESSION_RECYCLED, worker=worker, rss=sample['rss'])
+
+            return True
+
+        if action == THROTTLE:
+            self.reduce_concurrency(sample)
+
+        return False
+
+    async def scrape_failed_actor_with_playwright(self, browser: PlaywrightBrowser, page: 'Page',
+                                                  entry: Dict[str, Union[str, int]],
+                                                  worker: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+            Scrapes a single actor from the dead-letter queue in a Playwright page, see retry_actor. The page source
+            is always parsed locally, whatever PARSE_PAGE_SOURCE is.
+
+            retry_actor runs in a thread, so parsing and the files do not block the other pages. It drives the page
+            through the event loop.
+
+            Parameters:
+            - browser: The PlaywrightBrowser.
+            - page: The page of the worker.
+            - entry: The dead-letter queue entry of the actor.
+            - worker: The worker ID for the event log.
+
+            Returns:
+            - A tuple of the actor ID and the actor information, None if the actor failed again.
+        """
+        loop = asyncio.get_running_loop()
+
+        def run_in_loop(coroutine: Coroutine) -> Any:
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+        def load_page(page: 'Page', url: str, wait_time: float) -> Optional[str]:
+            try:
+                run_in_loop(browser.get_url(page, url, wait_time))
+            except browser.timeout_error as e:
+                return str(e)
+
+            actor_information = run_in_loop(browser.wait_for_presence(page, ACTOR_INFORMATION, wait_time))
+
+            return actor_information if isinstance(actor_information, str) else None
+
+        def extract_page(page: 'Page', wait_time: float) -> Dict[str, str]:
+            run_in_loop(browser.wait_for_presence(page, ACTOR_INFORMATION_CONTAINER, wait_time))
+            run_in_loop(browser.wait_for_presence(page, INFORMATION_LAST_UPDATED, wait_time))
+
+            page_source = run_in_loop(page.content())
+
+            actor_information = parse_actor_html(page_source, page.url)
+
+            if self.page_archive is not None:
+                self.page_archive.add(entry['Actor ID/SRN'], actor_information['Actor URL'], page_source)
+
+            return actor_information
+
+        return await asyncio.to_thread(self.retry_actor, entry, worker, lambda: page, load_page, extract_page)
+
+    def save_recovered_data(self, recovered: Dict[str, Dict[str, str]]) -> None:
+        """
+            Adds the recovered actors to the scraped data and removes them from the dead-letter queue.
+
+            Parameters:
+            - recovered: The recovered actor information by actor ID.
+        """
+        if not recovered:
+            return
+
+        if self.changefeed is not None:
+            self.changefeed.update_data(recovered, self.filename, self.DATA_SNAPSHOTS)
+        else:
+            update_data(recovered, self.filename, self.DATA_SNAPSHOTS)
+
+        for actor_id in recovered:
+            self.dead_letter_queue.resolve(actor_id)
+
+    def cleanup(self) -> None:
+        """
+            Quits the browsers of all worker threads.
+        """
+        for driver in self.drivers:
+            driver.quit()
+
+        self.logger.log_info('Cleaning up the driver resources.')
+
+
+def run_replay(recording_directory: str, latency: float, message_provider: MessageProvider,
+               config: Optional[Config] = None) -> str:
+    """
+        Crawls a recorded crawl again through a local replay server instead of the website, to test or benchmark the
+        scraper with the same pages every time.
+
+        The data, the event log, the log file and the other files of the run are saved to
+        <recording directory>/runs/<time>/, so the real data is left untouched. The scraper works in that directory
+        while it runs, the previous working directory is restored afterwards.
+
+        Parameters:
+        - recording_directory: The directory of the recording, see ScraperOptions.RECORD_DIRECTORY.
+        - latency: How long (in seconds) every response is delayed, to replay the load times of the website.
+        - message_provider: MessageProvider used to display messages.
+        - config: The options of the run, the defaults if None.
+
+        Returns:
+        - The directory of the run.
+    """
+    config = config or Config()
+
+    recording = Recording(recording_directory)
+
+    run_directory = os.path.abspath(os.path.join(recording_directory, 'runs', time.strftime('%Y%m%d-%H%M%S')))
+
+    os.makedirs(run_directory)
+
+    logger = Logger(os.path.join(run_directory, Logger.LOG_FILE_NAME))
+
+    replay_server = ReplayServer(recording, latency=latency)
+
+    replay_server.start()
+
+    message_provider.replay_started(len(recording), replay_server.url, run_directory)
+
+    web_driver_options = config.get_web_driver_options(arguments=replay_server.get_browser_arguments())
+
+    def driver_factory() -> WebDriver:
+        return create_driver(web_driver_options)
+
+    previous_directory = os.getcwd()
+
+    scraper = None
+
+    try:
+        driver = driver_factory()
+
+        browse_page = BrowsePage(driver, web_driver_options.get_web_driver_wait_time,
+                                 web_driver_options.WEBDRIVER_POLL_FREQUENCY)
+        browse_page.set_base_url(replay_server.get_url(EUDAMED_URL))
+
+        actor_page = ActorPage(driver, web_driver_options.get_web_driver_wait_time,
+                               web_driver_options.WEBDRIVER_POLL_FREQUENCY)
+
+        # The scraper saves its files to the working directory
+        os.chdir(run_directory)
+
+        scraper = Scraper(driver, browse_page, actor_page, message_provider, logger, driver_factory, config.scraper)
+
+        scraper.run()
+    finally:
+        replay_server.stop()
+
+        # The report is read from the event log, so the queued events have to be written first
+        if scraper is not None:
+            scraper.event_log.close()
+
+        os.chdir(previous_directory)
+
+    message_provider.replay_completed(replay_server.served, replay_server.missed)
+
+    logger.log_info(message_provider.app_messages.REPLAY_COMPLETED_MESSAGE.format(served=replay_server.served,
+                                                                                  missed=replay_server.missed))
+
+    logger.stop()
+
+    return run_directory
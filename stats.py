@@ -0,0 +1,91 @@
+import os
+import time
+from typing import Any, Dict
+
+from data_handling import get_snapshot_filename, iter_data
+from dead_letter import DeadLetterQueue
+from page_index import PageIndex
+from reconciliation import load_id_list
+from records import INACTIVE_SINCE_FIELD
+
+
+def build_stats(role: str, max_attempts: int) -> Dict[str, Any]:
+    """
+        Collects the state of the scraped data of a role from its files, without a browser: the scraped and inactive
+        actors, the failed actors, the list pages complete in the last run and the page a crawl resumes from.
+
+        Args:
+            - role: The role, e.g. importer.
+            - max_attempts: The maximum number of attempts of a failed actor, see ScraperOptions.MAX_RETRY_ATTEMPTS.
+
+        Returns:
+            - A dictionary with the stats.
+    """
+    filename = f'{role}s_data.json'
+
+    actor_ids = set()
+    inactive = 0
+
+    for actor_id, record in iter_data(filename):
+        actor_ids.add(actor_id)
+
+        if record.get(INACTIVE_SINCE_FIELD):
+            inactive += 1
+
+    snapshots = 0
+
+    while os.path.exists(get_snapshot_filename(filename, snapshots + 1)):
+        snapshots += 1
+
+    dead_letter_queue = DeadLetterQueue(f'{role}s_failed.json')
+
+    page_index = PageIndex(f'{role}s_page_index.json')
+
+    # The first page of a crawl that is not jumped over, see Scraper.skip_scraped_pages
+    resume_page = page_index.find_skip_target(1) + 1 if page_index.is_complete(1) else 1
+
+    list_ids = load_id_list(f'{role}s_list_ids.txt')
+
+    return {
+        'filename': filename,
+        'modified': os.path.getmtime(filename) if os.path.exists(filename) else None,
+        'size': os.path.getsize(filename) if os.path.exists(filename) else 0,
+        'snapshots': snapshots,
+        'records': len(actor_ids),
+        'inactive': inactive,
+        'failed': len(dead_letter_queue),
+        'retryable': len(dead_letter_queue.get_retryable(max_attempts)),
+        'total_records': page_index.previous_total_records,
+        'pages': len(page_index.pages),
+        'complete_pages': sum(1 for entry in page_index.pages.values() if entry['complete']),
+        'resume_page': resume_page,
+        'listed': len(list_ids),
+        'unscraped': len(list_ids - actor_ids),
+    }
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """
+        Formats the stats built by build_stats as text.
+
+        Args:
+            - stats: The stats.
+
+        Returns:
+            - The text of the stats.
+    """
+    modified = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats['modified'])) if stats['modified'] else '-'
+
+    lines = [
+        f'Data: {stats["filename"]}, {stats["size"] / 1024 / 1024:.1f} MB, last saved {modified}, '
+        f'{stats["snapshots"]} snapshot(s)',
+        f'Actors: {stats["records"]} scraped, {stats["inactive"]} of them inactive',
+        f'Failed actors: {stats["failed"]}, {stats["retryable"]} can be retried with retry-failed',
+        f'List: {stats["total_records"] or "-"} records in the last crawl, {stats["complete_pages"]} of '
+        f'{stats["pages"]} visited pages complete, a crawl resumes from page {stats["resume_page"]}',
+    ]
+
+    if stats['listed']:
+        lines.append(f'Last reconciliation: {stats["listed"]} actors listed, {stats["unscraped"]} not scraped yet')
+
+    return '\n'.join(lines)
@@ -0,0 +1,171 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium.common import NoSuchElementException
+
+from pages.locators import ACTOR_ID_CELLS, BODY_ROWS, COLUMN_HEADERS, NEXT_PAGE_BUTTON, PAGE_LINKS, PAGINATOR, \
+    RESULTS_TABLE, RESULTS_TABLE_BODY_ROW, SORTABLE_COLUMN_HEADERS
+
+# The columns of the fake table, the actor ID is the first one like on the website
+COLUMNS = ['Actor ID/SRN', 'Name', 'Last update date']
+
+ASCENDING = 'ascending'
+DESCENDING = 'descending'
+
+
+class FakeElement:
+    """
+        An element of FakeTableDriver, its child elements are found through the driver.
+    """
+
+    def __init__(self, driver: 'FakeTableDriver', name: str, text: str = '', attributes: Optional[Dict] = None,
+                 on_click: Optional[Callable[[], None]] = None):
+        self.driver = driver
+        self.name = name
+        self.text = text
+        self.attributes = attributes or {}
+        self.on_click = on_click
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.attributes.get(name)
+
+    def click(self) -> None:
+        if self.on_click is not None:
+            self.on_click()
+
+    def find_element(self, by: str, value: str) -> 'FakeElement':
+        elements = self.find_elements(by, value)
+
+        if not elements:
+            raise NoSuchElementException(f'{self.name} has no {value}')
+
+        return elements[0]
+
+    def find_elements(self, by: str, value: str) -> List['FakeElement']:
+        return self.driver.find_children(self.name, (by, value))
+
+
+class FakeTableDriver:
+    """
+        A WebDriver showing the search results table of EUDAMED: rows of (actor ID, name, last update date), a
+        paginator and sortable column headers.
+
+        Like on the website, the table element stays the same when the page changes or the table is sorted, and the
+        new rows are only rendered after render_delay reads of the rows. Until then the old rows are shown.
+    """
+
+    def __init__(self, rows: List[Tuple[str, str, str]], rows_per_page: int = 10, render_delay: int = 2):
+        self.rows = rows
+        self.rows_per_page = rows_per_page
+        self.render_delay = render_delay
+        # The page and the sort order requested by the last click, and the ones of the rendered rows
+        self.state = (1, None)
+        self.shown_state = self.state
+        self.pending_reads = 0
+        self.current_url = 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo'
+
+    @property
+    def page_count(self) -> int:
+        return (len(self.rows) + self.rows_per_page - 1) // self.rows_per_page
+
+    def get_rows(self, state: Tuple[int, Optional[str]]) -> List[Tuple[str, str, str]]:
+        page, order = state
+
+        rows = self.rows if order is None else sorted(self.rows, key=lambda row: row[2], reverse=order == DESCENDING)
+
+        return rows[(page - 1) * self.rows_per_page:page * self.rows_per_page]
+
+    def get_shown_rows(self) -> List[Tuple[str, str, str]]:
+        if self.pending_reads > 0:
+            self.pending_reads -= 1
+
+            if self.pending_reads == 0:
+                self.shown_state = self.state
+
+        return self.get_rows(self.shown_state)
+
+    def change_state(self, page: int, order: Optional[str]) -> None:
+        self.state = (page, order)
+        self.pending_reads = self.render_delay
+
+        if self.render_delay == 0:
+            self.shown_state = self.state
+
+    def go_to(self, page: int) -> None:
+        self.change_state(page, self.state[1])
+
+    def sort(self) -> None:
+        # Like PrimeNG: no order, then ascending, then descending, and the table goes back to the first page
+        order = {None: ASCENDING, ASCENDING: DESCENDING, DESCENDING: ASCENDING}[self.state[1]]
+
+        self.change_state(1, order)
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        elements = self.find_elements(by, value)
+
+        if not elements:
+            raise NoSuchElementException(value)
+
+        return elements[0]
+
+    def find_elements(self, by: str, value: str) -> List[FakeElement]:
+        if (by, value) == RESULTS_TABLE:
+            return [FakeElement(self, 'table')]
+
+        if (by, value) == RESULTS_TABLE_BODY_ROW:
+            return self.find_children('table', BODY_ROWS)
+
+        if (by, value) == PAGINATOR:
+            return [FakeElement(self, 'paginator')]
+
+        return []
+
+    def find_children(self, name: str, location: Tuple[str, str]) -> List[FakeElement]:
+        if name == 'table' and location == BODY_ROWS:
+            return [FakeElement(self, f'row {row[0]}', '\n'.join(row)) for row in self.get_rows(self.shown_state)]
+
+        if name == 'table' and location == COLUMN_HEADERS:
+            return [FakeElement(self, f'header {title}', title) for title in COLUMNS]
+
+        if name == 'table' and location == SORTABLE_COLUMN_HEADERS:
+            # The header shows the requested order before the rows are rendered
+            return [FakeElement(self, f'header {title}', title, {'aria-sort': self.state[1] or 'none'}, self.sort)
+                    for title in COLUMNS[1:]]
+
+        if name == 'paginator' and location == NEXT_PAGE_BUTTON:
+            page = self.shown_state[0]
+
+            disabled = ' p-disabled' if page >= self.page_count else ''
+
+            return [FakeElement(self, 'next', attributes={'class': f'p-paginator-next{disabled}'},
+                                on_click=lambda: self.go_to(page + 1))]
+
+        if name == 'paginator' and location == PAGE_LINKS:
+            page = self.shown_state[0]
+
+            # The paginator shows five page links around the current page
+            first_page = max(1, min(page - 2, self.page_count - 4))
+
+            return [FakeElement(self, f'page {link}', str(link), on_click=lambda link=link: self.go_to(link))
+                    for link in range(first_page, min(first_page + 5, self.page_count + 1))]
+
+        return []
+
+    def execute_script(self, script: str, selector: str) -> List[str]:
+        rows = self.get_shown_rows()
+
+        if selector == ACTOR_ID_CELLS[1]:
+            return [row[0] for row in rows]
+
+        # The cells of another column, see BrowsePage.find_column_values
+        column = int(selector.rsplit('nth-child(', 1)[1].rstrip(')')) - 1
+
+        return [row[column] for row in rows]
+
+    def refresh(self) -> None:
+        pass
+
+    def back(self) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
@@ -0,0 +1,48 @@
+import os
+import unittest
+from typing import List, Optional
+
+from replay import Recording, ReplayServer
+
+# A recording made with ScraperOptions.RECORD_DIRECTORY. When the environment variable is set, the browser tests run
+# against a replay server of the recording instead of the website.
+RECORDING_DIRECTORY = os.environ.get('EUDAMED_RECORDING')
+
+# Without a recording the browser tests need Chrome and the website, so they only run when this environment variable
+# is set to 1, true, yes or on
+LIVE_TESTS = os.environ.get('EUDAMED_LIVE_TESTS', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Whether the browser tests run, see the skipUnless decorators of the tests
+BROWSER_TESTS = bool(RECORDING_DIRECTORY) or LIVE_TESTS
+
+BROWSER_TESTS_SKIP_REASON = 'Set EUDAMED_RECORDING to a recording, or EUDAMED_LIVE_TESTS=1 to use the website'
+
+
+def start_replay_server(test_case: unittest.TestCase) -> Optional[ReplayServer]:
+    """
+        Starts a replay server of the recording for a test and stops it after the test.
+
+        Args:
+            - test_case: The test.
+
+        Returns:
+            - The replay server, None if there is no recording.
+    """
+    if not RECORDING_DIRECTORY:
+        return None
+
+    replay_server = ReplayServer(Recording(RECORDING_DIRECTORY))
+
+    replay_server.start()
+
+    test_case.addCleanup(replay_server.stop)
+
+    return replay_server
+
+
+def get_browser_arguments(replay_server: Optional[ReplayServer]) -> List[str]:
+    return replay_server.get_browser_arguments() if replay_server else []
+
+
+def get_url(replay_server: Optional[ReplayServer], url: str) -> str:
+    return replay_server.get_url(url) if replay_server else url
@@ -5,8 +5,11 @@ from selenium import webdriver
 
 from main import WebDriverOptions
 from pages.actor_page import ActorPage
+from tests.replay_fixture import BROWSER_TESTS, BROWSER_TESTS_SKIP_REASON, get_browser_arguments, get_url, \
+    start_replay_server
 
 
+@unittest.skipUnless(BROWSER_TESTS, BROWSER_TESTS_SKIP_REASON)
 class TestActorPage(unittest.TestCase):
     TEST_URL = 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo/22938fc4-eadb-459b-9a6a-14defd0275c8'
 
@@ -36,11 +39,13 @@ class TestActorPage(unittest.TestCase):
     }
 
     def setUp(self) -> None:
-        self.web_driver_options = WebDriverOptions(wait_time=3)
+        self.replay_server = start_replay_server(self)
+
+        self.web_driver_options = WebDriverOptions(wait_time=3, arguments=get_browser_arguments(self.replay_server))
 
         self.driver = webdriver.Chrome(options=self.web_driver_options.get_driver_options())
 
-        self.driver.get(self.TEST_URL)
+        self.driver.get(get_url(self.replay_server, self.TEST_URL))
 
         self.actor_page = ActorPage(self.driver, self.web_driver_options.get_web_driver_wait_time)
 
@@ -112,4 +117,6 @@ class TestActorPage(unittest.TestCase):
     def test_extract_actor_information(self):
         actor_information = self.actor_page.extract_actor_information()
 
-        self.assertEqual(self.EXPECTED_DATA, actor_information)
+        expected_data = {**self.EXPECTED_DATA, 'Actor URL': get_url(self.replay_server, self.TEST_URL)}
+
+        self.assertEqual(expected_data, actor_information)
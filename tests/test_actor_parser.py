@@ -0,0 +1,54 @@
+import os
+import unittest
+
+from pages.actor_parser import parse_actor_html, parse_dl_texts, parse_last_updated
+
+
+class TestActorParser(unittest.TestCase):
+    TEST_URL = 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo/22938fc4-eadb-459b-9a6a-14defd0275c8'
+
+    TEST_PAGE = os.path.join(os.path.dirname(__file__), 'fixtures', 'actor_page.html')
+
+    EXPECTED_DATA = {
+        "Actor ID/SRN": "AD-MF-000001354",
+        "Role": "Manufacturer",
+        "Country": "Andorra",
+        "Actor/Organisation name": "SOADCO, S.L. [ES]",
+        "Abbreviated name": "SOADCO, S.L. [ES]",
+        "VAT number": "-",
+        "EORI": "BEAD923395B",
+        "National trade register": "923395B",
+        "Last confirmation date of actor data accuracy": "-",
+        "Street name": "Av. del Pessebre",
+        "Street number": "76-82",
+        "Address line 2": "-",
+        "PO box": "-",
+        "City name": "Escaldes-Engordany",
+        "Postal Code": "AD700",
+        "Latitude": "42.513416",
+        "Longitude": "1.535454",
+        "Email": "maria.mitjaneta@soadco.com",
+        "Telephone number": "+37 6 800 590",
+        "Web site": "-",
+        "Last update date": "2021-02-11",
+        "Actor URL": TEST_URL
+    }
+
+    def test_parse_actor_html(self):
+        with open(self.TEST_PAGE, encoding='utf-8') as file:
+            html = file.read()
+
+        self.assertEqual(self.EXPECTED_DATA, parse_actor_html(html, self.TEST_URL))
+
+    def test_parse_actor_html_without_actor_information(self):
+        with self.assertRaises(ValueError):
+            parse_actor_html('<html><body><app-root></app-root></body></html>', self.TEST_URL)
+
+    def test_parse_dl_texts(self):
+        dl_texts = ["Role\nManufacturer", "Street number\n123 Street", "Actor identification", "Phone number"]
+
+        self.assertEqual({'Role': 'Manufacturer', 'Street number': '123 Street', 'Phone number': '-'},
+                         parse_dl_texts(dl_texts))
+
+    def test_parse_last_updated(self):
+        self.assertEqual({'Last update date': '2021-02-11'}, parse_last_updated('Last update date: 2021-02-11'))
@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+import unittest
+
+from selenium.common import WebDriverException
+
+from api_capture import ApiCapture, build_actor_record
+from http_cache import HttpCache
+from replay import Recording, RECORDED_URL_PATTERN
+
+ACTOR_URL = 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo/1d2f1f2e'
+DETAIL_URL = 'https://ec.europa.eu/tools/eudamed/api/actors/1d2f1f2e/publicInformation'
+
+ACTOR_JSON = {
+    'srn': 'AD-MF-000001354',
+    'actorType': {'code': 'refdata.actor-type.manufacturer'},
+    'countryName': 'Andorra',
+    'name': 'Example Medical',
+    'actorAddress': {'streetName': 'Carrer Major', 'cityName': 'Andorra la Vella', 'latitude': 42.5},
+    'lastUpdateDate': '2021-02-11T10:15:00.000+01:00',
+}
+
+
+def create_log_entry(method, params):
+    return {'level': 'INFO', 'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class FakeDriver:
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.log = []
+        self.current_url = ACTOR_URL
+
+    def load(self, request_id, url, mime_type='application/json', finished=True):
+        self.log.append(create_log_entry('Network.responseReceived', {
+            'requestId': request_id,
+            'response': {'url': url, 'status': 200, 'headers': {'ETag': '"v1"'}, 'mimeType': mime_type}}))
+
+        if finished:
+            self.log.append(create_log_entry('Network.loadingFinished', {'requestId': request_id}))
+
+    def get_log(self, log_type):
+        entries, self.log = self.log, []
+
+        return entries
+
+    def execute_cdp_cmd(self, command, params):
+        if params['requestId'] not in self.bodies:
+            raise WebDriverException('No resource with given identifier found')
+
+        return {'body': self.bodies[params['requestId']], 'base64Encoded': False}
+
+
+class TestBuildActorRecord(unittest.TestCase):
+    def test_build_actor_record(self):
+        actor_information = build_actor_record(ACTOR_JSON, ACTOR_URL)
+
+        self.assertEqual('AD-MF-000001354', actor_information['Actor ID/SRN'])
+        self.assertEqual('Manufacturer', actor_information['Role'])
+        self.assertEqual('Andorra la Vella', actor_information['City name'])
+        self.assertEqual('42.5', actor_information['Latitude'])
+        self.assertEqual('-', actor_information['PO box'])
+        self.assertEqual('2021-02-11', actor_information['Last update date'])
+        self.assertEqual(ACTOR_URL, actor_information['Actor URL'])
+
+    def test_missing_required_field(self):
+        self.assertIsNone(build_actor_record({**ACTOR_JSON, 'name': None}, ACTOR_URL))
+        self.assertIsNone(build_actor_record([ACTOR_JSON], ACTOR_URL))
+
+
+class TestApiCapture(unittest.TestCase):
+    def test_collect(self):
+        driver = FakeDriver({'1': json.dumps(ACTOR_JSON), '2': 'body { color: red }'})
+
+        with tempfile.TemporaryDirectory() as directory:
+            http_cache = HttpCache(os.path.join(directory, 'cache.sqlite3'), 60, 1024 * 1024)
+
+            api_capture = ApiCapture(http_cache)
+
+            driver.load('1', DETAIL_URL)
+            driver.load('2', 'https://ec.europa.eu/tools/eudamed/styles.css', mime_type='text/css')
+
+            collected = api_capture.collect(driver)
+
+            self.assertEqual([DETAIL_URL], [response['url'] for response in collected])
+            self.assertEqual(ACTOR_JSON, collected[0]['data'])
+            self.assertEqual(json.dumps(ACTOR_JSON).encode('utf-8'), http_cache.get(DETAIL_URL)['body'])
+
+            http_cache.close()
+
+    def test_get_cached_actor(self):
+        driver = FakeDriver({'1': json.dumps(ACTOR_JSON)})
+
+        with tempfile.TemporaryDirectory() as directory:
+            http_cache = HttpCache(os.path.join(directory, 'cache.sqlite3'), 60, 1024 * 1024)
+
+            driver.load('1', DETAIL_URL)
+
+            ApiCapture(http_cache).collect(driver)
+
+            # A later run finds the actor in the cache, without a browser
+            api_capture = ApiCapture(http_cache)
+
+            actor_information = api_capture.get_cached_actor('AD-MF-000001354')
+
+            self.assertEqual('Example Medical', actor_information['Actor/Organisation name'])
+            self.assertEqual(ACTOR_URL, actor_information['Actor URL'])
+            self.assertIsNone(api_capture.get_cached_actor('AD-MF-000001355'))
+            self.assertIsNone(ApiCapture().get_cached_actor('AD-MF-000001354'))
+
+            http_cache.ttl = 0
+
+            self.assertIsNone(api_capture.get_cached_actor('AD-MF-000001354'))
+
+            http_cache.close()
+
+    def test_record(self):
+        driver = FakeDriver({'1': json.dumps(ACTOR_JSON), '2': 'body { color: red }'})
+
+        with tempfile.TemporaryDirectory() as directory:
+            recording = Recording(directory)
+
+            api_capture = ApiCapture(recording, url_pattern=RECORDED_URL_PATTERN, json_only=False)
+
+            driver.load('1', DETAIL_URL)
+            driver.load('2', 'https://ec.europa.eu/tools/eudamed/styles.css', mime_type='text/css')
+
+            # Only the JSON is kept in memory, everything is recorded
+            self.assertEqual(1, len(api_capture.collect(driver)))
+            self.assertEqual(b'body { color: red }', recording.get('/tools/eudamed/styles.css')['body'])
+
+    def test_waits_for_loading_to_finish(self):
+        driver = FakeDriver({'1': json.dumps(ACTOR_JSON)})
+
+        api_capture = ApiCapture()
+
+        driver.load('1', DETAIL_URL, finished=False)
+
+        self.assertEqual([], api_capture.collect(driver))
+
+        driver.log.append(create_log_entry('Network.loadingFinished', {'requestId': '1'}))
+
+        self.assertEqual(1, len(api_capture.collect(driver)))
+        self.assertEqual({}, api_capture.pending)
+
+    def test_unavailable_body_is_skipped(self):
+        driver = FakeDriver({})
+
+        api_capture = ApiCapture()
+
+        driver.load('1', DETAIL_URL)
+
+        self.assertEqual([], api_capture.collect(driver))
+
+    def test_wait_for_actor(self):
+        driver = FakeDriver({'1': json.dumps(ACTOR_JSON)})
+
+        api_capture = ApiCapture()
+
+        driver.load('1', DETAIL_URL)
+
+        actor_information = api_capture.wait_for_actor(driver, 'AD-MF-000001354', 1)
+
+        self.assertEqual('Example Medical', actor_information['Actor/Organisation name'])
+
+    def test_wait_for_actor_stops(self):
+        driver = FakeDriver({'1': json.dumps(ACTOR_JSON)})
+
+        api_capture = ApiCapture()
+
+        driver.load('1', DETAIL_URL)
+
+        self.assertIsNone(api_capture.wait_for_actor(driver, 'AD-MF-000000001', 10, stop=lambda: True))
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from archive import PageArchive, reextract
+from data_handling import load_data
+
+
+class TestPageArchive(unittest.TestCase):
+    TEST_URL = 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo/22938fc4-eadb-459b-9a6a-14defd0275c8'
+
+    TEST_PAGE = os.path.join(os.path.dirname(__file__), 'fixtures', 'actor_page.html')
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.page_archive = PageArchive(os.path.join(self.temp_dir.name, 'importers_pages'))
+
+        with open(self.TEST_PAGE, encoding='utf-8') as file:
+            self.html = file.read()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_add_is_content_addressed(self):
+        first_hash = self.page_archive.add('AD-MF-000001354', self.TEST_URL, self.html, fetched_at=0)
+        second_hash = self.page_archive.add('AD-MF-000001354', self.TEST_URL, self.html, fetched_at=60)
+
+        self.assertEqual(first_hash, second_hash)
+        self.assertEqual(2, len(list(self.page_archive.iter_entries())))
+        self.assertEqual(self.html, self.page_archive.read(first_hash))
+
+    def test_get_latest(self):
+        self.page_archive.add('AD-MF-000001354', self.TEST_URL, '<html>old</html>', fetched_at=0)
+        self.page_archive.add('AD-MF-000001354', self.TEST_URL, self.html, fetched_at=60)
+
+        self.assertEqual(self.html, self.page_archive.get_latest('AD-MF-000001354'))
+        self.assertIsNone(self.page_archive.get_latest('missing'))
+
+    def test_reextract(self):
+        self.page_archive.add('AD-MF-000001354', self.TEST_URL, self.html)
+        self.page_archive.add('BROKEN', self.TEST_URL, '<html></html>')
+
+        filename = os.path.join(self.temp_dir.name, 'importers_data.reextracted.json')
+
+        extracted, failed = reextract(self.page_archive, filename, workers=2)
+
+        self.assertEqual((1, 1), (extracted, failed))
+
+        data = load_data(filename)
+
+        self.assertEqual(['AD-MF-000001354'], list(data))
+        self.assertEqual('Andorra', data['AD-MF-000001354']['Country'])
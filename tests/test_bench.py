@@ -0,0 +1,22 @@
+import os
+import tempfile
+import unittest
+
+from bench import format_benchmarks, run_benchmarks
+from data_handling import save_data
+
+
+class TestBench(unittest.TestCase):
+    def test_run_benchmarks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'importers_data.json')
+
+            save_data({f'AD-MF-{i:09}': {'Actor ID/SRN': f'AD-MF-{i:09}', 'Last update date': '2021-02-11'}
+                       for i in range(10)}, filename)
+
+            results = run_benchmarks(filename, repeat=1)
+
+        self.assertEqual(['Load actor IDs', 'Stream records', 'Hash records', 'Typed records', 'Parquet export'],
+                         [name for name, _, _ in results])
+        self.assertTrue(all(records == 10 for _, _, records in results))
+        self.assertEqual(5, len(format_benchmarks(results).splitlines()))
@@ -7,18 +7,26 @@ from selenium.webdriver.remote.webelement import WebElement
 
 from main import WebDriverOptions
 from pages.browse_page import BrowsePage
+from pages.utils.page_helper import EUDAMED_URL
+from tests.replay_fixture import BROWSER_TESTS, BROWSER_TESTS_SKIP_REASON, get_browser_arguments, get_url, \
+    start_replay_server
 
 
+@unittest.skipUnless(BROWSER_TESTS, BROWSER_TESTS_SKIP_REASON)
 class TestBrowsePage(unittest.TestCase):
     TEST_ROLE = 'importer'
 
     def setUp(self) -> None:
-        self.web_driver_options = WebDriverOptions(wait_time=3)
+        self.replay_server = start_replay_server(self)
+
+        self.web_driver_options = WebDriverOptions(wait_time=3, arguments=get_browser_arguments(self.replay_server))
 
         self.driver = webdriver.Chrome(options=self.web_driver_options.get_driver_options())
 
         self.browse_page = BrowsePage(self.driver, self.web_driver_options.get_web_driver_wait_time)
 
+        self.browse_page.set_base_url(get_url(self.replay_server, EUDAMED_URL))
+
         self.browse_page.load_url(self.TEST_ROLE)
 
     #
@@ -0,0 +1,51 @@
+import unittest
+
+from browser_profiles import BLOCK_IMAGES_PREFERENCE, BROWSER_PROFILES, DENSE_PROFILE, get_browser_profile, \
+    LEGACY_PROFILE, LIGHTWEIGHT_PROFILE
+from options import WebDriverOptions
+
+
+class TestBrowserProfiles(unittest.TestCase):
+    def test_legacy_profile(self):
+        options = WebDriverOptions(profile=LEGACY_PROFILE).get_driver_options()
+
+        self.assertEqual(['headless', '--disable-extensions', '--disable-infobars', '--disable-gpu',
+                          '--disable-notifications'], options.arguments)
+        self.assertEqual('normal', options.page_load_strategy)
+        self.assertNotIn('prefs', options.experimental_options)
+
+    def test_lightweight_profile(self):
+        options = WebDriverOptions(profile=LIGHTWEIGHT_PROFILE).get_driver_options()
+
+        self.assertEqual(['--headless=new', '--window-size=1280,800'], options.arguments[:2])
+        self.assertIn('--disable-background-networking', options.arguments)
+        self.assertIn('--disk-cache-size=33554432', options.arguments)
+        self.assertNotIn('--renderer-process-limit=1', options.arguments)
+        self.assertEqual('eager', options.page_load_strategy)
+        self.assertNotIn('prefs', options.experimental_options)
+
+    def test_dense_profile(self):
+        options = WebDriverOptions(profile=DENSE_PROFILE).get_driver_options()
+
+        self.assertEqual(['--headless=new', '--window-size=1024,768'], options.arguments[:2])
+        self.assertIn('--renderer-process-limit=1', options.arguments)
+        self.assertIn('--js-flags=--max-old-space-size=256', options.arguments)
+        self.assertEqual('eager', options.page_load_strategy)
+        self.assertEqual({BLOCK_IMAGES_PREFERENCE: 2}, options.experimental_options['prefs'])
+
+    def test_additional_arguments_come_after_the_profile(self):
+        options = WebDriverOptions(profile=DENSE_PROFILE, arguments=['--proxy-server=localhost'],
+                                   options={'WEBDRIVER_OPTIONS': ['--lang=en']}).get_driver_options()
+
+        self.assertEqual(BROWSER_PROFILES[DENSE_PROFILE]['arguments'], options.arguments[:-2])
+        self.assertEqual(['--lang=en', '--proxy-server=localhost'], options.arguments[-2:])
+
+    def test_default_profile(self):
+        self.assertIs(BROWSER_PROFILES[WebDriverOptions.BROWSER_PROFILE], WebDriverOptions().profile)
+
+    def test_unknown_profile(self):
+        with self.assertRaisesRegex(ValueError, 'legacy, lightweight, dense'):
+            get_browser_profile('turbo')
+
+        with self.assertRaises(ValueError):
+            WebDriverOptions(profile='turbo')
@@ -0,0 +1,184 @@
+import asyncio
+import importlib.util
+import os
+import tempfile
+import unittest
+from typing import Optional
+from unittest.mock import Mock
+
+from browsers import create_driver, get_playwright_selector, PlaywrightBrowser
+from config import ConfigError, load_config
+from data_handling import load_data
+from dead_letter import DeadLetterQueue
+from options import WebDriverOptions
+from pages.locators import ACTOR_INFORMATION, ACTOR_INFORMATION_CONTAINER, TOTAL_RECORDS
+from scraper import FailedActorsScraper
+
+
+class FakePage:
+    def __init__(self, html: str):
+        self.html = html
+        self.url = None
+
+    async def content(self) -> str:
+        return self.html
+
+
+class FakePlaywrightBrowser:
+    """
+        Serves the same actor page for every URL, except the one given as missing and the one that does not load in
+        time.
+    """
+    timeout_error = TimeoutError
+
+    def __init__(self, html: str, missing_url: str, slow_url: Optional[str] = None):
+        self.html = html
+        self.missing_url = missing_url
+        self.slow_url = slow_url
+        self.pages = []
+        self.closed_pages = 0
+        self.stopped = False
+
+    async def start(self):
+        pass
+
+    async def new_page(self):
+        self.pages.append(FakePage(self.html))
+
+        return self.pages[-1]
+
+    async def close_page(self, page):
+        self.closed_pages += 1
+
+    async def get_url(self, page, url, wait_time):
+        if url == self.slow_url:
+            raise self.timeout_error(f'Timeout {wait_time * 1000}ms exceeded.')
+
+        page.url = url
+
+    async def wait_for_presence(self, page, location, wait_time):
+        await asyncio.sleep(0)
+
+        return 'Timeout for presence Exception error!' if page.url == self.missing_url else Mock()
+
+    async def stop(self):
+        self.stopped = True
+
+
+class TestBrowsers(unittest.TestCase):
+    TEST_PAGE = os.path.join(os.path.dirname(__file__), 'fixtures', 'actor_page.html')
+
+    TEST_URL = 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo/{}'
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.previous_directory = os.getcwd()
+
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.previous_directory)
+
+        self.temp_dir.cleanup()
+
+    def test_playwright_selectors(self):
+        self.assertEqual('id=actor_information', get_playwright_selector(ACTOR_INFORMATION))
+        self.assertEqual('css=app-eo-detail mat-expansion-panel > div > div > div:nth-child(2)',
+                         get_playwright_selector(ACTOR_INFORMATION_CONTAINER))
+        self.assertEqual('css=.nb-records', get_playwright_selector(TOTAL_RECORDS))
+
+    def test_browser_option(self):
+        config = load_config(environ={'EUDAMED_BROWSER': 'firefox'}, overrides=['PLAYWRIGHT_BROWSER_TYPE=webkit'])
+
+        web_driver_options = config.get_web_driver_options()
+
+        self.assertEqual('firefox', web_driver_options.BROWSER)
+        self.assertEqual('webkit', web_driver_options.PLAYWRIGHT_BROWSER_TYPE)
+        self.assertEqual('chrome', WebDriverOptions.BROWSER)
+
+        for override in ['BROWSER=safari', 'PLAYWRIGHT_BROWSER_TYPE=chrome']:
+            with self.subTest(override=override), self.assertRaises(ConfigError):
+                load_config(environ={}, overrides=[override])
+
+    def test_playwright_does_not_drive_the_pages(self):
+        with self.assertRaises(ValueError):
+            create_driver(WebDriverOptions(options={'BROWSER': 'playwright'}))
+
+    def test_firefox_needs_chrome_for_the_api_capture(self):
+        with self.assertRaises(ValueError):
+            create_driver(WebDriverOptions(capture_api_responses=True, options={'BROWSER': 'firefox'}))
+
+    def test_firefox_options_follow_the_profile(self):
+        options = WebDriverOptions(profile='dense', options={'WEBDRIVER_OPTIONS': ['-private']}).get_firefox_options()
+
+        self.assertEqual(['-headless', '--width=1024', '--height=768', '-private'], options.arguments)
+        self.assertEqual('eager', options.page_load_strategy)
+        self.assertEqual(2, options.preferences['permissions.default.image'])
+
+    def test_playwright_launch_options(self):
+        browser = PlaywrightBrowser(WebDriverOptions(profile='lightweight', arguments=['--proxy-server=localhost']))
+
+        launch_options = browser.get_launch_options()
+
+        self.assertIs(True, launch_options['headless'])
+        self.assertNotIn('--headless=new', launch_options['args'])
+        self.assertEqual('--proxy-server=localhost', launch_options['args'][-1])
+
+    @unittest.skipIf(importlib.util.find_spec('playwright') is not None, 'Playwright is installed')
+    def test_missing_playwright(self):
+        with self.assertRaisesRegex(ImportError, 'pip install playwright'):
+            asyncio.run(PlaywrightBrowser(WebDriverOptions()).start())
+
+    def test_retry_failed_with_playwright_contexts(self):
+        with open(self.TEST_PAGE, encoding='utf-8') as file:
+            html = file.read()
+
+        dead_letter_queue = DeadLetterQueue('importers_failed.json')
+
+        for actor_id in ['AD-MF-000001354', 'AD-MF-000001355', 'AD-MF-000001356']:
+            dead_letter_queue.record_failure(actor_id, self.TEST_URL.format(actor_id), 'actor page', 'Timeout')
+
+        scraper = FailedActorsScraper(WebDriverOptions(options={'BROWSER': 'playwright'}), Mock(), Mock(), workers=2,
+                                      options={'CHANGEFEED': False, 'MEMORY_LIMIT_MB': None,
+                                               'SYSTEM_MEMORY_LIMIT_PERCENT': None, 'SYSTEM_CPU_LIMIT_PERCENT': None})
+
+        browser = FakePlaywrightBrowser(html, self.TEST_URL.format('AD-MF-000001356'))
+
+        scraper.playwright_browser = browser
+
+        scraper.run()
+
+        scraper.event_log.close()
+
+        self.assertEqual(2, len(load_data('importers_data.json')))
+        self.assertEqual(['AD-MF-000001356'], [entry['Actor ID/SRN'] for entry in
+                                               DeadLetterQueue('importers_failed.json').get_retryable(3)])
+        self.assertTrue(browser.stopped)
+        self.assertEqual(len(browser.pages), browser.closed_pages)
+
+    def test_page_load_timeout_lowers_the_concurrency(self):
+        with open(self.TEST_PAGE, encoding='utf-8') as file:
+            html = file.read()
+
+        dead_letter_queue = DeadLetterQueue('importers_failed.json')
+
+        for actor_id in ['AD-MF-000001354', 'AD-MF-000001355']:
+            dead_letter_queue.record_failure(actor_id, self.TEST_URL.format(actor_id), 'actor page', 'Timeout')
+
+        scraper = FailedActorsScraper(WebDriverOptions(options={'BROWSER': 'playwright'}), Mock(), Mock(), workers=1,
+                                      options={'CHANGEFEED': False, 'MEMORY_LIMIT_MB': None,
+                                               'SYSTEM_MEMORY_LIMIT_PERCENT': None, 'SYSTEM_CPU_LIMIT_PERCENT': None})
+
+        scraper.concurrency_controller = Mock(wraps=scraper.concurrency_controller)
+
+        scraper.playwright_browser = FakePlaywrightBrowser(html, None, self.TEST_URL.format('AD-MF-000001355'))
+
+        scraper.run()
+
+        scraper.event_log.close()
+
+        self.assertEqual(['AD-MF-000001354'], list(load_data('importers_data.json')))
+        self.assertEqual(1, scraper.concurrency_controller.record_failure.call_count)
+        self.assertEqual(['AD-MF-000001355'], [entry['Actor ID/SRN'] for entry in
+                                               DeadLetterQueue('importers_failed.json').get_retryable(3)])
@@ -0,0 +1,166 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from changefeed import Changefeed, diff_snapshots, get_field_changes, get_record_hash, HashIndex, INSERTED, \
+    REMOVED, UPDATED
+from data_handling import load_data, save_data
+
+
+class TestChangefeed(unittest.TestCase):
+    TEST_DATA = {
+        'AD-MF-000001354': {'Actor ID/SRN': 'AD-MF-000001354', 'Email': 'old@example.com', 'Web site': '-'},
+        'AD-MF-000001355': {'Actor ID/SRN': 'AD-MF-000001355', 'Email': 'b@example.com', 'Web site': '-'},
+    }
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.filename = os.path.join(self.temp_dir.name, 'importers_data.json')
+        self.directory = os.path.join(self.temp_dir.name, 'importers_changes')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_changes(self, changefeed):
+        with open(changefeed.filename, 'r', encoding='utf-8') as file:
+            return [json.loads(line) for line in file]
+
+    def test_get_record_hash(self):
+        record = self.TEST_DATA['AD-MF-000001354']
+
+        self.assertEqual(get_record_hash(record), get_record_hash(dict(reversed(list(record.items())))))
+        self.assertNotEqual(get_record_hash(record), get_record_hash({**record, 'Email': 'new@example.com'}))
+
+    def test_get_field_changes(self):
+        old_record = {'Email': 'old@example.com', 'Web site': '-', 'PO box': '12'}
+        new_record = {'Email': 'new@example.com', 'Web site': '-', 'Telephone number': '123'}
+
+        self.assertEqual({
+            'Email': {'old': 'old@example.com', 'new': 'new@example.com'},
+            'PO box': {'old': '12', 'new': None},
+            'Telephone number': {'old': None, 'new': '123'},
+        }, get_field_changes(old_record, new_record))
+
+    def test_update_data(self):
+        save_data({'AD-MF-000001354': self.TEST_DATA['AD-MF-000001354']}, self.filename)
+
+        changefeed = Changefeed(self.directory, self.filename, run_id='run-1')
+
+        updated_record = {**self.TEST_DATA['AD-MF-000001354'], 'Email': 'new@example.com'}
+
+        changes = changefeed.update_data({'AD-MF-000001354': updated_record,
+                                          'AD-MF-000001355': self.TEST_DATA['AD-MF-000001355']}, self.filename)
+
+        self.assertEqual(2, changes)
+        self.assertEqual(updated_record, load_data(self.filename)['AD-MF-000001354'])
+
+        inserted, updated = sorted(self.read_changes(changefeed), key=lambda change: change['change'])
+
+        self.assertEqual(INSERTED, inserted['change'])
+        self.assertEqual(self.TEST_DATA['AD-MF-000001355'], inserted['record'])
+        self.assertIsNone(inserted['previous_hash'])
+
+        self.assertEqual(UPDATED, updated['change'])
+        self.assertEqual('run-1', updated['run'])
+        self.assertEqual({'Email': {'old': 'old@example.com', 'new': 'new@example.com'}}, updated['fields'])
+        self.assertEqual(get_record_hash(self.TEST_DATA['AD-MF-000001354']), updated['previous_hash'])
+        self.assertEqual(get_record_hash(updated_record), updated['hash'])
+
+    def test_changes_saved_before_a_crash_are_recovered(self):
+        save_data({'AD-MF-000001354': self.TEST_DATA['AD-MF-000001354']}, self.filename)
+
+        changefeed = Changefeed(self.directory, self.filename, run_id='run-1')
+
+        # The data file is replaced, the process dies before the changes are committed
+        with mock.patch.object(changefeed, 'commit_pending', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                changefeed.update_data({'AD-MF-000001355': self.TEST_DATA['AD-MF-000001355']}, self.filename)
+
+        self.assertFalse(os.path.exists(changefeed.filename))
+
+        Changefeed(self.directory, self.filename, run_id='run-2')
+
+        self.assertEqual([('AD-MF-000001355', INSERTED, 'run-1')],
+                         [(change['actor_id'], change['change'], change['run'])
+                          for change in self.read_changes(changefeed)])
+        self.assertFalse(os.path.exists(changefeed.pending_filename))
+        self.assertEqual(get_record_hash(self.TEST_DATA['AD-MF-000001355']),
+                         HashIndex(self.filename).get('AD-MF-000001355'))
+
+    def test_changes_of_an_unsaved_update_are_dropped(self):
+        save_data({'AD-MF-000001354': self.TEST_DATA['AD-MF-000001354']}, self.filename)
+
+        changefeed = Changefeed(self.directory, self.filename, run_id='run-1')
+
+        # The process dies before the data file is replaced
+        with mock.patch('data_handling.os.replace', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                changefeed.update_data({'AD-MF-000001355': self.TEST_DATA['AD-MF-000001355']}, self.filename)
+
+        self.assertTrue(os.path.exists(changefeed.pending_filename))
+
+        Changefeed(self.directory, self.filename, run_id='run-2')
+
+        self.assertFalse(os.path.exists(changefeed.pending_filename))
+        self.assertFalse(os.path.exists(changefeed.filename))
+        self.assertEqual(['AD-MF-000001354'], list(load_data(self.filename)))
+
+    def test_committed_changes_are_not_written_twice(self):
+        save_data({'AD-MF-000001354': self.TEST_DATA['AD-MF-000001354']}, self.filename)
+
+        changefeed = Changefeed(self.directory, self.filename, run_id='run-1')
+
+        changefeed.update_data({'AD-MF-000001355': self.TEST_DATA['AD-MF-000001355']}, self.filename)
+
+        # A crash after the changes were appended and before the pending file was removed
+        with open(changefeed.filename, 'r', encoding='utf-8') as file, \
+                open(changefeed.pending_filename, 'w', encoding='utf-8') as pending_file:
+            pending_file.write(file.read())
+
+        Changefeed(self.directory, self.filename, run_id='run-2')
+
+        self.assertEqual(1, len(self.read_changes(changefeed)))
+        self.assertFalse(os.path.exists(changefeed.pending_filename))
+
+    def test_unchanged_records_are_not_written(self):
+        save_data(self.TEST_DATA, self.filename)
+
+        changefeed = Changefeed(self.directory, self.filename)
+
+        self.assertEqual(0, changefeed.update_data(dict(self.TEST_DATA), self.filename))
+        self.assertFalse(os.path.exists(changefeed.filename))
+
+    def test_hash_index(self):
+        save_data(self.TEST_DATA, self.filename)
+
+        hash_index = HashIndex(self.filename)
+
+        self.assertEqual(get_record_hash(self.TEST_DATA['AD-MF-000001354']), hash_index.get('AD-MF-000001354'))
+
+        hash_index.update({'AD-MF-000001354': None, 'AD-MF-000001356': 'abc'})
+
+        reloaded = HashIndex(self.filename)
+
+        self.assertIsNone(reloaded.get('AD-MF-000001354'))
+        self.assertEqual('abc', reloaded.get('AD-MF-000001356'))
+        self.assertEqual(2, len(reloaded.hashes))
+
+    def test_diff_snapshots(self):
+        old_filename = f'{self.filename}.1'
+
+        save_data(self.TEST_DATA, old_filename)
+
+        updated_record = {**self.TEST_DATA['AD-MF-000001354'], 'Web site': 'example.com'}
+        inserted_record = {'Actor ID/SRN': 'AD-MF-000001356'}
+
+        save_data({'AD-MF-000001354': updated_record, 'AD-MF-000001356': inserted_record}, self.filename)
+
+        changes = list(diff_snapshots(old_filename, self.filename))
+
+        self.assertEqual([(INSERTED, 'AD-MF-000001356'), (UPDATED, 'AD-MF-000001354'), (REMOVED, 'AD-MF-000001355')],
+                         [(change['change'], change['actor_id']) for change in changes])
+        self.assertEqual({'Web site': {'old': '-', 'new': 'example.com'}}, changes[1]['fields'])
+        self.assertIsNone(changes[2]['hash'])
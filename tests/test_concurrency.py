@@ -0,0 +1,112 @@
+import threading
+import time
+import unittest
+
+from concurrency import AIMDController, ConcurrencyLimit, LatencyTracker
+
+
+class TestConcurrencyLimit(unittest.TestCase):
+    def test_limit(self):
+        concurrency_limit = ConcurrencyLimit(4)
+
+        self.assertEqual(3, concurrency_limit.decrease())
+        self.assertEqual(1, concurrency_limit.set_limit(0))
+        self.assertEqual(4, concurrency_limit.set_limit(10))
+
+    def test_lower_limit_blocks_new_tasks(self):
+        concurrency_limit = ConcurrencyLimit(2)
+
+        concurrency_limit.acquire()
+        concurrency_limit.acquire()
+
+        concurrency_limit.set_limit(1)
+
+        acquired = threading.Event()
+
+        def task():
+            with concurrency_limit:
+                acquired.set()
+
+        threading.Thread(target=task, daemon=True).start()
+
+        concurrency_limit.release()
+
+        time.sleep(0.05)
+
+        # One task is still running, which is the new limit
+        self.assertFalse(acquired.is_set())
+
+        concurrency_limit.release()
+
+        self.assertTrue(acquired.wait(1))
+
+
+class TestAIMDController(unittest.TestCase):
+    def setUp(self) -> None:
+        self.concurrency_limit = ConcurrencyLimit(1, max_limit=8)
+
+        self.controller = AIMDController(self.concurrency_limit, latency_target=5)
+
+    def test_additive_increase(self):
+        # Rounds of 1, 2 and 3 fast fetches
+        for _ in range(6):
+            self.controller.record_success(1)
+
+        self.assertEqual(4, self.concurrency_limit.limit)
+
+    def test_increase_stops_at_max_limit(self):
+        for _ in range(100):
+            self.controller.record_success(1)
+
+        self.assertEqual(8, self.concurrency_limit.limit)
+
+    def test_multiplicative_decrease_on_failure(self):
+        self.concurrency_limit.set_limit(8)
+
+        self.controller.record_failure()
+
+        self.assertEqual(4, self.concurrency_limit.limit)
+
+        # Failures of the fetches that were in flight during the cut
+        for _ in range(4):
+            self.controller.record_failure()
+
+        self.assertEqual(4, self.concurrency_limit.limit)
+
+        self.controller.record_failure()
+
+        self.assertEqual(2, self.concurrency_limit.limit)
+
+    def test_decrease_on_slow_round(self):
+        self.concurrency_limit.set_limit(4)
+
+        for latency in (1, 1, 1, 20):
+            self.controller.record_success(latency)
+
+        self.assertEqual(2, self.concurrency_limit.limit)
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_get_timeout(self):
+        latency_tracker = LatencyTracker(window=100, min_samples=10)
+
+        self.assertEqual(10, latency_tracker.get_timeout(10, 5, 60))
+
+        for _ in range(20):
+            latency_tracker.add(4)
+
+        self.assertEqual(8, latency_tracker.get_timeout(10, 5, 60))
+
+        for _ in range(20):
+            latency_tracker.add(1)
+
+        self.assertEqual(5, latency_tracker.get_timeout(10, 5, 60, factor=1))
+
+        for _ in range(100):
+            latency_tracker.add(50)
+
+        self.assertEqual(60, latency_tracker.get_timeout(10, 5, 60))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+
+from config import ConfigError, get_option_defaults, load_config, OPTION_CLASSES, validate_option
+from options import ScraperOptions, WebDriverOptions
+from utils import MessageProvider
+
+
+class TestConfig(unittest.TestCase):
+    CONFIG = """
+[scraper]
+rows_per_page = 50
+verbosity = "quiet"
+memory_limit_mb = "none"
+min_wait_time = 2
+
+[webdriver]
+BROWSER_PROFILE = "dense"
+webdriver_options = ["--mute-audio"]
+
+[hosts.small-host.scraper]
+retry_workers = 1
+"""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.filename = os.path.join(self.temp_dir.name, 'eudamed.toml')
+
+        self.write_config(self.CONFIG)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_config(self, text):
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    def test_config_file(self):
+        config = load_config(self.filename, environ={}, hostname='large-host')
+
+        self.assertEqual({'ROWS_PER_PAGE': 50, 'VERBOSITY': MessageProvider.QUIET, 'MEMORY_LIMIT_MB': None,
+                          'MIN_WAIT_TIME': 2.0}, config.scraper)
+        self.assertEqual({'BROWSER_PROFILE': 'dense', 'WEBDRIVER_OPTIONS': ['--mute-audio']}, config.webdriver)
+
+    def test_host_table(self):
+        config = load_config(self.filename, environ={}, hostname='small-host')
+
+        self.assertEqual(1, config.scraper['RETRY_WORKERS'])
+
+    def test_precedence(self):
+        environ = {'EUDAMED_ROWS_PER_PAGE': '25', 'EUDAMED_SKIP_SCRAPED_PAGES': 'no', 'EUDAMED_RECORDING': 'recording'}
+
+        config = load_config(self.filename, environ=environ, overrides=['rows-per-page=10', 'WEBDRIVER_WAIT_TIME=2.5'],
+                             hostname='large-host')
+
+        self.assertEqual(10, config.scraper['ROWS_PER_PAGE'])
+        self.assertIs(False, config.scraper['SKIP_SCRAPED_PAGES'])
+        self.assertEqual(2.5, config.webdriver['WEBDRIVER_WAIT_TIME'])
+
+    def test_config_file_from_environment(self):
+        config = load_config(environ={'EUDAMED_CONFIG': self.filename}, hostname='large-host')
+
+        self.assertEqual(50, config.scraper['ROWS_PER_PAGE'])
+
+    def test_options_are_injected(self):
+        config = load_config(self.filename, environ={}, overrides=['WEBDRIVER_WAIT_TIME=3'], hostname='large-host')
+
+        scraper_options = config.get_scraper_options()
+        web_driver_options = config.get_web_driver_options()
+
+        self.assertEqual(50, scraper_options.ROWS_PER_PAGE)
+        self.assertEqual(ScraperOptions.ROWS_PER_PAGE, ScraperOptions().ROWS_PER_PAGE)
+        self.assertEqual(3, web_driver_options.get_web_driver_wait_time)
+        self.assertEqual(['--mute-audio'], web_driver_options.WEBDRIVER_OPTIONS)
+        self.assertEqual([], WebDriverOptions.WEBDRIVER_OPTIONS)
+
+    def test_invalid_options(self):
+        invalid = [
+            (None, ['ROWS_PER_PAGE=12']),
+            (None, ['ROLE=distributor']),
+            (None, ['RETRY_WORKERS=-1']),
+            (None, ['RETRY_WORKERS=two']),
+            (None, ['CHANGEFEED=maybe']),
+            (None, ['ROWS_PER_PAGE=none']),
+            (None, ['COLOUR=red']),
+            (None, ['ROWS_PER_PAGE']),
+            (None, ['MIN_WAIT_TIME=90']),
+            (None, ['PAGES_PER_WORK_UNIT=0']),
+            (None, ['RETRY_WORKERS=0']),
+            (None, ['RESOURCE_SAMPLE_INTERVAL=0']),
+            (None, ['HEARTBEAT_INTERVAL=0']),
+            (None, ['MAX_INACTIVE_FRACTION=1.5']),
+            (None, ['SYSTEM_CPU_LIMIT_PERCENT=150']),
+            (None, ['COORDINATOR_PORT=70000']),
+            ('[scraper]\nbrowser_profile = "dense"\n', []),
+            ('[scraper]\nrows_per_page = true\n', []),
+            ('[browser]\nrows_per_page = 10\n', []),
+            ('[scraper\n', []),
+        ]
+
+        for text, overrides in invalid:
+            with self.subTest(text=text, overrides=overrides):
+                if text is not None:
+                    self.write_config(text)
+
+                with self.assertRaises(ConfigError):
+                    load_config(self.filename, environ={}, overrides=overrides, hostname='large-host')
+
+    def test_option_ranges(self):
+        self.assertEqual(0, validate_option('DATA_SNAPSHOTS', 0, 'test'))
+        self.assertEqual(1.0, validate_option('MAX_INACTIVE_FRACTION', 1, 'test'))
+        self.assertEqual(1, validate_option('PAGES_PER_WORK_UNIT', 1, 'test'))
+        self.assertEqual(0.5, validate_option('HEARTBEAT_INTERVAL', 0.5, 'test'))
+
+    def test_defaults_are_valid(self):
+        for options_class in OPTION_CLASSES.values():
+            for option, value in get_option_defaults(options_class).items():
+                # None turns off the optional options, it is given as the text none
+                if value is None:
+                    continue
+
+                with self.subTest(option=option):
+                    self.assertEqual(value, validate_option(option, value, 'test'))
+
+    def test_missing_config_file(self):
+        with self.assertRaises(ConfigError):
+            load_config(os.path.join(self.temp_dir.name, 'missing.toml'), environ={})
@@ -0,0 +1,172 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+
+import requests
+
+from coordination import _make_request_handler, Coordinator, CoordinatorClient, is_loopback, WorkQueue
+from data_handling import load_data, save_data
+
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.work_queue = WorkQueue(os.path.join(self.temp_dir.name, 'work_queue.sqlite3'))
+
+        self.work_queue.create_units(total_pages=45, pages_per_unit=20, rows_per_page=10)
+
+    def tearDown(self):
+        self.work_queue.connection.close()
+        self.temp_dir.cleanup()
+
+    def test_create_units(self):
+        units = [self.work_queue.lease('worker', 60) for _ in range(4)]
+
+        self.assertEqual([(1, 20), (21, 40), (41, 45)], [(unit['first_page'], unit['last_page']) for unit in units[:3]])
+        self.assertEqual({10}, {unit['rows_per_page'] for unit in units[:3]})
+        self.assertIsNone(units[3])
+
+    def test_create_units_only_once(self):
+        self.work_queue.create_units(total_pages=100, pages_per_unit=10, rows_per_page=10)
+
+        self.assertEqual({'pending': 3, 'records': 0}, self.work_queue.get_status())
+
+    def test_reset_units_once_all_are_done(self):
+        units = [self.work_queue.lease('worker', 60) for _ in range(3)]
+
+        for unit in units[:2]:
+            self.work_queue.complete(unit['id'], 'worker')
+
+        self.assertFalse(self.work_queue.reset_units())
+        self.assertEqual({'done': 2, 'leased': 1, 'records': 0}, self.work_queue.get_status())
+
+        self.work_queue.complete(units[2]['id'], 'worker')
+
+        self.assertTrue(self.work_queue.reset_units())
+        self.assertFalse(self.work_queue.has_units())
+
+        self.work_queue.create_units(total_pages=10, pages_per_unit=10, rows_per_page=10)
+
+        unit = self.work_queue.lease('worker', 60)
+
+        self.assertEqual((1, 10), (unit['first_page'], unit['last_page']))
+
+    def test_expired_lease_is_reassigned(self):
+        unit = self.work_queue.lease('worker-1', lease_time=-1)
+
+        reassigned = self.work_queue.lease('worker-2', lease_time=60)
+
+        self.assertEqual(unit['id'], reassigned['id'])
+        self.assertFalse(self.work_queue.heartbeat(unit['id'], 'worker-1', 60))
+        self.assertFalse(self.work_queue.complete(unit['id'], 'worker-1'))
+        self.assertTrue(self.work_queue.heartbeat(unit['id'], 'worker-2', 60))
+        self.assertTrue(self.work_queue.complete(unit['id'], 'worker-2'))
+
+    def test_active_lease_is_not_reassigned(self):
+        unit = self.work_queue.lease('worker-1', lease_time=60)
+
+        self.assertNotEqual(unit['id'], self.work_queue.lease('worker-2', lease_time=60)['id'])
+
+    def test_records(self):
+        self.work_queue.add_records({'ID-1': {'Country': 'Andorra'}})
+        self.work_queue.add_records({'ID-1': {'Country': 'Belgium'}, 'ID-2': {}})
+
+        self.assertEqual({'ID-1': {'Country': 'Belgium'}, 'ID-2': {}}, self.work_queue.get_pending_records())
+
+        self.work_queue.remove_records(['ID-1'])
+
+        self.assertEqual({'ID-2': {}}, self.work_queue.get_pending_records())
+
+
+class TestCoordinator(unittest.TestCase):
+    TOKEN = None
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.filename = os.path.join(self.temp_dir.name, 'importers_data.json')
+
+        self.work_queue = WorkQueue(os.path.join(self.temp_dir.name, 'work_queue.sqlite3'))
+
+        self.coordinator = Coordinator(self.work_queue, self.filename, snapshots=0, lease_time=60,
+                                       pages_per_unit=2, rows_per_page=10, flush_interval=60, token=self.TOKEN)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _make_request_handler(self.coordinator))
+
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+        self.client = CoordinatorClient(self.url, 'worker-1', self.TOKEN)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.work_queue.connection.close()
+        self.temp_dir.cleanup()
+
+    def test_crawl(self):
+        leased_pages = []
+
+        while (unit := self.client.lease(total_records=50)) is not None:
+            leased_pages.append((unit['first_page'], unit['last_page']))
+
+            self.assertTrue(self.client.heartbeat(unit['id']))
+            self.assertTrue(self.client.submit(unit['id'], {f'ID-{unit["id"]}': {'Country': 'Andorra'}}))
+            self.assertTrue(self.client.complete(unit['id']))
+
+        self.assertEqual([(1, 2), (3, 4), (5, 5)], leased_pages)
+        self.assertEqual({'ID-1', 'ID-2', 'ID-3'}, self.client.get_ids())
+
+        self.assertEqual(3, self.coordinator.flush())
+        self.assertEqual({'ID-1', 'ID-2', 'ID-3'}, set(load_data(self.filename)))
+        self.assertEqual({'ID-1', 'ID-2', 'ID-3'}, self.client.get_ids())
+
+    def test_units_use_the_rows_per_page_of_the_coordinator(self):
+        self.coordinator.rows_per_page = 25
+
+        unit = self.client.lease(total_records=50)
+
+        self.assertEqual((1, 2, 25), (unit['first_page'], unit['last_page'], unit['rows_per_page']))
+        self.assertIsNone(self.client.lease(total_records=50))
+
+    def test_ids_are_read_once(self):
+        save_data({'ID-1': {'Country': 'Andorra'}}, self.filename)
+
+        unit = self.client.lease(total_records=50)
+
+        self.assertEqual({'ID-1'}, self.client.get_ids())
+
+        # Changes of the data file by others are not seen, the submitted records are
+        save_data({}, self.filename)
+
+        self.client.submit(unit['id'], {'ID-2': {}})
+
+        self.assertEqual({'ID-1', 'ID-2'}, self.client.get_ids())
+
+    def test_token_is_needed_on_other_addresses(self):
+        self.assertTrue(is_loopback('127.0.0.1'))
+        self.assertTrue(is_loopback('localhost'))
+        self.assertFalse(is_loopback('0.0.0.0'))
+
+        coordinator = Coordinator(self.work_queue, self.filename, snapshots=0, lease_time=60, pages_per_unit=2,
+                                  rows_per_page=10, flush_interval=60)
+
+        with self.assertRaises(ValueError):
+            coordinator.serve('0.0.0.0', 0)
+
+
+class TestCoordinatorWithToken(TestCoordinator):
+    TOKEN = 'secret'
+
+    def test_requests_without_the_token_are_refused(self):
+        for token in [None, 'wrong']:
+            with self.subTest(token=token), self.assertRaises(requests.HTTPError) as context:
+                CoordinatorClient(self.url, 'worker-2', token).lease(total_records=50)
+
+            self.assertEqual(401, context.exception.response.status_code)
+
+        self.assertFalse(self.work_queue.has_units())
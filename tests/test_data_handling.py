@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import unittest
+
+from data_handling import get_snapshot_filename, is_valid_data, iter_data, load_data, load_ids, save_data, \
+    save_data_stream, update_data
+
+
+class TestDataHandling(unittest.TestCase):
+    TEST_DATA = {
+        "AD-MF-000001354": {
+            "Actor ID/SRN": "AD-MF-000001354",
+            "Country": "Andorra",
+            "Actor/Organisation name": "SOADCO, S.L. [ES]",
+            "Street name": "Av. del Pessebre"
+        },
+        "BE-IM-000000001": {
+            "Actor ID/SRN": "BE-IM-000000001",
+            "Country": "Belgium",
+            "Actor/Organisation name": "Ünicode \"quoted\" {name}, [x]",
+            "Street name": "-"
+        }
+    }
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.filename = os.path.join(self.temp_dir.name, 'importers_data.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_data(self):
+        save_data(self.TEST_DATA, self.filename)
+
+        # Small chunks make sure records split between chunks are decoded correctly
+        for chunk_size in (1, 7, 64, 1024 * 1024):
+            self.assertEqual(list(self.TEST_DATA.items()), list(iter_data(self.filename, chunk_size)))
+
+    def test_iter_data_empty_and_missing_file(self):
+        save_data({}, self.filename)
+
+        self.assertEqual([], list(iter_data(self.filename)))
+        self.assertEqual([], list(iter_data(os.path.join(self.temp_dir.name, 'missing.json'))))
+
+    def test_iter_data_truncated_file(self):
+        save_data(self.TEST_DATA, self.filename)
+
+        with open(self.filename, 'r+', encoding='utf-8') as file:
+            file.truncate(100)
+
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_data(self.filename))
+
+    def test_load_ids(self):
+        save_data(self.TEST_DATA, self.filename)
+
+        self.assertEqual(set(self.TEST_DATA), load_ids(self.filename))
+
+    def test_save_data_stream_matches_save_data(self):
+        expected_filename = os.path.join(self.temp_dir.name, 'expected.json')
+
+        for data in (self.TEST_DATA, {}):
+            save_data(data, expected_filename)
+            save_data_stream(data.items(), self.filename)
+
+            with open(expected_filename, encoding='utf-8') as expected, open(self.filename, encoding='utf-8') as file:
+                self.assertEqual(expected.read(), file.read())
+
+    def test_update_data(self):
+        save_data(self.TEST_DATA, self.filename)
+
+        new_data = {
+            "BE-IM-000000001": {"Actor ID/SRN": "BE-IM-000000001", "Country": "Belgium"},
+            "DE-IM-000000002": {"Actor ID/SRN": "DE-IM-000000002", "Country": "Germany"}
+        }
+
+        update_data(new_data, self.filename)
+
+        expected_data = dict(self.TEST_DATA)
+        expected_data.update(new_data)
+
+        self.assertEqual(list(expected_data.items()), list(load_data(self.filename).items()))
+
+    def test_update_data_missing_file(self):
+        update_data(self.TEST_DATA, self.filename)
+
+        self.assertEqual(self.TEST_DATA, load_data(self.filename))
+
+    def test_save_data_failure_keeps_previous_file(self):
+        save_data(self.TEST_DATA, self.filename)
+
+        def failing_items():
+            yield "DE-IM-000000002", {"Actor ID/SRN": "DE-IM-000000002"}
+            raise RuntimeError('Crash while writing')
+
+        with self.assertRaises(RuntimeError):
+            save_data_stream(failing_items(), self.filename)
+
+        self.assertEqual(self.TEST_DATA, load_data(self.filename))
+        self.assertEqual(['importers_data.json'], os.listdir(self.temp_dir.name))
+
+    def test_snapshots_are_rotated(self):
+        for number in range(4):
+            save_data({str(number): {}}, self.filename, snapshots=2)
+
+        self.assertEqual({'3': {}}, load_data(self.filename))
+        self.assertEqual({'2': {}}, load_data(get_snapshot_filename(self.filename, 1)))
+        self.assertEqual({'1': {}}, load_data(get_snapshot_filename(self.filename, 2)))
+        self.assertFalse(os.path.exists(get_snapshot_filename(self.filename, 3)))
+
+    def test_corrupted_file_is_restored_from_snapshot(self):
+        save_data({"old": {}}, self.filename, snapshots=2)
+        save_data(self.TEST_DATA, self.filename, snapshots=2)
+        save_data({"new": {}}, self.filename, snapshots=2)
+
+        # Corrupt the file and the newest snapshot
+        for filename in (self.filename, get_snapshot_filename(self.filename, 1)):
+            with open(filename, 'r+', encoding='utf-8') as file:
+                file.truncate(5)
+
+        self.assertEqual({"old"}, load_ids(self.filename))
+        self.assertTrue(os.path.exists(f'{self.filename}.corrupt'))
+        self.assertTrue(is_valid_data(self.filename))
+
+    def test_corrupted_file_without_snapshot(self):
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write('{"broken": ')
+
+        with self.assertRaises(ValueError):
+            load_data(self.filename)
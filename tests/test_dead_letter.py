@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from dead_letter import DeadLetterQueue
+
+
+class TestDeadLetterQueue(unittest.TestCase):
+    TEST_ACTOR_ID = 'AD-MF-000001354'
+    TEST_URL = 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo/22938fc4-eadb-459b-9a6a-14defd0275c8'
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.filename = os.path.join(self.temp_dir.name, 'importers_failed.json')
+
+        self.dead_letter_queue = DeadLetterQueue(self.filename)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_record_failure(self):
+        entry = self.dead_letter_queue.record_failure(self.TEST_ACTOR_ID, None, DeadLetterQueue.STAGE_OPEN, 'error')
+
+        self.assertEqual(1, entry['Attempts'])
+        self.assertIsNone(entry['Actor URL'])
+
+        entry = self.dead_letter_queue.record_failure(self.TEST_ACTOR_ID, self.TEST_URL, DeadLetterQueue.STAGE_LOAD,
+                                                      'timeout')
+
+        self.assertEqual(2, entry['Attempts'])
+        self.assertEqual(self.TEST_URL, entry['Actor URL'])
+        self.assertEqual(DeadLetterQueue.STAGE_LOAD, entry['Stage'])
+
+    def test_record_failure_keeps_known_url(self):
+        self.dead_letter_queue.record_failure(self.TEST_ACTOR_ID, self.TEST_URL, DeadLetterQueue.STAGE_LOAD, 'error')
+
+        entry = self.dead_letter_queue.record_failure(self.TEST_ACTOR_ID, None, DeadLetterQueue.STAGE_OPEN, 'error')
+
+        self.assertEqual(self.TEST_URL, entry['Actor URL'])
+
+    def test_failures_are_persisted(self):
+        self.dead_letter_queue.record_failure(self.TEST_ACTOR_ID, self.TEST_URL, DeadLetterQueue.STAGE_LOAD, 'error')
+
+        reloaded = DeadLetterQueue(self.filename)
+
+        self.assertIn(self.TEST_ACTOR_ID, reloaded)
+
+    def test_resolve(self):
+        self.dead_letter_queue.record_failure(self.TEST_ACTOR_ID, self.TEST_URL, DeadLetterQueue.STAGE_LOAD, 'error')
+
+        self.dead_letter_queue.resolve(self.TEST_ACTOR_ID)
+
+        self.assertNotIn(self.TEST_ACTOR_ID, self.dead_letter_queue)
+        self.assertNotIn(self.TEST_ACTOR_ID, DeadLetterQueue(self.filename))
+
+    def test_get_retryable(self):
+        self.dead_letter_queue.record_failure('no-url', None, DeadLetterQueue.STAGE_OPEN, 'error')
+        self.dead_letter_queue.record_failure(self.TEST_ACTOR_ID, self.TEST_URL, DeadLetterQueue.STAGE_LOAD, 'error')
+
+        retryable = self.dead_letter_queue.get_retryable(max_attempts=3)
+
+        self.assertEqual([self.TEST_ACTOR_ID], [entry['Actor ID/SRN'] for entry in retryable])
+
+        self.assertEqual([], self.dead_letter_queue.get_retryable(max_attempts=1))
@@ -0,0 +1,68 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from export import export_data, export_jsonl, export_parquet, EXPORT_SCHEMA
+
+
+class TestExport(unittest.TestCase):
+    TEST_RECORD = {
+        "Actor ID/SRN": "AD-MF-000001354",
+        "Role": "Manufacturer",
+        "Country": "Andorra",
+        "Actor/Organisation name": "SOADCO, S.L. [ES]",
+        "VAT number": "-",
+        "Last confirmation date of actor data accuracy": "-",
+        "Latitude": "42.513416",
+        "Longitude": "1.535454",
+        "Last update date": "2021-02-11",
+        "Actor URL": "https://ec.europa.eu/tools/eudamed/#/screen/search-eo/22938fc4-eadb-459b-9a6a-14defd0275c8"
+    }
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_export_parquet(self):
+        filename = os.path.join(self.temp_dir.name, 'importers_data.parquet')
+
+        exported = export_parquet([self.TEST_RECORD] * 3, filename, batch_size=2)
+
+        self.assertEqual(3, exported)
+
+        table = pq.read_table(filename)
+
+        self.assertEqual(EXPORT_SCHEMA.names, table.schema.names)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field('country').type))
+
+        row = table.slice(0, 1).to_pylist()[0]
+
+        self.assertEqual('Andorra', row['country'])
+        self.assertEqual(42.513416, row['latitude'])
+        self.assertEqual(datetime.date(2021, 2, 11), row['last_update_date'])
+        self.assertIsNone(row['vat_number'])
+        self.assertIsNone(row['last_confirmation_date'])
+        self.assertIsNone(row['email'])
+
+    def test_export_jsonl(self):
+        filename = os.path.join(self.temp_dir.name, 'importers_data.jsonl.zst')
+
+        exported = export_jsonl([self.TEST_RECORD] * 3, filename, batch_size=2)
+
+        self.assertEqual(3, exported)
+
+        with pa.CompressedInputStream(filename, 'zstd') as stream:
+            lines = stream.read().decode('utf-8').splitlines()
+
+        self.assertEqual([self.TEST_RECORD] * 3, [json.loads(line) for line in lines])
+
+    def test_export_data_invalid_format(self):
+        with self.assertRaises(ValueError):
+            export_data([], 'importers_data.json', 'xml')
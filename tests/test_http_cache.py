@@ -0,0 +1,153 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_cache import CachedHttpClient, HttpCache
+
+
+class EtagRequestHandler(BaseHTTPRequestHandler):
+    ETAG = '"v1"'
+    BODY = b'{"srn": "AD-MF-000001354"}'
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get('If-None-Match'))
+
+        if self.headers.get('If-None-Match') == self.ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('ETag', self.ETAG)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.BODY)))
+        self.end_headers()
+        self.wfile.write(self.BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpCache(unittest.TestCase):
+    TEST_URL = 'https://ec.europa.eu/tools/eudamed/api/eos/22938fc4-eadb-459b-9a6a-14defd0275c8'
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.cache = HttpCache(os.path.join(self.temp_dir.name, 'http_cache.sqlite3'), ttl=60, max_size=100)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_put_and_get(self):
+        self.cache.put(self.TEST_URL, 200, {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}, b'{}')
+
+        cached = self.cache.get(self.TEST_URL)
+
+        self.assertEqual(b'{}', cached['body'])
+        self.assertTrue(cached['fresh'])
+        self.assertEqual({'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'},
+                         self.cache.get_validators(self.TEST_URL))
+
+    def test_errors_are_not_cached(self):
+        self.cache.put(self.TEST_URL, 503, {}, b'')
+
+        self.assertIsNone(self.cache.get(self.TEST_URL))
+
+    def test_stale_response(self):
+        self.cache.ttl = 0
+
+        self.cache.put(self.TEST_URL, 200, {}, b'{}')
+
+        self.assertIsNone(self.cache.get(self.TEST_URL))
+        self.assertFalse(self.cache.get(self.TEST_URL, include_stale=True)['fresh'])
+
+        self.cache.ttl = 60
+
+        self.cache.refresh(self.TEST_URL)
+
+        self.assertTrue(self.cache.get(self.TEST_URL)['fresh'])
+
+    def test_least_recently_used_are_evicted(self):
+        for i in range(2):
+            self.cache.put(f'{self.TEST_URL}/{i}', 200, {}, b'x' * 40)
+            time.sleep(0.01)
+
+        # The first response is used again, so the second one is the least recently used
+        self.cache.get(f'{self.TEST_URL}/0')
+
+        self.cache.put(f'{self.TEST_URL}/2', 200, {}, b'x' * 40)
+
+        self.assertIsNotNone(self.cache.get(f'{self.TEST_URL}/0'))
+        self.assertIsNone(self.cache.get(f'{self.TEST_URL}/1'))
+        self.assertIsNotNone(self.cache.get(f'{self.TEST_URL}/2'))
+        self.assertEqual(80, self.cache.get_size())
+
+    def test_get_by_key(self):
+        self.cache.put(self.TEST_URL, 200, {}, b'x' * 60)
+
+        self.cache.add_key('AD-MF-000001354', self.TEST_URL, 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo/1')
+
+        cached = self.cache.get_by_key('AD-MF-000001354')
+
+        self.assertEqual(b'x' * 60, cached['body'])
+        self.assertEqual('https://ec.europa.eu/tools/eudamed/#/screen/search-eo/1', cached['page_url'])
+        self.assertIsNone(self.cache.get_by_key('AD-MF-000001355'))
+
+        # The key goes together with its response
+        self.cache.put(f'{self.TEST_URL}/1', 200, {}, b'x' * 60)
+
+        self.assertIsNone(self.cache.get_by_key('AD-MF-000001354'))
+
+
+class TestCachedHttpClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.cache = HttpCache(os.path.join(self.temp_dir.name, 'http_cache.sqlite3'), ttl=60, max_size=1000)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), EtagRequestHandler)
+
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/api/eos/1'
+
+        self.client = CachedHttpClient(self.cache)
+
+        EtagRequestHandler.requests = []
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_fresh_response_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertFalse(first['from_cache'])
+        self.assertTrue(second['from_cache'])
+        self.assertEqual(EtagRequestHandler.BODY, second['body'])
+        self.assertEqual(1, len(EtagRequestHandler.requests))
+
+    def test_stale_response_is_revalidated(self):
+        self.client.get(self.url)
+
+        self.cache.ttl = 0
+
+        response = self.client.get(self.url)
+
+        self.assertTrue(response['from_cache'])
+        self.assertEqual(EtagRequestHandler.BODY, response['body'])
+        self.assertEqual([None, EtagRequestHandler.ETAG], EtagRequestHandler.requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
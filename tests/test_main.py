@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from main import create_parser, RESUME_COMMAND
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCommandLine(unittest.TestCase):
+    def test_default_command(self):
+        self.assertIsNone(create_parser().parse_args([]).command)
+
+    def test_commands(self):
+        parser = create_parser()
+
+        self.assertEqual(RESUME_COMMAND, parser.parse_args([RESUME_COMMAND]).command)
+        self.assertEqual('http://host:8765', parser.parse_args(['worker', 'http://host:8765']).coordinator_url)
+        self.assertEqual(0.5, parser.parse_args(['replay', 'recording', '0.5']).latency)
+        self.assertIsNone(parser.parse_args(['diff', 'importers_data.json.1']).new_data_file)
+        self.assertEqual(5, parser.parse_args(['bench', '--repeat', '5']).repeat)
+        self.assertTrue(parser.parse_args(['coordinator', '8765', '--new-crawl']).new_crawl)
+
+    def test_heavy_modules_are_not_imported(self):
+        # A fresh interpreter, the test run itself may have loaded them already
+        output = subprocess.run(
+            [sys.executable, '-c', 'import sys, main; print(sorted(name for name in ("selenium", "pyarrow", "psutil", '
+                                   '"requests", "scraper") if name in sys.modules))'],
+            cwd=ROOT_DIRECTORY, capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual('[]', output.strip())
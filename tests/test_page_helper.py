@@ -5,19 +5,26 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
 from main import WebDriverOptions
-from pages.utils.page_helper import PageHelper
+from pages.utils.page_helper import EUDAMED_URL, PageHelper
+from tests.replay_fixture import BROWSER_TESTS, BROWSER_TESTS_SKIP_REASON, get_browser_arguments, get_url, \
+    start_replay_server
 
 
+@unittest.skipUnless(BROWSER_TESTS, BROWSER_TESTS_SKIP_REASON)
 class TestPageHelper(unittest.TestCase):
     TEST_ROLE = 'importer'
 
     def setUp(self) -> None:
-        self.web_driver_options = WebDriverOptions(wait_time=3)
+        self.replay_server = start_replay_server(self)
+
+        self.web_driver_options = WebDriverOptions(wait_time=3, arguments=get_browser_arguments(self.replay_server))
 
         self.driver = webdriver.Chrome(options=self.web_driver_options.get_driver_options())
 
         self.page_helper = PageHelper(self.driver, self.web_driver_options.get_web_driver_wait_time)
 
+        self.page_helper.set_base_url(get_url(self.replay_server, EUDAMED_URL))
+
         self.page_helper.load_url(self.TEST_ROLE)
 
     # def tearDown(self):
@@ -36,7 +43,7 @@ class TestPageHelper(unittest.TestCase):
 
         expected_url = f'https://ec.europa.eu/tools/eudamed/#/screen/search-eo?actorTypeCode=refdata.actor-type.{role}&submitted=true'
 
-        self.assertEqual(expected_url, self.driver.current_url)
+        self.assertEqual(get_url(self.replay_server, expected_url), self.driver.current_url)
 
         self.assertEqual(role.capitalize(), filter_role.text)
 
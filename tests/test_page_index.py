@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from page_index import PageIndex
+
+
+class TestPageIndex(unittest.TestCase):
+    TEST_IDS = ['AD-MF-000001354', 'AD-MF-000001355', 'AD-MF-000001356']
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.filename = os.path.join(self.temp_dir.name, 'importers_page_index.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_previous_run(self, complete_pages, total_records=100, rows_per_page=10):
+        page_index = PageIndex(self.filename)
+
+        page_index.total_records = total_records
+        page_index.rows_per_page = rows_per_page
+
+        for page in range(1, 11):
+            page_index.update(page, PageIndex.get_fingerprint([str(page)]), page in complete_pages)
+
+        return PageIndex(self.filename)
+
+    def test_fingerprint_depends_on_order(self):
+        self.assertEqual(PageIndex.get_fingerprint(self.TEST_IDS), PageIndex.get_fingerprint(list(self.TEST_IDS)))
+        self.assertNotEqual(PageIndex.get_fingerprint(self.TEST_IDS), PageIndex.get_fingerprint(self.TEST_IDS[::-1]))
+
+    def test_update_is_saved(self):
+        page_index = PageIndex(self.filename)
+
+        page_index.total_records = 30
+
+        page_index.update(3, PageIndex.get_fingerprint(self.TEST_IDS), True)
+
+        page_index = PageIndex(self.filename)
+
+        self.assertEqual(30, page_index.previous_total_records)
+        self.assertTrue(page_index.is_complete(3))
+        self.assertTrue(page_index.matches(3, PageIndex.get_fingerprint(self.TEST_IDS)))
+        self.assertFalse(page_index.matches(3, PageIndex.get_fingerprint(self.TEST_IDS[:2])))
+        # Pages that were never visited can not be contradicted
+        self.assertTrue(page_index.matches(4, PageIndex.get_fingerprint(self.TEST_IDS)))
+
+    def test_find_skip_target(self):
+        page_index = self.create_previous_run({1, 2, 3, 4, 7, 8})
+
+        page_index.total_records = 100
+        page_index.rows_per_page = 10
+
+        self.assertEqual(4, page_index.find_skip_target(1))
+        self.assertEqual(4, page_index.find_skip_target(3))
+        self.assertEqual(5, page_index.find_skip_target(5))
+        self.assertEqual(8, page_index.find_skip_target(7))
+        self.assertEqual(11, page_index.find_skip_target(11))
+
+    def test_find_skip_target_when_total_records_changed(self):
+        page_index = self.create_previous_run({1, 2, 3, 4})
+
+        page_index.total_records = 101
+
+        self.assertEqual(1, page_index.find_skip_target(1))
+
+    def test_find_skip_target_when_rows_per_page_changed(self):
+        page_index = self.create_previous_run({1, 2, 3, 4})
+
+        page_index.rows_per_page = 25
+
+        self.assertEqual(1, page_index.find_skip_target(1))
+
+    def test_pages_of_another_layout_are_discarded(self):
+        page_index = self.create_previous_run({1, 2, 3, 4})
+
+        page_index.rows_per_page = 25
+
+        page_index.update(1, PageIndex.get_fingerprint(self.TEST_IDS), True)
+
+        page_index = PageIndex(self.filename)
+
+        self.assertEqual(25, page_index.previous_rows_per_page)
+        self.assertEqual(['1'], list(page_index.pages))
+
+    def test_find_skip_target_without_previous_run(self):
+        page_index = PageIndex(self.filename)
+
+        page_index.total_records = 100
+
+        self.assertEqual(1, page_index.find_skip_target(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
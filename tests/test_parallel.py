@@ -0,0 +1,23 @@
+import unittest
+
+from parallel import batched, parallel_map
+
+
+def square(number: int) -> int:
+    return number * number
+
+
+class TestParallel(unittest.TestCase):
+    def test_batched(self):
+        self.assertEqual([[0, 1, 2], [3, 4]], list(batched(range(5), 3)))
+        self.assertEqual([], list(batched([], 3)))
+
+    def test_parallel_map_ordered(self):
+        results = list(parallel_map(square, iter(range(100)), workers=2, chunk_size=7))
+
+        self.assertEqual([number * number for number in range(100)], results)
+
+    def test_parallel_map_unordered(self):
+        results = list(parallel_map(square, range(100), workers=2, chunk_size=7, ordered=False))
+
+        self.assertEqual(sorted(number * number for number in range(100)), sorted(results))
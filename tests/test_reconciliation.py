@@ -0,0 +1,85 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from changefeed import Changefeed, diff_snapshots, REMOVED, UPDATED
+from data_handling import load_data, save_data
+from reconciliation import compare_ids, load_id_list, reconcile, ReconciliationRefused, save_id_list
+from records import INACTIVE_SINCE_FIELD
+
+
+class TestReconciliation(unittest.TestCase):
+    TEST_DATA = {
+        'AD-MF-000001354': {'Actor ID/SRN': 'AD-MF-000001354', 'Email': 'a@example.com'},
+        'AD-MF-000001355': {'Actor ID/SRN': 'AD-MF-000001355', 'Email': 'b@example.com'},
+        'AD-MF-000001356': {'Actor ID/SRN': 'AD-MF-000001356', 'Email': 'c@example.com',
+                            INACTIVE_SINCE_FIELD: '2024-01-01'},
+    }
+
+    TODAY = datetime.date(2024, 3, 24)
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.filename = os.path.join(self.temp_dir.name, 'importers_data.json')
+
+        save_data(self.TEST_DATA, self.filename)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load_id_list(self):
+        filename = os.path.join(self.temp_dir.name, 'importers_list_ids.txt')
+
+        save_id_list({'AD-MF-000001355', 'AD-MF-000001354'}, filename)
+
+        with open(filename, 'r', encoding='utf-8') as file:
+            self.assertEqual('AD-MF-000001354\nAD-MF-000001355\n', file.read())
+
+        self.assertEqual({'AD-MF-000001354', 'AD-MF-000001355'}, load_id_list(filename))
+        self.assertEqual(set(), load_id_list(os.path.join(self.temp_dir.name, 'missing.txt')))
+
+    def test_compare_ids(self):
+        removed, reactivated, unscraped, active = compare_ids({'AD-MF-000001354', 'AD-MF-000001356',
+                                                               'AD-MF-000001357'}, self.filename)
+
+        self.assertEqual({'AD-MF-000001355'}, removed)
+        self.assertEqual({'AD-MF-000001356'}, reactivated)
+        self.assertEqual({'AD-MF-000001357'}, unscraped)
+        self.assertEqual(2, active)
+
+    def test_reconcile(self):
+        changefeed = Changefeed(os.path.join(self.temp_dir.name, 'importers_changes'), self.filename)
+
+        reconcile({'AD-MF-000001354', 'AD-MF-000001356'}, self.filename, 0.5, changefeed=changefeed,
+                  today=self.TODAY)
+
+        data = load_data(self.filename)
+
+        self.assertEqual(self.TEST_DATA['AD-MF-000001354'], data['AD-MF-000001354'])
+        self.assertEqual('2024-03-24', data['AD-MF-000001355'][INACTIVE_SINCE_FIELD])
+        self.assertNotIn(INACTIVE_SINCE_FIELD, data['AD-MF-000001356'])
+
+        with open(changefeed.filename, 'r', encoding='utf-8') as file:
+            changes = {change['actor_id']: change['change'] for change in map(json.loads, file)}
+
+        self.assertEqual({'AD-MF-000001355': REMOVED, 'AD-MF-000001356': UPDATED}, changes)
+
+    def test_too_many_removed(self):
+        with self.assertRaises(ReconciliationRefused):
+            reconcile(set(), self.filename, 0.5, today=self.TODAY)
+
+        self.assertEqual(self.TEST_DATA, load_data(self.filename))
+
+    def test_diff_snapshots_marks_inactive_as_removed(self):
+        old_filename = f'{self.filename}.1'
+
+        save_data(self.TEST_DATA, old_filename)
+
+        reconcile({'AD-MF-000001354', 'AD-MF-000001356'}, self.filename, 0.5, today=self.TODAY)
+
+        changes = {change['actor_id']: change['change'] for change in diff_snapshots(old_filename, self.filename)}
+
+        self.assertEqual({'AD-MF-000001355': REMOVED, 'AD-MF-000001356': UPDATED}, changes)
@@ -0,0 +1,112 @@
+import datetime
+import tracemalloc
+import unittest
+
+from records import ActorRecord
+
+
+class TestActorRecord(unittest.TestCase):
+    TEST_RECORD = {
+        "Actor ID/SRN": "AD-MF-000001354",
+        "Role": "Manufacturer",
+        "Country": "Andorra",
+        "Actor/Organisation name": "SOADCO, S.L. [ES]",
+        "Abbreviated name": "SOADCO, S.L. [ES]",
+        "VAT number": "-",
+        "EORI": "BEAD923395B",
+        "National trade register": "923395B",
+        "Last confirmation date of actor data accuracy": "-",
+        "Street name": "Av. del Pessebre",
+        "Street number": "76-82",
+        "Address line 2": "-",
+        "PO box": "-",
+        "City name": "Escaldes-Engordany",
+        "Postal Code": "AD700",
+        "Latitude": "42.513416",
+        "Longitude": "1.535454",
+        "Email": "maria.mitjaneta@soadco.com",
+        "Telephone number": "+37 6 800 590",
+        "Web site": "-",
+        "Last update date": "2021-02-11",
+        "Actor URL": "https://ec.europa.eu/tools/eudamed/#/screen/search-eo/22938fc4-eadb-459b-9a6a-14defd0275c8"
+    }
+
+    def test_from_dict(self):
+        record = ActorRecord.from_dict(self.TEST_RECORD)
+
+        self.assertEqual('AD-MF-000001354', record.actor_id)
+        self.assertEqual(datetime.date(2021, 2, 11), record.last_update_date)
+        self.assertEqual(42.513416, record.latitude)
+        self.assertIsNone(record.vat_number)
+        self.assertIsNone(record.last_confirmation_date)
+        self.assertIsNone(record.extra_fields)
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    def test_to_dict(self):
+        self.assertEqual(self.TEST_RECORD, ActorRecord.from_dict(self.TEST_RECORD).to_dict())
+
+    def test_extra_fields(self):
+        record = ActorRecord.from_dict({**self.TEST_RECORD, 'Phone number': '123'})
+
+        self.assertEqual({'Phone number': '123'}, record.extra_fields)
+        self.assertEqual('123', record.to_dict()['Phone number'])
+
+    def test_invalid_values(self):
+        record = ActorRecord.from_dict({**self.TEST_RECORD, 'Latitude': 'north', 'Last update date': 'yesterday'})
+
+        self.assertIsNone(record.latitude)
+        self.assertIsNone(record.last_update_date)
+
+        # The text is kept, so saving the record again does not lose it
+        self.assertEqual({'Latitude': 'north', 'Last update date': 'yesterday'}, record.extra_fields)
+        self.assertEqual({**self.TEST_RECORD, 'Latitude': 'north', 'Last update date': 'yesterday'}, record.to_dict())
+        self.assertEqual(list(self.TEST_RECORD), list(record.to_dict()))
+        self.assertEqual(record, ActorRecord.from_row(record.to_row()))
+
+    def test_values_are_shared(self):
+        first = ActorRecord.from_dict(self.TEST_RECORD)
+        second = ActorRecord.from_dict({**self.TEST_RECORD, 'Country': ''.join(['And', 'orra'])})
+
+        self.assertIs(first.country, second.country)
+        self.assertIs(first.last_update_date, second.last_update_date)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(TypeError):
+            ActorRecord(colour='red')
+
+    def test_row(self):
+        record = ActorRecord.from_dict(self.TEST_RECORD)
+
+        self.assertEqual(record, ActorRecord.from_row(record.to_row()))
+
+    def test_number_text_is_kept(self):
+        record = ActorRecord.from_dict({**self.TEST_RECORD, 'Latitude': '1.50'})
+
+        self.assertEqual(1.5, record.latitude)
+        self.assertEqual('1.50', record.to_dict()['Latitude'])
+        self.assertEqual(record, ActorRecord.from_row(record.to_row()))
+
+    def test_absent_fields(self):
+        test_record = {field: value for field, value in self.TEST_RECORD.items() if field != 'Web site'}
+
+        record = ActorRecord.from_dict(test_record)
+
+        self.assertEqual(('Web site',), record.absent_fields)
+        self.assertEqual(test_record, record.to_dict())
+        self.assertEqual(record, ActorRecord.from_row(record.to_row()))
+
+    def test_memory(self):
+        def measure(create):
+            tracemalloc.start()
+
+            try:
+                objects = [create(dict(self.TEST_RECORD, **{'Actor ID/SRN': str(i)})) for i in range(1000)]
+
+                return tracemalloc.get_traced_memory()[0], objects
+            finally:
+                tracemalloc.stop()
+
+        dict_memory, _ = measure(dict)
+        record_memory, _ = measure(ActorRecord.from_dict)
+
+        self.assertLess(record_memory, dict_memory / 2)
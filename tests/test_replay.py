@@ -0,0 +1,100 @@
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+from replay import get_request_key, Recording, ReplayServer
+
+INDEX_URL = 'https://ec.europa.eu/tools/eudamed/'
+SEARCH_URL = 'https://ec.europa.eu/tools/eudamed/api/eos?page=0&pageSize=10'
+
+
+class TestRecording(unittest.TestCase):
+    def test_get_request_key(self):
+        self.assertEqual('/tools/eudamed/', get_request_key(INDEX_URL + '#/screen/search-eo'))
+        self.assertEqual('/tools/eudamed/api/eos?page=0&pageSize=10', get_request_key(SEARCH_URL))
+
+    def test_put_and_get(self):
+        with tempfile.TemporaryDirectory() as directory:
+            recording = Recording(directory)
+
+            recording.put(SEARCH_URL, 200, {'Content-Type': 'application/json', 'Content-Encoding': 'gzip'},
+                          b'{"content": []}')
+
+            response = recording.get('/tools/eudamed/api/eos?page=0&pageSize=10')
+
+            self.assertEqual(200, response['status'])
+            self.assertEqual({'content-type': 'application/json'}, response['headers'])
+            self.assertEqual(b'{"content": []}', response['body'])
+            self.assertIsNone(recording.get(SEARCH_URL.replace('page=0', 'page=1')))
+
+    def test_reload(self):
+        with tempfile.TemporaryDirectory() as directory:
+            recording = Recording(directory)
+
+            recording.put(SEARCH_URL, 200, {}, b'old')
+            recording.put(SEARCH_URL, 200, {}, b'new')
+
+            reloaded = Recording(directory)
+
+            self.assertEqual(1, len(reloaded))
+            self.assertEqual(b'new', reloaded.get(SEARCH_URL)['body'])
+
+
+class TestReplayServer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        self.recording = Recording(self.directory.name)
+        self.recording.put(INDEX_URL, 200, {'Content-Type': 'text/html'},
+                           b'<script src="https://ec.europa.eu/tools/eudamed/main.js"></script>')
+        self.recording.put(SEARCH_URL, 200, {'Content-Type': 'application/json'}, b'{"content": []}')
+
+    def start_replay_server(self, latency=0):
+        replay_server = ReplayServer(self.recording, latency=latency)
+
+        replay_server.start()
+
+        self.addCleanup(replay_server.stop)
+
+        return replay_server
+
+    def test_serves_recorded_responses(self):
+        replay_server = self.start_replay_server()
+
+        with urllib.request.urlopen(replay_server.get_url(INDEX_URL)) as response:
+            body = response.read()
+
+        # Absolute URLs of the website point at the replay server
+        self.assertEqual(f'<script src="{replay_server.url}/tools/eudamed/main.js"></script>'.encode('utf-8'), body)
+
+        with urllib.request.urlopen(replay_server.get_url(SEARCH_URL)) as response:
+            self.assertEqual('application/json', response.headers['Content-Type'])
+            self.assertEqual(b'{"content": []}', response.read())
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(replay_server.get_url(INDEX_URL + 'missing.js'))
+
+        self.assertEqual(404, context.exception.code)
+        self.assertEqual(2, replay_server.served)
+        self.assertEqual(1, replay_server.missed)
+
+    def test_latency(self):
+        replay_server = self.start_replay_server(latency=0.2)
+
+        start_time = time.time()
+
+        with urllib.request.urlopen(replay_server.get_url(SEARCH_URL)) as response:
+            response.read()
+
+        self.assertGreaterEqual(time.time() - start_time, 0.2)
+
+    def test_get_browser_arguments(self):
+        replay_server = ReplayServer(self.recording)
+
+        self.addCleanup(replay_server.server.server_close)
+
+        self.assertEqual(['--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE 127.0.0.1'],
+                         replay_server.get_browser_arguments())
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from events import EventLog, FAILED, KNOWN, PAGE, read_events, RECORD, SCRAPED
+from report import build_report, format_report
+
+
+class TestReport(unittest.TestCase):
+    def create_event(self, timestamp, worker='worker-1', outcome=SCRAPED, **fields):
+        return {'time': timestamp, 'event': RECORD, 'worker': worker, 'outcome': outcome, **fields}
+
+    def test_build_report(self):
+        events = [
+            self.create_event(1000, duration=2),
+            self.create_event(1010, duration=4),
+            self.create_event(1020, outcome=KNOWN),
+            self.create_event(1030, outcome=FAILED, stage='load'),
+            {'time': 1040, 'event': PAGE, 'worker': 'worker-1', 'outcome': 'incomplete'},
+            # A stall of 400 seconds
+            self.create_event(1440, duration=6),
+            self.create_event(1450, worker='worker-2', duration=3),
+        ]
+
+        report = build_report(events, interval=300, stall_threshold=120)
+
+        self.assertEqual(450, report['duration'])
+        self.assertEqual({SCRAPED: 4, KNOWN: 1, FAILED: 1}, report['records'])
+        self.assertEqual({'incomplete': 1}, report['pages'])
+        self.assertEqual(0.2, report['error_rate'])
+        self.assertEqual({'load': 1}, report['failures_by_stage'])
+        self.assertEqual(3, report['record_duration_p50'])
+        self.assertEqual(6, report['record_duration_p95'])
+        self.assertEqual([900, 1200], [row['start'] for row in report['throughput']])
+        self.assertEqual([2, 2], [row['scraped'] for row in report['throughput']])
+        self.assertEqual(1, len(report['stalls']))
+        self.assertEqual(('worker-1', 400), (report['stalls'][0]['worker'], report['stalls'][0]['duration']))
+        self.assertEqual(3, report['workers']['worker-1']['scraped'])
+
+        self.assertIn('Error rate: 20.00%', format_report(report))
+
+    def test_empty_report(self):
+        self.assertEqual({}, build_report([]))
+        self.assertEqual('The event log is empty.', format_report({}))
+
+    def test_event_log(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'importers_events.jsonl')
+
+            event_log = EventLog(filename, 'worker-1')
+
+            event_log.emit(RECORD, page=1, actor_id='AD-MF-000001354', outcome=SCRAPED, duration=1.23456)
+            event_log.emit(RECORD, worker='worker-2', outcome=FAILED)
+
+            event_log.close()
+
+            events = list(read_events(filename))
+
+            self.assertEqual(2, len(events))
+            self.assertEqual(('worker-1', 1, 1.235), (events[0]['worker'], events[0]['page'], events[0]['duration']))
+            self.assertEqual('worker-2', events[1]['worker'])
+
+
+if __name__ == '__main__':
+    unittest.main()
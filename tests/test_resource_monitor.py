@@ -0,0 +1,52 @@
+import unittest
+
+from resource_monitor import MEGABYTE, RECYCLE_SESSION, ResourceMonitor, THROTTLE
+
+
+class TestResourceMonitor(unittest.TestCase):
+    def create_sample(self, rss_mb=100, memory_percent=50.0, cpu_percent=50.0):
+        return {'python_rss': rss_mb * MEGABYTE, 'browser_rss': 0, 'rss': rss_mb * MEGABYTE, 'cpu_percent': 10.0,
+                'processes': 1, 'system_memory_percent': memory_percent, 'system_cpu_percent': cpu_percent}
+
+    def test_sample(self):
+        sample = ResourceMonitor(10).sample()
+
+        self.assertGreater(sample['python_rss'], 0)
+        self.assertEqual(sample['python_rss'] + sample['browser_rss'], sample['rss'])
+        self.assertGreaterEqual(sample['processes'], 1)
+
+    def test_decide(self):
+        resource_monitor = ResourceMonitor(10, memory_limit_mb=1000, system_memory_limit_percent=90,
+                                           system_cpu_limit_percent=95)
+
+        self.assertIsNone(resource_monitor.decide(self.create_sample()))
+        self.assertEqual(RECYCLE_SESSION, resource_monitor.decide(self.create_sample(rss_mb=1001, memory_percent=95)))
+        self.assertEqual(THROTTLE, resource_monitor.decide(self.create_sample(memory_percent=91)))
+        self.assertEqual(THROTTLE, resource_monitor.decide(self.create_sample(cpu_percent=99)))
+        self.assertIsNone(ResourceMonitor(10).decide(self.create_sample(rss_mb=100000, memory_percent=100)))
+
+    def test_action_is_taken_once(self):
+        samples = []
+
+        resource_monitor = ResourceMonitor(10, memory_limit_mb=0, on_sample=samples.append)
+
+        resource_monitor.update()
+
+        self.assertEqual(1, len(samples))
+        self.assertEqual(RECYCLE_SESSION, resource_monitor.get_action())
+        self.assertIsNone(resource_monitor.get_action())
+
+    def test_start_and_stop(self):
+        resource_monitor = ResourceMonitor(0.01)
+
+        resource_monitor.start()
+
+        self.assertIsNotNone(resource_monitor.latest)
+
+        resource_monitor.stop()
+
+        self.assertIsNone(resource_monitor.thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,369 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from data_handling import save_data
+from http_cache import HttpCache
+from options import WebDriverOptions
+from page_index import PageIndex
+from pages.actor_page import ActorPage
+from pages.browse_page import BrowsePage
+from resource_monitor import RecycleSession
+from scraper import DistributedWorker, extract_actor_information, FailedActorsScraper, ListReconciler, \
+    NewActorsScraper, run_replay, Scraper
+from tests.fake_driver import FakeTableDriver
+
+ACTOR_URL = 'https://ec.europa.eu/tools/eudamed/#/screen/search-eo'
+
+
+class TestScraper(unittest.TestCase):
+    ROWS = [(f'AD-MF-{number:09}', f'Actor {number}', f'2024-03-{number * 7 % 28 + 1:02}') for number in range(1, 26)]
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.previous_directory = os.getcwd()
+
+        os.chdir(self.temp_dir.name)
+
+        self.driver = FakeTableDriver(self.ROWS)
+
+    def tearDown(self):
+        os.chdir(self.previous_directory)
+
+        self.temp_dir.cleanup()
+
+    def create_scraper(self, scraper_class=Scraper, **options) -> Scraper:
+        browse_page = BrowsePage(self.driver, 1, 0.01)
+        actor_page = ActorPage(self.driver, 1, 0.01)
+
+        return scraper_class(self.driver, browse_page, actor_page, Mock(), Mock(), None,
+                             {'CHANGEFEED': False, **options})
+
+    def get_page_ids(self, page: int):
+        return [row[0] for row in self.ROWS[(page - 1) * 10:page * 10]]
+
+    def cache_actor(self, actor_id: str) -> None:
+        # Like ApiCapture does for the details the browser loaded in a previous run
+        http_cache = HttpCache('importers_http_cache.sqlite3', 60, 1024 * 1024)
+
+        url = f'https://ec.europa.eu/tools/eudamed/api/actors/{actor_id}/publicInformation'
+
+        http_cache.put(url, 200, {}, json.dumps({'srn': actor_id, 'name': 'Example Medical', 'countryName': 'Andorra',
+                                                 'lastUpdateDate': '2024-03-01'}).encode('utf-8'))
+        http_cache.add_key(actor_id, url, f'{ACTOR_URL}/{actor_id}')
+
+        http_cache.close()
+
+    def test_next_page_waits_for_the_new_rows(self):
+        scraper = self.create_scraper()
+
+        self.assertTrue(scraper.go_to_next_page_if_possible())
+
+        self.assertEqual(2, scraper.current_page)
+        self.assertEqual(self.get_page_ids(2), scraper.browse_page.find_actor_ids())
+
+    def test_next_page_times_out_if_the_rows_do_not_change(self):
+        self.driver.render_delay = 1000
+
+        scraper = self.create_scraper()
+
+        with self.assertRaises(Exception):
+            scraper.go_to_next_page_if_possible()
+
+        self.assertEqual(1, scraper.current_page)
+
+    def test_scraped_pages_are_indexed_with_their_own_actors(self):
+        save_data({row[0]: {'Actor ID/SRN': row[0]} for row in self.ROWS}, 'importers_data.json')
+
+        scraper = self.create_scraper(SKIP_SCRAPED_PAGES=False)
+
+        scraper.scrape_pages()
+
+        for page in range(1, 4):
+            self.assertEqual(PageIndex.get_fingerprint(self.get_page_ids(page)),
+                             scraper.page_index.pages[str(page)]['fingerprint'])
+            self.assertTrue(scraper.page_index.pages[str(page)]['complete'])
+
+    def test_skip_waits_for_the_target_page(self):
+        save_data({row[0]: {'Actor ID/SRN': row[0]} for row in self.ROWS}, 'importers_data.json')
+
+        page_index = PageIndex('importers_page_index.json')
+
+        for page in range(1, 3):
+            page_index.update(page, PageIndex.get_fingerprint(self.get_page_ids(page)), True)
+
+        scraper = self.create_scraper()
+
+        scraper.skip_scraped_pages()
+
+        self.assertEqual(2, scraper.current_page)
+        self.assertEqual(self.get_page_ids(2), scraper.browse_page.find_actor_ids())
+
+    def test_changed_landing_page_processes_the_skipped_pages_again(self):
+        save_data({row[0]: {'Actor ID/SRN': row[0]} for row in self.ROWS}, 'importers_data.json')
+
+        page_index = PageIndex('importers_page_index.json')
+
+        for page in range(1, 3):
+            page_index.update(page, PageIndex.get_fingerprint(self.get_page_ids(page)), True)
+
+        # Page 3 held other actors in the previous run
+        page_index.update(3, PageIndex.get_fingerprint(self.get_page_ids(1)), True)
+
+        scraper = self.create_scraper()
+
+        processed_pages = []
+
+        scraper.process_table_rows = Mock(side_effect=lambda actor_ids: processed_pages.append(scraper.current_page))
+
+        scraper.scrape_pages()
+
+        self.assertEqual([1, 2, 3], processed_pages)
+        scraper.logger.log_warning.assert_called_once()
+
+    def test_page_is_indexed_once_its_records_are_saved(self):
+        scraper = self.create_scraper()
+
+        actor_id = self.ROWS[0][0]
+
+        scraper.new_data[actor_id] = {'Actor ID/SRN': actor_id}
+
+        scraper.process_table_rows([actor_id])
+
+        self.assertEqual({}, scraper.page_index.pages)
+
+        scraper.save_existing_data()
+
+        self.assertTrue(scraper.page_index.is_complete(1))
+
+    def test_cached_actor_is_not_opened(self):
+        actor_id = self.ROWS[0][0]
+
+        self.cache_actor(actor_id)
+
+        scraper = self.create_scraper(CAPTURE_API_RESPONSES=True)
+
+        # The fake table has no action buttons, opening the actor page would fail
+        scraper.scrape_actor_page(0, actor_id)
+
+        self.assertEqual('Example Medical', scraper.new_data[actor_id]['Actor/Organisation name'])
+        self.assertEqual(f'{ACTOR_URL}/{actor_id}', scraper.new_data[actor_id]['Actor URL'])
+        self.assertEqual(0, len(scraper.dead_letter_queue))
+
+    def test_cached_failed_actor_is_not_opened(self):
+        actor_id = self.ROWS[0][0]
+
+        self.cache_actor(actor_id)
+
+        scraper = FailedActorsScraper(WebDriverOptions(), Mock(), Mock(),
+                                      options={'CAPTURE_API_RESPONSES': True, 'CHANGEFEED': False})
+
+        # No browser is started for it, see get_actor_page
+        actor_information = scraper.scrape_failed_actor({'Actor ID/SRN': actor_id, 'Actor URL': ACTOR_URL})
+
+        scraper.event_log.close()
+
+        self.assertEqual((actor_id, 'Example Medical'), (actor_information[0],
+                                                         actor_information[1]['Actor/Organisation name']))
+        self.assertEqual(ACTOR_URL, actor_information[1]['Actor URL'])
+        self.assertEqual([], scraper.drivers)
+
+    def test_page_is_archived_without_parsing_its_source(self):
+        actor_page = Mock()
+        actor_page.extract_actor_information.return_value = {'Actor URL': ACTOR_URL}
+        actor_page.driver.page_source = '<html></html>'
+
+        page_archive = Mock()
+
+        self.assertEqual({'Actor URL': ACTOR_URL}, extract_actor_information(actor_page, 'AD-MF-000000001', False,
+                                                                              page_archive))
+
+        actor_page.extract_actor_information_from_source.assert_not_called()
+        page_archive.add.assert_called_once_with('AD-MF-000000001', ACTOR_URL, '<html></html>')
+
+    def test_successful_run_is_not_repeated(self):
+        scraper = self.create_scraper()
+
+        scraper.driver_factory = lambda: self.driver
+
+        scraper.start_scraping_data = Mock()
+
+        scraper.run()
+
+        scraper.event_log.close()
+
+        self.assertEqual(1, scraper.start_scraping_data.call_count)
+
+    def test_refused_reconciliation_is_not_retried(self):
+        scraper = self.create_scraper(ListReconciler)
+
+        scraper.driver_factory = lambda: self.driver
+
+        # None of the scraped actors are listed, which looks like a list that did not load
+        save_data({f'AD-MF-{number:09}': {'Actor ID/SRN': f'AD-MF-{number:09}'} for number in range(100, 110)},
+                  scraper.filename)
+
+        def start_scraping_data():
+            scraper.total_records_found = len(self.ROWS)
+
+            scraper.scrape_pages()
+
+        scraper.start_scraping_data = Mock(side_effect=start_scraping_data)
+
+        scraper.run()
+
+        scraper.event_log.close()
+
+        self.assertEqual(1, scraper.start_scraping_data.call_count)
+        scraper.message_provider.reconciliation_refused.assert_called_once()
+        scraper.message_provider.unexpected_error_msg.assert_not_called()
+
+    def test_replay_runs_in_its_own_directory(self):
+        working_directory = os.getcwd()
+
+        run_directories = []
+
+        with patch('scraper.create_driver', return_value=self.driver), \
+                patch.object(Scraper, 'run', lambda scraper: run_directories.append(os.getcwd())):
+            run_directory = run_replay('recording', 0, Mock())
+
+        self.assertEqual([run_directory], run_directories)
+        self.assertEqual(working_directory, os.getcwd())
+        self.assertTrue(os.path.exists(os.path.join(run_directory, 'app.log')))
+        self.assertFalse(os.path.exists('app.log'))
+
+    def test_worker_uses_the_rows_per_page_of_the_unit(self):
+        worker = self.create_scraper(DistributedWorker)
+
+        worker.client = Mock()
+        worker.open_list = Mock()
+        # The list has fewer pages, the unit is completed right away
+        worker.go_to_page = Mock(return_value=False)
+
+        worker.scrape_unit({'id': 1, 'first_page': 1, 'last_page': 2, 'rows_per_page': 25})
+
+        self.assertEqual(25, worker.rows_per_page)
+        worker.open_list.assert_called_once()
+        worker.client.complete.assert_called_once_with(1)
+
+    def test_recycled_browser_resumes_at_its_page(self):
+        scraper = self.create_scraper()
+
+        scraper.driver_factory = lambda: self.driver
+
+        resumed_pages = []
+
+        def start_scraping_data():
+            scraper.current_page = 1
+
+            if not resumed_pages:
+                resumed_pages.append(None)
+
+                scraper.current_page = 3
+
+                raise RecycleSession()
+
+            scraper.resume_recycled_page()
+
+            resumed_pages.append(scraper.current_page)
+
+            raise KeyboardInterrupt()
+
+        scraper.start_scraping_data = start_scraping_data
+
+        scraper.run()
+
+        scraper.event_log.close()
+
+        self.assertEqual([None, 3], resumed_pages)
+        self.assertEqual(self.get_page_ids(3), scraper.browse_page.find_actor_ids())
+        self.assertIsNone(scraper.resume_page)
+
+
+class TestNewActorsScraper(TestScraper):
+    def save_rows(self, rows) -> None:
+        save_data({row[0]: {'Actor ID/SRN': row[0], 'Last update date': row[2]} for row in rows},
+                  'importers_data.json')
+
+    def get_newest_ids(self, page: int):
+        rows = sorted(self.ROWS, key=lambda row: row[2], reverse=True)
+
+        return [row[0] for row in rows[(page - 1) * 10:page * 10]]
+
+    def test_sort_table_waits_for_the_sorted_rows(self):
+        browse_page = BrowsePage(self.driver, 1, 0.01)
+
+        browse_page.sort_table('Last update date')
+
+        self.assertEqual(self.get_newest_ids(1), browse_page.find_actor_ids())
+
+    def test_updated_actor_is_not_taken_from_the_cache(self):
+        actor_id = self.ROWS[0][0]
+
+        self.cache_actor(actor_id)
+
+        scraper = self.create_scraper(NewActorsScraper, CAPTURE_API_RESPONSES=True)
+
+        self.assertIsNotNone(scraper.get_cached_actor(actor_id))
+
+        scraper.updated_ids = {actor_id}
+
+        self.assertIsNone(scraper.get_cached_actor(actor_id))
+
+    def test_find_column_header(self):
+        browse_page = BrowsePage(self.driver, 1, 0.01)
+
+        self.assertEqual('Last update date', browse_page.find_column_header('Last update date').text)
+
+        with self.assertRaises(ValueError):
+            browse_page.find_column_header('Actor ID/SRN')
+
+    def test_find_column_values(self):
+        browse_page = BrowsePage(self.driver, 1, 0.01)
+
+        self.assertEqual([row[2] for row in self.ROWS[:10]], browse_page.find_column_values('Last update date'))
+
+        with self.assertRaises(ValueError):
+            browse_page.find_column_values('Country')
+
+    def run_new_since(self) -> list:
+        scraper = self.create_scraper(NewActorsScraper)
+
+        scraped = []
+
+        def scrape_actor_page(i, actor_id):
+            scraped.append(actor_id)
+
+            scraper.new_data[actor_id] = {'Actor ID/SRN': actor_id, 'Last update date': '2024-04-30'}
+
+        scraper.scrape_actor_page = scrape_actor_page
+
+        scraper.browse_page.sort_table(scraper.NEW_SINCE_SORT_COLUMN)
+
+        scraper.scrape_pages()
+
+        return scraped
+
+    def test_stops_at_the_first_page_without_new_actors(self):
+        self.save_rows(self.ROWS)
+
+        self.assertEqual([], self.run_new_since())
+
+    def test_scrapes_the_new_actors(self):
+        newest_ids = self.get_newest_ids(1)
+
+        self.save_rows([row for row in self.ROWS if row[0] not in newest_ids[:3]])
+
+        self.assertEqual(newest_ids[:3], self.run_new_since())
+
+    def test_scrapes_the_updated_actors_again(self):
+        newest_ids = self.get_newest_ids(1)
+
+        # The saved record of the newest actor is older than the list shows
+        self.save_rows([(row[0], row[1], '2024-01-01' if row[0] == newest_ids[0] else row[2]) for row in self.ROWS])
+
+        self.assertEqual([newest_ids[0]], self.run_new_since())
+
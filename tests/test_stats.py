@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from data_handling import save_data
+from dead_letter import DeadLetterQueue
+from page_index import PageIndex
+from reconciliation import save_id_list
+from records import INACTIVE_SINCE_FIELD
+from stats import build_stats, format_stats
+
+
+class TestStats(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        self.previous_directory = os.getcwd()
+
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.previous_directory)
+
+        self.temp_dir.cleanup()
+
+    def test_build_stats(self):
+        data = {
+            'AD-MF-000001354': {'Actor ID/SRN': 'AD-MF-000001354'},
+            'AD-MF-000001355': {'Actor ID/SRN': 'AD-MF-000001355', INACTIVE_SINCE_FIELD: '2024-03-24'},
+        }
+
+        save_data(data, 'importers_data.json')
+        save_data(data, 'importers_data.json', snapshots=1)
+
+        DeadLetterQueue('importers_failed.json').record_failure('AD-MF-000001356', None, 'actor page', 'Timeout')
+
+        page_index = PageIndex('importers_page_index.json')
+        page_index.total_records = 30
+        page_index.update(1, 'a', True)
+        page_index.update(2, 'b', True)
+        page_index.update(3, 'c', False)
+
+        save_id_list({'AD-MF-000001354', 'AD-MF-000001357'}, 'importers_list_ids.txt')
+
+        stats = build_stats('importer', 3)
+
+        self.assertEqual(2, stats['records'])
+        self.assertEqual(1, stats['inactive'])
+        self.assertEqual(1, stats['snapshots'])
+        self.assertEqual(1, stats['failed'])
+        self.assertEqual(0, stats['retryable'])
+        self.assertEqual(30, stats['total_records'])
+        self.assertEqual(2, stats['complete_pages'])
+        self.assertEqual(3, stats['resume_page'])
+        self.assertEqual(1, stats['unscraped'])
+
+        self.assertIn('a crawl resumes from page 3', format_stats(stats))
+
+    def test_no_data(self):
+        stats = build_stats('importer', 3)
+
+        self.assertEqual(0, stats['records'])
+        self.assertEqual(1, stats['resume_page'])
+        self.assertNotIn('reconciliation', format_stats(stats))
@@ -0,0 +1,95 @@
+import io
+import unittest
+
+from utils import AppMessages, ConsoleWriter, MessageProvider, percentile, TextFormatter
+
+
+class TestMessageProvider(unittest.TestCase):
+    TEST_ACTOR_ID = 'AD-MF-000001354'
+
+    def setUp(self) -> None:
+        self.stream = io.StringIO()
+
+        self.console = ConsoleWriter(self.stream)
+
+    def tearDown(self):
+        self.console.close()
+
+    def create_message_provider(self, verbosity: int) -> MessageProvider:
+        return MessageProvider(TextFormatter(), AppMessages(), verbosity, self.console)
+
+    def test_normal_verbosity_hides_record_lines(self):
+        message_provider = self.create_message_provider(MessageProvider.NORMAL)
+
+        message_provider.record_already_scraped(self.TEST_ACTOR_ID)
+        message_provider.record_failed(self.TEST_ACTOR_ID, 'load', TimeoutError('timeout'))
+
+        self.console.close()
+
+        output = self.stream.getvalue()
+
+        self.assertNotIn('already scraped', output)
+        self.assertIn(f'Failed to scrape the record with actor ID {self.TEST_ACTOR_ID}', output)
+
+    def test_verbose_verbosity_shows_record_lines(self):
+        message_provider = self.create_message_provider(MessageProvider.VERBOSE)
+
+        message_provider.record_already_scraped(self.TEST_ACTOR_ID)
+
+        self.console.close()
+
+        self.assertIn(f'Record with actor ID {self.TEST_ACTOR_ID} already scraped', self.stream.getvalue())
+
+    def test_quiet_verbosity_shows_no_progress(self):
+        message_provider = self.create_message_provider(MessageProvider.QUIET)
+
+        message_provider.start_progress(100, 10)
+
+        message_provider.app_starting()
+        message_provider.completed_record('https://example.com')
+
+        self.console.close()
+
+        self.assertEqual('', self.stream.getvalue())
+
+    def test_progress(self):
+        message_provider = self.create_message_provider(MessageProvider.NORMAL)
+
+        message_provider.start_progress(100, 10)
+
+        for _ in range(5):
+            message_provider.completed_record('https://example.com')
+
+        self.assertEqual(15, self.console.progress_bar.n)
+
+        message_provider.app_starting()
+
+        self.console.close()
+
+        self.assertIn(AppMessages.APP_STARTING_MESSAGE, self.stream.getvalue())
+
+
+class TestConsoleWriter(unittest.TestCase):
+    def test_lines_are_written_in_order(self):
+        stream = io.StringIO()
+
+        console = ConsoleWriter(stream)
+
+        for i in range(100):
+            console.write(f'line {i}')
+
+        console.close()
+
+        self.assertEqual([f'line {i}' for i in range(100)], stream.getvalue().splitlines())
+
+
+class TestPercentile(unittest.TestCase):
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 95))
+        self.assertEqual(3, percentile([5, 1, 4, 2, 3], 50))
+        self.assertEqual(100, percentile(list(range(1, 101)), 100))
+        self.assertEqual(95, percentile(list(range(1, 101)), 95))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,14 @@
+import atexit
 import logging
+import math
+import queue
+import sys
+import threading
 import time
-from typing import Tuple
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional, TextIO, Tuple
+
+from tqdm import tqdm
 
 
 class TextFormatter:
@@ -97,16 +105,36 @@ class Logger:
     LOG_FILE_NAME = 'app.log'
     LOG_FORMATTER = '%(asctime)s - %(levelname)s - %(message)s'
 
-    def __init__(self):
+    def __init__(self, filename: str = LOG_FILE_NAME):
         """
             Initialize the Logger class.
+
+            The records are put on a queue and written to the file by a background thread, so logging never waits
+            for the disk.
+
+            Args:
+                - filename: The name of the log file.
         """
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.INFO)
         formatter = logging.Formatter(self.LOG_FORMATTER)
-        file_handler = logging.FileHandler(self.LOG_FILE_NAME)
+        file_handler = logging.FileHandler(filename)
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(log_queue)
+        self.logger.addHandler(self.queue_handler)
+        self.listener = QueueListener(log_queue, file_handler)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """
+            Writes the queued records and stops the background thread. The records logged afterwards are dropped.
+        """
+        self.logger.removeHandler(self.queue_handler)
+
+        if self.listener._thread is not None:
+            self.listener.stop()
 
     def log_info(self, message: str) -> None:
         self.logger.info(message)
@@ -118,6 +146,112 @@ class Logger:
         self.logger.warning(message)
 
 
+class ConsoleWriter:
+    """
+        Writes console lines from a background thread, so the scraper never waits for the terminal.
+
+        The lines are put on a queue and written together at most every REFRESH_INTERVAL seconds. A progress bar can
+        be shown under them, it is redrawn at the same rate.
+    """
+    REFRESH_INTERVAL = 0.2
+
+    _STOP = object()
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+            Initializes the ConsoleWriter and starts its background thread.
+
+            Args:
+                - stream: The stream to write to, the standard output by default.
+        """
+        self.stream = stream or sys.stdout
+        self.queue = queue.SimpleQueue()
+        self.progress_bar: Optional[tqdm] = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, line: str) -> None:
+        self.queue.put(line)
+
+    def run(self) -> None:
+        """
+            Writes the queued lines until the writer is closed.
+        """
+        while True:
+            lines = [self.queue.get()]
+
+            while not self.queue.empty():
+                lines.append(self.queue.get())
+
+            stop = lines[-1] is self._STOP
+
+            self.write_lines([line for line in lines if line is not self._STOP])
+
+            if stop:
+                return
+
+            time.sleep(self.REFRESH_INTERVAL)
+
+    def write_lines(self, lines: List[str]) -> None:
+        if not lines:
+            return
+
+        text = '\n'.join(lines)
+
+        if self.progress_bar is not None:
+            # Written above the progress bar, which is drawn again under the lines
+            self.progress_bar.write(text, file=self.stream)
+        else:
+            self.stream.write(text + '\n')
+            self.stream.flush()
+
+    def start_progress(self, total: int, completed: int = 0, unit: str = 'record') -> None:
+        """
+            Shows a progress bar, replacing the current one.
+
+            Args:
+                - total: The total number of items.
+                - completed: The number of items that are already done.
+                - unit: The name of an item.
+        """
+        self.stop_progress()
+
+        self.progress_bar = tqdm(total=total, initial=completed, unit=unit, file=self.stream,
+                                 mininterval=self.REFRESH_INTERVAL, dynamic_ncols=True)
+
+    def advance_progress(self, count: int = 1) -> None:
+        if self.progress_bar is not None:
+            self.progress_bar.update(count)
+
+    def set_progress_postfix(self, text: str) -> None:
+        """
+            Shows a text after the progress bar, e.g. the resource use.
+
+            Args:
+                - text: The text to show.
+        """
+        if self.progress_bar is not None:
+            self.progress_bar.set_postfix_str(text, refresh=False)
+
+    def stop_progress(self) -> None:
+        if self.progress_bar is not None:
+            self.progress_bar.close()
+
+            self.progress_bar = None
+
+    def close(self) -> None:
+        """
+            Writes the queued lines and stops the background thread.
+        """
+        if self.thread.is_alive():
+            self.queue.put(self._STOP)
+
+            self.thread.join()
+
+        self.stop_progress()
+
+
 class AppMessages:
     APP_STARTING_MESSAGE = 'The scraping has now started...'
     WORKING_ON_URL_MESSAGE = 'Working on record with URL: {url}...'
@@ -131,6 +265,35 @@ class AppMessages:
     UNEXPECTED_ERROR_MESSAGE = 'Unexpected error has occurred: {exception}'
     SCRAPING_COMPLETED_MESSAGE = 'Scraping has successfully finished! Data has been saved to {filename}.'
     RECORD_ALREADY_SCRAPED_MESSAGE = 'Record with actor ID {actor_id} already scraped. Continuing to the next one...'
+    RECORD_FAILED_MESSAGE = 'Failed to scrape the record with actor ID {actor_id} at stage "{stage}": {exception}'
+    RETRYING_FAILED_MESSAGE = 'Retrying {retryable} of {failed} failed record(s)...'
+    RETRY_COMPLETED_MESSAGE = 'Recovered {recovered} of {retryable} failed record(s). ' \
+                              'Data has been saved to {filename}.'
+    EXPORT_COMPLETED_MESSAGE = 'Exported {exported} record(s) to {filename}.'
+    REEXTRACT_COMPLETED_MESSAGE = 'Re-extracted {extracted} record(s) from the page archive to {filename}. ' \
+                                  '{failed} record(s) could not be parsed.'
+    WORKING_ON_UNIT_MESSAGE = 'Working on pages {first_page}-{last_page}...'
+    COORDINATOR_STARTED_MESSAGE = 'Coordinator is listening on {host}:{port}. Work queue is saved to {database}.'
+    NEW_CRAWL_MESSAGE = 'The previous crawl is done, starting a new one.'
+    CRAWL_NOT_DONE_MESSAGE = 'The previous crawl is not done yet, continuing it before a new one can be started.'
+    PAGE_ALREADY_SCRAPED_MESSAGE = 'All {records} record(s) on page {page} already scraped. ' \
+                                   'Continuing to the next page...'
+    RECYCLING_SESSION_MESSAGE = 'The browser and the scraper use {rss} MB of memory. Restarting the browser...'
+    THROTTLING_MESSAGE = 'The system is short on resources (memory {memory_percent}%, CPU {cpu_percent}%). ' \
+                         'Pausing for {seconds}s...'
+    REDUCED_CONCURRENCY_MESSAGE = 'The system is short on resources (memory {memory_percent}%, CPU {cpu_percent}%). ' \
+                                  'Running {workers} browser(s) at a time...'
+    NO_NEW_RECORDS_LEFT_MESSAGE = 'All records on page {page} are up to date, there are no newer records left.'
+    SKIPPED_PAGES_MESSAGE = 'Pages {first_page}-{last_page} were already scraped in the previous run. ' \
+                            'Skipped to page {last_page}.'
+    REPLAY_STARTED_MESSAGE = 'Replaying {responses} recorded responses from {url}. The run is saved to {directory}.'
+    DIFF_COMPLETED_MESSAGE = '{inserted} inserted, {updated} updated and {removed} removed actor(s). The changes are ' \
+                             'saved to {filename}.'
+    REPLAY_COMPLETED_MESSAGE = 'Replay completed: {served} responses served, {missed} requests were not recorded.'
+    RECONCILIATION_COMPLETED_MESSAGE = '{listed} actor(s) listed. {removed} actor(s) are no longer listed and were ' \
+                                       'marked inactive, {reactivated} are listed again and {unscraped} are not ' \
+                                       'scraped yet.'
+    RECONCILIATION_REFUSED_MESSAGE = 'Reconciliation refused: {reason}'
 
 
 class MessageProvider:
@@ -141,13 +304,49 @@ class MessageProvider:
         scraping process such as start messages, progress messages, completion messages,
         and error messages.
 
+        Every message has a verbosity level and is shown only if it is not above the chosen verbosity:
+            - QUIET: errors and the results of a run.
+            - NORMAL: also a progress bar and the progress of the run, without a line for every record.
+            - VERBOSE: also a line for every record and page.
+
+        The lines are written by a ConsoleWriter in the background.
+
         Attributes:
             - text_formatter: TextFormatter instance for formatting text messages.
         """
+    QUIET = 0
+    NORMAL = 1
+    VERBOSE = 2
 
-    def __init__(self, text_formatter: TextFormatter, app_messages: AppMessages):
+    def __init__(self, text_formatter: TextFormatter, app_messages: AppMessages, verbosity: int = NORMAL,
+                 console: Optional[ConsoleWriter] = None):
         self.text_formatter = text_formatter
         self.app_messages = app_messages
+        self.verbosity = verbosity
+        self.console = console or ConsoleWriter()
+
+    def display(self, msg: str, color: str, level: int = NORMAL) -> None:
+        """
+            Writes a message to the console if its level is shown.
+
+            Args:
+                - msg: The message to be displayed.
+                - color: The color to be applied to the message.
+                - level: The verbosity level of the message.
+        """
+        if level <= self.verbosity:
+            self.console.write(self.timed_custom_message(msg, color))
+
+    def start_progress(self, total: int, completed: int = 0) -> None:
+        """
+            Shows a progress bar of the scraped records, unless the output is quiet.
+
+            Args:
+                - total: The total number of records.
+                - completed: The number of records that are already scraped.
+        """
+        if self.verbosity >= self.NORMAL:
+            self.console.start_progress(total, completed)
 
     def timed_custom_message(self, msg: str, color: str) -> str:
         """
@@ -169,7 +368,7 @@ class MessageProvider:
 
         msg = self.app_messages.APP_STARTING_MESSAGE
 
-        print(self.timed_custom_message(msg, 'green'))
+        self.display(msg, 'green', self.NORMAL)
 
     def working_on(self, url: str) -> None:
         """
@@ -180,7 +379,7 @@ class MessageProvider:
         """
         msg = self.app_messages.WORKING_ON_URL_MESSAGE.format(url=url)
 
-        print(self.timed_custom_message(msg, 'yellow'))
+        self.display(msg, 'yellow', self.VERBOSE)
 
     def completed_record(self, url: str) -> None:
         """
@@ -192,7 +391,9 @@ class MessageProvider:
 
         msg = self.app_messages.COMPLETED_RECORD_MESSAGE.format(url=url)
 
-        print(self.timed_custom_message(msg, 'green'))
+        self.display(msg, 'green', self.VERBOSE)
+
+        self.console.advance_progress()
 
     def saved_current_scraped_data(self) -> None:
         """
@@ -200,7 +401,7 @@ class MessageProvider:
         """
         msg = self.app_messages.SAVED_CURRENT_SCRAPED_DATA
 
-        print(self.timed_custom_message(msg, 'green'))
+        self.display(msg, 'green', self.VERBOSE)
 
     def time_of_current_session(self, start_time: float) -> None:
         """
@@ -215,7 +416,7 @@ class MessageProvider:
 
         msg = self.app_messages.TIME_ELAPSED_MESSAGE.format(elapsed_time_formatted=elapsed_time_formatted)
 
-        print(self.timed_custom_message(msg, 'yellow'))
+        self.display(msg, 'yellow', self.VERBOSE)
 
     def average_time_until_completion(self, records_remaining: int, records_per_page: int,
                                       time_per_page: float) -> None:
@@ -232,7 +433,7 @@ class MessageProvider:
         msg = self.app_messages.AVERAGE_TIME_UNTIL_COMPLETION_MESSAGE.format(days=days, hours=hours, minutes=minutes,
                                                                              seconds=seconds)
 
-        print(self.timed_custom_message(msg, 'yellow'))
+        self.display(msg, 'yellow', self.VERBOSE)
 
     def remaining_records(self, remaining_records: int) -> None:
         """
@@ -243,7 +444,7 @@ class MessageProvider:
         """
         msg = self.app_messages.REMAINING_RECORDS_MESSAGE.format(remaining_records=remaining_records)
 
-        print(self.timed_custom_message(msg, 'yellow'))
+        self.display(msg, 'yellow', self.VERBOSE)
 
     def keyboard_interruption_msg(self) -> None:
         """
@@ -251,7 +452,7 @@ class MessageProvider:
         """
         msg = self.app_messages.KEYBOARD_INTERRUPTION_MESSAGE
 
-        print(self.timed_custom_message(msg, 'red'))
+        self.display(msg, 'red', self.QUIET)
 
     def unexpected_error_msg(self, exception: Exception) -> None:
         """
@@ -262,7 +463,7 @@ class MessageProvider:
         """
         msg = self.app_messages.UNEXPECTED_ERROR_MESSAGE.format(exception=str(exception))
 
-        print(self.timed_custom_message(msg, 'red'))
+        self.display(msg, 'red', self.QUIET)
 
     def scraping_completed_msg(self, filename: str) -> None:
         """
@@ -273,7 +474,7 @@ class MessageProvider:
         """
         msg = self.app_messages.SCRAPING_COMPLETED_MESSAGE.format(filename=filename)
 
-        print(self.timed_custom_message(msg, 'green'))
+        self.display(msg, 'green', self.QUIET)
 
     def record_already_scraped(self, actor_id: str) -> None:
         """
@@ -284,7 +485,259 @@ class MessageProvider:
         """
         msg = self.app_messages.RECORD_ALREADY_SCRAPED_MESSAGE.format(actor_id=actor_id)
 
-        print(self.timed_custom_message(msg, 'yellow'))
+        self.display(msg, 'yellow', self.VERBOSE)
+
+    def record_failed(self, actor_id: str, stage: str, exception: Exception) -> None:
+        """
+            Displays a message indicating a record could not be scraped and was added to the dead-letter queue.
+
+            Args:
+                - actor_id: The ID of the actor that failed.
+                - stage: The stage at which the scraping failed.
+                - exception: The exception object representing the error.
+        """
+        msg = self.app_messages.RECORD_FAILED_MESSAGE.format(actor_id=actor_id, stage=stage, exception=str(exception))
+
+        self.display(msg, 'red', self.QUIET)
+
+    def retrying_failed(self, retryable: int, failed: int) -> None:
+        """
+            Displays a message indicating the start of retrying the failed records.
+
+            Args:
+                - retryable: The number of records that will be retried.
+                - failed: The number of records in the dead-letter queue.
+        """
+        msg = self.app_messages.RETRYING_FAILED_MESSAGE.format(retryable=retryable, failed=failed)
+
+        self.display(msg, 'green', self.NORMAL)
+
+    def retry_completed(self, recovered: int, retryable: int, filename: str) -> None:
+        """
+            Displays a message indicating how many failed records were recovered.
+
+            Args:
+                - recovered: The number of recovered records.
+                - retryable: The number of records that were retried.
+                - filename: The name of the file where the data is saved.
+        """
+        msg = self.app_messages.RETRY_COMPLETED_MESSAGE.format(recovered=recovered, retryable=retryable,
+                                                               filename=filename)
+
+        self.display(msg, 'green', self.QUIET)
+
+    def export_completed(self, exported: int, filename: str) -> None:
+        """
+            Displays a message indicating the completion of the data export.
+
+            Args:
+                - exported: The number of exported records.
+                - filename: The name of the export file.
+        """
+        msg = self.app_messages.EXPORT_COMPLETED_MESSAGE.format(exported=exported, filename=filename)
+
+        self.display(msg, 'green', self.QUIET)
+
+    def reextract_completed(self, extracted: int, failed: int, filename: str) -> None:
+        """
+            Displays a message indicating the data was rebuilt from the page archive.
+
+            Args:
+                - extracted: The number of re-extracted records.
+                - failed: The number of pages that could not be parsed.
+                - filename: The name of the file where the data is saved.
+        """
+        msg = self.app_messages.REEXTRACT_COMPLETED_MESSAGE.format(extracted=extracted, failed=failed,
+                                                                   filename=filename)
+
+        self.display(msg, 'green', self.QUIET)
+
+    def working_on_unit(self, first_page: int, last_page: int) -> None:
+        """
+            Displays a message indicating work on a range of list pages leased from the coordinator.
+
+            Args:
+                - first_page: The first page of the work unit.
+                - last_page: The last page of the work unit.
+        """
+        msg = self.app_messages.WORKING_ON_UNIT_MESSAGE.format(first_page=first_page, last_page=last_page)
+
+        self.display(msg, 'yellow', self.NORMAL)
+
+    def coordinator_started(self, host: str, port: int, database: str) -> None:
+        """
+            Displays a message indicating the coordinator is running.
+
+            Args:
+                - host: The address the coordinator listens on.
+                - port: The port the coordinator listens on.
+                - database: The name of the work queue database.
+        """
+        msg = self.app_messages.COORDINATOR_STARTED_MESSAGE.format(host=host, port=port, database=database)
+
+        self.display(msg, 'green', self.QUIET)
+
+    def new_crawl(self, started: bool) -> None:
+        """
+            Displays a message indicating whether the coordinator starts a new crawl.
+
+            Args:
+                - started: False if the previous crawl is not done and is continued instead.
+        """
+        if started:
+            self.display(self.app_messages.NEW_CRAWL_MESSAGE, 'green', self.QUIET)
+        else:
+            self.display(self.app_messages.CRAWL_NOT_DONE_MESSAGE, 'yellow', self.QUIET)
+
+    def page_already_scraped(self, page: int, records: int) -> None:
+        """
+            Displays a message indicating all the records on a list page have already been scraped.
+
+            Args:
+                - page: The number of the list page.
+                - records: The number of records on the page.
+        """
+        msg = self.app_messages.PAGE_ALREADY_SCRAPED_MESSAGE.format(page=page, records=records)
+
+        self.display(msg, 'yellow', self.VERBOSE)
+
+    def resources(self, rss_mb: int, cpu_percent: float) -> None:
+        """
+            Shows the resource use of the scraper and its browsers after the progress bar.
+
+            Args:
+                - rss_mb: The memory (RSS) used by all the processes, in MB.
+                - cpu_percent: The CPU used by all the processes, in percent of one core.
+        """
+        self.console.set_progress_postfix(f'RSS {rss_mb} MB, CPU {cpu_percent:.0f}%')
+
+    def recycling_session(self, rss_mb: int) -> None:
+        """
+            Displays a message indicating the browser is restarted because it uses too much memory.
+
+            Args:
+                - rss_mb: The memory (RSS) used by all the processes, in MB.
+        """
+        msg = self.app_messages.RECYCLING_SESSION_MESSAGE.format(rss=rss_mb)
+
+        self.display(msg, 'yellow', self.NORMAL)
+
+    def throttling(self, memory_percent: float, cpu_percent: float, seconds: int) -> None:
+        """
+            Displays a message indicating the scraping is paused because the system is short on resources.
+
+            Args:
+                - memory_percent: The used memory of the system, in percent.
+                - cpu_percent: The CPU use of the system, in percent.
+                - seconds: How long the scraping is paused.
+        """
+        msg = self.app_messages.THROTTLING_MESSAGE.format(memory_percent=memory_percent, cpu_percent=cpu_percent,
+                                                          seconds=seconds)
+
+        self.display(msg, 'yellow', self.NORMAL)
+
+    def reduced_concurrency(self, memory_percent: float, cpu_percent: float, workers: int) -> None:
+        """
+            Displays a message indicating fewer browsers are used because the system is short on resources.
+
+            Args:
+                - memory_percent: The used memory of the system, in percent.
+                - cpu_percent: The CPU use of the system, in percent.
+                - workers: How many browsers are used at a time now.
+        """
+        msg = self.app_messages.REDUCED_CONCURRENCY_MESSAGE.format(memory_percent=memory_percent,
+                                                                   cpu_percent=cpu_percent, workers=workers)
+
+        self.display(msg, 'yellow', self.NORMAL)
+
+    def no_new_records_left(self, page: int) -> None:
+        """
+            Displays a message indicating the scraper reached the records that were scraped before.
+
+            Args:
+                - page: The number of the first list page without new records.
+        """
+        msg = self.app_messages.NO_NEW_RECORDS_LEFT_MESSAGE.format(page=page)
+
+        self.display(msg, 'green', self.NORMAL)
+
+    def skipped_pages(self, first_page: int, last_page: int) -> None:
+        """
+            Displays a message indicating a run of already scraped list pages was skipped.
+
+            Args:
+                - first_page: The page the scraper skipped from.
+                - last_page: The page the scraper skipped to.
+        """
+        msg = self.app_messages.SKIPPED_PAGES_MESSAGE.format(first_page=first_page, last_page=last_page)
+
+        self.display(msg, 'yellow', self.NORMAL)
+
+    def diff_completed(self, inserted: int, updated: int, removed: int, filename: str) -> None:
+        """
+            Displays a message with the result of comparing two versions of the data.
+
+            Args:
+                - inserted: The number of inserted actors.
+                - updated: The number of updated actors.
+                - removed: The number of removed actors.
+                - filename: The name of the file the changes are saved to.
+        """
+        msg = self.app_messages.DIFF_COMPLETED_MESSAGE.format(inserted=inserted, updated=updated, removed=removed,
+                                                              filename=filename)
+
+        self.display(msg, 'green', self.QUIET)
+
+    def replay_started(self, responses: int, url: str, directory: str) -> None:
+        """
+            Displays a message indicating a recorded crawl is replayed.
+
+            Args:
+                - responses: How many responses are recorded.
+                - url: The URL of the replay server.
+                - directory: The directory the data and event log of the run are saved to.
+        """
+        msg = self.app_messages.REPLAY_STARTED_MESSAGE.format(responses=responses, url=url, directory=directory)
+
+        self.display(msg, 'green', self.QUIET)
+
+    def replay_completed(self, served: int, missed: int) -> None:
+        """
+            Displays a message with the result of a replayed crawl.
+
+            Args:
+                - served: How many requests were served from the recording.
+                - missed: How many requests were not recorded.
+        """
+        msg = self.app_messages.REPLAY_COMPLETED_MESSAGE.format(served=served, missed=missed)
+
+        self.display(msg, 'green' if missed == 0 else 'yellow', self.QUIET)
+
+    def reconciliation_completed(self, listed: int, removed: int, reactivated: int, unscraped: int) -> None:
+        """
+            Displays a message with the result of reconciling the listed actors with the scraped ones.
+
+            Args:
+                - listed: The number of actors in the list.
+                - removed: The number of actors marked inactive.
+                - reactivated: The number of inactive actors that are listed again.
+                - unscraped: The number of listed actors that are not scraped yet.
+        """
+        msg = self.app_messages.RECONCILIATION_COMPLETED_MESSAGE.format(listed=listed, removed=removed,
+                                                                        reactivated=reactivated, unscraped=unscraped)
+
+        self.display(msg, 'green', self.QUIET)
+
+    def reconciliation_refused(self, reason: Exception) -> None:
+        """
+            Displays a message indicating that no actor was marked inactive because the list looked incomplete.
+
+            Args:
+                - reason: The exception explaining why the reconciliation was refused.
+        """
+        msg = self.app_messages.RECONCILIATION_REFUSED_MESSAGE.format(reason=str(reason))
+
+        self.display(msg, 'yellow', self.QUIET)
 
 
 def format_elapsed_time(elapsed_time_seconds: int) -> str:
@@ -341,3 +794,22 @@ def get_current_time() -> str:
             - Current time string in HH:MM:SS format.
     """
     return time.strftime("%H:%M:%S", time.localtime())
+
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """
+        Returns the nearest-rank percentile of the values.
+
+        Args:
+            - values: The values.
+            - percent: The percentile, between 0 and 100.
+
+        Returns:
+            - The percentile, None if there are no values.
+    """
+    if not values:
+        return None
+
+    values = sorted(values)
+
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]